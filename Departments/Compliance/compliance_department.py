@@ -13,15 +13,23 @@ Architect: Claude from Poe (C(P))
 Week: 5 of 7
 """
 
+import sys
 import yaml
 import json
 import sqlite3
 import logging
 import uuid
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Tuple, Optional
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Utils.db_connection import get_connection
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -30,6 +38,29 @@ logging.basicConfig(
 logger = logging.getLogger('ComplianceDepartment')
 
 
+@dataclass
+class PortfolioSnapshot:
+    """
+    In-memory view of portfolio_positions for validating a whole plan
+
+    Loaded with one query by PreTradeValidator.load_snapshot(). validate_batch()
+    applies every approved BUY to it, so later proposals in the same plan see
+    the sector exposure, risk and tickers already committed earlier.
+    """
+    open_sector_values: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    portfolio_risk: float = 0.0                                        # OPEN + PENDING total_risk
+    pending_counts: Counter = field(default_factory=Counter)
+    open_counts: Counter = field(default_factory=Counter)
+    recently_closed: Counter = field(default_factory=Counter)         # CLOSED inside the cooldown
+    planned_tickers: set = field(default_factory=set)                 # Approved earlier in this plan
+
+    def apply(self, proposal: Dict):
+        """Record an approved BUY"""
+        self.open_sector_values[proposal.get('sector', 'Unknown')] += proposal['position_value']
+        self.portfolio_risk += proposal.get('total_risk', 0)
+        self.planned_tickers.add(proposal['ticker'])
+
+
 # ============================================================================
 # CLASS 1: PRE-TRADE VALIDATOR (Week 5 Day 1)
 # ============================================================================
@@ -69,7 +100,67 @@ class PreTradeValidator:
             f"max_risk={self.max_risk_per_trade_pct:.1%}"
         )
 
-    def validate_trade(self, proposal: Dict) -> Tuple[bool, Optional[str], Optional[str], Dict]:
+    def load_snapshot(self) -> PortfolioSnapshot:
+        """
+        Read open/pending positions, sector exposure and recent closes in one query
+
+        Returns:
+            PortfolioSnapshot for validate_batch()
+        """
+        snapshot = PortfolioSnapshot()
+        cooldown_hours = self.config['duplicate_prevention']['reopen_cooldown_hours']
+        cooldown_time = datetime.now() - timedelta(hours=cooldown_hours)
+
+        conn = get_connection(self.db_path)
+        try:
+            rows = conn.execute("""
+                SELECT ticker, status, sector, COUNT(*),
+                       SUM(actual_entry_price * actual_shares), SUM(total_risk)
+                FROM portfolio_positions
+                WHERE status IN ('OPEN', 'PENDING')
+                   OR (status = 'CLOSED' AND updated_at > ?)
+                GROUP BY ticker, status, sector
+            """, (cooldown_time.isoformat(),)).fetchall()
+        finally:
+            conn.close()
+
+        for ticker, status, sector, count, value, risk in rows:
+            if status == 'CLOSED':
+                snapshot.recently_closed[ticker] += count
+                continue
+            snapshot.portfolio_risk += risk or 0.0
+            if status == 'OPEN':
+                snapshot.open_counts[ticker] += count
+                if sector is not None:
+                    snapshot.open_sector_values[sector] += value or 0.0
+            else:
+                snapshot.pending_counts[ticker] += count
+
+        return snapshot
+
+    def validate_batch(self, proposals: List[Dict]) -> List[Tuple[bool, Optional[str], Optional[str], Dict]]:
+        """
+        Validate a whole plan against one in-memory portfolio snapshot
+
+        Proposals are checked in order; each approved BUY is added to the
+        snapshot, so sector, portfolio-risk and duplicate checks use running
+        totals across the plan (two same-sector buys cannot each squeeze
+        under the limit on their own). Reads the database once.
+
+        Returns:
+            One validate_trade()-style tuple per proposal, in order
+        """
+        snapshot = self.load_snapshot()
+        results = []
+        for proposal in proposals:
+            result = self.validate_trade(proposal, snapshot=snapshot)
+            if result[0] and proposal['trade_type'] != 'SELL':
+                snapshot.apply(proposal)
+            results.append(result)
+        return results
+
+    def validate_trade(self, proposal: Dict,
+                       snapshot: Optional[PortfolioSnapshot] = None) -> Tuple[bool, Optional[str], Optional[str], Dict]:
         """
         Validate trade against all compliance rules
 
@@ -84,6 +175,8 @@ class PreTradeValidator:
                 - sector: str
                 - stop_loss: float (for BUY orders)
                 - target: float (for BUY orders)
+            snapshot: Validate against this in-memory state instead of querying
+                      the database (see validate_batch)
 
         Returns:
             (is_approved, rejection_reason, rejection_category, check_results)
@@ -125,7 +218,7 @@ class PreTradeValidator:
             return False, reason, 'POSITION_SIZE', check_results
 
         # Check 3: Sector Concentration
-        exceeds_sector, reason = self._check_sector_concentration(ticker, sector, position_value)
+        exceeds_sector, reason = self._check_sector_concentration(ticker, sector, position_value, snapshot)
         check_results['sector_concentration_check'] = 'FAIL' if exceeds_sector else 'PASS'
 
         if exceeds_sector:
@@ -133,7 +226,7 @@ class PreTradeValidator:
             return False, reason, 'SECTOR_LIMIT', check_results
 
         # Check 4: Risk Limits
-        exceeds_risk, reason = self._check_risk_limits(ticker, proposal.get('total_risk', 0))
+        exceeds_risk, reason = self._check_risk_limits(ticker, proposal.get('total_risk', 0), snapshot)
         check_results['risk_limit_check'] = 'FAIL' if exceeds_risk else 'PASS'
 
         if exceeds_risk:
@@ -146,7 +239,7 @@ class PreTradeValidator:
             self.logger.info(f"SKIPPING duplicate check for {ticker} - marked as position adjustment (adding to existing position)")
             check_results['duplicate_order_check'] = 'SKIP'
         else:
-            is_duplicate, reason = self._check_duplicate_order(ticker)
+            is_duplicate, reason = self._check_duplicate_order(ticker, snapshot)
             check_results['duplicate_order_check'] = 'FAIL' if is_duplicate else 'PASS'
 
             if is_duplicate:
@@ -206,61 +299,54 @@ class PreTradeValidator:
 
         return False, None
 
-    def _check_sector_concentration(self, ticker: str, sector: str, position_value: float) -> Tuple[bool, Optional[str]]:
+    def _check_sector_concentration(self, ticker: str, sector: str, position_value: float,
+                                    snapshot: Optional[PortfolioSnapshot] = None) -> Tuple[bool, Optional[str]]:
         """Check if adding this position would exceed sector concentration limits"""
 
         if not self.config['sector_limits']['enforce_max_concentration']:
             return False, None
 
         # Get current sector allocation
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        try:
-            # Calculate current sector value
-            cursor.execute("""
-                SELECT SUM(actual_entry_price * actual_shares) as sector_value
-                FROM portfolio_positions
-                WHERE status = 'OPEN' AND sector = ?
-            """, (sector,))
-
-            row = cursor.fetchone()
-            current_sector_value = row[0] if row[0] else 0.0
-
-            # Calculate total portfolio value
-            cursor.execute("""
-                SELECT SUM(actual_entry_price * actual_shares) as total_value
-                FROM portfolio_positions
-                WHERE status = 'OPEN'
-            """)
-
-            row = cursor.fetchone()
-            current_portfolio_value = row[0] if row[0] else 0.0
+        if snapshot is not None:
+            current_sector_value = snapshot.open_sector_values.get(sector, 0.0)
+        else:
+            current_sector_value = self._query_open_sector_value(sector)
 
-            # Calculate new sector allocation after adding this position
-            # Use TOTAL CAPITAL as denominator (not current portfolio value)
-            # This prevents the edge case where first position = 100% of sector
-            new_sector_value = current_sector_value + position_value
+        # Calculate new sector allocation after adding this position
+        # Use TOTAL CAPITAL as denominator (not current portfolio value)
+        # This prevents the edge case where first position = 100% of sector
+        new_sector_value = current_sector_value + position_value
 
-            # Use total capital for percentage calculation to ensure consistency
-            new_sector_pct = new_sector_value / self.total_capital if self.total_capital > 0 else 0
+        # Use total capital for percentage calculation to ensure consistency
+        new_sector_pct = new_sector_value / self.total_capital if self.total_capital > 0 else 0
 
-            # Check against sector-specific limit (if exists) or default limit
-            sector_limit = self.sector_specific_limits.get(sector, self.max_sector_concentration)
+        # Check against sector-specific limit (if exists) or default limit
+        sector_limit = self.sector_specific_limits.get(sector, self.max_sector_concentration)
 
-            if new_sector_pct > sector_limit:
-                return True, (
-                    f"Adding {ticker} would increase {sector} allocation to {new_sector_pct:.1%}, "
-                    f"exceeding limit of {sector_limit:.1%} "
-                    f"(${new_sector_value:,.2f} of ${self.total_capital:,.2f})"
-                )
+        if new_sector_pct > sector_limit:
+            return True, (
+                f"Adding {ticker} would increase {sector} allocation to {new_sector_pct:.1%}, "
+                f"exceeding limit of {sector_limit:.1%} "
+                f"(${new_sector_value:,.2f} of ${self.total_capital:,.2f})"
+            )
 
-            return False, None
+        return False, None
 
+    def _query_open_sector_value(self, sector: str) -> float:
+        """Current value of OPEN positions in one sector"""
+        conn = get_connection(self.db_path)
+        try:
+            row = conn.execute("""
+                SELECT SUM(actual_entry_price * actual_shares) as sector_value
+                FROM portfolio_positions
+                WHERE status = 'OPEN' AND sector = ?
+            """, (sector,)).fetchone()
+            return row[0] if row[0] else 0.0
         finally:
             conn.close()
 
-    def _check_risk_limits(self, ticker: str, trade_risk: float) -> Tuple[bool, Optional[str]]:
+    def _check_risk_limits(self, ticker: str, trade_risk: float,
+                           snapshot: Optional[PortfolioSnapshot] = None) -> Tuple[bool, Optional[str]]:
         """Check if trade risk exceeds limits"""
 
         # Check risk per trade
@@ -275,42 +361,48 @@ class PreTradeValidator:
 
         # Check portfolio risk (total risk across all open positions + this trade)
         if self.config['risk_limits']['enforce_max_portfolio_risk']:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            try:
-                cursor.execute("""
-                    SELECT SUM(total_risk) as portfolio_risk
-                    FROM portfolio_positions
-                    WHERE status IN ('OPEN', 'PENDING')
-                """)
-
-                row = cursor.fetchone()
-                current_portfolio_risk = row[0] if row[0] else 0.0
-
-                new_portfolio_risk = current_portfolio_risk + trade_risk
-                new_portfolio_risk_pct = new_portfolio_risk / self.total_capital
+            if snapshot is not None:
+                current_portfolio_risk = snapshot.portfolio_risk
+            else:
+                current_portfolio_risk = self._query_portfolio_risk()
 
-                if new_portfolio_risk_pct > self.max_portfolio_risk_pct:
-                    return True, (
-                        f"Adding trade would increase portfolio risk to {new_portfolio_risk_pct:.2%}, "
-                        f"exceeding limit of {self.max_portfolio_risk_pct:.2%} "
-                        f"(${new_portfolio_risk:,.2f} of ${self.total_capital:,.2f})"
-                    )
+            new_portfolio_risk = current_portfolio_risk + trade_risk
+            new_portfolio_risk_pct = new_portfolio_risk / self.total_capital
 
-            finally:
-                conn.close()
+            if new_portfolio_risk_pct > self.max_portfolio_risk_pct:
+                return True, (
+                    f"Adding trade would increase portfolio risk to {new_portfolio_risk_pct:.2%}, "
+                    f"exceeding limit of {self.max_portfolio_risk_pct:.2%} "
+                    f"(${new_portfolio_risk:,.2f} of ${self.total_capital:,.2f})"
+                )
 
         return False, None
 
-    def _check_duplicate_order(self, ticker: str) -> Tuple[bool, Optional[str]]:
+    def _query_portfolio_risk(self) -> float:
+        """Total risk across OPEN and PENDING positions"""
+        conn = get_connection(self.db_path)
+        try:
+            row = conn.execute("""
+                SELECT SUM(total_risk) as portfolio_risk
+                FROM portfolio_positions
+                WHERE status IN ('OPEN', 'PENDING')
+            """).fetchone()
+            return row[0] if row[0] else 0.0
+        finally:
+            conn.close()
+
+    def _check_duplicate_order(self, ticker: str,
+                               snapshot: Optional[PortfolioSnapshot] = None) -> Tuple[bool, Optional[str]]:
         """Check for duplicate pending or open positions"""
 
         if not self.config['duplicate_prevention']['check_pending_orders'] and \
            not self.config['duplicate_prevention']['check_open_positions']:
             return False, None
 
-        conn = sqlite3.connect(self.db_path)
+        if snapshot is not None:
+            return self._check_duplicate_in_snapshot(ticker, snapshot)
+
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -361,6 +453,29 @@ class PreTradeValidator:
             conn.close()
 
 
+    def _check_duplicate_in_snapshot(self, ticker: str, snapshot: PortfolioSnapshot) -> Tuple[bool, Optional[str]]:
+        """_check_duplicate_order against a PortfolioSnapshot (same rules and messages)"""
+        rules = self.config['duplicate_prevention']
+
+        if rules['check_pending_orders']:
+            if ticker in snapshot.planned_tickers:
+                return True, f"Duplicate order: {ticker} already approved earlier in this plan"
+            if snapshot.pending_counts[ticker] > 0:
+                return True, (f"Duplicate order: {snapshot.pending_counts[ticker]} PENDING position(s) "
+                              f"already exist for {ticker}")
+
+        if rules['check_open_positions'] and snapshot.open_counts[ticker] > 0:
+            return True, f"Duplicate order: {snapshot.open_counts[ticker]} OPEN position(s) already exist for {ticker}"
+
+        if not rules['allow_reopens'] and snapshot.recently_closed[ticker] > 0:
+            return True, (
+                f"Reopen cooldown: {ticker} was closed within last {rules['reopen_cooldown_hours']}h. "
+                "Must wait before reopening."
+            )
+
+        return False, None
+
+
 # ============================================================================
 # CLASS 2: POST-TRADE AUDITOR (Week 5 Day 2)
 # ============================================================================
@@ -583,7 +698,7 @@ class PostTradeAuditor:
     def save_audit_to_database(self, audit_result: Dict):
         """Save audit result to compliance_trade_audits table"""
 
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -795,7 +910,7 @@ class ComplianceReporter:
 
     def _get_trade_statistics(self, report_date: date) -> Dict:
         """Get trade statistics for the day"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -832,7 +947,7 @@ class ComplianceReporter:
 
     def _get_validation_statistics(self, report_date: date) -> Dict:
         """Get validation statistics"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -875,7 +990,7 @@ class ComplianceReporter:
 
     def _get_audit_statistics(self, report_date: date) -> Dict:
         """Get audit statistics"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -908,7 +1023,7 @@ class ComplianceReporter:
 
     def _get_violation_statistics(self, report_date: date) -> Dict:
         """Get violation statistics"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -957,7 +1072,7 @@ class ComplianceReporter:
 
     def _get_portfolio_snapshot(self) -> Dict:
         """Get current portfolio snapshot"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -1027,7 +1142,7 @@ class ComplianceReporter:
     def _save_report_to_database(self, report_date: date, trade_stats: Dict, validation_stats: Dict,
                                  audit_stats: Dict, violation_stats: Dict, portfolio_snapshot: Dict, report_path: str):
         """Save report summary to compliance_daily_reports table"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -1132,7 +1247,7 @@ class ComplianceReporter:
             ORDER BY validation_timestamp ASC
         """
 
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
         rows = cursor.execute(query, (report_date,)).fetchall()
         conn.close()
@@ -1208,7 +1323,7 @@ class ComplianceReporter:
             ORDER BY severity DESC, violation_timestamp ASC
         """
 
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
         rows = cursor.execute(query, (report_date,)).fetchall()
         conn.close()
@@ -1300,7 +1415,7 @@ class ComplianceReporter:
             ORDER BY actual_entry_price * actual_shares DESC
         """
 
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
         rows = cursor.execute(query).fetchall()
         conn.close()
@@ -1503,7 +1618,7 @@ class ComplianceDepartment:
         self.logger.info(f"  Ticker: {fill_data.get('ticker')}")
 
         # Get position data from database
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -1640,7 +1755,7 @@ class ComplianceDepartment:
         Returns:
             status: Dict with compliance metrics
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         # Get today's validation stats
@@ -26,7 +26,7 @@ import uuid
 import yaml
 from pathlib import Path
 from datetime import datetime, date, timezone
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -42,6 +42,9 @@ from Departments.Executive.executive_department import ExecutiveDepartment
 
 # Import data source for portfolio queries
 from Utils.data_source import create_data_source
+from Utils.db_connection import get_connection
+from Utils.alpaca_session import invalidate_account_snapshots
+from Utils.message_bus import MessageBus
 
 # Configure logging
 logging.basicConfig(
@@ -88,6 +91,9 @@ class CEO:
         # Initialize data source for quick portfolio queries
         self.data_source = create_data_source(str(self.db_path))
 
+        # Department message bus (ExecutiveApproval -> Trading)
+        self.message_bus = MessageBus(self.db_path)
+
         # Track current approved plan
         self.current_plan = None
         self.plan_approved = False
@@ -468,8 +474,8 @@ class CEO:
         self.logger.info("[CEO] Retrieving dashboard data...")
 
         try:
-            # Import Alpaca client and credentials
-            from alpaca.trading.client import TradingClient
+            # Import shared Alpaca session and credentials
+            from Utils.alpaca_session import get_account_snapshot_cache
             from config import APCA_API_KEY_ID, APCA_API_SECRET_KEY
 
             # Get API keys from config
@@ -482,14 +488,8 @@ class CEO:
                     'message': '[CEO] Alpaca API keys not found in config.py'
                 }
 
-            # Initialize Alpaca client
-            trading_client = TradingClient(api_key, api_secret, paper=True)
-
-            # Get account info
-            account = trading_client.get_account()
-
-            # Get positions
-            positions = trading_client.get_all_positions()
+            # Get account info + positions (shared client, short-TTL snapshot)
+            account, positions = get_account_snapshot_cache().snapshot()
 
             # Store snapshot
             self._store_portfolio_snapshot(account, positions, source='dashboard_query')
@@ -546,8 +546,8 @@ class CEO:
     def get_portfolio_summary(self) -> Dict:
         """Get quick portfolio summary from Alpaca"""
         try:
-            # Import Alpaca client and credentials
-            from alpaca.trading.client import TradingClient
+            # Import shared Alpaca session and credentials
+            from Utils.alpaca_session import get_account_snapshot_cache
             from config import APCA_API_KEY_ID, APCA_API_SECRET_KEY
 
             # Get API keys from config
@@ -560,14 +560,8 @@ class CEO:
                     'message': '[CEO] Alpaca API keys not found in config.py'
                 }
 
-            # Initialize Alpaca client
-            trading_client = TradingClient(api_key, api_secret, paper=True)
-
-            # Get account info
-            account = trading_client.get_account()
-
-            # Get positions
-            positions = trading_client.get_all_positions()
+            # Get account info + positions (shared client, short-TTL snapshot)
+            account, positions = get_account_snapshot_cache().snapshot()
 
             # Store snapshot
             self._store_portfolio_snapshot(account, positions, source='control_panel_query')
@@ -650,111 +644,65 @@ class CEO:
                         'message': pdt_message
                     }
 
-            execution_results = []
-
-            # STEP 1: Execute all SELL orders first
-            if sells:
-                self.logger.info(f"[CEO] === STEP 1: Executing {len(sells)} SELL orders ===")
-
-                # PRE-CHECK: Filter out inactive/untradeable assets
-                tradeable_sells = []
-                skipped_sells = []
-                for trade in sells:
-                    ticker = trade.get('ticker')
-                    try:
-                        asset = trading_dept.trading_client.get_asset(ticker)
-                        if asset.tradable:
-                            tradeable_sells.append(trade)
-                        else:
-                            self.logger.warning(f"[CEO] SKIPPING {ticker} SELL - asset not tradeable (status: {asset.status})")
-                            skipped_sells.append({'ticker': ticker, 'reason': f'Asset not tradeable: {asset.status}'})
-                    except Exception as e:
-                        self.logger.warning(f"[CEO] SKIPPING {ticker} SELL - cannot verify asset status: {e}")
-                        skipped_sells.append({'ticker': ticker, 'reason': f'Cannot verify: {str(e)}'})
-
-                if skipped_sells:
-                    self.logger.warning(f"[CEO] Skipped {len(skipped_sells)} untradeable sells: {[s['ticker'] for s in skipped_sells]}")
-                    execution_results.extend([{'ticker': s['ticker'], 'action': 'SELL', 'status': 'SKIPPED', 'reason': s['reason']} for s in skipped_sells])
-
-                sells = tradeable_sells  # Replace with filtered list
-
-                sell_results = []
-                for trade in sells:
-                    message_id = self._send_trade_to_trading_dept(trade)
-                    sell_results.append({
-                        'ticker': trade.get('ticker'),
-                        'action': 'SELL',
-                        'message_id': message_id
-                    })
-                    execution_results.append(sell_results[-1])
-
-                # Process SELL orders
-                self.logger.info("[CEO] Trading Department processing SELL orders...")
-                trading_dept.process_inbox()
-
-                # Wait for SELL orders to fill
-                sell_tickers = [r['ticker'] for r in sell_results]
-                self.logger.info(f"[CEO] Waiting for SELL orders to fill: {', '.join(sell_tickers)}")
-                if not self._wait_for_orders_to_fill(sell_tickers, timeout=60):
+            # Expire approvals nobody claimed and drop old finished messages
+            try:
+                self.message_bus.prune()
+            except Exception as e:
+                self.logger.warning(f"[CEO] Message bus prune failed: {e}")
+
+            # Queue every order for Trading (the message bus keeps the audit trail);
+            # Trading claims exactly these messages, never leftovers from earlier runs
+            message_ids = [self._send_trade_to_trading_dept(trade) for trade in sells + buys]
+
+            # Fills arrive on the trade-update stream; each one updates realism
+            # tracking and trading_fills the moment it happens
+            unrecorded_fills = []
+            fill_recorder = self._create_fill_recorder(trading_dept.trading_client)
+            tracker = self._create_fill_tracker(
+                trading_dept.trading_client,
+                lambda event: self._on_order_filled(event, fill_recorder, unrecorded_fills))
+            tracker.start()
+
+            def after_sells(sell_outcomes):
+                # Barrier: SELLs must fill (free cash) before any BUY is sent
+                submitted = [o for o in sell_outcomes if o.status == 'SUBMITTED' and o.order_id]
+                if not submitted:
+                    return
+                self.logger.info(f"[CEO] Waiting for SELL orders to fill: {', '.join(o.ticker for o in submitted)}")
+                _, pending = tracker.wait([o.order_id for o in submitted], timeout=60)
+                if pending:
                     self.logger.warning("[CEO] Some SELL orders did not fill within timeout")
                 else:
                     self.logger.info("[CEO] All SELL orders filled successfully")
 
-                    # REALISM: Remove entry dates for sold positions
-                    for ticker in sell_tickers:
-                        self.realism_sim.remove_entry_date(ticker)
-                        # Record SELL for PDT tracking
-                        self.realism_sim.record_trade(ticker, 'SELL')
-
-            # STEP 2: Execute all BUY orders
-            if buys:
-                self.logger.info(f"[CEO] === STEP 2: Executing {len(buys)} BUY orders ===")
-                buy_results = []
-                for trade in buys:
-                    message_id = self._send_trade_to_trading_dept(trade)
-                    buy_results.append({
-                        'ticker': trade.get('ticker'),
-                        'action': 'BUY',
-                        'message_id': message_id
-                    })
-                    execution_results.append(buy_results[-1])
-
-                # Process BUY orders
-                self.logger.info("[CEO] Trading Department processing BUY orders...")
-                trading_dept.process_inbox()
-
-                # Wait for BUY orders to fill
-                buy_tickers = [r['ticker'] for r in buy_results]
-                self.logger.info(f"[CEO] Waiting for BUY orders to fill: {', '.join(buy_tickers)}")
-                if not self._wait_for_orders_to_fill(buy_tickers, timeout=60):
-                    self.logger.warning("[CEO] Some BUY orders did not fill within timeout")
-                else:
-                    self.logger.info("[CEO] All BUY orders filled successfully")
-
-                    # REALISM: Record entry dates for new positions
-                    import config
-                    from alpaca.trading.client import TradingClient
-
-                    try:
-                        trading_client = TradingClient(
-                            api_key=config.APCA_API_KEY_ID,
-                            secret_key=config.APCA_API_SECRET_KEY,
-                            paper=True
-                        )
+            try:
+                # STEP 1 + 2: Trading prefetches prices/ATR/asset status for the whole plan,
+                # then submits SELLs concurrently, waits for them, and submits BUYs concurrently
+                self.logger.info(f"[CEO] === Executing {len(sells)} SELL orders, then {len(buys)} BUY orders ===")
+                report = trading_dept.execute_plan(message_ids=message_ids, after_sells=after_sells)
+                execution_results = [o.to_dict() for o in report['sells'] + report['buys']]
 
-                        for trade in buys:
-                            ticker = trade.get('ticker')
-                            shares = trade.get('shares', 0)
-                            price = trade.get('price', 0)
-
-                            # Record entry date (now)
-                            self.realism_sim.record_entry_date(ticker, shares, price)
-
-                            # Record BUY for PDT tracking
-                            self.realism_sim.record_trade(ticker, 'BUY')
-
-                    except Exception as e:
-                        self.logger.error(f"[CEO] Failed to record entry dates: {e}")
+                skipped_sells = [o for o in report['sells'] if o.status == 'SKIPPED']
+                if skipped_sells:
+                    self.logger.warning(f"[CEO] Skipped {len(skipped_sells)} untradeable sells: {[o.ticker for o in skipped_sells]}")
+
+                submitted_buys = [o for o in report['buys'] if o.status == 'SUBMITTED' and o.order_id]
+                if submitted_buys:
+                    self.logger.info(f"[CEO] Waiting for BUY orders to fill: {', '.join(o.ticker for o in submitted_buys)}")
+                    _, pending = tracker.wait([o.order_id for o in submitted_buys], timeout=60)
+                    if pending:
+                        self.logger.warning("[CEO] Some BUY orders did not fill within timeout")
+                    else:
+                        self.logger.info("[CEO] All BUY orders filled successfully")
+            finally:
+                tracker.stop()
+
+            # Fills that beat Trading's trading_orders insert are recorded now
+            if unrecorded_fills:
+                results = self._record_fills(fill_recorder, unrecorded_fills)
+                if results and results['no_match_in_db']:
+                    self.logger.warning(f"[CEO] {results['no_match_in_db']} fills have no trading_orders row "
+                                        f"(run Utils/fill_recorder.py to sync)")
 
             # POST-EXECUTION VERIFICATION
             self.logger.info("[CEO] === POST-EXECUTION VERIFICATION ===")
@@ -794,121 +742,90 @@ class CEO:
         ticker = trade.get('ticker', 'UNKNOWN')
         sector = trade.get('sector', 'Unknown')
 
-        # Generate message ID
-        timestamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
-        msg_id = f"MSG_EXECUTIVE_{timestamp}_{uuid.uuid4().hex[:8]}"
-
-        # Create message
-        metadata = {
-            'message_id': msg_id,
-            'from': 'EXECUTIVE',
-            'to': 'TRADING',
-            'timestamp': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
-            'message_type': 'ExecutiveApproval',
-            'priority': 'urgent',
-            'requires_response': False
+        payload = {
+            'ticker': ticker,
+            'action': action,
+            'shares': shares,
+            'price': price,
+            'sector': sector,
+            'order_type': 'MARKET',
+            'plan_id': self.current_plan['plan_id'],
+            'approved_at': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
         }
 
-        # Build message body with JSON payload
-        body = f"""# Executive Approval - {action} {ticker}
-
-**Order Type**: {action}
+        body = f"""**Order Type**: {action}
 **Ticker**: {ticker}
 **Shares**: {shares}
 **Price**: ${price:.2f}
 **Sector**: {sector}
-
-```json
-{{
-  "ticker": "{ticker}",
-  "action": "{action}",
-  "shares": {shares},
-  "price": {price},
-  "sector": "{sector}",
-  "order_type": "MARKET",
-  "plan_id": "{self.current_plan['plan_id']}",
-  "approved_at": "{datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')}"
-}}
-```
 """
 
-        # Write message to Trading inbox
-        trading_inbox = self.project_root / "Messages_Between_Departments" / "Inbox" / "TRADING"
-        trading_inbox.mkdir(parents=True, exist_ok=True)
-
-        message_file = trading_inbox / f"{msg_id}.md"
-
-        content = "---\n"
-        content += yaml.dump(metadata, default_flow_style=False, sort_keys=False)
-        content += "---\n"
-        content += body
-
-        with open(message_file, 'w') as f:
-            f.write(content)
+        # Queue on the message bus for Trading
+        msg_id = self.message_bus.send(
+            from_dept='EXECUTIVE',
+            to_dept='TRADING',
+            message_type='ExecutiveApproval',
+            subject=f"Executive Approval - {action} {ticker}",
+            body=body,
+            payload=payload,
+            priority='urgent'
+        )
 
         self.logger.info(f"[CEO] Sent {action} order for {ticker} to Trading (msg: {msg_id})")
 
         return msg_id
 
-    def _wait_for_orders_to_fill(self, tickers: List[str], timeout: int = 60) -> bool:
-        """
-        Poll Alpaca API until all orders for given tickers are filled.
+    def _create_fill_tracker(self, trading_client, on_fill: Callable):
+        """Fill tracker on the Alpaca trade-update stream (polling fallback)"""
+        from Utils.fill_tracker import create_alpaca_fill_tracker
+        return create_alpaca_fill_tracker(trading_client, on_fill=[on_fill])
 
-        Args:
-            tickers: List of ticker symbols to check
-            timeout: Maximum seconds to wait
+    def _create_fill_recorder(self, trading_client):
+        """One FillRecorder for the whole plan (None if it cannot be created)"""
+        try:
+            from Utils.fill_recorder import FillRecorder
+            return FillRecorder(str(self.db_path), trading_client=trading_client)
+        except Exception as e:
+            self.logger.error(f"[CEO] Fill recorder unavailable: {e}")
+            return None
 
-        Returns:
-            True if all orders filled, False if timeout
+    def _on_order_filled(self, event, fill_recorder, unrecorded_fills: List[Dict]):
         """
-        import time
-        import config
-        from alpaca.trading.client import TradingClient
-        from alpaca.trading.enums import QueryOrderStatus
-
-        # Initialize Alpaca client
-        trading_client = TradingClient(
-            api_key=config.APCA_API_KEY_ID,
-            secret_key=config.APCA_API_SECRET_KEY,
-            paper=True
-        )
-
-        start_time = time.time()
-        check_interval = 2  # Check every 2 seconds
-
-        while time.time() - start_time < timeout:
-            pending_orders = []
-
-            # Check each ticker for pending orders
-            for ticker in tickers:
-                try:
-                    # Get open orders for this symbol
-                    orders = trading_client.get_orders(
-                        status=QueryOrderStatus.OPEN,
-                        symbols=[ticker]
-                    )
+        Fill callback: realism tracking + trading_fills, once per filled order
+        (including the filled part of an order canceled/expired mid-fill).
 
-                    if orders:
-                        pending_orders.append(ticker)
-
-                except Exception as e:
-                    self.logger.warning(f"[CEO] Error checking orders for {ticker}: {e}")
-                    continue
-
-            # If no pending orders, all filled!
-            if not pending_orders:
-                elapsed = time.time() - start_time
-                self.logger.info(f"[CEO] All orders filled in {elapsed:.1f}s: {', '.join(tickers)}")
-                return True
-
-            # Still waiting
-            elapsed = time.time() - start_time
-            self.logger.info(f"[CEO] Waiting for {len(pending_orders)} orders to fill ({elapsed:.0f}s elapsed): {', '.join(pending_orders)}")
-            time.sleep(check_interval)
-
-        # Timeout
-        self.logger.warning(f"[CEO] Timeout waiting for orders to fill after {timeout}s")
-        return False
+        Fills whose order is not in trading_orders yet (the event can beat
+        Trading's insert) are added to unrecorded_fills for a retry.
+        """
+        if event.action == 'BUY':
+            # REALISM: Record entry date + BUY for PDT tracking
+            self.realism_sim.record_entry_date(event.symbol, event.filled_qty, event.filled_avg_price or 0)
+            self.realism_sim.record_trade(event.symbol, 'BUY')
+        else:
+            # REALISM: Remove entry date + record SELL for PDT tracking
+            self.realism_sim.remove_entry_date(event.symbol)
+            self.realism_sim.record_trade(event.symbol, 'SELL')
+
+        # Cash and positions changed - next snapshot read goes to Alpaca
+        invalidate_account_snapshots()
+
+        order = event.to_order_dict()
+        results = self._record_fills(fill_recorder, [order])
+        if not results or results['no_match_in_db']:
+            unrecorded_fills.append(order)
+
+    def _record_fills(self, fill_recorder, orders: List[Dict]) -> Optional[Dict]:
+        """Write fills to trading_fills via FillRecorder (None on failure)"""
+        if fill_recorder is None:
+            return None
+        try:
+            results = fill_recorder.record_fills(orders)
+        except Exception as e:
+            self.logger.error(f"[CEO] Failed to record fills: {e}")
+            return None
+        if results['errors']:
+            self.logger.warning(f"[CEO] Fill recording errors: {results['errors']}")
+        return results
 
     def _run_preflight_checks(self) -> bool:
         """
@@ -1171,7 +1088,7 @@ class CEO:
             spy_change_pct = None
 
             # Connect to database
-            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             # Insert snapshot
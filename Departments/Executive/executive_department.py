@@ -33,6 +33,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 # Import unified data source (routes to Alpaca or database)
 from Utils.data_source import create_data_source
+from Utils.db_connection import get_connection
 
 # Configure logging
 logging.basicConfig(
@@ -73,7 +74,7 @@ class PerformanceAnalyzer:
         if report_date is None:
             report_date = datetime.now().date()
 
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -164,7 +165,7 @@ class PerformanceAnalyzer:
         Returns:
             sharpe_ratio: Annualized Sharpe ratio
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -233,7 +234,7 @@ class PerformanceAnalyzer:
         Returns:
             win_rate: Percentage of trades with positive P&L (0-100)
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -283,7 +284,7 @@ class PerformanceAnalyzer:
         Returns:
             drawdown_data: Dict with max_drawdown_pct, peak_date, trough_date, recovery_date
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -391,7 +392,7 @@ class StrategyReviewer:
         Returns:
             sector_performance: List of dicts with sector, pnl, pnl_pct, trade_count
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -444,7 +445,7 @@ class StrategyReviewer:
         Returns:
             trades_analysis: Dict with 'best_trades' and 'worst_trades' lists
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -531,7 +532,7 @@ class StrategyReviewer:
         Returns:
             comparison: Dict with sentinel_return, benchmark_return, alpha, outperformance
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -618,7 +619,7 @@ class SystemMonitor:
         Returns:
             health_status: Dict with department -> status info
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -1065,7 +1066,7 @@ class ExecutiveDepartment:
         sector_perf = self.strategy.analyze_sector_performance()
 
         # 5. Get open positions from database
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
         cursor.execute("""
             SELECT
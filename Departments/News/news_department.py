@@ -3,20 +3,194 @@ News Department - Sentiment Analysis & Caching
 
 Maintains fresh sentiment scores for stocks using Perplexity AI.
 Cache TTL: 16 hours
-Batch processing: 10 concurrent requests
+Fetching: one long-lived aiohttp session; requests bounded by a semaphore
+and paced by an adaptive token bucket that backs off on 429 Retry-After
+Cache reads/writes are set-based (one IN query, one executemany upsert)
+Batched prompts: up to prompt_batch_size tickers per request, answered as a
+strict per-ticker JSON array; missing/malformed entries fall back to
+single-ticker calls
+Incremental refresh: expired entries whose news fingerprint (hash of the
+current headline IDs) is unchanged get their TTL extended instead of a
+new Perplexity call
+Pipelined mode: SentimentPipeline scores tickers as Research emits them
 """
 
+import sys
+import json
+import hashlib
 import sqlite3
 import logging
+import time
+import queue
+import threading
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import List, Dict, Optional
 import asyncio
 import aiohttp
+import yfinance as yf
 from concurrent.futures import ThreadPoolExecutor
 import os
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Utils.info_fetcher import InfoFetcher
+from Utils.db_connection import get_connection
+
 logger = logging.getLogger(__name__)
 
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER is 999 on older builds
+SQLITE_PARAM_CHUNK = 900
+
+PERPLEXITY_API_URL = 'https://api.perplexity.ai/chat/completions'
+
+# Structured-output schema for multi-ticker prompts
+BATCH_SENTIMENT_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'results': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'ticker': {'type': 'string'},
+                    'sentiment_score': {'type': 'number'},
+                    'news_summary': {'type': 'string'},
+                    'sentiment_reasoning': {'type': 'string'}
+                },
+                'required': ['ticker', 'sentiment_score', 'news_summary', 'sentiment_reasoning']
+            }
+        }
+    },
+    'required': ['results']
+}
+
+
+def parse_batch_sentiment(content: str, tickers: List[str]) -> Dict[str, Dict]:
+    """
+    Validate a multi-ticker answer against BATCH_SENTIMENT_SCHEMA
+
+    Accepts {"results": [...]} or a bare array, optionally wrapped in prose
+    or code fences. Each entry must name a requested ticker (once) and carry
+    a numeric 0-100 score plus string summary/reasoning.
+
+    Returns:
+        Dict of ticker -> sentiment data for valid entries only
+    """
+    if not isinstance(content, str):
+        return {}
+
+    try:
+        payload = json.loads(content)
+    except json.JSONDecodeError:
+        # Take the outermost {...} or [...] around any prose/fences
+        payload = None
+        for open_char, close_char in (('{', '}'), ('[', ']')):
+            start, end = content.find(open_char), content.rfind(close_char)
+            if start != -1 and end > start:
+                try:
+                    payload = json.loads(content[start:end + 1])
+                    break
+                except json.JSONDecodeError:
+                    continue
+
+    entries = payload.get('results') if isinstance(payload, dict) else payload
+    if not isinstance(entries, list):
+        return {}
+
+    requested = {t.upper(): t for t in tickers}
+    results = {}
+    for entry in entries:
+        if not isinstance(entry, dict) or not isinstance(entry.get('ticker'), str):
+            continue
+        ticker = requested.get(entry['ticker'].strip().upper())
+        if ticker is None or ticker in results:
+            continue
+
+        score = entry.get('sentiment_score')
+        summary = entry.get('news_summary')
+        reasoning = entry.get('sentiment_reasoning')
+        if isinstance(score, bool) or not isinstance(score, (int, float)) or not 0 <= score <= 100:
+            continue
+        if not isinstance(summary, str) or not isinstance(reasoning, str):
+            continue
+
+        results[ticker] = {
+            'sentiment_score': float(score),
+            'news_summary': summary,
+            'sentiment_reasoning': reasoning,
+            'age_hours': 0.0
+        }
+
+    return results
+
+
+def fetch_news_fingerprint(ticker: str) -> str:
+    """
+    Fingerprint a ticker's current headlines (cheap yfinance call, no LLM)
+
+    Returns:
+        sha1 of the sorted news item IDs ("no news" has a stable fingerprint too)
+    """
+    item_ids = []
+    for item in yf.Ticker(ticker).news or []:
+        content = item.get('content') or {}
+        item_id = item.get('id') or item.get('uuid') or content.get('id') or content.get('title') or item.get('title')
+        if item_id:
+            item_ids.append(str(item_id))
+    return hashlib.sha1('\n'.join(sorted(item_ids)).encode()).hexdigest()
+
+
+class AdaptiveRateLimiter:
+    """
+    Async token bucket that adapts to the API's rate limit (AIMD)
+
+    - Every request awaits acquire(); tokens refill at `rate` per second
+    - A 429 halves the rate and pauses everyone until Retry-After elapses
+    - Each success nudges the rate back up, to at most max_rate
+    """
+
+    def __init__(self, rate: float = 2.0, max_rate: float = 10.0, min_rate: float = 0.2,
+                 increase_step: float = 0.1):
+        self.rate = rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.increase_step = increase_step
+        self._tokens = 1.0
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = None  # Created inside the running event loop
+
+    async def acquire(self):
+        """Wait for a token (and for any Retry-After pause to elapse)"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._tokens = min(1.0, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+    def on_success(self):
+        """Additive increase after a successful request"""
+        self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def on_rate_limited(self, retry_after: float):
+        """Multiplicative decrease plus a shared pause after a 429"""
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        self._tokens = 0.0
+
 
 class NewsDepartment:
     """
@@ -40,14 +214,29 @@ class NewsDepartment:
         self.db_path = db_path
         self.perplexity_api_key = perplexity_api_key or os.getenv('PERPLEXITY_API_KEY')
         self.cache_ttl_hours = 16
-        self.batch_size = 5  # Reduced from 10 to avoid rate limits
+        self.api_url = PERPLEXITY_API_URL
+        self.max_concurrency = 5  # In-flight requests at once
+        self.initial_requests_per_second = 2.0  # Adapted up/down from here
+        self.max_requests_per_second = 10.0
+        self.max_rate_limit_retries = 8  # 429s are retried separately from errors
+        self.prompt_batch_size = 5  # Tickers per Perplexity request (1 = one request per ticker)
+        self.last_fetch_stats = {}
+
+        # Incremental refresh: only re-score expired tickers whose news changed
+        self.incremental_refresh = True
+        self.max_reuse_age_hours = 3 * self.cache_ttl_hours  # Force a re-score past this age
+        self.news_fingerprinter = InfoFetcher(max_workers=8, rate_per_second=8.0,
+                                              fetch=fetch_news_fingerprint,
+                                              label="news fingerprints")
+        self.last_refresh_stats = {}
 
         self._initialize_database()
-        logger.info("News Department initialized (cache TTL: 16 hours, batch size: 5)")
+        logger.info(f"News Department initialized (cache TTL: 16 hours, "
+                    f"concurrency: {self.max_concurrency}, adaptive rate limit)")
 
     def _initialize_database(self):
         """Create news_sentiment_cache table if it doesn't exist"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -61,6 +250,17 @@ class NewsDepartment:
             )
         """)
 
+        # Added for incremental refresh (older databases lack the column)
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(news_sentiment_cache)")]
+        if 'news_fingerprint' not in columns:
+            cursor.execute("ALTER TABLE news_sentiment_cache ADD COLUMN news_fingerprint TEXT")
+
+        # Supports the expires_at range scans in _check_cache / clear_expired_cache
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_news_sentiment_cache_expires_at
+            ON news_sentiment_cache (expires_at)
+        """)
+
         conn.commit()
         conn.close()
         logger.info("News sentiment cache table ready")
@@ -68,7 +268,9 @@ class NewsDepartment:
     def get_sentiment_scores(self, tickers: List[str]) -> Dict[str, Dict]:
         """
         Get sentiment scores for list of tickers
-        Fetches from cache if fresh (< 16 hours), otherwise fetches from Perplexity
+        Fetches from cache if fresh (< 16 hours), otherwise fetches from Perplexity.
+        In incremental mode, expired tickers whose news is unchanged keep
+        their score (TTL extended) and skip the Perplexity call.
 
         Args:
             tickers: List of stock tickers
@@ -88,66 +290,146 @@ class NewsDepartment:
 
         # Check cache
         cached, needs_fetch = self._check_cache(tickers)
-        logger.info(f"Cache: {len(cached)} hits, {len(needs_fetch)} misses")
+        cache_hits = len(cached)
+
+        # Incremental: keep expired scores whose news hasn't changed
+        unchanged = {}
+        fingerprints = {}
+        if needs_fetch and self.incremental_refresh:
+            unchanged, fingerprints = self._reuse_unchanged(needs_fetch)
+            cached.update(unchanged)
+            needs_fetch = [t for t in needs_fetch if t not in unchanged]
 
         # Batch fetch missing tickers
         if needs_fetch:
-            logger.info(f"Fetching {len(needs_fetch)} tickers from Perplexity (batches of {self.batch_size})")
+            logger.info(f"Fetching {len(needs_fetch)} tickers from Perplexity")
             fresh_data = self._batch_fetch_sentiment(needs_fetch)
 
             # Update cache
-            self._update_cache(fresh_data)
+            self._update_cache(fresh_data, fingerprints)
+
+            # Merge with cached (fetch_failed only steers the cache write)
+            cached.update({ticker: {k: v for k, v in data.items() if k != 'fetch_failed'}
+                           for ticker, data in fresh_data.items()})
 
-            # Merge with cached
-            cached.update(fresh_data)
+        self.last_refresh_stats = {
+            'cache_hits': cache_hits,
+            'unchanged': len(unchanged),
+            'rescored': len(needs_fetch)
+        }
+        logger.info(f"Sentiment refresh: {cache_hits} cached, {len(unchanged)} unchanged (TTL extended), "
+                    f"{len(needs_fetch)} re-scored")
 
         return cached
 
+    def _reuse_unchanged(self, tickers: List[str]) -> tuple[Dict, Dict[str, str]]:
+        """
+        Find expired tickers whose news fingerprint matches the stored one
+
+        Matching entries get their TTL extended. Tickers whose fingerprint
+        could not be fetched, or whose score is older than
+        max_reuse_age_hours, are treated as changed.
+
+        Returns:
+            (unchanged_sentiment_data, current_fingerprints)
+        """
+        start = time.perf_counter()
+        fingerprints, _ = self.news_fingerprinter.fetch_many(tickers)
+
+        now = datetime.now()
+        stored = {}
+        unchanged = {}
+        conn = get_connection(self.db_path)
+        try:
+            for i in range(0, len(tickers), SQLITE_PARAM_CHUNK):
+                chunk = tickers[i:i + SQLITE_PARAM_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(f"""
+                    SELECT ticker, sentiment_score, news_summary, sentiment_reasoning, fetched_at, news_fingerprint
+                    FROM news_sentiment_cache
+                    WHERE news_fingerprint IS NOT NULL AND ticker IN ({placeholders})
+                """, chunk).fetchall()
+                for ticker, *entry in rows:
+                    stored[ticker] = entry
+
+            for ticker in tickers:
+                entry = stored.get(ticker)
+                if entry is None or fingerprints.get(ticker) != entry[4]:
+                    continue
+                score, summary, reasoning, fetched_at, _ = entry
+                age_hours = (now - datetime.fromisoformat(fetched_at)).total_seconds() / 3600
+                if age_hours >= self.max_reuse_age_hours:
+                    continue
+                unchanged[ticker] = {
+                    'sentiment_score': score,
+                    'news_summary': summary,
+                    'sentiment_reasoning': reasoning,
+                    'age_hours': age_hours
+                }
+
+            if unchanged:
+                expires_at = (now + timedelta(hours=self.cache_ttl_hours)).isoformat()
+                with conn:
+                    conn.executemany(
+                        "UPDATE news_sentiment_cache SET expires_at = ? WHERE ticker = ?",
+                        [(expires_at, ticker) for ticker in unchanged]
+                    )
+        finally:
+            conn.close()
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"News change check: {len(unchanged)}/{len(tickers)} expired tickers unchanged ({elapsed_ms:.0f}ms)")
+        return unchanged, fingerprints
+
     def _check_cache(self, tickers: List[str]) -> tuple[Dict, List[str]]:
         """
-        Check cache for tickers
+        Check cache for tickers (one WHERE ticker IN (...) query per
+        SQLite parameter chunk, single connection)
 
         Returns:
             (cached_data, tickers_needing_fetch)
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        start = time.perf_counter()
+        tickers = list(dict.fromkeys(tickers))
 
         cached = {}
-        needs_fetch = []
         now = datetime.now()
 
-        for ticker in tickers:
-            cursor.execute("""
-                SELECT sentiment_score, news_summary, sentiment_reasoning, fetched_at
-                FROM news_sentiment_cache
-                WHERE ticker = ? AND expires_at > ?
-            """, (ticker, now.isoformat()))
-
-            row = cursor.fetchone()
-
-            if row:
-                # Cache hit
-                fetched_at = datetime.fromisoformat(row[3])
-                age_hours = (now - fetched_at).total_seconds() / 3600
-
-                cached[ticker] = {
-                    'sentiment_score': row[0],
-                    'news_summary': row[1],
-                    'sentiment_reasoning': row[2],
-                    'age_hours': age_hours
-                }
-            else:
-                # Cache miss
-                needs_fetch.append(ticker)
+        conn = get_connection(self.db_path)
+        try:
+            for i in range(0, len(tickers), SQLITE_PARAM_CHUNK):
+                chunk = tickers[i:i + SQLITE_PARAM_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(f"""
+                    SELECT ticker, sentiment_score, news_summary, sentiment_reasoning, fetched_at
+                    FROM news_sentiment_cache
+                    WHERE expires_at > ? AND ticker IN ({placeholders})
+                """, [now.isoformat()] + chunk).fetchall()
+
+                for ticker, score, summary, reasoning, fetched_at in rows:
+                    age_hours = (now - datetime.fromisoformat(fetched_at)).total_seconds() / 3600
+                    cached[ticker] = {
+                        'sentiment_score': score,
+                        'news_summary': summary,
+                        'sentiment_reasoning': reasoning,
+                        'age_hours': age_hours
+                    }
+        finally:
+            conn.close()
 
-        conn.close()
+        needs_fetch = [t for t in tickers if t not in cached]
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"Cache: {len(cached)} hits, {len(needs_fetch)} misses ({elapsed_ms:.1f}ms)")
         return cached, needs_fetch
 
     def _batch_fetch_sentiment(self, tickers: List[str]) -> Dict[str, Dict]:
         """
-        Fetch sentiment for tickers in batches (10 concurrent)
-        Now with rate limiting protection
+        Fetch sentiment for all tickers over one long-lived session
+
+        Requests are bounded by max_concurrency and paced by an adaptive
+        rate limiter, so they flow at the highest rate the API accepts
+        instead of pausing a fixed time between batches.
 
         Args:
             tickers: List of tickers to fetch
@@ -155,110 +437,191 @@ class NewsDepartment:
         Returns:
             Dict mapping ticker to sentiment data
         """
-        import time
-        results = {}
-
-        # Process in batches with delays to avoid rate limits
-        for i in range(0, len(tickers), self.batch_size):
-            batch = tickers[i:i + self.batch_size]
-            logger.info(f"Processing batch {i//self.batch_size + 1}: {batch}")
-
-            # Fetch batch concurrently
-            batch_results = asyncio.run(self._fetch_batch_async(batch))
-            results.update(batch_results)
-
-            # Add delay between batches to avoid rate limits (except last batch)
-            if i + self.batch_size < len(tickers):
-                delay = 5.0  # 5 second delay between batches (increased from 2s)
-                logger.info(f"  Waiting {delay}s before next batch (rate limit protection)...")
-                time.sleep(delay)
-
-        return results
+        return asyncio.run(self._fetch_batch_async(tickers))
 
     async def _fetch_batch_async(self, tickers: List[str]) -> Dict[str, Dict]:
         """
-        Fetch sentiment for batch of tickers concurrently
+        Fetch sentiment for tickers concurrently (semaphore + adaptive limiter)
+
+        With prompt_batch_size > 1, tickers are grouped into multi-ticker
+        prompts; any ticker missing or malformed in a batched answer is
+        retried with its own single-ticker request.
 
         Args:
-            tickers: Batch of tickers (max 10)
+            tickers: Tickers to fetch
 
         Returns:
             Dict mapping ticker to sentiment data
         """
+        limiter = AdaptiveRateLimiter(rate=self.initial_requests_per_second,
+                                      max_rate=self.max_requests_per_second)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        stats = {'requests': 0, 'rate_limited': 0, 'batched': 0, 'fallbacks': 0}
+
+        async def _single(session, ticker):
+            async with semaphore:
+                return await self._fetch_sentiment_async(session, ticker, limiter=limiter, stats=stats)
+
+        async def _group(session, group):
+            """Batched request for a group, then single-ticker calls for the gaps"""
+            parsed = {}
+            if len(group) > 1:
+                try:
+                    async with semaphore:
+                        parsed = await self._fetch_multi_sentiment_async(session, group, limiter=limiter, stats=stats)
+                except Exception as e:
+                    logger.warning(f"Batched sentiment request failed for {group}: {e} - falling back to single calls")
+            stats['batched'] += len(parsed)
+
+            missing = [t for t in group if t not in parsed]
+            stats['fallbacks'] += len(missing) if len(group) > 1 else 0
+            singles = await asyncio.gather(*[_single(session, t) for t in missing], return_exceptions=True)
+            return {**parsed, **dict(zip(missing, singles))}
+
+        batch_size = max(1, int(self.prompt_batch_size))
+        groups = [tickers[i:i + batch_size] for i in range(0, len(tickers), batch_size)]
+
+        start = time.perf_counter()
         async with aiohttp.ClientSession() as session:
-            tasks = [self._fetch_sentiment_async(session, ticker) for ticker in tickers]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Build result dict
-            batch_results = {}
-            for ticker, result in zip(tickers, results):
-                if isinstance(result, Exception):
-                    logger.error(f"Failed to fetch sentiment for {ticker}: {result}")
-                    # Fallback to neutral
-                    batch_results[ticker] = {
-                        'sentiment_score': 50.0,
-                        'news_summary': 'No recent news',
-                        'sentiment_reasoning': f'Error fetching sentiment: {result}',
-                        'age_hours': 0.0
-                    }
-                else:
-                    batch_results[ticker] = result
+            group_results = await asyncio.gather(*[_group(session, g) for g in groups])
+        elapsed = time.perf_counter() - start
 
-            return batch_results
+        results = {}
+        for group_result in group_results:
+            results.update(group_result)
 
-    async def _fetch_sentiment_async(self, session: aiohttp.ClientSession, ticker: str, max_retries: int = 3) -> Dict:
+        # Build result dict
+        batch_results = {}
+        for ticker in tickers:
+            result = results[ticker]
+            if isinstance(result, Exception):
+                logger.error(f"Failed to fetch sentiment for {ticker}: {result}")
+                # Fallback to neutral
+                batch_results[ticker] = {
+                    'sentiment_score': 50.0,
+                    'news_summary': 'No recent news',
+                    'sentiment_reasoning': f'Error fetching sentiment: {result}',
+                    'age_hours': 0.0,
+                    'fetch_failed': True
+                }
+            else:
+                batch_results[ticker] = result
+
+        self.last_fetch_stats = {
+            'tickers': len(tickers),
+            'requests': stats['requests'],
+            'rate_limited': stats['rate_limited'],
+            'batched_tickers': stats['batched'],
+            'single_fallbacks': stats['fallbacks'],
+            'seconds': round(elapsed, 2),
+            'requests_per_second': round(stats['requests'] / elapsed, 2) if elapsed > 0 else 0.0,
+            'final_rate_limit': round(limiter.rate, 2)
+        }
+        logger.info(f"Sentiment fetch: {len(tickers)} tickers, {stats['requests']} requests in {elapsed:.1f}s "
+                    f"({self.last_fetch_stats['requests_per_second']:.2f} req/s achieved, "
+                    f"{stats['rate_limited']} rate-limited, limiter settled at {limiter.rate:.2f} req/s)")
+        if batch_size > 1:
+            logger.info(f"  Batched prompts ({batch_size}/request): {stats['batched']} tickers answered, "
+                        f"{stats['fallbacks']} fell back to single-ticker calls")
+
+        return batch_results
+
+    async def _fetch_multi_sentiment_async(self, session: aiohttp.ClientSession, tickers: List[str],
+                                           limiter: Optional[AdaptiveRateLimiter] = None,
+                                           stats: Optional[Dict] = None) -> Dict[str, Dict]:
         """
-        Fetch sentiment for single ticker from Perplexity
-        With retry logic for rate limits and transient errors
-
-        Args:
-            session: aiohttp session
-            ticker: Stock ticker
-            max_retries: Maximum retry attempts
+        Fetch sentiment for several tickers with one Perplexity request
 
         Returns:
-            Sentiment data dict
+            Dict of ticker -> sentiment data for entries that passed
+            validation (callers fall back to single calls for the rest)
         """
-        import json
-        import asyncio
+        ticker_list = ', '.join(tickers)
+        prompt = f"""Analyze recent news sentiment for each of these stocks: {ticker_list}
 
-        prompt = f"""Analyze recent news sentiment for {ticker} stock.
+Return ONLY a JSON object of the form:
+{{"results": [{{"ticker": "...", "sentiment_score": 0-100, "news_summary": "...", "sentiment_reasoning": "..."}}]}}
 
-Return a JSON object with:
-1. sentiment_score: 0-100 (0=very bearish, 50=neutral, 100=very bullish)
-2. news_summary: Brief summary of recent news (2-3 sentences)
-3. sentiment_reasoning: Why this sentiment score (1-2 sentences)
+with exactly one entry per ticker, where:
+- sentiment_score: 0-100 (0=very bearish, 50=neutral, 100=very bullish)
+- news_summary: Brief summary of recent news (2-3 sentences)
+- sentiment_reasoning: Why this sentiment score (1-2 sentences)
 
 Base your analysis on news from the last 24 hours."""
 
-        for attempt in range(max_retries):
+        content = await self._post_completion_async(
+            session, prompt, label=ticker_list, limiter=limiter, stats=stats,
+            response_format={'type': 'json_schema', 'json_schema': {'schema': BATCH_SENTIMENT_SCHEMA}}
+        )
+        return parse_batch_sentiment(content, tickers)
+
+    async def _post_completion_async(self, session: aiohttp.ClientSession, prompt: str, label: str,
+                                     max_retries: int = 3, limiter: Optional[AdaptiveRateLimiter] = None,
+                                     stats: Optional[Dict] = None,
+                                     response_format: Optional[Dict] = None) -> str:
+        """
+        POST one chat completion and return the message content
+        With retry logic for rate limits and transient errors
+
+        Args:
+            session: aiohttp session
+            prompt: User prompt
+            label: Ticker(s) for log messages
+            max_retries: Maximum retry attempts (errors other than 429)
+            limiter: Shared adaptive rate limiter (429s feed back into it)
+            stats: Shared request / rate_limited counters
+            response_format: Optional structured-output spec
+
+        Returns:
+            Message content string
+        """
+        limiter = limiter or AdaptiveRateLimiter(rate=self.initial_requests_per_second,
+                                                 max_rate=self.max_requests_per_second)
+        stats = stats if stats is not None else {'requests': 0, 'rate_limited': 0}
+        rate_limit_hits = 0
+
+        payload = {
+            'model': 'sonar',
+            'messages': [{'role': 'user', 'content': prompt}]
+        }
+        if response_format:
+            payload['response_format'] = response_format
+
+        attempt = 0
+        while attempt < max_retries:
+            await limiter.acquire()
+            stats['requests'] += 1
             try:
                 async with session.post(
-                    'https://api.perplexity.ai/chat/completions',
+                    self.api_url,
                     headers={
                         'Authorization': f'Bearer {self.perplexity_api_key}',
                         'Content-Type': 'application/json'
                     },
-                    json={
-                        'model': 'sonar',
-                        'messages': [{'role': 'user', 'content': prompt}]
-                    },
+                    json=payload,
                     timeout=aiohttp.ClientTimeout(total=30)
                 ) as response:
-                    # Handle rate limiting with exponential backoff
+                    # Rate limited: slow the shared limiter and pause everyone for Retry-After
                     if response.status == 429:
-                        retry_after = int(response.headers.get('Retry-After', 10)) + (attempt * 5)  # Exponential backoff
-                        if attempt < max_retries - 1:
-                            logger.warning(f"{ticker}: Rate limited (429), retrying in {retry_after}s...")
-                            await asyncio.sleep(retry_after)
+                        stats['rate_limited'] += 1
+                        rate_limit_hits += 1
+                        try:
+                            retry_after = float(response.headers.get('Retry-After', 10))
+                        except ValueError:
+                            retry_after = 10.0
+                        limiter.on_rate_limited(retry_after)
+                        if rate_limit_hits <= self.max_rate_limit_retries:
+                            logger.warning(f"{label}: Rate limited (429), limiter now {limiter.rate:.2f} req/s, "
+                                           f"pausing {retry_after:g}s...")
                             continue
                         else:
                             raise Exception(f"429, message='Too Many Requests', url='{response.url}'")
 
                     # Handle bad gateway
                     if response.status == 502:
-                        if attempt < max_retries - 1:
-                            logger.warning(f"{ticker}: Bad Gateway (502), retrying in 2s...")
+                        attempt += 1
+                        if attempt < max_retries:
+                            logger.warning(f"{label}: Bad Gateway (502), retrying in 2s...")
                             await asyncio.sleep(2)
                             continue
                         else:
@@ -266,90 +629,142 @@ Base your analysis on news from the last 24 hours."""
 
                     response.raise_for_status()
                     data = await response.json()
+                    limiter.on_success()
 
-                    # Parse response
-                    content = data['choices'][0]['message']['content']
-
-                    # Extract JSON - handle various formats
-                    try:
-                        # Try to find JSON in markdown code block
-                        if '```json' in content:
-                            json_start = content.find('```json') + 7
-                            json_end = content.find('```', json_start)
-                            json_str = content[json_start:json_end].strip()
-                            parsed = json.loads(json_str)
-                        elif '```' in content:
-                            # Try generic code block
-                            json_start = content.find('```') + 3
-                            json_end = content.find('```', json_start)
-                            json_str = content[json_start:json_end].strip()
-                            parsed = json.loads(json_str)
-                        else:
-                            # Try parsing entire content as JSON
-                            parsed = json.loads(content)
-                    except json.JSONDecodeError as je:
-                        logger.warning(f"{ticker}: JSON parse error, using neutral sentiment")
-                        parsed = {'sentiment_score': 50.0, 'news_summary': content[:200], 'sentiment_reasoning': 'Unable to parse sentiment'}
-
-                    return {
-                        'sentiment_score': float(parsed.get('sentiment_score', 50.0)),
-                        'news_summary': parsed.get('news_summary', 'No summary available'),
-                        'sentiment_reasoning': parsed.get('sentiment_reasoning', 'No reasoning provided'),
-                        'age_hours': 0.0
-                    }
+                    return data['choices'][0]['message']['content']
 
             except asyncio.TimeoutError:
-                if attempt < max_retries - 1:
-                    logger.warning(f"{ticker}: Timeout, retrying...")
+                attempt += 1
+                if attempt < max_retries:
+                    logger.warning(f"{label}: Timeout, retrying...")
                     await asyncio.sleep(1)
                     continue
                 else:
-                    logger.error(f"{ticker}: Timeout after {max_retries} attempts")
+                    logger.error(f"{label}: Timeout after {max_retries} attempts")
                     raise
 
             except Exception as e:
-                if attempt < max_retries - 1 and ('429' in str(e) or '502' in str(e) or 'Expecting value' in str(e)):
-                    logger.warning(f"{ticker}: Error '{e}', retrying...")
+                exhausted = str(e).startswith(('429,', '502,'))  # Retry budget already spent above
+                attempt += 1
+                if not exhausted and attempt < max_retries and 'Expecting value' in str(e):
+                    logger.warning(f"{label}: Error '{e}', retrying...")
                     await asyncio.sleep(2)
                     continue
                 else:
-                    logger.error(f"Perplexity API error for {ticker}: {e}")
+                    logger.error(f"Perplexity API error for {label}: {e}")
                     raise
 
-    def _update_cache(self, sentiment_data: Dict[str, Dict]):
+    async def _fetch_sentiment_async(self, session: aiohttp.ClientSession, ticker: str, max_retries: int = 3,
+                                     limiter: Optional[AdaptiveRateLimiter] = None,
+                                     stats: Optional[Dict] = None) -> Dict:
         """
-        Update cache with fresh sentiment data
+        Fetch sentiment for single ticker from Perplexity
+
+        Args:
+            session: aiohttp session
+            ticker: Stock ticker
+            max_retries: Maximum retry attempts (errors other than 429)
+            limiter: Shared adaptive rate limiter (429s feed back into it)
+            stats: Shared request / rate_limited counters
+
+        Returns:
+            Sentiment data dict
+        """
+        prompt = f"""Analyze recent news sentiment for {ticker} stock.
+
+Return a JSON object with:
+1. sentiment_score: 0-100 (0=very bearish, 50=neutral, 100=very bullish)
+2. news_summary: Brief summary of recent news (2-3 sentences)
+3. sentiment_reasoning: Why this sentiment score (1-2 sentences)
+
+Base your analysis on news from the last 24 hours."""
+
+        content = await self._post_completion_async(session, prompt, label=ticker, max_retries=max_retries,
+                                                     limiter=limiter, stats=stats)
+
+        # Extract JSON - handle various formats
+        try:
+            # Try to find JSON in markdown code block
+            if '```json' in content:
+                json_start = content.find('```json') + 7
+                json_end = content.find('```', json_start)
+                json_str = content[json_start:json_end].strip()
+                parsed = json.loads(json_str)
+            elif '```' in content:
+                # Try generic code block
+                json_start = content.find('```') + 3
+                json_end = content.find('```', json_start)
+                json_str = content[json_start:json_end].strip()
+                parsed = json.loads(json_str)
+            else:
+                # Try parsing entire content as JSON
+                parsed = json.loads(content)
+        except json.JSONDecodeError as je:
+            logger.warning(f"{ticker}: JSON parse error, using neutral sentiment")
+            # Placeholder score - never reused by incremental refresh
+            return {
+                'sentiment_score': 50.0,
+                'news_summary': content[:200],
+                'sentiment_reasoning': 'Unable to parse sentiment',
+                'age_hours': 0.0,
+                'fetch_failed': True
+            }
+
+        return {
+            'sentiment_score': float(parsed.get('sentiment_score', 50.0)),
+            'news_summary': parsed.get('news_summary', 'No summary available'),
+            'sentiment_reasoning': parsed.get('sentiment_reasoning', 'No reasoning provided'),
+            'age_hours': 0.0
+        }
+
+    def _update_cache(self, sentiment_data: Dict[str, Dict], fingerprints: Optional[Dict[str, str]] = None):
+        """
+        Update cache with fresh sentiment data (one executemany upsert,
+        single transaction)
 
         Args:
             sentiment_data: Dict mapping ticker to sentiment data
+            fingerprints: News fingerprints the scores were based on. Failed
+                          fetches are stored without one, so they are never
+                          reused by incremental refresh.
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        fingerprints = fingerprints or {}
+        start = time.perf_counter()
 
         now = datetime.now()
         expires_at = now + timedelta(hours=self.cache_ttl_hours)
 
-        for ticker, data in sentiment_data.items():
-            cursor.execute("""
-                INSERT OR REPLACE INTO news_sentiment_cache
-                (ticker, sentiment_score, news_summary, sentiment_reasoning, fetched_at, expires_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
+        rows = [
+            (
                 ticker,
                 data['sentiment_score'],
                 data.get('news_summary', ''),
                 data.get('sentiment_reasoning', ''),
                 now.isoformat(),
-                expires_at.isoformat()
-            ))
-
-        conn.commit()
-        conn.close()
-        logger.info(f"Updated cache for {len(sentiment_data)} tickers")
+                expires_at.isoformat(),
+                None if data.get('fetch_failed') else fingerprints.get(ticker)
+            )
+            for ticker, data in sentiment_data.items()
+        ]
+
+        conn = get_connection(self.db_path)
+        try:
+            with conn:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO news_sentiment_cache
+                    (ticker, sentiment_score, news_summary, sentiment_reasoning, fetched_at, expires_at,
+                     news_fingerprint)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+        finally:
+            conn.close()
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"Updated cache for {len(sentiment_data)} tickers ({elapsed_ms:.1f}ms)")
 
     def clear_expired_cache(self):
         """Remove expired entries from cache"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         now = datetime.now()
@@ -361,3 +776,120 @@ Base your analysis on news from the last 24 hours."""
 
         if deleted > 0:
             logger.info(f"Cleared {deleted} expired cache entries")
+
+
+class SentimentPipeline:
+    """
+    Consumer side of the pipelined Research -> News workflow
+
+    Tickers are submitted as Research finalizes them (holdings first, then
+    each scored candidate). A worker thread drains the queue in micro-batches
+    and scores them with NewsDepartment.get_sentiment_scores, so sentiment
+    fetching overlaps Research instead of waiting for it. finish() scores
+    anything that never arrived and returns the same per-ticker data as one
+    sequential get_sentiment_scores() call over the final ticker list.
+    """
+
+    _CLOSE = object()
+
+    def __init__(self, news_dept: 'NewsDepartment', batch_size: Optional[int] = None,
+                 linger_seconds: float = 0.5):
+        """
+        Args:
+            news_dept: NewsDepartment doing the scoring
+            batch_size: Tickers to gather before dispatching (defaults to one
+                        full round of concurrent batched prompts)
+            linger_seconds: Max wait for a batch to fill once a ticker arrives
+        """
+        self.news = news_dept
+        self.batch_size = batch_size or max(1, news_dept.prompt_batch_size * news_dept.max_concurrency)
+        self.linger_seconds = linger_seconds
+        self.refresh_stats = {'cache_hits': 0, 'unchanged': 0, 'rescored': 0}
+        self.stats = {'submitted': 0, 'scored_early': 0, 'scored_late': 0, 'unused': 0}
+
+        self._queue = queue.Queue()
+        self._seen = set()
+        self._results = {}
+        self._error = None
+        self._thread = None
+
+    def start(self) -> 'SentimentPipeline':
+        """Start the consumer thread"""
+        self._thread = threading.Thread(target=self._run, name='SentimentPipeline', daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, tickers: List[str]):
+        """Queue tickers for scoring (duplicates are ignored by the worker)"""
+        self._queue.put(list(tickers))
+
+    def finish(self, tickers: List[str]) -> Dict[str, Dict]:
+        """
+        Stop consuming and return sentiment data for exactly `tickers`
+
+        Raises whatever the worker raised, like a sequential call would.
+        """
+        self._stop()
+        if self._error is not None:
+            raise self._error
+
+        missing = [t for t in dict.fromkeys(tickers) if t not in self._results]
+        if missing:
+            self._score(missing)
+
+        wanted = set(tickers)
+        self.stats['scored_late'] = len(missing)
+        self.stats['scored_early'] = len(wanted) - len(missing)
+        self.stats['unused'] = len(set(self._results) - wanted)
+        logger.info(f"Sentiment pipeline: {self.stats['scored_early']} scored while Research ran, "
+                    f"{self.stats['scored_late']} after, {self.stats['unused']} unused")
+
+        return {t: self._results[t] for t in tickers if t in self._results}
+
+    def cancel(self):
+        """Stop the worker without scoring anything further"""
+        self._stop()
+
+    def _stop(self):
+        if self._thread is not None:
+            self._queue.put(self._CLOSE)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        closed = False
+        while not closed:
+            item = self._queue.get()
+            if item is self._CLOSE:
+                break
+            batch = self._new_tickers(item)
+
+            # Let the batch fill up so prompts and requests stay batched
+            deadline = time.monotonic() + self.linger_seconds
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is self._CLOSE:
+                    closed = True
+                    break
+                batch.extend(self._new_tickers(item))
+
+            if batch and self._error is None:
+                try:
+                    self._score(batch)
+                except Exception as e:
+                    logger.error(f"Sentiment pipeline batch failed: {e}")
+                    self._error = e
+
+    def _new_tickers(self, tickers: List[str]) -> List[str]:
+        fresh = [t for t in dict.fromkeys(tickers) if t not in self._seen]
+        self._seen.update(fresh)
+        self.stats['submitted'] += len(fresh)
+        return fresh
+
+    def _score(self, tickers: List[str]):
+        self._results.update(self.news.get_sentiment_scores(tickers))
+        for key in self.refresh_stats:
+            self.refresh_stats[key] += self.news.last_refresh_stats.get(key, 0)
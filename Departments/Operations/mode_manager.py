@@ -19,6 +19,7 @@ Author: Claude Code
 Date: November 7, 2025
 """
 
+import sys
 import sqlite3
 import logging
 from datetime import datetime, date, timedelta, timezone
@@ -26,6 +27,11 @@ from pathlib import Path
 from typing import Dict, Optional, Tuple
 import pytz
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Utils.db_connection import get_connection
+
 logger = logging.getLogger(__name__)
 
 
@@ -71,7 +77,7 @@ class ModeManager:
 
     def _ensure_database_table(self):
         """Create trading_sessions table if it doesn't exist"""
-        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -229,7 +235,7 @@ class ModeManager:
         """
         today = date.today().isoformat()
 
-        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -267,7 +273,7 @@ class ModeManager:
 
         market_status = self.get_market_status_display()
 
-        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -288,7 +294,7 @@ class ModeManager:
         now = datetime.now().isoformat()
         market_status = self.get_market_status_display()
 
-        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
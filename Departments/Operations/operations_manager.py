@@ -4,6 +4,8 @@ Coordinates workflow across all departments with quality assurance and escalatio
 
 Primary Responsibilities:
 - Coordinate Research → Risk → Portfolio → Compliance workflow
+- Overlap News sentiment scoring with Research (pipelined workflow mode)
+- Run independent workflow steps concurrently as a stage DAG, with per-stage timing
 - Validate quality at each stage
 - Handle department failures with retry logic
 - Escalate issues to CEO when needed
@@ -32,12 +34,18 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 # Import departments
 from Departments.Research.research_department import ResearchDepartment
-from Departments.News.news_department import NewsDepartment
+from Departments.News.news_department import NewsDepartment, SentimentPipeline
 from Departments.Risk.risk_department import RiskDepartment
 from Departments.Portfolio.portfolio_department import PortfolioDepartment
 from Departments.Compliance.compliance_department import ComplianceDepartment
 from Departments.Executive.gpt5_portfolio_optimizer import GPT5PortfolioOptimizer
 from Departments.Operations.realism_simulator import RealismSimulator
+from Departments.Operations.stage_dag import StageDAG
+from Departments.Operations.portfolio_allocator import (
+    PortfolioAllocator, PositionLimits, AllocationPlan, ABSOLUTE_SCORE_FLOOR
+)
+from Utils.price_history import get_shared_price_history
+from Utils.db_connection import get_connection
 
 # Import config
 import config
@@ -78,8 +86,23 @@ class OperationsManager:
     Handles quality assurance and escalations
     """
 
-    def __init__(self, project_root: Path):
+    WORKFLOW_MODES = ('sequential', 'pipelined')
+    WORKFLOW_STAGES = ('research', 'news', 'gpt5_optimizer', 'compliance')  # DAG nodes, in order
+    GATED_STAGES = ('research', 'news', 'gpt5_optimizer')  # Quality failures escalate to CEO
+
+    def __init__(self, project_root: Path, workflow_mode: str = 'pipelined'):
+        """
+        Args:
+            project_root: Sentinel project root (holds sentinel.db, Config, messages)
+            workflow_mode: 'pipelined' scores sentiment while Research is still
+                           producing candidates; 'sequential' runs News after
+                           Research. Both produce the same plan.
+        """
+        if workflow_mode not in self.WORKFLOW_MODES:
+            raise ValueError(f"workflow_mode must be one of {self.WORKFLOW_MODES}, got {workflow_mode!r}")
+
         self.project_root = project_root
+        self.workflow_mode = workflow_mode
         self.db_path = project_root / "sentinel.db"
         self.messages_dir = project_root / "Messages_Between_Departments"
         self.config_dir = project_root / "Config"
@@ -95,6 +118,9 @@ class OperationsManager:
         self.min_portfolio_approved = 1
         self.min_compliance_approved = 1
 
+        # Independent workflow steps run concurrently (see _build_workflow_dag)
+        self.workflow_max_workers = 4
+
         # Retry limits
         self.max_retries = 2
         self.retry_count = {}
@@ -116,6 +142,7 @@ class OperationsManager:
         self.logger.info("Operations Manager initialized successfully")
         self.logger.info(f"Project root: {project_root}")
         self.logger.info(f"Database: {self.db_path}")
+        self.logger.info(f"Workflow mode: {workflow_mode}")
 
     def set_mandatory_sells(self, sells: List[Dict]):
         """
@@ -144,7 +171,8 @@ class OperationsManager:
             - status: 'SUCCESS', 'ESCALATED', 'FAILED'
             - plan: Final trading plan (if SUCCESS)
             - escalation: Escalation details (if ESCALATED)
-            - stage_results: Results from each stage
+            - stage_results: Results from each stage (each with its DAG timing)
+            - workflow_timing: Per-node start/end/duration and the critical path
         """
         # Store model choice for GPT-5 optimizer stage
         self.ai_model = ai_model
@@ -155,39 +183,33 @@ class OperationsManager:
         self.logger.info(f"AI Model: {ai_model}")
 
         stage_results = []
+        sentiment_pipeline = None
+        dag = None
 
         try:
-            # STAGE 1: Research Department (50 buy candidates)
-            self.logger.info("\n[STAGE 1/3] Research Department - Market Analysis & Candidate Screening")
-            research_result = self._run_research_stage()
-            stage_results.append(research_result)
-
-            if not research_result.success:
-                return self._handle_stage_failure('research', research_result, stage_results)
-
-            # STAGE 2: News Department (sentiment for ALL ~110 stocks: candidates + holdings)
-            self.logger.info("\n[STAGE 2/3] News Department - Sentiment Analysis for All Stocks")
-            news_result = self._run_news_stage(research_result)
-            stage_results.append(news_result)
+            # Pipelined mode: News consumes tickers while Research produces them
+            if self.workflow_mode == 'pipelined':
+                self.logger.info("\n[PIPELINE] News Department will score sentiment as Research emits tickers")
+                sentiment_pipeline = SentimentPipeline(self._get_news_dept()).start()
 
-            if not news_result.success:
-                return self._handle_stage_failure('news', news_result, stage_results)
-
-            # STAGE 3: Portfolio Allocator (creates proposed trading plan from all scored stocks)
-            model_display = "DETERMINISTIC"
-            self.logger.info(f"\n[STAGE 3/3] Portfolio Allocator - Creating Proposed Trading Plan")
-            self.logger.info(f"  (Using deterministic logic based on comparative ranking...)")
-            gpt5_result = self._run_gpt5_optimization_stage(news_result)  # Function name kept for compatibility
-            stage_results.append(gpt5_result)
-
-            if not gpt5_result.success:
-                return self._handle_stage_failure('gpt5_optimizer', gpt5_result, stage_results)
-
-            # COMPLIANCE ENFORCEMENT - Reject trades that violate rules
-            self.logger.info("\n[COMPLIANCE ENFORCEMENT] Compliance Department - Enforcing Risk Limits")
-            self.logger.info("  (Validating all proposed trades against position sizing and risk rules...)")
-            compliance_result = self._run_compliance_advisory_loop(gpt5_result)
-            stage_results.append(compliance_result)
+            dag = self._build_workflow_dag(sentiment_pipeline)
+            try:
+                results = dag.run()
+            finally:
+                self.logger.info("\n" + dag.format_report())
+
+            # Stages in workflow order; the first one that failed quality checks escalates
+            for stage in self.WORKFLOW_STAGES:
+                if stage not in results:
+                    break
+                stage_results.append(results[stage])
+                if stage in self.GATED_STAGES and not results[stage].success:
+                    if sentiment_pipeline:
+                        sentiment_pipeline.cancel()
+                    response = self._handle_stage_failure(stage, results[stage], stage_results)
+                    response['stage_results'] = self._serialize_stage_results(stage_results, dag)
+                    response['workflow_timing'] = dag.to_payload()
+                    return response
 
             # Note: Compliance now ENFORCES rules - rejected trades are blocked
             # The final plan incorporates all agreed-upon improvements
@@ -203,20 +225,93 @@ class OperationsManager:
             return {
                 'status': 'SUCCESS',
                 'plan': final_plan,
-                'stage_results': [self._serialize_result(r) for r in stage_results],
+                'stage_results': self._serialize_stage_results(stage_results, dag),
+                'workflow_timing': dag.to_payload(),
                 'generated_at': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
             }
 
         except Exception as e:
             self.logger.error(f"WORKFLOW FAILED with exception: {e}", exc_info=True)
+            if sentiment_pipeline:
+                sentiment_pipeline.cancel()
+            if dag is not None:
+                stage_results = [dag.results[s] for s in self.WORKFLOW_STAGES if s in dag.results]
             return {
                 'status': 'FAILED',
                 'error': str(e),
-                'stage_results': [self._serialize_result(r) for r in stage_results]
+                'stage_results': self._serialize_stage_results(stage_results, dag),
+                'workflow_timing': dag.to_payload() if dag is not None else None
             }
 
-    def _run_research_stage(self) -> WorkflowStageResult:
-        """Run Research Department and validate output"""
+    def _build_workflow_dag(self, sentiment_pipeline: Optional[SentimentPipeline] = None) -> StageDAG:
+        """
+        Declare the plan-generation workflow as a dependency graph
+
+        The regime lookup and PENDING-ticker lookup only feed the allocator,
+        so they run alongside Research/News instead of serially inside the
+        allocator stage. Buying power is read once News finishes so the
+        allocator sizes trades from a fresh account snapshot.
+        """
+        failed = lambda result: not result.success
+
+        def research():
+            self.logger.info("\n[STAGE 1/3] Research Department - Market Analysis & Candidate Screening")
+            return self._run_research_stage(
+                ticker_sink=sentiment_pipeline.submit if sentiment_pipeline else None
+            )
+
+        def news(research_result):
+            # Sentiment for ALL ~110 stocks: candidates + holdings
+            self.logger.info("\n[STAGE 2/3] News Department - Sentiment Analysis for All Stocks")
+            return self._run_news_stage(research_result, sentiment_pipeline=sentiment_pipeline)
+
+        def allocator(news_result, regime_info, buying_power, pending_tickers):
+            # Creates proposed trading plan from all scored stocks
+            self.logger.info(f"\n[STAGE 3/3] Portfolio Allocator - Creating Proposed Trading Plan")
+            self.logger.info(f"  (Using deterministic logic based on comparative ranking...)")
+            return self._run_gpt5_optimization_stage(  # Function name kept for compatibility
+                news_result,
+                regime_info=regime_info,
+                buying_power=buying_power,
+                pending_tickers=pending_tickers
+            )
+
+        def compliance(gpt5_result):
+            # COMPLIANCE ENFORCEMENT - Reject trades that violate rules
+            self.logger.info("\n[COMPLIANCE ENFORCEMENT] Compliance Department - Enforcing Risk Limits")
+            self.logger.info("  (Validating all proposed trades against position sizing and risk rules...)")
+            return self._run_compliance_advisory_loop(gpt5_result)
+
+        dag = StageDAG(max_workers=self.workflow_max_workers)
+        dag.add('regime', self._get_latest_regime_assessment)
+        dag.add('pending_tickers', self._get_pending_tickers)
+        dag.add('research', research, halt_if=failed)
+        dag.add('news', news, deps=['research'], halt_if=failed)
+        dag.add('buying_power', lambda _news_result: self._get_alpaca_buying_power(), deps=['news'])
+        dag.add('gpt5_optimizer', allocator,
+                deps=['news', 'regime', 'buying_power', 'pending_tickers'], halt_if=failed)
+        dag.add('compliance', compliance, deps=['gpt5_optimizer'])
+        return dag
+
+    def _serialize_stage_results(self, stage_results: List[WorkflowStageResult],
+                                 dag: Optional[StageDAG] = None) -> List[Dict]:
+        """Serialize stage results (in WORKFLOW_STAGES order), attaching each stage's DAG timing"""
+        serialized = []
+        for node_name, result in zip(self.WORKFLOW_STAGES, stage_results):
+            entry = self._serialize_result(result)
+            if dag is not None:
+                entry['timing'] = dag.timings[node_name].to_dict()
+            serialized.append(entry)
+        return serialized
+
+    def _run_research_stage(self, ticker_sink=None) -> WorkflowStageResult:
+        """
+        Run Research Department and validate output
+
+        Args:
+            ticker_sink: Optional callable receiving tickers as Research
+                         finalizes them (pipelined workflow mode)
+        """
         try:
             # Initialize Research Department v3.0
             if not self._research_dept:
@@ -241,7 +336,7 @@ class OperationsManager:
             self.logger.info("  Generating market briefing and candidate screening...")
             self.logger.info("  (This may take 1-2 minutes for full analysis...)")
 
-            message_id = self._research_dept.generate_daily_briefing()
+            message_id = self._research_dept.generate_daily_briefing(ticker_sink=ticker_sink)
 
             # Read the message back to get candidate count
             outbox = self.messages_dir / "Outbox" / "RESEARCH"
@@ -328,7 +423,19 @@ class OperationsManager:
                 issues=[str(e)]
             )
 
-    def _run_news_stage(self, research_result: WorkflowStageResult) -> WorkflowStageResult:
+    def _get_news_dept(self) -> NewsDepartment:
+        """Lazily initialize the News Department"""
+        if not self._news_dept:
+            self.logger.info("  Initializing News Department...")
+            self._news_dept = NewsDepartment(
+                db_path=str(self.db_path),
+                perplexity_api_key=config.PERPLEXITY_API_KEY if hasattr(config, 'PERPLEXITY_API_KEY') else None
+            )
+            self.logger.info("  News Department initialized")
+        return self._news_dept
+
+    def _run_news_stage(self, research_result: WorkflowStageResult,
+                        sentiment_pipeline: Optional[SentimentPipeline] = None) -> WorkflowStageResult:
         """
         Run News Department to enrich candidates with sentiment scores
 
@@ -336,17 +443,16 @@ class OperationsManager:
         - Candidates from Research
         - Current holdings from Alpaca (included in Research output)
 
+        Args:
+            research_result: Output of the Research stage
+            sentiment_pipeline: Pipeline that has been scoring tickers while
+                                Research ran (pipelined mode); only tickers it
+                                has not seen are fetched here
+
         Returns WorkflowStageResult with enriched candidate data
         """
         try:
-            # Initialize News Department
-            if not self._news_dept:
-                self.logger.info("  Initializing News Department...")
-                self._news_dept = NewsDepartment(
-                    db_path=str(self.db_path),
-                    perplexity_api_key=config.PERPLEXITY_API_KEY if hasattr(config, 'PERPLEXITY_API_KEY') else None
-                )
-                self.logger.info("  News Department initialized")
+            news_dept = self._get_news_dept()
 
             # Extract candidates from Research result
             candidates = research_result.data.get('candidates', [])
@@ -362,7 +468,12 @@ class OperationsManager:
             self.logger.info(f"    - Holdings: {len(holding_tickers)}")
 
             # Get sentiment scores for all tickers
-            sentiment_data = self._news_dept.get_sentiment_scores(all_tickers)
+            if sentiment_pipeline:
+                sentiment_data = sentiment_pipeline.finish(all_tickers)
+                refresh_stats = sentiment_pipeline.refresh_stats
+            else:
+                sentiment_data = news_dept.get_sentiment_scores(all_tickers)
+                refresh_stats = news_dept.last_refresh_stats
 
             # Enrich candidates with sentiment
             enriched_candidates = []
@@ -410,6 +521,9 @@ class OperationsManager:
 
             self.logger.info(f"  News stage completed:")
             self.logger.info(f"    - Sentiment coverage: {scored_stocks}/{total_stocks} ({coverage_rate*100:.1f}%)")
+            self.logger.info(f"    - Refresh: {refresh_stats.get('cache_hits', 0)} cached, "
+                             f"{refresh_stats.get('unchanged', 0)} unchanged, "
+                             f"{refresh_stats.get('rescored', 0)} re-scored")
             self.logger.info(f"    - Quality score: {quality_score}/100")
 
             # Show top candidates with sentiment
@@ -430,7 +544,10 @@ class OperationsManager:
                     'current_holdings': enriched_holdings,
                     'sentiment_data': sentiment_data,
                     'coverage_rate': coverage_rate,
-                    'total_stocks_scored': scored_stocks
+                    'total_stocks_scored': scored_stocks,
+                    'sentiment_cache_hits': refresh_stats.get('cache_hits', 0),
+                    'sentiment_unchanged': refresh_stats.get('unchanged', 0),
+                    'sentiment_rescored': refresh_stats.get('rescored', 0)
                 },
                 message=f"News enriched {scored_stocks}/{total_stocks} stocks with sentiment",
                 quality_score=quality_score,
@@ -458,7 +575,8 @@ class OperationsManager:
                 # Risk Department uses default parameters (1% per trade, 5% portfolio heat)
                 self._risk_dept = RiskDepartment(
                     max_risk_per_trade_pct=1.0,
-                    max_portfolio_heat_pct=5.0
+                    max_portfolio_heat_pct=5.0,
+                    price_history=get_shared_price_history(str(self.db_path))
                 )
 
             # Get enriched candidates from News stage
@@ -647,7 +765,10 @@ class OperationsManager:
                 issues=[str(e)]
             )
 
-    def _run_gpt5_optimization_stage(self, news_result: WorkflowStageResult) -> WorkflowStageResult:
+    def _run_gpt5_optimization_stage(self, news_result: WorkflowStageResult,
+                                     regime_info: Optional[Dict] = None,
+                                     buying_power: Optional[float] = None,
+                                     pending_tickers: Optional[set] = None) -> WorkflowStageResult:
         """
         Run Deterministic Portfolio Allocator (GPT optimizer disabled)
 
@@ -657,6 +778,11 @@ class OperationsManager:
         - BUY: Top-ranked candidates scoring 60+ to fill open slots
         - ALLOCATION: Equal-weight across new positions
 
+        The decisions come from the pure PortfolioAllocator; this method only
+        gathers its inputs (I/O) and logs the resulting plan.
+        regime_info / buying_power / pending_tickers are normally prefetched by
+        the workflow DAG; anything not supplied is looked up here.
+
         Note: GPT-4o-mini optimizer code preserved but commented out for potential future use.
         """
         try:
@@ -680,793 +806,63 @@ class OperationsManager:
             if not candidates:
                 raise ValueError("No candidates from News stage to optimize")
 
-            # Filter out candidates with PENDING orders to prevent duplicates
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT DISTINCT ticker FROM portfolio_positions WHERE status = 'PENDING'")
-            pending_tickers = {row[0] for row in cursor.fetchall()}
-            conn.close()
-
-            original_count = len(candidates)
-            if pending_tickers:
-                candidates = [c for c in candidates if c.get('ticker') not in pending_tickers]
-                filtered_count = original_count - len(candidates)
-                if filtered_count > 0:
-                    self.logger.info(f"  Filtered {filtered_count} candidates with PENDING orders: {', '.join(sorted(pending_tickers))}")
-
-            self.logger.info(f"  {model_display} analyzing complete portfolio:")
-            self.logger.info(f"    - {len(candidates)} buy candidates (with scores & sentiment)")
-            self.logger.info(f"    - {len(holdings)} current holdings (with scores & sentiment)")
-            self.logger.info(f"    - Total stocks under consideration: {len(candidates) + len(holdings)}")
-
-            # ============================================================================
-            # MARKET REGIME ANALYSIS - Active Strategy Adjustment
-            # ============================================================================
-            # Fetch latest market regime assessment and adjust strategy parameters
-
-            regime_info = self._get_latest_regime_assessment()
-
-            if regime_info:
-                regime = regime_info.get('regime', 'NEUTRAL')
-                confidence = regime_info.get('confidence', 'MEDIUM')
-                vix_level = regime_info.get('vix_level', 20.0)
-
-                self.logger.info("")
-                self.logger.info("=" * 80)
-                self.logger.info("  MARKET REGIME ASSESSMENT (ACTIVE MODE)")
-                self.logger.info("=" * 80)
-                self.logger.info(f"  Regime: {regime} (Confidence: {confidence})")
-                self.logger.info(f"  VIX Level: {vix_level:.1f}")
-                self.logger.info(f"  SPY Change: {regime_info.get('spy_change_pct', 0):.2f}%")
-                self.logger.info("")
-
-                # Adjust strategy based on regime
-                if regime == 'BEARISH' and confidence == 'HIGH':
-                    # High-confidence bearish: Defensive posture
-                    TARGET_PORTFOLIO_SIZE = 15
-                    POSITION_SIZE_MULTIPLIER = 0.6  # Smaller positions
-                    self.logger.warning("  BEARISH REGIME (HIGH CONFIDENCE) → Defensive Mode")
-                    self.logger.warning(f"    - Target positions: 15 (reduced from 28)")
-                    self.logger.warning(f"    - Position sizing: 60% of normal")
-
-                elif regime == 'BEARISH':
-                    # Medium/low-confidence bearish: Moderate caution
-                    TARGET_PORTFOLIO_SIZE = 20
-                    POSITION_SIZE_MULTIPLIER = 0.75
-                    self.logger.info("  BEARISH REGIME → Cautious Mode")
-                    self.logger.info(f"    - Target positions: 20 (reduced from 28)")
-                    self.logger.info(f"    - Position sizing: 75% of normal")
-
-                elif regime == 'BULLISH' and vix_level < 15:
-                    # Low volatility bull market: Slightly aggressive
-                    TARGET_PORTFOLIO_SIZE = 28
-                    POSITION_SIZE_MULTIPLIER = 1.1  # Slightly larger positions
-                    self.logger.info("  BULLISH REGIME + LOW VIX → Aggressive Mode")
-                    self.logger.info(f"    - Target positions: 28 (full deployment)")
-                    self.logger.info(f"    - Position sizing: 110% of normal")
-
-                else:
-                    # NEUTRAL or normal BULLISH: Standard strategy
-                    TARGET_PORTFOLIO_SIZE = 28
-                    POSITION_SIZE_MULTIPLIER = 1.0
-                    self.logger.info("  NEUTRAL/NORMAL REGIME → Standard Mode")
-                    self.logger.info(f"    - Target positions: 28")
-                    self.logger.info(f"    - Position sizing: 100% (normal)")
-
-                self.logger.info("=" * 80)
-                self.logger.info("")
-            else:
-                # No regime data available - use defaults
-                TARGET_PORTFOLIO_SIZE = 28
-                POSITION_SIZE_MULTIPLIER = 1.0
-                self.logger.warning("  No regime data available - using default parameters")
-                self.logger.info("")
-
             # ============================================================================
-            # COMPARATIVE RANKING ANALYSIS (Option B Implementation)
+            # I/O: everything the pure allocator needs is gathered here
             # ============================================================================
-            # Compare all holdings vs candidates to determine optimal portfolio composition
-            # Philosophy: Portfolio should hold the top N stocks by score (N adjusted by regime)
-
-            ABSOLUTE_SCORE_FLOOR = 60   # Never hold anything below this score (quality threshold)
-
-            mandatory_sells = []
-            holdings_to_keep = []
-
-            if holdings:
-                self.logger.info("")
-                self.logger.info("=" * 80)
-                self.logger.info("  COMPARATIVE RANKING ANALYSIS")
-                self.logger.info("=" * 80)
-                self.logger.info(f"  Quality threshold: {ABSOLUTE_SCORE_FLOOR} (only buy/hold stocks scoring {ABSOLUTE_SCORE_FLOOR}+)")
-                self.logger.info("")
-
-                # Step 1: Combine all holdings + candidates into unified ranking
-                all_stocks = []
-
-                # Add current holdings
-                for holding in holdings:
-                    ticker = holding.get('ticker')
-                    score = holding.get('research_composite_score', holding.get('composite_score', 50))
-                    unrealized_plpc = holding.get('unrealized_plpc', 0)
-                    market_value = holding.get('market_value', 0)
-                    days_held = self.realism_sim.calculate_days_held(ticker)
-
-                    all_stocks.append({
-                        'ticker': ticker,
-                        'composite_score': score,
-                        'type': 'HOLDING',
-                        'market_value': market_value,
-                        'unrealized_plpc': unrealized_plpc,
-                        'days_held': days_held,
-                        'data': holding
-                    })
-
-                # Add new candidates
-                for candidate in candidates:
-                    ticker = candidate.get('ticker')
-                    score = candidate.get('composite_score', candidate.get('research_composite_score', 0))
-
-                    all_stocks.append({
-                        'ticker': ticker,
-                        'composite_score': score,
-                        'type': 'CANDIDATE',
-                        'data': candidate
-                    })
-
-                # Step 2: Sort by composite score (highest first)
-                all_stocks.sort(key=lambda x: x['composite_score'], reverse=True)
-
-                # Step 3: Analyze ranking and identify swaps needed
-                self.logger.info(f"  Total universe: {len(all_stocks)} stocks ({len(holdings)} holdings + {len(candidates)} candidates)")
-                self.logger.info(f"  Target portfolio size: {TARGET_PORTFOLIO_SIZE} positions")
-                self.logger.info(f"  Absolute score floor: {ABSOLUTE_SCORE_FLOOR} (never hold below this)")
-                self.logger.info("")
-
-                # Determine keeper threshold
-                keeper_threshold_rank = TARGET_PORTFOLIO_SIZE
-
-                # Log top performers and identify actions needed
-                self.logger.info("  TOP 30 RANKED STOCKS:")
-                self.logger.info("  " + "-" * 76)
-                self.logger.info(f"  {'Rank':<6} {'Ticker':<8} {'Score':<8} {'Type':<12} {'Action':<20}")
-                self.logger.info("  " + "-" * 76)
-
-                holdings_in_top_n = 0
-                candidates_in_top_n = 0
-                holdings_below_threshold = []
-
-                for i, stock in enumerate(all_stocks[:30]):  # Show top 30 for visibility
-                    rank = i + 1
-                    ticker = stock['ticker']
-                    score = stock['composite_score']
-                    stock_type = stock['type']
-
-                    # Determine action based on rank and type
-                    if rank <= keeper_threshold_rank:
-                        if stock_type == 'HOLDING':
-                            action = "✓ KEEP (top performer)"
-                            holdings_in_top_n += 1
-                        else:
-                            action = "→ BUY (top opportunity)"
-                            candidates_in_top_n += 1
-                    else:
-                        if stock_type == 'HOLDING':
-                            action = "✗ SELL (below threshold)"
-                            holdings_below_threshold.append(stock)
-                        else:
-                            action = "- Pass (not in top 28)"
-
-                    # Check absolute floor
-                    if stock_type == 'HOLDING' and score < ABSOLUTE_SCORE_FLOOR:
-                        action = f"✗ SELL (score < {ABSOLUTE_SCORE_FLOOR})"
-                        if stock not in holdings_below_threshold:
-                            holdings_below_threshold.append(stock)
-
-                    self.logger.info(f"  {rank:<6} {ticker:<8} {score:<8.1f} {stock_type:<12} {action:<20}")
-
-                self.logger.info("  " + "-" * 76)
-                self.logger.info("")
-
-                # Step 4: Process holdings for mandatory sells
-                self.logger.info("  POSITION QUALITY CHECK:")
-                self.logger.info("")
-
-                for holding in holdings:
-                    ticker = holding.get('ticker')
-                    score = holding.get('research_composite_score', holding.get('composite_score', 50))
-                    unrealized_plpc = holding.get('unrealized_plpc', 0)
-                    days_held = self.realism_sim.calculate_days_held(ticker)
-
-                    # Find this holding's rank
-                    holding_rank = next((i+1 for i, s in enumerate(all_stocks) if s['ticker'] == ticker), None)
-
-                    # Determine if this position MUST be sold
-                    must_sell = False
-                    sell_reason = None
-
-                    # Rule 1: Score below absolute floor
-                    if score < ABSOLUTE_SCORE_FLOOR:
-                        must_sell = True
-                        sell_reason = f"Score {score:.1f} < {ABSOLUTE_SCORE_FLOOR} absolute minimum"
-
-                    # Rule 2: Ranked below keeper threshold (fell out of top 28)
-                    elif holding_rank is not None and holding_rank > keeper_threshold_rank:
-                        must_sell = True
-                        sell_reason = f"Rank #{holding_rank} (below top {keeper_threshold_rank}), score {score:.1f}"
-
-                    if must_sell:
-                        self.logger.warning(f"    ❌ {ticker}: MANDATORY SELL - {sell_reason}")
-                        holding['MANDATORY_SELL'] = True
-                        holding['MANDATORY_SELL_REASON'] = sell_reason
-                        mandatory_sells.append(ticker)
-                    else:
-                        rank_display = f"Rank #{holding_rank}" if holding_rank else "Not ranked"
-                        self.logger.info(f"    ✓ {ticker}: KEEP - {rank_display}, Score {score:.1f}, P&L {unrealized_plpc:+.1f}%")
-                        holdings_to_keep.append(ticker)
-
-                self.logger.info("")
-                self.logger.info(f"  SUMMARY:")
-                self.logger.info(f"    Holdings in top {keeper_threshold_rank}: {holdings_in_top_n}")
-                self.logger.info(f"    Candidates in top {keeper_threshold_rank}: {candidates_in_top_n}")
-                self.logger.info(f"    Holdings to sell (below threshold): {len(mandatory_sells)}")
-                self.logger.info(f"    Open slots for new positions: {len(mandatory_sells)}")
-
-                if mandatory_sells:
-                    self.logger.warning(f"  MANDATORY SELLS: {', '.join(mandatory_sells)}")
-                else:
-                    self.logger.info(f"  All {len(holdings)} holdings are top performers - no sells needed")
-
-                self.logger.info("=" * 80)
-                self.logger.info("")
-
-            self.logger.info(f"  ({model_display} will decide which to BUY, which to SELL, and allocation amounts...)")
-            if mandatory_sells:
-                self.logger.info(f"  ({len(mandatory_sells)} holdings flagged as MANDATORY SELL)")
-
-            # Get portfolio state and market conditions from News result
-            market_conditions = news_result.data.get('market_conditions', {
-                'spy_change_pct': 0.0,
-                'vix_level': 20.0,
-                'market_sentiment': 'NEUTRAL'
-            })
-
-            # Get REAL buying power from Alpaca (ground truth)
-            try:
-                from Utils.alpaca_client import AlpacaClient
-                alpaca = AlpacaClient()
-                account = alpaca.trading_client.get_account()
-                buying_power = float(account.buying_power)
-                self.logger.info(f"  Alpaca buying power: ${buying_power:,.2f}")
-            except Exception as e:
-                self.logger.warning(f"  Could not fetch Alpaca buying power: {e}")
-                buying_power = 100000.0  # Fallback
-                self.logger.info(f"  Using fallback capital: ${buying_power:,.2f}")
-
-            # CRITICAL FIX: Calculate proceeds from MANDATORY sells
-            # These positions MUST be sold, so their proceeds are guaranteed capital
-            mandatory_sell_proceeds = 0.0
-            for holding in holdings:
-                if holding.get('MANDATORY_SELL'):
-                    proceeds = holding.get('market_value', 0)
-                    mandatory_sell_proceeds += proceeds
-                    self.logger.info(f"    {holding.get('ticker')}: +${proceeds:,.2f} from mandatory sell")
-
-            # Total available capital = buying power + guaranteed sell proceeds
-            available_capital = buying_power + mandatory_sell_proceeds
-
-            if mandatory_sell_proceeds > 0:
-                self.logger.info(f"  Mandatory sell proceeds: ${mandatory_sell_proceeds:,.2f}")
-                self.logger.info(f"  Total available capital: ${available_capital:,.2f} (buying power + sell proceeds)")
-            else:
-                self.logger.info(f"  Total available capital: ${available_capital:,.2f} (no mandatory sells)")
-
-            current_positions = len(holdings)
-            max_positions = 20
+            if pending_tickers is None:
+                pending_tickers = self._get_pending_tickers()
+            if regime_info is None:
+                regime_info = self._get_latest_regime_assessment()
+            if buying_power is None:
+                buying_power = self._get_alpaca_buying_power()  # REAL buying power (ground truth)
+            days_held = self.realism_sim.calculate_days_held_bulk([h.get('ticker') for h in holdings]) if holdings else {}
 
             # ============================================================================
             # GPT OPTIMIZER (DISABLED - COMMENTED OUT FOR DETERMINISTIC MODE)
             # ============================================================================
             # Reason: GPT-4o-mini was making poor decisions (selling high-scoring holdings,
             # hallucinating facts). Replaced with deterministic logic that strictly follows
-            # comparative ranking. GPT code preserved for potential future use in:
-            # - Report generation / narrative synthesis
-            # - Risk assessment commentary
-            # - User-facing explanations
-            # ============================================================================
-
-            # COMMENTED OUT: GPT optimizer call
-            # optimized_candidates, reasoning = self._gpt5_optimizer.optimize_portfolio(
-            #     candidates=candidates,
-            #     holdings=holdings,
-            #     available_capital=available_capital,
-            #     market_conditions=market_conditions,
-            #     current_positions=current_positions,
-            #     max_positions=max_positions
-            # )
-
+            # comparative ranking (PortfolioAllocator). GPT code preserved in
+            # GPT5PortfolioOptimizer for potential future use.
             # ============================================================================
-            # DETERMINISTIC ALLOCATION (ACTIVE)
-            # ============================================================================
-            # Pure logic-based allocation following comparative ranking
-            # No AI hallucinations, no overrides, just clean ranking-based decisions
-
-            self.logger.info("")
-            self.logger.info("  Using deterministic allocation (comparative ranking only)")
-
-            # Step 1: Determine how many positions to add
-            # IMPORTANT: Exclude untradeable positions (mergers, halts) from active count
-            tradeable_holdings = [h for h in holdings if h.get('tradeable', True)]
-            untradeable_holdings = [h for h in holdings if not h.get('tradeable', True)]
-
-            if untradeable_holdings:
-                self.logger.warning(f"  {len(untradeable_holdings)} FROZEN positions (not counted against limit):")
-                for h in untradeable_holdings:
-                    self.logger.warning(f"    - {h['ticker']}: ${h.get('market_value', 0):,.2f} (status: {h.get('asset_status', 'UNKNOWN')})")
-
-            holdings_to_keep_count = len([h for h in tradeable_holdings if not h.get('MANDATORY_SELL', False)])
-            open_slots = TARGET_PORTFOLIO_SIZE - holdings_to_keep_count
-
-            self.logger.info(f"  Tradeable holdings to keep: {holdings_to_keep_count}")
-            self.logger.info(f"  Open slots for new positions: {open_slots}")
-
-            # Step 2: Select top candidates by rank to fill open slots
-            # Candidates are already sorted by rank in comparative ranking
-            optimized_candidates = []
-
-            if open_slots > 0:
-                # Take top N candidates that aren't already held AND meet quality threshold
-                held_tickers = {h['ticker'] for h in holdings}
-                available_candidates = [
-                    c for c in candidates
-                    if c['ticker'] not in held_tickers
-                    and c.get('composite_score', 0) >= ABSOLUTE_SCORE_FLOOR
-                ]
-
-                # Sort by composite score (descending)
-                available_candidates.sort(key=lambda x: -x.get('composite_score', 0))
-
-                # Select top candidates to fill slots (may be fewer than open_slots if quality is scarce)
-                selected_candidates = available_candidates[:open_slots]
-
-                if len(selected_candidates) < open_slots:
-                    self.logger.warning(f"  Only {len(selected_candidates)} candidates meet quality threshold (score ≥ {ABSOLUTE_SCORE_FLOOR})")
-                    self.logger.warning(f"  Will leave {open_slots - len(selected_candidates)} slots unfilled rather than buy low-quality stocks")
-
-                # Step 3: Equal-weight allocation across selected candidates
-                if len(selected_candidates) > 0:
-                    # Load compliance position sizing limits
-                    import yaml
-                    compliance_config_path = self.project_root / "Config" / "compliance_config.yaml"
-                    try:
-                        with open(compliance_config_path) as f:
-                            compliance_cfg = yaml.safe_load(f)
-                        max_position_value = compliance_cfg['position_sizing'].get('max_position_value', 50000)
-                        max_position_pct = compliance_cfg['position_sizing'].get('max_position_pct', 0.10)
-                    except Exception as e:
-                        self.logger.warning(f"  Could not load compliance limits: {e}, using defaults")
-                        max_position_value = 50000
-                        max_position_pct = 0.10
 
-                    # Calculate max position size (smaller of absolute limit or percentage limit)
-                    max_position_from_pct = available_capital * max_position_pct
-                    max_allowed_position = min(max_position_value, max_position_from_pct)
-
-                    # Calculate equal-weight per position, capped at compliance limits
-                    capital_per_position = available_capital / len(selected_candidates)
-                    capital_per_position = min(capital_per_position, max_allowed_position)
-
-                    self.logger.info(f"  Position sizing limits: ${max_position_value:,.0f} absolute, {max_position_pct:.0%} of portfolio (${max_position_from_pct:,.0f})")
-                    self.logger.info(f"  Max allowed per position: ${max_allowed_position:,.0f}")
-
-                    for candidate in selected_candidates:
-                        entry_price = candidate.get('current_price', candidate.get('entry_price', 0))
-                        if entry_price <= 0:
-                            continue
-
-                        allocated_capital = capital_per_position
-                        shares = int(allocated_capital / entry_price)
-
-                        if shares > 0:
-                            candidate['allocated_capital'] = allocated_capital
-                            optimized_candidates.append(candidate)
-
-                    self.logger.info(f"  Selected {len(optimized_candidates)} candidates (equal-weight: ${capital_per_position:,.2f} each)")
-                else:
-                    self.logger.info("  No candidates available for purchase")
-            else:
-                self.logger.info("  Portfolio is full - no new positions needed")
-
-            # Calculate metrics
-            total_allocated = sum(c.get('allocated_capital', 0) for c in optimized_candidates)
-            capital_deployment_pct = (total_allocated / available_capital * 100) if available_capital > 0 else 0
-
-            self.logger.info(f"  Capital Deployment: ${total_allocated:,.2f} / ${available_capital:,.2f} ({capital_deployment_pct:.1f}%)")
-
-            reasoning = "Deterministic allocation: Top-ranked candidates selected by comparative ranking system, equal-weighted."
-
-            # Build buy orders and sell orders from deterministic allocation
-            buy_orders = []
-            sell_orders = []
-
-            for candidate in optimized_candidates:
-                ticker = candidate['ticker']
-                allocated_capital = candidate.get('allocated_capital', 0)
-
-                if allocated_capital > 0:
-                    # This is a BUY
-                    entry_price = candidate.get('current_price', candidate.get('entry_price', 0))
-                    shares = int(allocated_capital / entry_price) if entry_price > 0 else 0
-
-                    buy_order = {
-                        'ticker': ticker,
-                        'action': 'BUY',
-                        'shares': shares,
-                        'allocated_capital': allocated_capital,
-                        'entry_price': entry_price,
-                        'composite_score': candidate.get('composite_score', 0),
-                        'sentiment_score': candidate.get('sentiment', {}).get('score', 50),
-                        'sentiment_summary': candidate.get('sentiment', {}).get('summary', 'No data'),
-                        'sector': candidate.get('sector', 'Unknown'),
-                        'gpt5_reasoning': candidate.get('gpt5_reasoning', 'Selected by GPT-5'),
-                        'gpt5_allocated': True,
-                        'is_position_adjustment': candidate.get('is_position_adjustment', False)
-                    }
-                    buy_orders.append(buy_order)
-
-            # ============================================================================
-            # APPLY REGIME-BASED POSITION SIZING
-            # ============================================================================
-            # Adjust position sizes based on market regime
-
-            if 'POSITION_SIZE_MULTIPLIER' in locals() and POSITION_SIZE_MULTIPLIER != 1.0:
-                self.logger.info("")
-                self.logger.info(f"  Applying regime-based position sizing: {POSITION_SIZE_MULTIPLIER:.0%} of normal")
-
-                for order in buy_orders:
-                    old_capital = order['allocated_capital']
-                    new_capital = old_capital * POSITION_SIZE_MULTIPLIER
-                    order['allocated_capital'] = new_capital
-
-                    # Recalculate shares
-                    entry_price = order['entry_price']
-                    order['shares'] = int(new_capital / entry_price) if entry_price > 0 else 0
-
-                    self.logger.debug(f"    {order['ticker']}: ${old_capital:,.0f} → ${new_capital:,.0f} ({order['shares']} shares)")
-
-                # Recalculate total
-                total_allocated = sum(o['allocated_capital'] for o in buy_orders)
-                self.logger.info(f"  Adjusted total allocation: ${total_allocated:,.2f}")
-                self.logger.info("")
-
-            # ============================================================================
-            # PROCESS SELL DECISIONS (GPT-5 + Mandatory Automated Exits)
-            # ============================================================================
+            allocator = PortfolioAllocator(limits=self._load_position_limits())
+            plan = allocator.allocate(
+                holdings, candidates,
+                regime=regime_info,
+                buying_power=buying_power,
+                pending=pending_tickers,
+                days_held=days_held,
+                external_sells=self.mandatory_sells
+            )
 
-            # First: Process MANDATORY automated exits (always execute these)
-            mandatory_sell_tickers = set()
+            # Keep the News-stage payload annotated as before
             for holding in holdings:
-                if holding.get('MANDATORY_SELL'):
-                    ticker = holding.get('ticker')
-                    mandatory_sell_tickers.add(ticker)
-
-                    self.logger.warning(f"  Enforcing MANDATORY SELL: {ticker}")
-                    sell_order = {
-                        'ticker': ticker,
-                        'action': 'SELL',
-                        'shares': holding.get('quantity', 0),
-                        'sell_pct': 100,
-                        'composite_score': holding.get('research_composite_score', holding.get('composite_score', 0)),
-                        'current_price': holding.get('current_price', 0),
-                        'sentiment_score': holding.get('sentiment_score', holding.get('sentiment', {}).get('score', 50)),
-                        'sentiment_summary': holding.get('sentiment_summary', holding.get('sentiment', {}).get('summary', 'No data')),
-                        'gpt5_reasoning': f'AUTOMATED EXIT: {holding.get("MANDATORY_SELL_REASON")}',
-                        'current_value': holding.get('market_value', 0)
-                    }
-                    sell_orders.append(sell_order)
-
-            # Second: Process GPT-5's explicit SELL decisions (DISABLED IN DETERMINISTIC MODE)
-            # COMMENTED OUT: GPT sell recommendations
-            # In deterministic mode, we only sell based on comparative ranking (MANDATORY_SELL flag)
-            # No AI override of ranking decisions
-
-            # gpt5_sell_decisions = []
-            # if optimized_candidates and len(optimized_candidates) > 0:
-            #     gpt5_sell_decisions = optimized_candidates[0].get('gpt5_sell_decisions', [])
-            #
-            # if gpt5_sell_decisions:
-            #     self.logger.info(f"  Processing {model_display}'s {len(gpt5_sell_decisions)} SELL recommendations")
-            #     [... GPT sell validation code omitted ...]
-            #     sell_orders.append(sell_order)
-
-            # DETERMINISTIC MODE: Only mandatory sells (already processed above)
-
-            # Third: Fallback safety check for any remaining underperformers
-            # (Should be unnecessary since comparative ranking catches everything, but kept as safeguard)
-            if not mandatory_sell_tickers:
-                self.logger.info(f"  No mandatory sells - checking for any stragglers below score threshold")
-                for holding in holdings:
-                    ticker = holding.get('ticker')
-                    composite = holding.get('research_composite_score', holding.get('composite_score', 0))
-
-                    # Only sell if score is genuinely poor (< 60) AND not already processed
-                    if composite < ABSOLUTE_SCORE_FLOOR and ticker not in mandatory_sell_tickers:
-                        self.logger.warning(f"  Fallback auto-sell: {ticker} (score: {composite:.1f} < {ABSOLUTE_SCORE_FLOOR} threshold)")
-                        sell_order = {
-                            'ticker': ticker,
-                            'action': 'SELL',
-                            'shares': holding.get('quantity', 0),
-                            'sell_pct': 100,
-                            'composite_score': composite,
-                            'current_price': holding.get('current_price', 0),
-                            'sentiment_score': holding.get('sentiment_score', holding.get('sentiment', {}).get('score', 50)),
-                            'sentiment_summary': holding.get('sentiment_summary', holding.get('sentiment', {}).get('summary', 'No data')),
-                            'gpt5_reasoning': f'Fallback automatic sell: Score {composite:.1f} below {ABSOLUTE_SCORE_FLOOR} threshold',
-                            'current_value': holding.get('market_value', 0)
-                        }
-                        sell_orders.append(sell_order)
-                        mandatory_sell_tickers.add(ticker)  # Track to avoid duplicates
-                    elif composite >= ABSOLUTE_SCORE_FLOOR:
-                        self.logger.info(f"  Keeping {ticker} (score: {composite:.1f} ≥ {ABSOLUTE_SCORE_FLOOR} threshold)")
-
-            # Fourth: Process externally-injected mandatory sells (e.g., position drift trims)
-            if self.mandatory_sells:
-                self.logger.info(f"  Processing {len(self.mandatory_sells)} externally-injected mandatory sell(s)")
-                for ext_sell in self.mandatory_sells:
-                    ticker = ext_sell.get('ticker')
-                    shares_to_sell = ext_sell.get('shares', 0)
-
-                    # Skip if already being sold
-                    if ticker in mandatory_sell_tickers:
-                        self.logger.info(f"    Skipping {ticker} - already in sell orders")
-                        continue
-
-                    # Find the holding to get current price
-                    holding = next((h for h in holdings if h.get('ticker') == ticker), None)
-                    if holding:
-                        current_price = holding.get('current_price', 0)
-                        current_shares = holding.get('quantity', 0)
-
-                        # Don't sell more than we have
-                        actual_shares = min(shares_to_sell, current_shares)
-
-                        if actual_shares > 0:
-                            self.logger.warning(f"    DRIFT TRIM: {ticker} - SELL {actual_shares} of {current_shares} shares")
-                            sell_order = {
-                                'ticker': ticker,
-                                'action': 'SELL',
-                                'shares': actual_shares,
-                                'sell_pct': int((actual_shares / current_shares) * 100) if current_shares > 0 else 100,
-                                'composite_score': holding.get('research_composite_score', holding.get('composite_score', 0)),
-                                'current_price': current_price,
-                                'sentiment_score': holding.get('sentiment_score', 50),
-                                'sentiment_summary': 'Position drift trim',
-                                'gpt5_reasoning': ext_sell.get('reason', 'Position exceeds size limit - trimming'),
-                                'current_value': actual_shares * current_price,
-                                'source': ext_sell.get('source', 'position_drift_monitor')
-                            }
-                            sell_orders.append(sell_order)
-                            mandatory_sell_tickers.add(ticker)
-                    else:
-                        self.logger.warning(f"    Cannot find holding for {ticker} - skipping drift trim")
-
-            total_orders = len(buy_orders) + len(sell_orders)
-            self.logger.info(f"  Trading Plan: {len(sell_orders)} SELLs, {len(buy_orders)} BUYs")
-
-            # ============================================================================
-            # VALIDATION: CHECK FOR OVER-ALLOCATION (CRITICAL BUG PREVENTION)
-            # ============================================================================
-            MAX_DEPLOYMENT_PCT = 105.0  # Allow 5% overage for rounding, but no more
-
-            if capital_deployment_pct > MAX_DEPLOYMENT_PCT:
-                self.logger.error("=" * 80)
-                self.logger.error("CRITICAL ERROR: GPT OVER-ALLOCATED CAPITAL")
-                self.logger.error("=" * 80)
-                self.logger.error(f"  Requested: ${total_allocated:,.2f}")
-                self.logger.error(f"  Available: ${available_capital:,.2f}")
-                self.logger.error(f"  Over-allocation: {capital_deployment_pct:.1f}% (max: {MAX_DEPLOYMENT_PCT}%)")
-                self.logger.error(f"  Shortfall: ${total_allocated - available_capital:,.2f}")
-                self.logger.error("")
-                self.logger.error("  This plan CANNOT be executed - insufficient funds!")
-                self.logger.error("  Scaling down all positions proportionally...")
-
-                # Scale down all positions to fit within available capital
-                scale_factor = (available_capital * 0.95) / total_allocated  # Use 95% to be safe
-                self.logger.error(f"  Applying scale factor: {scale_factor:.3f}")
-
-                for order in buy_orders:
-                    old_capital = order['allocated_capital']
-                    new_capital = old_capital * scale_factor
-                    order['allocated_capital'] = new_capital
-
-                    # Recalculate shares
-                    entry_price = order['entry_price']
-                    order['shares'] = int(new_capital / entry_price) if entry_price > 0 else 0
-
-                    self.logger.error(f"    {order['ticker']}: ${old_capital:,.0f} → ${new_capital:,.0f} ({order['shares']} shares)")
-
-                # Recalculate totals after scaling
-                total_allocated = sum(o['allocated_capital'] for o in buy_orders)
-                capital_deployment_pct = (total_allocated / available_capital * 100) if available_capital > 0 else 0
-                self.logger.error(f"  After scaling: ${total_allocated:,.2f} ({capital_deployment_pct:.1f}%)")
-                self.logger.error("=" * 80)
-
-            # ============================================================================
-            # TIER 1 FIX: CAPITAL DEPLOYMENT VALIDATION (90% MINIMUM)
-            # ============================================================================
-            # This is a CRITICAL profitability improvement - idle capital earns nothing!
-            #
-            # Problem: GPT-4o was only selecting 5 positions ($33K of $100K = 33% deployed)
-            # Impact: 67% of capital sitting idle = massive profit opportunity loss
-            # Fix: Enforce 90% minimum deployment OR auto-fill with next-best candidates
-
-            MIN_DEPLOYMENT_PCT = 90.0
-            MIN_POSITIONS = 12  # Reduced from 15 to allow some flexibility
-
-            # Calculate final position count after all trades execute
-            positions_after_trades = current_positions - len(sell_orders) + len(buy_orders)
-
-            # Check if plan meets minimum standards
-            deployment_ok = capital_deployment_pct >= MIN_DEPLOYMENT_PCT
-            diversification_ok = len(buy_orders) >= MIN_POSITIONS
-
-            if not deployment_ok or not diversification_ok:
-                self.logger.warning("=" * 80)
-                self.logger.warning("CAPITAL DEPLOYMENT VALIDATION FAILED")
-                self.logger.warning("=" * 80)
-                self.logger.warning(f"  Current deployment: {capital_deployment_pct:.1f}% (minimum: {MIN_DEPLOYMENT_PCT}%)")
-                self.logger.warning(f"  New BUY positions: {len(buy_orders)} (minimum: {MIN_POSITIONS})")
-                self.logger.warning(f"  Total positions after trades: {positions_after_trades}")
-                self.logger.warning("")
-                self.logger.warning(f"  This plan would leave ${available_capital - total_allocated:,.0f} idle!")
-                self.logger.warning("  Idle capital = lost profit opportunity.")
-                self.logger.warning("")
-                self.logger.warning("  AUTO-CORRECTION: Adding next-highest-scoring candidates...")
-
-                # Auto-fill with next-best candidates to reach 90% deployment
-                # Sort candidates by composite score (descending)
-                selected_tickers = {order['ticker'] for order in buy_orders}
-                remaining_candidates = [
-                    c for c in candidates
-                    if c['ticker'] not in selected_tickers and c.get('composite_score', 0) >= ABSOLUTE_SCORE_FLOOR
-                ]
-                remaining_candidates.sort(key=lambda x: -x.get('composite_score', 0))
-
-                remaining_capital = available_capital - total_allocated
-                target_deployment = available_capital * (MIN_DEPLOYMENT_PCT / 100.0)
-                capital_needed = target_deployment - total_allocated
-
-                # Load compliance config to get position sizing limits
-                import yaml
-                compliance_config_path = self.project_root / "Config" / "compliance_config.yaml"
-                MIN_POSITION_VALUE = 500  # Default fallback
-                MAX_POSITION_VALUE = 50000  # Default fallback
-                MAX_POSITION_PCT = 0.10  # Default fallback
-                try:
-                    with open(compliance_config_path) as f:
-                        compliance_cfg = yaml.safe_load(f)
-                        position_sizing = compliance_cfg.get('position_sizing', {})
-                        MIN_POSITION_VALUE = position_sizing.get('min_position_value', 500)
-                        MAX_POSITION_VALUE = position_sizing.get('max_position_value', 50000)
-                        MAX_POSITION_PCT = position_sizing.get('max_position_pct', 0.10)
-                except Exception as e:
-                    self.logger.warning(f"Could not load compliance config, using defaults")
-
-                # Calculate max allowed position (smaller of absolute or percentage limit)
-                max_position_from_pct = available_capital * MAX_POSITION_PCT
-                max_allowed_position = min(MAX_POSITION_VALUE, max_position_from_pct)
-
-                added_count = 0
-                skipped_count = 0
-                for candidate in remaining_candidates:
-                    if total_allocated >= target_deployment:
-                        break
-                    if len(buy_orders) >= 30:  # Hard cap at 30 positions (raised from 20)
-                        break
-
-                    # Calculate position size (aim for equal weighting of remaining capital)
-                    positions_to_add = min(MIN_POSITIONS - len(buy_orders), len(remaining_candidates))
-                    if positions_to_add <= 0:
-                        break
-
-                    position_size = min(
-                        capital_needed / positions_to_add,  # Equal distribution
-                        max_allowed_position  # But never more than compliance max
-                    )
-
-                    entry_price = candidate.get('current_price', candidate.get('entry_price', 0))
-                    if entry_price <= 0:
-                        continue
-
-                    # Calculate shares needed to meet MINIMUM position size
-                    import math
-                    min_shares = math.ceil(MIN_POSITION_VALUE / entry_price) if entry_price > 0 else 0
-                    shares = max(min_shares, int(position_size / entry_price))
-
-                    if shares == 0:
-                        continue
-
-                    allocated = shares * entry_price
-
-                    # VALIDATION: Skip if position would be below minimum OR above compliance max
-                    if allocated < MIN_POSITION_VALUE:
-                        self.logger.debug(f"    - Skipped {candidate['ticker']}: ${allocated:,.0f} < ${MIN_POSITION_VALUE} minimum")
-                        skipped_count += 1
-                        continue
-
-                    if allocated > max_allowed_position:
-                        self.logger.debug(f"    - Skipped {candidate['ticker']}: ${allocated:,.0f} > ${max_allowed_position:,.0f} maximum")
-                        skipped_count += 1
-                        continue
-
-                    buy_order = {
-                        'ticker': candidate['ticker'],
-                        'action': 'BUY',
-                        'shares': shares,
-                        'allocated_capital': allocated,
-                        'entry_price': entry_price,
-                        'composite_score': candidate.get('composite_score', 0),
-                        'sentiment_score': candidate.get('sentiment', {}).get('score', 50),
-                        'sentiment_summary': candidate.get('sentiment', {}).get('summary', 'No data'),
-                        'sector': candidate.get('sector', 'Unknown'),
-                        'gpt5_reasoning': f'Auto-added for capital efficiency (score: {candidate.get("composite_score", 0):.1f})',
-                        'gpt5_allocated': False,  # Mark as auto-added
-                        'is_position_adjustment': False
-                    }
-                    buy_orders.append(buy_order)
-                    total_allocated += allocated
-                    added_count += 1
-                    selected_tickers.add(candidate['ticker'])
-
-                    self.logger.info(f"    + Added {candidate['ticker']} (score: {candidate.get('composite_score', 0):.1f}): ${allocated:,.0f}")
-
-                # Recalculate metrics
-                capital_deployment_pct = (total_allocated / available_capital * 100) if available_capital > 0 else 0
-                positions_after_trades = current_positions - len(sell_orders) + len(buy_orders)
-
-                self.logger.warning("")
-                self.logger.warning(f"  AUTO-CORRECTION COMPLETE:")
-                self.logger.warning(f"    - Added {added_count} positions")
-                if skipped_count > 0:
-                    self.logger.warning(f"    - Skipped {skipped_count} candidates (position size constraints)")
-                self.logger.warning(f"    - New deployment: {capital_deployment_pct:.1f}%")
-                self.logger.warning(f"    - New BUY positions: {len(buy_orders)}")
-                self.logger.warning(f"    - Total positions after trades: {positions_after_trades}")
-                self.logger.warning(f"    - Remaining idle capital: ${available_capital - total_allocated:,.0f}")
-                self.logger.warning("=" * 80)
-
-            # Quality score based on deployment and diversification
-            quality_score = min(100, int(
-                (capital_deployment_pct / 90.0 * 70) +  # 70% weight on deployment
-                (min(len(buy_orders) / 15.0, 1.0) * 30)  # 30% weight on diversification (target 15)
-            ))
-
-            # Recalculate final position count one more time (in case auto-correction changed it)
-            positions_after_trades = current_positions - len(sell_orders) + len(buy_orders)
-
-            issues = []
-            if capital_deployment_pct < MIN_DEPLOYMENT_PCT:
-                issues.append(f"Capital deployment {capital_deployment_pct:.1f}% (target {MIN_DEPLOYMENT_PCT}%+)")
-            if len(buy_orders) < MIN_POSITIONS:
-                issues.append(f"Limited diversification: {len(buy_orders)} new positions (target {MIN_POSITIONS}-20). Total after trades: {positions_after_trades}")
+                if holding.get('ticker') in plan.mandatory_sell_flags:
+                    holding['MANDATORY_SELL'] = True
+                    holding['MANDATORY_SELL_REASON'] = plan.mandatory_sell_flags[holding['ticker']]
+            for candidate in candidates:
+                if candidate.get('ticker') in plan.allocated_capital:
+                    candidate['allocated_capital'] = plan.allocated_capital[candidate['ticker']]
 
-            success = total_orders > 0
+            self._log_allocation_plan(plan, regime_info, pending_tickers, holdings, candidates, model_display)
 
             return WorkflowStageResult(
                 stage='portfolio_allocator',
-                success=success,
+                success=plan.success,
                 data={
-                    'buy_orders': buy_orders,
-                    'sell_orders': sell_orders,
-                    'total_orders': total_orders,
-                    'total_allocated': total_allocated,
-                    'capital_deployment_pct': capital_deployment_pct,
-                    'gpt5_reasoning': reasoning,  # Keep key name for compatibility
-                    'optimized_candidates': optimized_candidates
+                    'buy_orders': plan.buy_orders,
+                    'sell_orders': plan.sell_orders,
+                    'total_orders': plan.total_orders,
+                    'total_allocated': plan.total_allocated,
+                    'capital_deployment_pct': plan.capital_deployment_pct,
+                    'gpt5_reasoning': plan.reasoning,  # Keep key name for compatibility
+                    'optimized_candidates': plan.optimized_candidates
                 },
-                message=f"Deterministic allocator created trading plan: {len(sell_orders)} SELLs, {len(buy_orders)} BUYs (${total_allocated:,.0f} allocated)",
-                quality_score=int(quality_score),
-                issues=issues
+                message=f"Deterministic allocator created trading plan: {len(plan.sell_orders)} SELLs, "
+                        f"{len(plan.buy_orders)} BUYs (${plan.total_allocated:,.0f} allocated)",
+                quality_score=plan.quality_score,
+                issues=plan.issues
             )
 
         except Exception as e:
@@ -1511,6 +907,115 @@ class OperationsManager:
                 issues=[f"AI optimization failed: {str(e)}", "Using fallback equal-weight allocation"]
             )
 
+    def _load_position_limits(self) -> PositionLimits:
+        """Compliance position sizing limits (defaults if the config can't be read)"""
+        compliance_config_path = self.project_root / "Config" / "compliance_config.yaml"
+        try:
+            with open(compliance_config_path) as f:
+                return PositionLimits.from_compliance_config(yaml.safe_load(f))
+        except Exception as e:
+            self.logger.warning(f"  Could not load compliance limits: {e}, using defaults")
+            return PositionLimits()
+
+    def _log_allocation_plan(self, plan: AllocationPlan, regime_info: Optional[Dict], pending_tickers: set,
+                             holdings: List[Dict], candidates: List[Dict], model_display: str):
+        """Narrate an AllocationPlan (the allocator itself does no logging)"""
+        sizing = plan.sizing
+        target_size = sizing.target_portfolio_size
+
+        if plan.filtered_pending:
+            self.logger.info(f"  Filtered {len(plan.filtered_pending)} candidates with PENDING orders: "
+                             f"{', '.join(sorted(pending_tickers))}")
+
+        self.logger.info(f"  {model_display} analyzing complete portfolio:")
+        self.logger.info(f"    - {len(candidates) - len(plan.filtered_pending)} buy candidates (with scores & sentiment)")
+        self.logger.info(f"    - {len(holdings)} current holdings (with scores & sentiment)")
+
+        # MARKET REGIME ANALYSIS - Active Strategy Adjustment
+        if regime_info:
+            self.logger.info("")
+            self.logger.info("=" * 80)
+            self.logger.info("  MARKET REGIME ASSESSMENT (ACTIVE MODE)")
+            self.logger.info("=" * 80)
+            self.logger.info(f"  Regime: {regime_info.get('regime', 'NEUTRAL')} (Confidence: {regime_info.get('confidence', 'MEDIUM')})")
+            self.logger.info(f"  VIX Level: {regime_info.get('vix_level', 20.0):.1f}")
+            self.logger.info(f"  SPY Change: {regime_info.get('spy_change_pct', 0):.2f}%")
+            self.logger.info(f"  {sizing.mode} MODE → Target positions: {target_size}, "
+                             f"position sizing: {sizing.position_size_multiplier:.0%} of normal")
+            self.logger.info("=" * 80)
+        else:
+            self.logger.warning("  No regime data available - using default parameters")
+
+        # COMPARATIVE RANKING ANALYSIS
+        if plan.ranking is not None:
+            self.logger.info("")
+            self.logger.info("=" * 80)
+            self.logger.info("  COMPARATIVE RANKING ANALYSIS")
+            self.logger.info("=" * 80)
+            self.logger.info(f"  Total universe: {len(plan.ranking.all_stocks)} stocks")
+            self.logger.info(f"  Target portfolio size: {target_size} positions")
+            self.logger.info(f"  Absolute score floor: {ABSOLUTE_SCORE_FLOOR} (never hold below this)")
+            self.logger.info("")
+            self.logger.info("  TOP 30 RANKED STOCKS:")
+            self.logger.info("  " + "-" * 76)
+            self.logger.info(f"  {'Rank':<6} {'Ticker':<8} {'Score':<8} {'Type':<12} {'Action':<20}")
+            self.logger.info("  " + "-" * 76)
+
+            for i, stock in enumerate(plan.ranking.top(30)):
+                rank = i + 1
+                score = stock['composite_score']
+                stock_type = stock['type']
+                if stock_type == 'HOLDING' and score < ABSOLUTE_SCORE_FLOOR:
+                    action = f"✗ SELL (score < {ABSOLUTE_SCORE_FLOOR})"
+                elif rank <= target_size:
+                    action = "✓ KEEP (top performer)" if stock_type == 'HOLDING' else "→ BUY (top opportunity)"
+                else:
+                    action = "✗ SELL (below threshold)" if stock_type == 'HOLDING' else f"- Pass (not in top {target_size})"
+                self.logger.info(f"  {rank:<6} {stock['ticker']:<8} {score:<8.1f} {stock_type:<12} {action:<20}")
+
+            self.logger.info("  " + "-" * 76)
+            self.logger.info("")
+            self.logger.info("  POSITION QUALITY CHECK:")
+            for holding, decision in zip(holdings, plan.holding_decisions):
+                if decision.must_sell:
+                    self.logger.warning(f"    ❌ {decision.ticker}: MANDATORY SELL - {decision.sell_reason}")
+                else:
+                    rank_display = f"Rank #{decision.rank}" if decision.rank else "Not ranked"
+                    self.logger.info(f"    ✓ {decision.ticker}: KEEP - {rank_display}, Score {decision.score:.1f}, "
+                                     f"P&L {holding.get('unrealized_plpc', 0):+.1f}%")
+            self.logger.info("=" * 80)
+
+        # CAPITAL
+        if plan.mandatory_sell_proceeds > 0:
+            self.logger.info(f"  Mandatory sell proceeds: ${plan.mandatory_sell_proceeds:,.2f}")
+        self.logger.info(f"  Total available capital: ${plan.available_capital:,.2f} "
+                         f"(buying power ${plan.buying_power:,.2f})")
+        for h in holdings:
+            if not h.get('tradeable', True):
+                self.logger.warning(f"  FROZEN position (not counted against limit): {h['ticker']} "
+                                    f"${h.get('market_value', 0):,.2f} (status: {h.get('asset_status', 'UNKNOWN')})")
+        self.logger.info(f"  Tradeable holdings to keep: {plan.holdings_to_keep_count}")
+        self.logger.info(f"  Open slots for new positions: {plan.open_slots}")
+        if plan.unfilled_slots:
+            self.logger.warning(f"  Only {plan.open_slots - plan.unfilled_slots} candidates meet quality threshold "
+                                f"(score ≥ {ABSOLUTE_SCORE_FLOOR}) - leaving {plan.unfilled_slots} slots unfilled")
+
+        # VALIDATION
+        if plan.over_allocation_scale is not None:
+            self.logger.error(f"  CRITICAL: over-allocated capital - scaled all buys by {plan.over_allocation_scale:.3f}")
+        if plan.auto_fill is not None:
+            self.logger.warning(f"  CAPITAL DEPLOYMENT AUTO-CORRECTION: added {len(plan.auto_fill['added'])} positions"
+                                + (f" ({', '.join(plan.auto_fill['added'])})" if plan.auto_fill['added'] else "")
+                                + f", skipped {len(plan.auto_fill['skipped'])} (position size constraints)")
+        for ticker in plan.skipped_external_sells:
+            self.logger.warning(f"    Cannot find holding for {ticker} - skipping drift trim")
+
+        for order in plan.sell_orders:
+            self.logger.warning(f"  SELL {order['ticker']}: {order['shares']} shares - {order['gpt5_reasoning']}")
+        self.logger.info(f"  Trading Plan: {len(plan.sell_orders)} SELLs, {len(plan.buy_orders)} BUYs")
+        self.logger.info(f"  Capital Deployment: ${plan.total_allocated:,.2f} / ${plan.available_capital:,.2f} "
+                         f"({plan.capital_deployment_pct:.1f}%), positions after trades: {plan.positions_after_trades}")
+
     def _generate_risk_assessment_message(self, candidates: List[Dict], available_capital: float) -> str:
         """
         Generate RiskAssessment message for Portfolio Department
@@ -1688,24 +1193,24 @@ class OperationsManager:
             approved_buys = []
             flagged_buys = []
 
-            for buy_order in buy_orders:
-                # Run through Compliance pre-trade validation (advisory only)
-                # Note: We're using Compliance's validate_trade but treating rejections as suggestions
-                proposal = {
-                    'ticker': buy_order['ticker'],
-                    'trade_type': 'BUY',
-                    'shares': buy_order['shares'],
-                    'price': buy_order['entry_price'],
-                    'position_value': buy_order['allocated_capital'],
-                    'total_risk': buy_order.get('total_risk', 0),
-                    'sector': buy_order.get('sector', 'Unknown'),
-                    'stop_loss': buy_order.get('stop_loss', 0),
-                    'target': buy_order.get('target_price', 0),
-                    'is_position_adjustment': buy_order.get('is_position_adjustment', False)
-                }
-
-                is_approved, rejection_reason, rejection_category, check_results = \
-                    self._compliance_dept.validator.validate_trade(proposal)
+            # Run the whole plan through Compliance pre-trade validation in one batch
+            # (one portfolio snapshot; running sector/risk totals across the plan)
+            proposals = [{
+                'ticker': buy_order['ticker'],
+                'trade_type': 'BUY',
+                'shares': buy_order['shares'],
+                'price': buy_order['entry_price'],
+                'position_value': buy_order['allocated_capital'],
+                'total_risk': buy_order.get('total_risk', 0),
+                'sector': buy_order.get('sector', 'Unknown'),
+                'stop_loss': buy_order.get('stop_loss', 0),
+                'target': buy_order.get('target_price', 0),
+                'is_position_adjustment': buy_order.get('is_position_adjustment', False)
+            } for buy_order in buy_orders]
+            validations = self._compliance_dept.validator.validate_batch(proposals)
+
+            for buy_order, validation in zip(buy_orders, validations):
+                is_approved, rejection_reason, rejection_category, check_results = validation
 
                 if is_approved:
                     approved_buys.append(buy_order)
@@ -1798,13 +1303,14 @@ class OperationsManager:
             approved_trades = []
             rejected_trades = []
 
+            proposals = []
             for order in buy_orders:
                 # Format trade proposal for Compliance validator
                 # Note: Portfolio uses 'position_size_value' from Risk, not 'position_value'
                 position_val = order.get('position_value', order.get('position_size_value', 0))
                 entry_price = order.get('price', order.get('entry_price', order.get('current_price', 0)))
 
-                proposal = {
+                proposals.append({
                     'ticker': order.get('ticker', order.get('symbol', 'UNKNOWN')),
                     'trade_type': 'BUY',
                     'shares': order.get('shares', order.get('position_size_shares', order.get('qty', 0))),
@@ -1815,11 +1321,13 @@ class OperationsManager:
                     'stop_loss': order.get('stop_loss', order.get('stop', 0)),
                     'target': order.get('target_price', order.get('target', 0)),
                     'is_position_adjustment': order.get('is_position_adjustment', False)
-                }
+                })
 
-                # Validate trade
-                is_approved, rejection_reason, rejection_category, check_results = \
-                    self._compliance_dept.validator.validate_trade(proposal)
+            # Validate the whole plan against one portfolio snapshot
+            validations = self._compliance_dept.validator.validate_batch(proposals)
+
+            for order, validation in zip(buy_orders, validations):
+                is_approved, rejection_reason, rejection_category, check_results = validation
 
                 if is_approved:
                     approved_trades.append({
@@ -2039,6 +1547,34 @@ class OperationsManager:
             'recommendation': escalation.recommendation
         }
 
+    def _get_pending_tickers(self) -> set:
+        """
+        Tickers with PENDING orders in portfolio_positions
+
+        Raises on DB errors: this guards against duplicate orders, so the
+        allocator must not run without it.
+        """
+        conn = get_connection(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT DISTINCT ticker FROM portfolio_positions WHERE status = 'PENDING'")
+            return {row[0] for row in cursor.fetchall()}
+        finally:
+            conn.close()
+
+    def _get_alpaca_buying_power(self) -> float:
+        """REAL buying power from Alpaca (ground truth), with a fixed fallback"""
+        try:
+            from Utils.alpaca_session import get_account_snapshot_cache
+            account = get_account_snapshot_cache().get_account()
+            buying_power = float(account.buying_power)
+            self.logger.info(f"  Alpaca buying power: ${buying_power:,.2f}")
+        except Exception as e:
+            self.logger.warning(f"  Could not fetch Alpaca buying power: {e}")
+            buying_power = 100000.0  # Fallback
+            self.logger.info(f"  Using fallback capital: ${buying_power:,.2f}")
+        return buying_power
+
     def _get_latest_regime_assessment(self) -> Optional[Dict]:
         """
         Fetch the latest market regime assessment from database
@@ -2048,7 +1584,7 @@ class OperationsManager:
         """
         try:
             import sqlite3
-            conn = sqlite3.connect(self.project_root / "sentinel.db", timeout=30)
+            conn = get_connection(self.project_root / "sentinel.db")
             cursor = conn.cursor()
 
             # Get most recent assessment
@@ -0,0 +1,556 @@
+"""
+PORTFOLIO ALLOCATOR - Sentinel Corporation
+Deterministic allocator behind the Operations "gpt5_optimizer" stage
+
+- Holdings and candidates are ranked together by composite score (one sort)
+- Ranks are looked up through a ticker -> rank dict instead of list scans
+- Holding keep/sell decisions: absolute score floor, then keeper-rank threshold
+- PortfolioAllocator.allocate() turns one day's inputs into a trading plan:
+  regime sizing, equal-weight buys, mandatory/fallback/drift sells,
+  over-allocation scaling and the 90% capital deployment auto-fill
+- No I/O and no logging: regime, buying power, PENDING tickers, entry dates
+  and compliance limits are all passed in, so historical days can be
+  replayed through allocate() in a loop (see scripts/benchmark_portfolio_allocator.py)
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+ABSOLUTE_SCORE_FLOOR = 60  # Never hold anything below this score (quality threshold)
+MAX_DEPLOYMENT_PCT = 105.0  # Allow 5% overage for rounding, but no more
+MIN_DEPLOYMENT_PCT = 90.0
+MIN_POSITIONS = 12  # Reduced from 15 to allow some flexibility
+MAX_BUY_ORDERS = 30  # Hard cap when auto-filling (raised from 20)
+
+
+def holding_score(holding: Dict) -> float:
+    """Composite score for a current holding (Research score preferred)"""
+    return holding.get('research_composite_score', holding.get('composite_score', 50))
+
+
+def candidate_score(candidate: Dict) -> float:
+    """Composite score for a buy candidate (News-adjusted score preferred)"""
+    return candidate.get('composite_score', candidate.get('research_composite_score', 0))
+
+
+@dataclass
+class HoldingDecision:
+    """Keep/sell outcome for one holding"""
+    ticker: str
+    score: float
+    rank: Optional[int]
+    must_sell: bool
+    sell_reason: Optional[str] = None
+
+
+class ComparativeRanking:
+    """
+    Unified holdings + candidates ranking
+
+    all_stocks is sorted by composite score, highest first. The sort is stable,
+    so ties keep holdings-then-candidates input order. A ticker listed more
+    than once takes its best (first) rank.
+    """
+
+    def __init__(self, holdings: List[Dict], candidates: List[Dict],
+                 days_held: Optional[Dict[str, Optional[int]]] = None):
+        """
+        Args:
+            holdings: Current holdings (dicts with ticker + scores/position data)
+            candidates: Buy candidates (dicts with ticker + scores)
+            days_held: ticker -> days held (None if unknown), bulk-loaded by caller
+        """
+        days_held = days_held or {}
+        self.holdings = holdings
+        self.candidates = candidates
+        self.all_stocks = []
+
+        for holding in holdings:
+            ticker = holding.get('ticker')
+            self.all_stocks.append({
+                'ticker': ticker,
+                'composite_score': holding_score(holding),
+                'type': 'HOLDING',
+                'market_value': holding.get('market_value', 0),
+                'unrealized_plpc': holding.get('unrealized_plpc', 0),
+                'days_held': days_held.get(ticker),
+                'data': holding
+            })
+
+        for candidate in candidates:
+            self.all_stocks.append({
+                'ticker': candidate.get('ticker'),
+                'composite_score': candidate_score(candidate),
+                'type': 'CANDIDATE',
+                'data': candidate
+            })
+
+        self.all_stocks.sort(key=lambda x: x['composite_score'], reverse=True)
+
+        self.rank_by_ticker = {}
+        for i, stock in enumerate(self.all_stocks):
+            self.rank_by_ticker.setdefault(stock['ticker'], i + 1)
+
+    def rank_of(self, ticker: str) -> Optional[int]:
+        """1-based rank, or None if the ticker is not in the ranking"""
+        return self.rank_by_ticker.get(ticker)
+
+    def top(self, n: int) -> List[Dict]:
+        """Top n ranked entries"""
+        return self.all_stocks[:n]
+
+    def evaluate_holdings(self, keeper_threshold_rank: int,
+                          score_floor: float = ABSOLUTE_SCORE_FLOOR) -> List[HoldingDecision]:
+        """
+        Decide keep/sell for every holding (in holdings order)
+
+        Rule 1: score below the absolute floor -> sell
+        Rule 2: ranked below keeper_threshold_rank -> sell
+        """
+        decisions = []
+        for holding in self.holdings:
+            ticker = holding.get('ticker')
+            score = holding_score(holding)
+            rank = self.rank_of(ticker)
+
+            must_sell = False
+            sell_reason = None
+
+            if score < score_floor:
+                must_sell = True
+                sell_reason = f"Score {score:.1f} < {score_floor} absolute minimum"
+            elif rank is not None and rank > keeper_threshold_rank:
+                must_sell = True
+                sell_reason = f"Rank #{rank} (below top {keeper_threshold_rank}), score {score:.1f}"
+
+            decisions.append(HoldingDecision(ticker=ticker, score=score, rank=rank,
+                                             must_sell=must_sell, sell_reason=sell_reason))
+        return decisions
+
+
+@dataclass
+class RegimeSizing:
+    """Target portfolio size and position size multiplier for a market regime"""
+    mode: str  # 'DEFENSIVE', 'CAUTIOUS', 'AGGRESSIVE', 'STANDARD', 'DEFAULT'
+    target_portfolio_size: int
+    position_size_multiplier: float
+
+    @classmethod
+    def from_regime(cls, regime_info: Optional[Dict]) -> 'RegimeSizing':
+        """Map the latest market_regime_assessments row (or None) to sizing"""
+        if not regime_info:
+            return cls('DEFAULT', 28, 1.0)
+
+        regime = regime_info.get('regime', 'NEUTRAL')
+        confidence = regime_info.get('confidence', 'MEDIUM')
+        vix_level = regime_info.get('vix_level', 20.0)
+
+        if regime == 'BEARISH' and confidence == 'HIGH':
+            return cls('DEFENSIVE', 15, 0.6)  # High-confidence bearish: smaller book, smaller positions
+        if regime == 'BEARISH':
+            return cls('CAUTIOUS', 20, 0.75)
+        if regime == 'BULLISH' and vix_level < 15:
+            return cls('AGGRESSIVE', 28, 1.1)  # Low volatility bull market
+        return cls('STANDARD', 28, 1.0)
+
+
+@dataclass
+class PositionLimits:
+    """Compliance position sizing limits (Config/compliance_config.yaml: position_sizing)"""
+    max_position_value: float = 50000
+    max_position_pct: float = 0.10
+    min_position_value: float = 500
+
+    @classmethod
+    def from_compliance_config(cls, compliance_cfg: Optional[Dict]) -> 'PositionLimits':
+        """Build from a parsed compliance config; missing keys keep the defaults"""
+        try:
+            sizing = compliance_cfg.get('position_sizing', {})
+            return cls(
+                max_position_value=sizing.get('max_position_value', 50000),
+                max_position_pct=sizing.get('max_position_pct', 0.10),
+                min_position_value=sizing.get('min_position_value', 500)
+            )
+        except AttributeError:
+            return cls()
+
+    def max_allowed_position(self, available_capital: float) -> float:
+        """Smaller of the absolute and percentage-of-capital limits"""
+        return min(self.max_position_value, available_capital * self.max_position_pct)
+
+
+@dataclass
+class AllocationPlan:
+    """Everything allocate() decided, plus the numbers behind it (for logging)"""
+    buy_orders: List[Dict]
+    sell_orders: List[Dict]
+    optimized_candidates: List[Dict]
+    total_orders: int  # Before auto-fill (as reported by the original stage)
+    total_allocated: float
+    capital_deployment_pct: float
+    quality_score: int
+    issues: List[str]
+    success: bool
+    sizing: RegimeSizing
+    buying_power: float
+    available_capital: float
+    mandatory_sell_proceeds: float
+    open_slots: int
+    holdings_to_keep_count: int
+    positions_after_trades: int
+    filtered_pending: List[str] = field(default_factory=list)
+    ranking: Optional[ComparativeRanking] = None
+    holding_decisions: List[HoldingDecision] = field(default_factory=list)
+    mandatory_sell_flags: Dict[str, str] = field(default_factory=dict)  # ticker -> reason
+    allocated_capital: Dict[str, float] = field(default_factory=dict)  # Candidate ticker -> capital
+    unfilled_slots: int = 0
+    skipped_external_sells: List[str] = field(default_factory=list)
+    over_allocation_scale: Optional[float] = None
+    auto_fill: Optional[Dict] = None  # {'added': n, 'skipped': n} when deployment fell short
+    reasoning: str = "Deterministic allocation: Top-ranked candidates selected by comparative ranking system, equal-weighted."
+
+
+def _holding_sell_score(holding: Dict) -> float:
+    return holding.get('research_composite_score', holding.get('composite_score', 0))
+
+
+def _sentiment_fields(holding: Dict) -> Dict:
+    return {
+        'sentiment_score': holding.get('sentiment_score', holding.get('sentiment', {}).get('score', 50)),
+        'sentiment_summary': holding.get('sentiment_summary', holding.get('sentiment', {}).get('summary', 'No data')),
+    }
+
+
+class PortfolioAllocator:
+    """
+    Pure deterministic allocator
+
+    allocate() never mutates its inputs: MANDATORY_SELL flags and candidate
+    allocated_capital are returned on the plan for the caller to apply.
+    """
+
+    def __init__(self, limits: Optional[PositionLimits] = None, score_floor: float = ABSOLUTE_SCORE_FLOOR):
+        self.limits = limits or PositionLimits()
+        self.score_floor = score_floor
+
+    def allocate(self, holdings: List[Dict], candidates: List[Dict], regime: Optional[Dict],
+                 buying_power: float, pending: Optional[set] = None,
+                 days_held: Optional[Dict[str, Optional[int]]] = None,
+                 external_sells: Optional[List[Dict]] = None) -> AllocationPlan:
+        """
+        Build one day's trading plan
+
+        Args:
+            holdings: Current holdings with scores/sentiment/position data
+            candidates: Scored buy candidates
+            regime: Latest regime assessment dict (None = defaults)
+            buying_power: Alpaca buying power
+            pending: Tickers with PENDING orders (excluded from buys)
+            days_held: ticker -> days held, for the ranking table
+            external_sells: Injected sells (e.g. position drift trims)
+
+        Raises:
+            ValueError: if there are no candidates at all
+        """
+        if not candidates:
+            raise ValueError("No candidates from News stage to optimize")
+
+        floor = self.score_floor
+        pending = pending or set()
+
+        # Filter out candidates with PENDING orders to prevent duplicates
+        filtered_pending = []
+        if pending:
+            filtered_pending = [c.get('ticker') for c in candidates if c.get('ticker') in pending]
+            candidates = [c for c in candidates if c.get('ticker') not in pending]
+
+        sizing = RegimeSizing.from_regime(regime)
+        target_size = sizing.target_portfolio_size
+
+        # Comparative ranking: portfolio should hold the top N stocks by score
+        ranking = None
+        decisions = []
+        sell_flags = {t: h.get('MANDATORY_SELL_REASON') for h in holdings
+                      if h.get('MANDATORY_SELL') for t in [h.get('ticker')]}
+        if holdings:
+            ranking = ComparativeRanking(holdings, candidates, days_held=days_held)
+            decisions = ranking.evaluate_holdings(target_size, floor)
+            for decision in decisions:
+                if decision.must_sell:
+                    sell_flags[decision.ticker] = decision.sell_reason
+
+        def flagged(holding):
+            return holding.get('ticker') in sell_flags
+
+        # Mandatory sells are guaranteed capital
+        mandatory_sell_proceeds = 0.0
+        for holding in holdings:
+            if flagged(holding):
+                mandatory_sell_proceeds += holding.get('market_value', 0)
+        available_capital = buying_power + mandatory_sell_proceeds
+        current_positions = len(holdings)
+
+        # Open slots exclude untradeable positions (mergers, halts) from the active count
+        tradeable_holdings = [h for h in holdings if h.get('tradeable', True)]
+        holdings_to_keep_count = len([h for h in tradeable_holdings if not flagged(h)])
+        open_slots = target_size - holdings_to_keep_count
+
+        # Top candidates by score, not already held, above the quality floor
+        optimized_candidates = []
+        allocated_capital = {}
+        unfilled_slots = 0
+        if open_slots > 0:
+            held_tickers = {h['ticker'] for h in holdings}
+            available_candidates = [
+                c for c in candidates
+                if c['ticker'] not in held_tickers
+                and c.get('composite_score', 0) >= floor
+            ]
+            available_candidates.sort(key=lambda x: -x.get('composite_score', 0))
+            selected_candidates = available_candidates[:open_slots]
+            unfilled_slots = open_slots - len(selected_candidates)
+
+            # Equal-weight across selected candidates, capped at compliance limits
+            if selected_candidates:
+                max_allowed_position = self.limits.max_allowed_position(available_capital)
+                capital_per_position = min(available_capital / len(selected_candidates), max_allowed_position)
+
+                for candidate in selected_candidates:
+                    entry_price = candidate.get('current_price', candidate.get('entry_price', 0))
+                    if entry_price <= 0:
+                        continue
+                    if int(capital_per_position / entry_price) > 0:
+                        allocated_capital[candidate['ticker']] = capital_per_position
+                        optimized_candidates.append(dict(candidate, allocated_capital=capital_per_position))
+
+        total_allocated = sum(c.get('allocated_capital', 0) for c in optimized_candidates)
+        capital_deployment_pct = (total_allocated / available_capital * 100) if available_capital > 0 else 0
+
+        buy_orders = []
+        for candidate in optimized_candidates:
+            capital = candidate.get('allocated_capital', 0)
+            if capital > 0:
+                entry_price = candidate.get('current_price', candidate.get('entry_price', 0))
+                buy_orders.append({
+                    'ticker': candidate['ticker'],
+                    'action': 'BUY',
+                    'shares': int(capital / entry_price) if entry_price > 0 else 0,
+                    'allocated_capital': capital,
+                    'entry_price': entry_price,
+                    'composite_score': candidate.get('composite_score', 0),
+                    'sentiment_score': candidate.get('sentiment', {}).get('score', 50),
+                    'sentiment_summary': candidate.get('sentiment', {}).get('summary', 'No data'),
+                    'sector': candidate.get('sector', 'Unknown'),
+                    'gpt5_reasoning': candidate.get('gpt5_reasoning', 'Selected by GPT-5'),
+                    'gpt5_allocated': True,
+                    'is_position_adjustment': candidate.get('is_position_adjustment', False)
+                })
+
+        # Regime-based position sizing (deployment % intentionally stays pre-multiplier)
+        if sizing.position_size_multiplier != 1.0:
+            for order in buy_orders:
+                order['allocated_capital'] = order['allocated_capital'] * sizing.position_size_multiplier
+                entry_price = order['entry_price']
+                order['shares'] = int(order['allocated_capital'] / entry_price) if entry_price > 0 else 0
+            total_allocated = sum(o['allocated_capital'] for o in buy_orders)
+
+        sell_orders, skipped_external = self._build_sell_orders(holdings, sell_flags, external_sells or [])
+        total_orders = len(buy_orders) + len(sell_orders)
+
+        # Over-allocation guard: scale every buy down to 95% of available capital
+        over_allocation_scale = None
+        if capital_deployment_pct > MAX_DEPLOYMENT_PCT:
+            over_allocation_scale = (available_capital * 0.95) / total_allocated
+            for order in buy_orders:
+                order['allocated_capital'] = order['allocated_capital'] * over_allocation_scale
+                entry_price = order['entry_price']
+                order['shares'] = int(order['allocated_capital'] / entry_price) if entry_price > 0 else 0
+            total_allocated = sum(o['allocated_capital'] for o in buy_orders)
+            capital_deployment_pct = (total_allocated / available_capital * 100) if available_capital > 0 else 0
+
+        # Capital deployment validation: auto-fill toward 90% / MIN_POSITIONS
+        auto_fill = None
+        if capital_deployment_pct < MIN_DEPLOYMENT_PCT or len(buy_orders) < MIN_POSITIONS:
+            total_allocated, auto_fill = self._auto_fill(buy_orders, candidates, available_capital, total_allocated)
+            capital_deployment_pct = (total_allocated / available_capital * 100) if available_capital > 0 else 0
+
+        # Quality: 70% weight on deployment, 30% on diversification (target 15)
+        quality_score = min(100, int(
+            (capital_deployment_pct / 90.0 * 70) +
+            (min(len(buy_orders) / 15.0, 1.0) * 30)
+        ))
+        positions_after_trades = current_positions - len(sell_orders) + len(buy_orders)
+
+        issues = []
+        if capital_deployment_pct < MIN_DEPLOYMENT_PCT:
+            issues.append(f"Capital deployment {capital_deployment_pct:.1f}% (target {MIN_DEPLOYMENT_PCT}%+)")
+        if len(buy_orders) < MIN_POSITIONS:
+            issues.append(f"Limited diversification: {len(buy_orders)} new positions (target {MIN_POSITIONS}-20). "
+                          f"Total after trades: {positions_after_trades}")
+
+        return AllocationPlan(
+            buy_orders=buy_orders,
+            sell_orders=sell_orders,
+            optimized_candidates=optimized_candidates,
+            total_orders=total_orders,
+            total_allocated=total_allocated,
+            capital_deployment_pct=capital_deployment_pct,
+            quality_score=int(quality_score),
+            issues=issues,
+            success=total_orders > 0,
+            sizing=sizing,
+            buying_power=buying_power,
+            available_capital=available_capital,
+            mandatory_sell_proceeds=mandatory_sell_proceeds,
+            open_slots=open_slots,
+            holdings_to_keep_count=holdings_to_keep_count,
+            positions_after_trades=positions_after_trades,
+            filtered_pending=filtered_pending,
+            ranking=ranking,
+            holding_decisions=decisions,
+            mandatory_sell_flags=sell_flags,
+            allocated_capital=allocated_capital,
+            unfilled_slots=max(0, unfilled_slots),
+            skipped_external_sells=skipped_external,
+            over_allocation_scale=over_allocation_scale,
+            auto_fill=auto_fill
+        )
+
+    def _build_sell_orders(self, holdings: List[Dict], sell_flags: Dict[str, str],
+                           external_sells: List[Dict]) -> tuple:
+        """Mandatory exits, fallback below-floor exits, then injected drift trims"""
+        floor = self.score_floor
+        sell_orders = []
+        sold = set()
+
+        for holding in holdings:
+            ticker = holding.get('ticker')
+            if ticker in sell_flags:
+                sold.add(ticker)
+                sell_orders.append({
+                    'ticker': ticker,
+                    'action': 'SELL',
+                    'shares': holding.get('quantity', 0),
+                    'sell_pct': 100,
+                    'composite_score': _holding_sell_score(holding),
+                    'current_price': holding.get('current_price', 0),
+                    **_sentiment_fields(holding),
+                    'gpt5_reasoning': f'AUTOMATED EXIT: {sell_flags[ticker]}',
+                    'current_value': holding.get('market_value', 0)
+                })
+
+        # Safeguard: should be unnecessary since the ranking catches everything
+        if not sold:
+            for holding in holdings:
+                ticker = holding.get('ticker')
+                composite = _holding_sell_score(holding)
+                if composite < floor and ticker not in sold:
+                    sell_orders.append({
+                        'ticker': ticker,
+                        'action': 'SELL',
+                        'shares': holding.get('quantity', 0),
+                        'sell_pct': 100,
+                        'composite_score': composite,
+                        'current_price': holding.get('current_price', 0),
+                        **_sentiment_fields(holding),
+                        'gpt5_reasoning': f'Fallback automatic sell: Score {composite:.1f} below {floor} threshold',
+                        'current_value': holding.get('market_value', 0)
+                    })
+                    sold.add(ticker)
+
+        skipped = []
+        holdings_by_ticker = {}
+        for holding in holdings:
+            holdings_by_ticker.setdefault(holding.get('ticker'), holding)
+
+        for ext_sell in external_sells:
+            ticker = ext_sell.get('ticker')
+            if ticker in sold:
+                continue
+            holding = holdings_by_ticker.get(ticker)
+            if not holding:
+                skipped.append(ticker)
+                continue
+
+            current_price = holding.get('current_price', 0)
+            current_shares = holding.get('quantity', 0)
+            actual_shares = min(ext_sell.get('shares', 0), current_shares)  # Don't sell more than we have
+            if actual_shares > 0:
+                sell_orders.append({
+                    'ticker': ticker,
+                    'action': 'SELL',
+                    'shares': actual_shares,
+                    'sell_pct': int((actual_shares / current_shares) * 100) if current_shares > 0 else 100,
+                    'composite_score': _holding_sell_score(holding),
+                    'current_price': current_price,
+                    'sentiment_score': holding.get('sentiment_score', 50),
+                    'sentiment_summary': 'Position drift trim',
+                    'gpt5_reasoning': ext_sell.get('reason', 'Position exceeds size limit - trimming'),
+                    'current_value': actual_shares * current_price,
+                    'source': ext_sell.get('source', 'position_drift_monitor')
+                })
+                sold.add(ticker)
+
+        return sell_orders, skipped
+
+    def _auto_fill(self, buy_orders: List[Dict], candidates: List[Dict], available_capital: float,
+                   total_allocated: float) -> tuple:
+        """Add next-highest-scoring candidates until 90% deployed (appends to buy_orders)"""
+        selected_tickers = {order['ticker'] for order in buy_orders}
+        remaining_candidates = [
+            c for c in candidates
+            if c['ticker'] not in selected_tickers and c.get('composite_score', 0) >= self.score_floor
+        ]
+        remaining_candidates.sort(key=lambda x: -x.get('composite_score', 0))
+
+        target_deployment = available_capital * (MIN_DEPLOYMENT_PCT / 100.0)
+        capital_needed = target_deployment - total_allocated
+        min_position_value = self.limits.min_position_value
+        max_allowed_position = self.limits.max_allowed_position(available_capital)
+
+        added, skipped = [], []
+        for candidate in remaining_candidates:
+            if total_allocated >= target_deployment or len(buy_orders) >= MAX_BUY_ORDERS:
+                break
+
+            # Aim for equal weighting of the remaining capital
+            positions_to_add = min(MIN_POSITIONS - len(buy_orders), len(remaining_candidates))
+            if positions_to_add <= 0:
+                break
+            position_size = min(capital_needed / positions_to_add, max_allowed_position)
+
+            entry_price = candidate.get('current_price', candidate.get('entry_price', 0))
+            if entry_price <= 0:
+                continue
+
+            # At least enough shares for the minimum position size
+            min_shares = math.ceil(min_position_value / entry_price)
+            shares = max(min_shares, int(position_size / entry_price))
+            if shares == 0:
+                continue
+
+            allocated = shares * entry_price
+            if allocated < min_position_value or allocated > max_allowed_position:
+                skipped.append(candidate['ticker'])
+                continue
+
+            buy_orders.append({
+                'ticker': candidate['ticker'],
+                'action': 'BUY',
+                'shares': shares,
+                'allocated_capital': allocated,
+                'entry_price': entry_price,
+                'composite_score': candidate.get('composite_score', 0),
+                'sentiment_score': candidate.get('sentiment', {}).get('score', 50),
+                'sentiment_summary': candidate.get('sentiment', {}).get('summary', 'No data'),
+                'sector': candidate.get('sector', 'Unknown'),
+                'gpt5_reasoning': f'Auto-added for capital efficiency (score: {candidate.get("composite_score", 0):.1f})',
+                'gpt5_allocated': False,  # Mark as auto-added
+                'is_position_adjustment': False
+            })
+            total_allocated += allocated
+            added.append(candidate['ticker'])
+            selected_tickers.add(candidate['ticker'])
+
+        return total_allocated, {'added': added, 'skipped': skipped}
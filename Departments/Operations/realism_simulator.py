@@ -27,12 +27,21 @@ it is trading real money."
 Created: November 10, 2025
 """
 
+import sys
 import logging
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import sqlite3
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
 import config
+from Utils.db_connection import get_connection
+
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER is 999 on older builds
+SQLITE_PARAM_CHUNK = 900
 
 
 class RealismSimulator:
@@ -73,7 +82,7 @@ class RealismSimulator:
     def _initialize_entry_dates_table(self):
         """Create entry_dates table if it doesn't exist"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -131,7 +140,7 @@ class RealismSimulator:
             entry_date = datetime.now(timezone.utc)
 
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -162,7 +171,7 @@ class RealismSimulator:
             datetime object if entry date found, None otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -183,10 +192,42 @@ class RealismSimulator:
             self.logger.error(f"[RealismSimulator] Failed to get entry date for {ticker}: {e}")
             return None
 
+    def get_entry_dates(self, tickers: List[str]) -> Dict[str, datetime]:
+        """
+        Get entry dates for many positions over one connection
+
+        Returns:
+            Dict of ticker -> entry datetime (tickers without a row are absent)
+        """
+        unique = list(dict.fromkeys(t for t in tickers if t))
+        entry_dates = {}
+        if not unique:
+            return entry_dates
+
+        try:
+            conn = get_connection(self.db_path)
+            try:
+                for i in range(0, len(unique), SQLITE_PARAM_CHUNK):
+                    chunk = unique[i:i + SQLITE_PARAM_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        f"SELECT ticker, entry_date FROM entry_dates WHERE ticker IN ({placeholders})",
+                        chunk
+                    ).fetchall()
+                    for ticker, entry_date_str in rows:
+                        entry_dates[ticker] = datetime.fromisoformat(entry_date_str)
+            finally:
+                conn.close()
+
+        except Exception as e:
+            self.logger.error(f"[RealismSimulator] Failed to get entry dates for {len(unique)} tickers: {e}")
+
+        return entry_dates
+
     def remove_entry_date(self, ticker: str):
         """Remove entry date for a position (called when SELL order fills)"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -219,6 +260,20 @@ class RealismSimulator:
 
         return days_held
 
+    def calculate_days_held_bulk(self, tickers: List[str]) -> Dict[str, Optional[int]]:
+        """
+        calculate_days_held() for many tickers with a single query
+
+        Returns:
+            Dict of ticker -> days held (None if entry date not found)
+        """
+        entry_dates = self.get_entry_dates(tickers)
+        now = datetime.now(timezone.utc)
+        return {
+            ticker: (now - entry_dates[ticker]).days if ticker in entry_dates else None
+            for ticker in tickers
+        }
+
     def record_trade(self, ticker: str, action: str, trade_date: Optional[datetime] = None):
         """
         Record a trade for PDT tracking
@@ -0,0 +1,231 @@
+"""
+STAGE DAG EXECUTOR - Sentinel Corporation
+Runs workflow steps as a dependency graph on a thread pool
+
+Used by OperationsManager.generate_trading_plan:
+- Each node declares the nodes it depends on; independent nodes run concurrently
+- A node's function receives its dependencies' results as positional arguments
+- halt_if lets a node stop its dependents (e.g. a stage that failed quality checks)
+- Start/end/duration is recorded for every node
+- critical_path() / format_report() show which chain of nodes set the wall time
+"""
+
+import time
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StageNode:
+    """One step of the workflow graph"""
+    name: str
+    fn: Callable[..., Any]
+    deps: List[str]
+    halt_if: Optional[Callable[[Any], bool]] = None
+
+
+@dataclass
+class NodeTiming:
+    """Timing for one node (offsets are seconds since the run started)"""
+    name: str
+    deps: List[str]
+    status: str = 'pending'  # 'ok', 'halted', 'failed', 'skipped'
+    start: Optional[float] = None
+    end: Optional[float] = None
+    started_at: Optional[str] = None  # Wall-clock ISO timestamps
+    ended_at: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        if self.start is None or self.end is None:
+            return 0.0
+        return self.end - self.start
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'deps': list(self.deps),
+            'status': self.status,
+            'started_at': self.started_at,
+            'ended_at': self.ended_at,
+            'start_offset_seconds': round(self.start, 3) if self.start is not None else None,
+            'duration_seconds': round(self.duration, 3),
+            'error': self.error
+        }
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+class StageDAG:
+    """
+    Minimal dependency-graph executor
+
+    Nodes must be added after their dependencies, which also rules out cycles.
+    If a node raises, everything downstream of it is skipped and run() re-raises
+    the first error once the in-flight nodes have finished.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max(1, int(max_workers))
+        self.nodes: Dict[str, StageNode] = {}
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, NodeTiming] = {}
+        self.total_seconds = 0.0
+
+    def add(self, name: str, fn: Callable[..., Any], deps: Sequence[str] = (),
+            halt_if: Optional[Callable[[Any], bool]] = None) -> 'StageDAG':
+        """
+        Add a node
+
+        Args:
+            name: Unique node name
+            fn: Called with the results of `deps`, in order
+            deps: Names of nodes that must finish first
+            halt_if: Predicate on this node's result; True skips its dependents
+        """
+        if name in self.nodes:
+            raise ValueError(f"Duplicate stage: {name}")
+        unknown = [d for d in deps if d not in self.nodes]
+        if unknown:
+            raise ValueError(f"Stage {name} depends on unknown stage(s): {', '.join(unknown)}")
+
+        self.nodes[name] = StageNode(name=name, fn=fn, deps=list(deps), halt_if=halt_if)
+        self.timings[name] = NodeTiming(name=name, deps=list(deps))
+        return self
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Execute the graph
+
+        Returns:
+            Dict of node name -> result for every node that ran
+        """
+        run_start = time.perf_counter()
+        first_error = None
+        blocked = set()  # Nodes that must not run (upstream halted/failed)
+        futures = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='stage') as pool:
+            while True:
+                for node in self._ready(futures, blocked):
+                    timing = self.timings[node.name]
+                    timing.start = time.perf_counter() - run_start
+                    timing.started_at = _utc_now()
+                    args = [self.results[d] for d in node.deps]
+                    futures[pool.submit(node.fn, *args)] = node
+
+                if not futures:
+                    break
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = futures.pop(future)
+                    timing = self.timings[node.name]
+                    timing.end = time.perf_counter() - run_start
+                    timing.ended_at = _utc_now()
+
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Stage {node.name} raised: {e}")
+                        timing.status = 'failed'
+                        timing.error = str(e)
+                        blocked |= self._downstream(node.name)
+                        first_error = first_error or e
+                        continue
+
+                    self.results[node.name] = result
+                    if node.halt_if is not None and node.halt_if(result):
+                        timing.status = 'halted'
+                        blocked |= self._downstream(node.name)
+                    else:
+                        timing.status = 'ok'
+
+        for name in blocked:
+            self.timings[name].status = 'skipped'
+        self.total_seconds = time.perf_counter() - run_start
+
+        if first_error is not None:
+            raise first_error
+        return self.results
+
+    def _ready(self, futures: Dict, blocked: set) -> List[StageNode]:
+        running = {node.name for node in futures.values()}
+        ready = []
+        for name, node in self.nodes.items():
+            if name in blocked or name in running or self.timings[name].start is not None:
+                continue
+            if all(self.timings[d].status == 'ok' for d in node.deps):
+                ready.append(node)
+        return ready
+
+    def _downstream(self, name: str) -> set:
+        found = set()
+        frontier = [name]
+        while frontier:
+            current = frontier.pop()
+            for node in self.nodes.values():
+                if current in node.deps and node.name not in found:
+                    found.add(node.name)
+                    frontier.append(node.name)
+        return found
+
+    def critical_path(self) -> List[NodeTiming]:
+        """
+        Chain of nodes that determined the total wall time
+
+        Starts from the node that finished last and walks back through the
+        dependency that finished last (the one it was waiting on).
+        """
+        finished = [t for t in self.timings.values() if t.end is not None]
+        if not finished:
+            return []
+
+        path = [max(finished, key=lambda t: t.end)]
+        while True:
+            deps = [self.timings[d] for d in path[-1].deps if self.timings[d].end is not None]
+            if not deps:
+                break
+            path.append(max(deps, key=lambda t: t.end))
+        return list(reversed(path))
+
+    def to_payload(self) -> Dict:
+        """JSON-friendly timing summary for the workflow result"""
+        return {
+            'total_seconds': round(self.total_seconds, 3),
+            'nodes': [t.to_dict() for t in self.timings.values()],
+            'critical_path': [t.name for t in self.critical_path()]
+        }
+
+    def format_report(self) -> str:
+        """Human-readable per-node timing table plus the critical path"""
+        lines = [
+            "=" * 80,
+            f"WORKFLOW TIMING - total {self.total_seconds:.1f}s",
+            "=" * 80,
+            f"  {'Stage':<20} {'Status':<9} {'Start':>9} {'Duration':>10}  Depends on",
+            "  " + "-" * 76
+        ]
+        for t in sorted(self.timings.values(), key=lambda t: (t.start is None, t.start or 0.0)):
+            start = f"{t.start:8.1f}s" if t.start is not None else "        -"
+            lines.append(f"  {t.name:<20} {t.status:<9} {start:>9} {t.duration:9.1f}s  {', '.join(t.deps) or '-'}")
+
+        path = self.critical_path()
+        lines.append("")
+        lines.append("  CRITICAL PATH:")
+        for t in path:
+            share = (t.duration / self.total_seconds * 100) if self.total_seconds > 0 else 0.0
+            ready_at = max((self.timings[d].end for d in t.deps if self.timings[d].end is not None), default=0.0)
+            wait_seconds = max(0.0, (t.start or 0.0) - ready_at)
+            wait_note = f" (waited {wait_seconds:.1f}s for a worker)" if wait_seconds >= 0.05 else ""
+            lines.append(f"    {t.name:<20} {t.duration:9.1f}s  {share:5.1f}% of total{wait_note}")
+        lines.append("=" * 80)
+        return "\n".join(lines)
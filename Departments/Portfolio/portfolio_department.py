@@ -31,6 +31,8 @@ from dataclasses import dataclass
 
 # Import unified data source (routes to Alpaca or database)
 from Utils.data_source import create_data_source
+from Utils.db_connection import get_connection
+from Utils.message_bus import MessageBus
 
 # Set up logging
 logging.basicConfig(
@@ -45,13 +47,16 @@ class MessageHandler:
     Handles reading and writing messages for Portfolio Department
 
     Pattern learned from Risk Department (Week 3)
-    Implements YAML frontmatter + Markdown + JSON payload format
+    Outgoing messages go on the SQLite message bus and are also exported to
+    Outbox/PORTFOLIO in the YAML frontmatter + Markdown + JSON payload format,
+    which Operations reads. Risk messages are read from the bus and the inbox.
     """
 
-    def __init__(self):
+    def __init__(self, db_path: Path = Path("sentinel.db"), bus: Optional[MessageBus] = None):
         self.inbox_path = Path("Messages_Between_Departments/Inbox/PORTFOLIO")
         self.outbox_path = Path("Messages_Between_Departments/Outbox/PORTFOLIO")
         self.archive_path = Path("Messages_Between_Departments/Archive")
+        self.bus = bus or MessageBus(db_path, markdown_dir=Path("Messages_Between_Departments"))
 
         # Create directories if they don't exist
         self.inbox_path.mkdir(parents=True, exist_ok=True)
@@ -96,7 +101,7 @@ class MessageHandler:
                      priority: str = 'routine',
                      requires_response: bool = False) -> str:
         """
-        Write message to outbox with YAML frontmatter + markdown + JSON payload
+        Send message on the bus (exported to outbox as YAML frontmatter + markdown + JSON payload)
 
         Args:
             to_dept: Destination department
@@ -111,43 +116,15 @@ class MessageHandler:
         Returns:
             message_id (for database tracking)
         """
-        timestamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
-        msg_id = f"MSG_PORTFOLIO_{timestamp}_{uuid.uuid4().hex[:8]}"
-
-        # Build YAML frontmatter
-        metadata = {
-            'message_id': msg_id,
-            'from': 'PORTFOLIO',
-            'to': to_dept,
-            'timestamp': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
-            'message_type': message_type,
-            'priority': priority,
-            'requires_response': requires_response
-        }
-
-        # Add parent message ID if provided (for message chain tracking)
-        if parent_message_id:
-            metadata['parent_message_id'] = parent_message_id
-
-        # Build message content
-        content = "---\n"
-        content += yaml.dump(metadata, default_flow_style=False)
-        content += "---\n\n"
-        content += f"# {subject}\n\n"
-        content += body
-
-        # Add JSON payload if provided
-        if data_payload:
-            content += "\n\n```json\n"
-            content += json.dumps(data_payload, indent=2)
-            content += "\n```\n"
-
-        # Write to outbox
-        filename = f"{msg_id}.md"
-        filepath = self.outbox_path / filename
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        msg_id = self.bus.send(
+            'PORTFOLIO', to_dept, message_type,
+            subject=subject,
+            body=body,
+            payload=data_payload,
+            priority=priority,
+            parent_message_id=parent_message_id,
+            requires_response=requires_response
+        )
 
         logger.info(f"Wrote message {msg_id} to {to_dept}")
         return msg_id
@@ -520,7 +497,7 @@ class ExitSignalGenerator:
     def get_open_positions(self) -> List[Dict]:
         """Get all open positions from database"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -588,7 +565,7 @@ class ExitSignalGenerator:
             Latest composite score or None if not found
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -840,7 +817,7 @@ class PositionTracker:
         position_id = candidate['position_id']
         ticker = candidate['ticker']
 
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -904,7 +881,7 @@ class PositionTracker:
         Returns:
             success: True if updated, False if position not found
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -980,7 +957,7 @@ class PositionTracker:
         Returns:
             success: True if closed, False if not found
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -1051,7 +1028,7 @@ class PositionTracker:
         Returns:
             issues: Dict with keys 'stale_pending', 'price_discrepancies'
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         issues = {
@@ -1114,7 +1091,7 @@ class PositionTracker:
         Returns:
             position_dict or None if not found
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -1139,7 +1116,7 @@ class PositionTracker:
         Returns:
             summary: Dict with counts, capital deployed, performance metrics
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -1263,7 +1240,7 @@ class PortfolioRebalancer:
         Returns:
             status: Dict with deployment metrics and rebalancing recommendation
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -1422,7 +1399,7 @@ class PortfolioRebalancer:
         Returns:
             sector_weights: Dict mapping sector -> weight percentage
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -1474,7 +1451,7 @@ class PortfolioRebalancer:
         sector_allocation = self.check_sector_concentration()
 
         # Calculate position metrics
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -1561,7 +1538,7 @@ class PortfolioDepartment:
         self.db_path = db_path
 
         # Initialize all components
-        self.message_handler = MessageHandler()
+        self.message_handler = MessageHandler(db_path)
         self.decision_engine = PortfolioDecisionEngine(self.config, db_path)
         self.exit_generator = ExitSignalGenerator(self.config, db_path)
         self.position_tracker = PositionTracker(db_path)
@@ -1616,12 +1593,27 @@ class PortfolioDepartment:
         self.logger.info(f"  Found {len(risk_messages)} RiskAssessment messages")
 
         for risk_msg in risk_messages:
-            self._process_single_risk_assessment(risk_msg)
+            metadata, _, msg_file = risk_msg
+            if msg_file is not None:
+                self._process_single_risk_assessment(risk_msg)
+                continue
 
-    def _read_risk_assessments(self) -> List[Tuple[Dict, Dict, Path]]:
-        """Read unprocessed RiskAssessment messages from inbox"""
+            # Bus message: ack once processed, hand back on failure
+            try:
+                self._process_single_risk_assessment(risk_msg)
+            except Exception as e:
+                self.message_handler.bus.nack(metadata['message_id'], str(e))
+                raise
+            self.message_handler.bus.ack(metadata['message_id'])
+
+    def _read_risk_assessments(self) -> List[Tuple[Dict, Dict, Optional[Path]]]:
+        """Read unprocessed RiskAssessment messages from the bus and inbox (path is None for bus messages)"""
         inbox_path = self.message_handler.inbox_path
-        messages = []
+        messages = [
+            (message.metadata, message.payload or {}, None)
+            for message in self.message_handler.bus.claim(
+                'PORTFOLIO', message_types=['RiskAssessment'], consumer='PORTFOLIO')
+        ]
 
         if not inbox_path.exists():
             self.logger.warning(f"Inbox path does not exist: {inbox_path}")
@@ -1640,7 +1632,7 @@ class PortfolioDepartment:
 
         return messages
 
-    def _process_single_risk_assessment(self, risk_msg: Tuple[Dict, Dict, Path]):
+    def _process_single_risk_assessment(self, risk_msg: Tuple[Dict, Dict, Optional[Path]]):
         """Process one RiskAssessment message"""
         metadata, data, msg_file = risk_msg
 
@@ -1793,7 +1785,7 @@ class PortfolioDepartment:
 
     def _log_portfolio_rejections(self, rejected: List[Dict], decision_msg_id: str):
         """Log rejected candidates to portfolio_rejections table"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -1833,7 +1825,7 @@ class PortfolioDepartment:
     def _log_portfolio_decision(self, metadata: Dict, accepted: List, rejected: List,
                                positions_before: int, capital_before: float):
         """Log Portfolio decision to portfolio_decisions table"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -1899,7 +1891,7 @@ class PortfolioDepartment:
                 - rejection_reason: str
                 - rejection_details: str
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
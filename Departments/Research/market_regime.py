@@ -5,6 +5,7 @@ Provides advisory regime classification (BULLISH/NEUTRAL/BEARISH) based on:
 - VIX (Volatility Index) level
 """
 
+import sys
 import yfinance as yf
 import logging
 from datetime import datetime, timedelta
@@ -12,6 +13,11 @@ from pathlib import Path
 import sqlite3
 import uuid
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Utils.db_connection import get_connection
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,7 +31,7 @@ class MarketRegimeAnalyzer:
 
     def _ensure_table_exists(self):
         """Create market_regime_assessments table if it doesn't exist"""
-        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -63,7 +69,7 @@ class MarketRegimeAnalyzer:
         Returns:
             dict with assessment data or None if no valid assessment
         """
-        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
@@ -139,7 +145,7 @@ class MarketRegimeAnalyzer:
             # Store assessment
             assessment_id = f"REGIME_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
 
-            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -264,7 +270,7 @@ class MarketRegimeAnalyzer:
 
     def record_user_decision(self, assessment_id, decision):
         """Record user's decision to proceed or skip"""
-        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -279,7 +285,7 @@ class MarketRegimeAnalyzer:
 
     def record_outcome(self, assessment_id, trades_executed, portfolio_change_pct, spy_eod_change_pct):
         """Record outcome of trading day for accuracy tracking"""
-        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
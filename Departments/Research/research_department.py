@@ -29,17 +29,30 @@ Key Changes from v2.0:
 - Maintains same output format for compatibility
 """
 
+import sys
 import logging
 import sqlite3
 import yfinance as yf
+import numpy as np
 import pandas as pd
 import json
+import time
 import yaml
 import uuid
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 from pathlib import Path
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Utils.price_cache import PriceCache, FrameStore
+from Utils.fundamentals_store import FundamentalsStore
+from Utils.db_connection import get_connection
+from Utils.universe_pipeline import extract_ticker_frame
+from Departments.Research import swing_scoring
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,27 +68,56 @@ class ResearchDepartment:
     5. Output Daily Candidate Universe for downstream departments
     """
 
-    def __init__(self, db_path: str = "sentinel.db", alpaca_client=None):
+    # Stage 2 filter presets (strict → loose)
+    STAGE2_PRESETS = [
+        {'name': 'VERY_STRICT', 'rsi': (30, 45), 'volume_min': 2000000, 'price_min': 20},
+        {'name': 'STRICT', 'rsi': (25, 50), 'volume_min': 1000000, 'price_min': 10},
+        {'name': 'MODERATE', 'rsi': (20, 60), 'volume_min': 500000, 'price_min': 5},
+        {'name': 'RELAXED', 'rsi': (15, 70), 'volume_min': 250000, 'price_min': 2},
+        {'name': 'VERY_RELAXED', 'rsi': (10, 80), 'volume_min': 100000, 'price_min': 1},
+    ]
+
+    def __init__(self, db_path: str = "sentinel.db", alpaca_client=None,
+                 prefetch_chunk_size: int = 100, frame_store_max_mb: float = 256,
+                 fundamentals_ttl_days: float = 7, info_fetcher=None):
         """
         Initialize Research Department
 
         Args:
             db_path: Path to SQLite database (for caching)
             alpaca_client: Alpaca API client (for current holdings)
+            prefetch_chunk_size: Tickers per multi-symbol yfinance download
+                                 when prefetching cache misses
+            frame_store_max_mb: Memory cap for the per-run in-process frame
+                                store (LRU eviction above this)
+            fundamentals_ttl_days: Days before cached yfinance fundamentals
+                                   are refreshed (stale rows are still served)
+            info_fetcher: InfoFetcher for fundamentals cache misses (defaults
+                          to the shared, rate-limited fetcher)
         """
         self.db_path = db_path
         self.alpaca = alpaca_client
         self.cache_ttl_hours = 16
         self.universe_file = "ticker_universe.txt"
+        self.prefetch_chunk_size = max(1, int(prefetch_chunk_size))
+        self.price_cache = PriceCache(db_path, ttl_hours=self.cache_ttl_hours)
+        self.frame_store_max_mb = frame_store_max_mb
+        self._frame_store = None  # Only set while a run is in progress
+        self.vectorized_swing_scoring = True  # False = per-ticker Stage 1 scoring
+        self.fundamentals = FundamentalsStore(db_path, ttl_days=fundamentals_ttl_days,
+                                              info_fetcher=info_fetcher)
+        self._fundamentals = {}  # ticker -> fundamentals fields for the current run
+        self._ticker_sink = None  # Set while a run streams tickers downstream
 
         self._initialize_cache()
         logger.info("Research Department v3.0 initialized (two-stage filtering)")
 
     def _initialize_cache(self):
-        """Create cache table for price/volume data"""
-        conn = sqlite3.connect(self.db_path)
+        """Create cache tables for price/volume data (migrates legacy JSON rows)"""
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
+        # Legacy JSON cache - kept so old rows can be migrated
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS market_data_cache (
                 ticker TEXT,
@@ -89,12 +131,48 @@ class ResearchDepartment:
 
         conn.commit()
         conn.close()
-        logger.info("Market data cache ready (16-hour TTL)")
 
-    def generate_daily_candidate_universe(self) -> Dict:
+        self.price_cache.initialize()
+        logger.info("Market data cache ready (16-hour TTL, binary columnar)")
+
+    @contextmanager
+    def _frame_store_scope(self):
+        """
+        Share one in-memory frame store across every stage of a run
+
+        Nested scopes reuse the outer store; the store is dropped when the
+        outermost scope exits.
+        """
+        if self._frame_store is not None:
+            yield self._frame_store
+            return
+
+        self._frame_store = FrameStore(max_megabytes=self.frame_store_max_mb)
+        try:
+            yield self._frame_store
+        finally:
+            self._frame_store = None
+
+    def _emit_tickers(self, tickers: List[str]):
+        """Hand tickers to the downstream consumer (if any) as soon as they are known"""
+        if self._ticker_sink is None or not tickers:
+            return
+        try:
+            self._ticker_sink(list(tickers))
+        except Exception as e:
+            # Downstream prefetch is an optimization - never fail Research over it
+            logger.warning(f"Ticker sink failed, disabling streaming for this run: {e}")
+            self._ticker_sink = None
+
+    def generate_daily_candidate_universe(self, ticker_sink: Optional[Callable[[List[str]], None]] = None) -> Dict:
         """
         Generate Daily Candidate Universe
 
+        Args:
+            ticker_sink: Optional callable fed lists of tickers as they become
+                         final (holdings first, then each scored candidate), so
+                         downstream stages can start before Research finishes
+
         Returns:
             {
                 'current_holdings': [...],  # From Alpaca
@@ -107,25 +185,46 @@ class ResearchDepartment:
         logger.info("GENERATING DAILY CANDIDATE UNIVERSE")
         logger.info("=" * 80)
 
-        # Step 1: Load universe
-        universe_tickers = self._load_universe()
-        logger.info(f"Universe loaded: {len(universe_tickers)} tickers")
+        self._ticker_sink = ticker_sink
+        try:
+            return self._build_candidate_universe()
+        finally:
+            self._ticker_sink = None
+
+    def _build_candidate_universe(self) -> Dict:
+        """Body of generate_daily_candidate_universe (runs with the sink installed)"""
+        with self._frame_store_scope() as frame_store:
+            # Step 1: Load universe
+            universe_tickers = self._load_universe()
+            logger.info(f"Universe loaded: {len(universe_tickers)} tickers")
+
+            # Step 2: Get current holdings from Alpaca
+            current_holdings = self._get_current_holdings()
+            logger.info(f"Current portfolio: {len(current_holdings)} positions")
+            self._emit_tickers([h['ticker'] for h in current_holdings])
+
+            # Step 3: TWO-STAGE FILTERING for ~80 buy candidates (target 15-20 positions)
+            buy_candidates = self._two_stage_filter(
+                universe_tickers,
+                target_count=80,
+                exclude=[h['ticker'] for h in current_holdings]
+            )
+            logger.info(f"Buy candidates found: {len(buy_candidates)} tickers (all swing-suitable)")
 
-        # Step 2: Get current holdings from Alpaca
-        current_holdings = self._get_current_holdings()
-        logger.info(f"Current portfolio: {len(current_holdings)} positions")
+            # Step 4: Score all stocks (programmatic only)
+            # Fundamentals come from the persistent store in one bulk read;
+            # only tickers never seen before hit the network
+            self.fundamentals.reset_stats()
+            self._fundamentals = {}
+            self._load_fundamentals([h['ticker'] for h in current_holdings] + list(buy_candidates))
+            scored_holdings = self._score_stocks(current_holdings, context='holdings')
+            scored_candidates = self._score_stocks(buy_candidates, context='new_buys')
 
-        # Step 3: TWO-STAGE FILTERING for ~80 buy candidates (target 15-20 positions)
-        buy_candidates = self._two_stage_filter(
-            universe_tickers,
-            target_count=80,
-            exclude=[h['ticker'] for h in current_holdings]
-        )
-        logger.info(f"Buy candidates found: {len(buy_candidates)} tickers (all swing-suitable)")
+            frame_store_stats = frame_store.stats()
 
-        # Step 4: Score all stocks (programmatic only)
-        scored_holdings = self._score_stocks(current_holdings, context='holdings')
-        scored_candidates = self._score_stocks(buy_candidates, context='new_buys')
+        # Stale fundamentals were served as-is; refresh them off the critical path
+        fundamentals_stats = self.fundamentals.stats()
+        self.fundamentals.refresh_stale_in_background()
 
         # Step 5: Get market conditions
         market_conditions = self._get_market_conditions()
@@ -142,13 +241,20 @@ class ResearchDepartment:
                 'holdings_count': len(current_holdings),
                 'total_output': len(scored_holdings) + len(scored_candidates),
                 'version': '3.0',
-                'architecture': 'two-stage filtering'
+                'architecture': 'two-stage filtering',
+                'frame_store': frame_store_stats,
+                'fundamentals_cache': fundamentals_stats
             }
         }
 
         logger.info(f"Daily Candidate Universe complete: {universe['total_count']} stocks")
         logger.info(f"  - Holdings: {len(scored_holdings)}")
         logger.info(f"  - Candidates: {len(scored_candidates)}")
+        logger.info(f"  - Frame store: {frame_store_stats['hits']} hits, {frame_store_stats['misses']} misses, "
+                    f"{frame_store_stats['evictions']} evictions")
+        logger.info(f"  - Fundamentals cache: {fundamentals_stats['hit_rate']:.0%} hit rate, "
+                    f"{fundamentals_stats['misses']} fetched, {fundamentals_stats['stale_hits']} stale "
+                    f"(avg age {fundamentals_stats['avg_age_hours']:.1f}h)")
 
         return universe
 
@@ -266,10 +372,19 @@ class ResearchDepartment:
         Returns:
             List of ~target_count swing-suitable tickers with good technicals
         """
-        import numpy as np
-
         exclude = exclude or []
 
+        with self._frame_store_scope():
+            return self._run_two_stage_filter(universe, target_count, exclude)
+
+    def _run_two_stage_filter(self, universe: List[str], target_count: int,
+                              exclude: List[str]) -> List[str]:
+        """Body of _two_stage_filter (runs inside a frame store scope)"""
+        # ====================================================================
+        # PREFETCH: Load cache hits + bulk-download cache misses up front
+        # ====================================================================
+        self._prefetch_price_data([t for t in universe if t not in exclude])
+
         # ====================================================================
         # STAGE 1: SWING SUITABILITY SCORING (Strategic Filter)
         # ====================================================================
@@ -280,6 +395,7 @@ class ResearchDepartment:
         no_data_count = 0
         insufficient_data_count = 0
 
+        scorable = {}
         for ticker in universe:
             if ticker in exclude:
                 continue
@@ -295,80 +411,27 @@ class ResearchDepartment:
                 logger.debug(f"{ticker}: Insufficient data ({len(data)} days)")
                 continue
 
-            # Calculate swing suitability metrics
-            try:
-                returns = data['Close'].pct_change().dropna()
-                volatility = float(returns.std() * np.sqrt(252) * 100)  # Annualized %
-                avg_volume = float(data['Volume'].mean())
-                current_price = float(data['Close'].iloc[-1])
-
-                # ATR for stop distance assessment
-                high_low = data['High'] - data['Low']
-                high_close = abs(data['High'] - data['Close'].shift(1))
-                low_close = abs(data['Low'] - data['Close'].shift(1))
-                atr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1).rolling(14).mean()
-                atr_value = float(atr.iloc[-1]) if not pd.isna(atr.iloc[-1]) else 0
-                atr_pct = (atr_value / current_price) * 100 if current_price > 0 else 0
-
-                # Score swing suitability (0-100)
-                # Volatility score (want 20-40%)
-                if 25 <= volatility <= 35:
-                    vol_score = 25
-                elif 20 <= volatility < 25 or 35 < volatility <= 40:
-                    vol_score = 20
-                elif 15 <= volatility < 20 or 40 < volatility <= 50:
-                    vol_score = 10
-                else:
-                    vol_score = 5
-
-                # Liquidity score (want 500K+)
-                if avg_volume >= 2000000:
-                    liq_score = 25
-                elif avg_volume >= 1000000:
-                    liq_score = 20
-                elif avg_volume >= 500000:
-                    liq_score = 15
-                elif avg_volume >= 250000:
-                    liq_score = 10
-                else:
-                    liq_score = 5
-
-                # Price score (want $5-$500 range)
-                if 10 <= current_price <= 200:
-                    price_score = 25
-                elif 5 <= current_price < 10 or 200 < current_price <= 500:
-                    price_score = 15
-                elif 2 <= current_price < 5:
-                    price_score = 10
-                else:
-                    price_score = 5
-
-                # ATR score (want 5-10% stops)
-                if 6 <= atr_pct <= 9:
-                    atr_score = 25
-                elif 5 <= atr_pct < 6 or 9 < atr_pct <= 10:
-                    atr_score = 20
-                elif 4 <= atr_pct < 5 or 10 < atr_pct <= 12:
-                    atr_score = 10
-                else:
-                    atr_score = 5
+            scorable[ticker] = data
 
-                swing_score = vol_score + liq_score + price_score + atr_score
+        # Calculate swing suitability metrics for every ticker at once
+        # (volatility, avg volume, price, ATR% -> 0-100 swing score)
+        start = time.perf_counter()
+        results = swing_scoring.score_many(scorable, vectorized=self.vectorized_swing_scoring)
+        logger.info(f"  Scored {len(scorable)} tickers in {time.perf_counter() - start:.3f}s "
+                    f"({'vectorized panel' if self.vectorized_swing_scoring else 'per-ticker'})")
 
-                swing_scores.append({
-                    'ticker': ticker,
-                    'swing_score': swing_score,
-                    'volatility': volatility,
-                    'avg_volume': avg_volume,
-                    'price': current_price,
-                    'atr_pct': atr_pct
-                })
+        for ticker in universe:
+            if ticker not in scorable:
+                continue
 
-            except Exception as e:
+            result = results[ticker]
+            if isinstance(result, Exception):
                 failed_count += 1
-                logger.warning(f"{ticker}: Scoring failed - {str(e)}")
+                logger.warning(f"{ticker}: Scoring failed - {str(result)}")
                 continue
 
+            swing_scores.append({'ticker': ticker, **result})
+
         # Log statistics
         total_processed = len(universe) - len(exclude)
         successful = len(swing_scores)
@@ -398,27 +461,28 @@ class ResearchDepartment:
         logger.info("STAGE 2: Applying technical filters to qualified tickers...")
 
         qualified_tickers = [item['ticker'] for item in swing_qualified]
+        return self._apply_stage2_filters(qualified_tickers, target_count)
 
-        # Filter presets (strict → loose)
-        presets = [
-            {'name': 'VERY_STRICT', 'rsi': (30, 45), 'volume_min': 2000000, 'price_min': 20},
-            {'name': 'STRICT', 'rsi': (25, 50), 'volume_min': 1000000, 'price_min': 10},
-            {'name': 'MODERATE', 'rsi': (20, 60), 'volume_min': 500000, 'price_min': 5},
-            {'name': 'RELAXED', 'rsi': (15, 70), 'volume_min': 250000, 'price_min': 2},
-            {'name': 'VERY_RELAXED', 'rsi': (10, 80), 'volume_min': 100000, 'price_min': 1},
-        ]
+    def _apply_stage2_filters(self, qualified_tickers: List[str], target_count: int) -> List[str]:
+        """
+        Stage 2: pick the strictest preset that yields ~target_count candidates
 
-        candidates = []
-        for preset in presets:
-            candidates = []
-            for ticker in qualified_tickers:
-                data = self._get_cached_price_data(ticker)
-                if data is None or len(data) < 20:
-                    continue
+        Args:
+            qualified_tickers: Swing-qualified tickers from Stage 1 (ranked)
+            target_count: Target number of candidates
+
+        Returns:
+            Candidate tickers in qualified order
+        """
+        # RSI / avg volume / price don't depend on the preset - compute once
+        features = self._build_stage2_features(qualified_tickers)
 
-                # Apply technical filters (RSI, volume, price)
-                if self._passes_filters(data, preset):
-                    candidates.append(ticker)
+        # Evaluate every preset as a mask; picking one is just counting
+        masks = [self._preset_mask(features, preset) for preset in self.STAGE2_PRESETS]
+
+        candidates = []
+        for preset, mask in zip(self.STAGE2_PRESETS, masks):
+            candidates = [ticker for ticker, passed in zip(features['ticker'], mask) if passed]
 
             logger.info(f"  {preset['name']:15s}: {len(candidates)} candidates")
 
@@ -436,6 +500,63 @@ class ResearchDepartment:
 
         return candidates[:target_count]
 
+    def _build_stage2_features(self, tickers: List[str]) -> pd.DataFrame:
+        """
+        Compute preset-independent Stage 2 features once per ticker
+
+        Args:
+            tickers: Swing-qualified tickers (order is preserved)
+
+        Returns:
+            DataFrame with ticker, price, avg_volume, rsi and eligible columns.
+            eligible is False for tickers with no/short data or features that
+            could not be computed (those fail every preset, as before).
+        """
+        rows = []
+        for ticker in tickers:
+            row = {'ticker': ticker, 'price': np.nan, 'avg_volume': np.nan, 'rsi': np.nan, 'eligible': False}
+
+            data = self._get_cached_price_data(ticker)
+            if data is not None and len(data) >= 20:
+                try:
+                    price = data['Close'].iloc[-1]
+                    avg_volume = data['Volume'].mean()
+                    if isinstance(price, pd.Series) or isinstance(avg_volume, pd.Series):
+                        raise ValueError("ambiguous multi-column price data")
+                    row.update({
+                        'price': float(price),
+                        'avg_volume': float(avg_volume),
+                        'rsi': self._calculate_rsi(data),
+                        'eligible': True
+                    })
+                except Exception as e:
+                    logger.debug(f"{ticker}: Filter features failed: {e}")
+
+            rows.append(row)
+
+        return pd.DataFrame(rows, columns=['ticker', 'price', 'avg_volume', 'rsi', 'eligible'])
+
+    @staticmethod
+    def _preset_mask(features: pd.DataFrame, preset: Dict) -> np.ndarray:
+        """
+        Vectorized equivalent of _passes_filters for a whole feature table
+
+        Comparisons mirror _passes_filters exactly, including NaN handling
+        (a NaN price/volume is not "below" the minimum; a NaN RSI is never
+        inside the band).
+        """
+        price = features['price'].to_numpy(dtype=np.float64)
+        avg_volume = features['avg_volume'].to_numpy(dtype=np.float64)
+        rsi = features['rsi'].to_numpy(dtype=np.float64)
+        rsi_min, rsi_max = preset['rsi']
+
+        return (
+            features['eligible'].to_numpy(dtype=bool)
+            & ~(price < preset['price_min'])
+            & ~(avg_volume < preset['volume_min'])
+            & (rsi_min <= rsi) & (rsi <= rsi_max)
+        )
+
     def _passes_filters(self, data: pd.DataFrame, preset: Dict) -> bool:
         """
         Apply technical filters to stock data
@@ -469,6 +590,117 @@ class ResearchDepartment:
             logger.debug(f"Filter check failed: {e}")
             return False
 
+    def _prefetch_price_data(self, tickers: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Load price data for a whole ticker list before scoring starts
+
+        1. One bulk cache read for all tickers
+        2. Chunked multi-symbol yfinance downloads for cache misses only
+        3. One transaction writing all newly fetched frames to the cache
+
+        When a run is in progress, every frame (and every ticker with no
+        data) is also placed in the run's frame store for later stages.
+
+        Args:
+            tickers: Tickers to load
+
+        Returns:
+            Dict of ticker -> OHLCV DataFrame (tickers with no data are omitted)
+        """
+        tickers = list(dict.fromkeys(tickers))  # De-duplicate, keep order
+        start = time.perf_counter()
+
+        frames = self._load_cached_price_data_bulk(tickers)
+        cache_read_secs = time.perf_counter() - start
+
+        misses = [t for t in tickers if t not in frames]
+        fetched = {}
+        failed = []
+        chunk_count = 0
+
+        download_start = time.perf_counter()
+        for i in range(0, len(misses), self.prefetch_chunk_size):
+            chunk = misses[i:i + self.prefetch_chunk_size]
+            chunk_count += 1
+            chunk_frames, chunk_failed = self._download_price_chunk(chunk)
+            fetched.update(chunk_frames)
+            failed.extend(chunk_failed)
+        download_secs = time.perf_counter() - download_start
+
+        write_start = time.perf_counter()
+        if fetched:
+            try:
+                self._cache_price_data_bulk(fetched)
+            except Exception as cache_error:
+                logger.warning(f"Failed to cache prefetched price data - {cache_error}")
+                # Still use the fetched data even if caching fails
+        cache_write_secs = time.perf_counter() - write_start
+
+        frames.update(fetched)
+        total_secs = time.perf_counter() - start
+
+        if self._frame_store is not None:
+            for ticker in tickers:
+                self._frame_store.put(ticker, frames.get(ticker))
+
+        logger.info(f"  Prefetch: {len(tickers)} tickers - {len(tickers) - len(misses)} cached, "
+                    f"{len(fetched)} fetched in {chunk_count} chunk(s), {len(failed)} failed")
+        logger.info(f"    Timing: cache read {cache_read_secs:.2f}s, download {download_secs:.2f}s, "
+                    f"cache write {cache_write_secs:.2f}s, total {total_secs:.2f}s")
+        if failed:
+            logger.debug(f"    No data for: {', '.join(failed)}")
+
+        return frames
+
+    def _download_price_chunk(self, tickers: List[str]) -> Tuple[Dict[str, pd.DataFrame], List[str]]:
+        """
+        Download 60 days of OHLCV for several tickers in one yfinance request
+
+        If the multi-symbol request itself fails, each ticker is retried on
+        its own so one bad symbol cannot sink the whole chunk.
+
+        Returns:
+            (frames, failed) - per-ticker DataFrames and tickers with no data
+        """
+        try:
+            data = yf.download(tickers, period='60d', group_by='ticker',
+                               progress=False, threads=True)
+        except Exception as e:
+            logger.warning(f"Chunk download failed for {len(tickers)} tickers ({e}) - retrying individually")
+            frames = {}
+            failed = []
+            for ticker in tickers:
+                try:
+                    single = yf.download(ticker, period='60d', progress=False)
+                    frame = extract_ticker_frame(single, ticker)
+                except Exception as single_error:
+                    logger.debug(f"{ticker}: Failed to fetch from yfinance - {single_error}")
+                    frame = None
+                if frame is None:
+                    failed.append(ticker)
+                else:
+                    frames[ticker] = frame
+            return frames, failed
+
+        frames = {}
+        failed = []
+        for ticker in tickers:
+            frame = extract_ticker_frame(data, ticker)
+            if frame is None:
+                failed.append(ticker)
+            else:
+                frames[ticker] = frame
+        return frames, failed
+
+    def _load_cached_price_data_bulk(self, tickers: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Read unexpired cached price data for many tickers
+
+        Returns:
+            Dict of ticker -> DataFrame for cache hits only
+        """
+        return self.price_cache.get_many(tickers)
+
     def _get_cached_price_data(self, ticker: str) -> Optional[pd.DataFrame]:
         """
         Get price/volume data from cache or fetch if stale
@@ -479,25 +711,24 @@ class ResearchDepartment:
         Returns:
             DataFrame with OHLCV data or None if failed
         """
-        # Check cache
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # Check this run's in-memory frame store first
+        if self._frame_store is not None:
+            found, df = self._frame_store.lookup(ticker)
+            if found:
+                return df
 
-        now = datetime.now()
-        cursor.execute("""
-            SELECT data_json, fetched_at
-            FROM market_data_cache
-            WHERE ticker = ? AND data_type = 'price_data' AND expires_at > ?
-        """, (ticker, now.isoformat()))
+        data = self._load_price_data(ticker)
 
-        row = cursor.fetchone()
-        conn.close()
+        if self._frame_store is not None:
+            self._frame_store.put(ticker, data)
+
+        return data
 
-        if row:
-            # Cache hit
-            import json
-            data_dict = json.loads(row[0])
-            df = pd.DataFrame(data_dict)
+    def _load_price_data(self, ticker: str) -> Optional[pd.DataFrame]:
+        """Load price data from the SQLite cache, or fetch it from yfinance"""
+        # Check cache
+        df = self.price_cache.get(ticker)
+        if df is not None:
             logger.debug(f"{ticker}: Cache hit")
             return df
 
@@ -528,38 +759,11 @@ class ResearchDepartment:
 
     def _cache_price_data(self, ticker: str, data: pd.DataFrame):
         """Cache price data with 16-hour TTL"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        now = datetime.now()
-        expires_at = now + timedelta(hours=self.cache_ttl_hours)
-
-        # Convert DataFrame to JSON (handle datetime index and MultiIndex columns)
-        import json
-        df_copy = data.copy()
-
-        # Flatten MultiIndex columns if present (yfinance returns MultiIndex)
-        if isinstance(df_copy.columns, pd.MultiIndex):
-            df_copy.columns = [col[0] if isinstance(col, tuple) else col for col in df_copy.columns]
-
-        # Reset index to include dates as a column
-        df_copy = df_copy.reset_index()
-
-        # Convert any datetime columns to strings for JSON serialization
-        for col in df_copy.columns:
-            if pd.api.types.is_datetime64_any_dtype(df_copy[col]):
-                df_copy[col] = df_copy[col].astype(str)
-
-        data_json = json.dumps(df_copy.to_dict(orient='records'))
+        self._cache_price_data_bulk({ticker: data})
 
-        cursor.execute("""
-            INSERT OR REPLACE INTO market_data_cache
-            (ticker, data_type, data_json, fetched_at, expires_at)
-            VALUES (?, ?, ?, ?, ?)
-        """, (ticker, 'price_data', data_json, now.isoformat(), expires_at.isoformat()))
-
-        conn.commit()
-        conn.close()
+    def _cache_price_data_bulk(self, frames: Dict[str, pd.DataFrame]):
+        """Cache price data for many tickers in a single transaction (16-hour TTL)"""
+        self.price_cache.put_many(frames)
 
     def _score_stocks(self, tickers: List, context: str) -> List[Dict]:
         """
@@ -617,6 +821,8 @@ class ResearchDepartment:
                         result[key] = item[key]
 
             scored.append(result)
+            if context != 'holdings':  # Holdings were emitted as soon as they were known
+                self._emit_tickers([ticker])
 
         return scored
 
@@ -690,10 +896,27 @@ class ResearchDepartment:
         except:
             return 'NEUTRAL'
 
+    def _load_fundamentals(self, tickers: List[str]) -> Dict[str, Dict]:
+        """
+        Bulk-load fundamentals for tickers not already loaded this run
+
+        Returns:
+            The run's ticker -> fundamentals fields map (None = unavailable)
+        """
+        missing = [t for t in tickers if t not in self._fundamentals]
+        if missing:
+            loaded = self.fundamentals.load(missing)
+            # Failed fetches are remembered as None so scoring doesn't retry them
+            self._fundamentals.update({t: loaded.get(t) for t in missing})
+        return self._fundamentals
+
     def _calculate_fundamental_score(self, ticker: str) -> tuple[float, str]:
         """
         Calculate fundamental score (0-100) using yfinance fundamental data
 
+        Fields come from the persistent fundamentals store (multi-day TTL);
+        yfinance is only called for tickers the store has never seen.
+
         Analyzes:
         - Profitability (ROE, Profit Margins)
         - Valuation (P/E, P/B ratios)
@@ -704,11 +927,12 @@ class ResearchDepartment:
             (score, sector) tuple
         """
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = self._load_fundamentals([ticker]).get(ticker)
+            if info is None:
+                raise ValueError("no fundamentals available")
 
             score = 0.0
-            sector = info.get('sector', 'Unknown')
+            sector = info.get('sector') or 'Unknown'
 
             # Component 1: Profitability (0-25 points)
             roe = info.get('returnOnEquity')
@@ -842,7 +1066,7 @@ class ResearchDepartment:
                 'date': datetime.now().date().isoformat()
             }
 
-    def generate_daily_briefing(self) -> str:
+    def generate_daily_briefing(self, ticker_sink: Optional[Callable[[List[str]], None]] = None) -> str:
         """
         Generate DailyBriefing message for Operations Manager
 
@@ -852,6 +1076,9 @@ class ResearchDepartment:
         - Markdown summary
         - JSON payload with candidates
 
+        Args:
+            ticker_sink: Passed through to generate_daily_candidate_universe()
+
         Returns:
             message_id of generated briefing
         """
@@ -860,11 +1087,12 @@ class ResearchDepartment:
         logger.info("=" * 80)
 
         # Step 1: Get candidate universe using two-stage filtering
-        universe_data = self.generate_daily_candidate_universe()
+        universe_data = self.generate_daily_candidate_universe(ticker_sink=ticker_sink)
 
         candidates = universe_data['buy_candidates']
         holdings = universe_data.get('current_holdings', [])
         market_conditions = universe_data.get('market_conditions', {})
+        fundamentals_stats = universe_data.get('summary', {}).get('fundamentals_cache', {})
 
         logger.info(f"Candidates: {len(candidates)}, Holdings: {len(holdings)}")
 
@@ -921,6 +1149,12 @@ class ResearchDepartment:
             f"- **Current Holdings**: {len(holdings)} positions from Alpaca",
             f"- **Total Scored**: {len(candidates) + len(holdings)} stocks",
             "",
+            "### Data Freshness",
+            f"- **Fundamentals Cache**: {fundamentals_stats.get('hit_rate', 0.0):.0%} hit rate "
+            f"({fundamentals_stats.get('misses', 0)} fetched, {fundamentals_stats.get('stale_hits', 0)} stale)",
+            f"- **Fundamentals Age**: avg {fundamentals_stats.get('avg_age_hours', 0.0):.1f}h, "
+            f"max {fundamentals_stats.get('max_age_hours', 0.0):.1f}h (TTL {fundamentals_stats.get('ttl_days', 0)} days)",
+            "",
             "### Filtering Process",
             "1. Stage 1: Swing suitability scoring (volatility, liquidity, ATR)",
             "2. Stage 2: Technical analysis (RSI, MACD, trend)",
@@ -950,7 +1184,8 @@ class ResearchDepartment:
                 'candidates_found': len(candidates),
                 'holdings_count': len(holdings),
                 'filtering_method': 'two_stage_swing_suitability',
-                'version': '3.0'
+                'version': '3.0',
+                'fundamentals_cache': fundamentals_stats
             }
         }
 
@@ -0,0 +1,282 @@
+"""
+Swing Suitability Scoring - Vectorized Panel Engine
+
+Stage 1 of the Research two-stage filter scores every ticker in the
+universe for swing-trading suitability:
+- Volatility score (annualized std of daily returns, want 20-40%)
+- Liquidity score (mean daily volume, want 500K+)
+- Price score (last close, want $5-$500)
+- ATR score (14-day ATR as % of price, want 5-10%)
+
+Two implementations live here:
+1. score_swing_suitability(): the original per-ticker pandas path
+   (reference implementation, also used for irregular frames)
+2. score_swing_suitability_panel(): stacks tickers into 2D NumPy arrays
+   (tickers x days) and scores the whole universe in a few array ops
+
+The panel engine produces bit-identical metrics and scores:
+- Tickers are grouped by history length so each group is a dense,
+  C-contiguous block; row-wise sums then use the same pairwise summation
+  NumPy applies to a single ticker's Series.
+- Mean/std follow pandas' nanops formulas (sum / count, then squared
+  deviations from that mean).
+- ATR(14) uses pandas' own rolling-mean kernel on the transposed panel.
+- Frames with NaNs or missing columns fall back to the scalar path.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+SWING_COLUMNS = ('Close', 'High', 'Low', 'Volume')
+ATR_PERIOD = 14
+
+# Liquidity ladder (monotonic): < 250K, 250K+, 500K+, 1M+, 2M+
+LIQUIDITY_BINS = np.array([250000, 500000, 1000000, 2000000], dtype=np.float64)
+LIQUIDITY_SCORES = np.array([5, 10, 15, 20, 25])
+
+
+def bucket_scores(volatility: np.ndarray, avg_volume: np.ndarray,
+                  price: np.ndarray, atr_pct: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Map swing metrics to 0-25 bucket scores (same ladders as the scalar path)
+
+    Returns:
+        Dict of vol_score / liq_score / price_score / atr_score / swing_score arrays
+    """
+    vol_score = np.select(
+        [(25 <= volatility) & (volatility <= 35),
+         ((20 <= volatility) & (volatility < 25)) | ((35 < volatility) & (volatility <= 40)),
+         ((15 <= volatility) & (volatility < 20)) | ((40 < volatility) & (volatility <= 50))],
+        [25, 20, 10], default=5)
+
+    liq_score = np.where(np.isnan(avg_volume), 5,
+                         LIQUIDITY_SCORES[np.digitize(avg_volume, LIQUIDITY_BINS)])
+
+    price_score = np.select(
+        [(10 <= price) & (price <= 200),
+         ((5 <= price) & (price < 10)) | ((200 < price) & (price <= 500)),
+         (2 <= price) & (price < 5)],
+        [25, 15, 10], default=5)
+
+    atr_score = np.select(
+        [(6 <= atr_pct) & (atr_pct <= 9),
+         ((5 <= atr_pct) & (atr_pct < 6)) | ((9 < atr_pct) & (atr_pct <= 10)),
+         ((4 <= atr_pct) & (atr_pct < 5)) | ((10 < atr_pct) & (atr_pct <= 12))],
+        [25, 20, 10], default=5)
+
+    return {
+        'vol_score': vol_score,
+        'liq_score': liq_score,
+        'price_score': price_score,
+        'atr_score': atr_score,
+        'swing_score': vol_score + liq_score + price_score + atr_score,
+    }
+
+
+def score_swing_suitability(data: pd.DataFrame) -> Dict:
+    """
+    Score one ticker for swing suitability (per-ticker reference path)
+
+    Args:
+        data: OHLCV DataFrame (at least 20 rows)
+
+    Returns:
+        {'swing_score', 'volatility', 'avg_volume', 'price', 'atr_pct'}
+
+    Raises:
+        Any pandas/KeyError from malformed data (caller counts it as failed)
+    """
+    returns = data['Close'].pct_change().dropna()
+    volatility = float(returns.std() * np.sqrt(252) * 100)  # Annualized %
+    avg_volume = float(data['Volume'].mean())
+    current_price = float(data['Close'].iloc[-1])
+
+    # ATR for stop distance assessment
+    high_low = data['High'] - data['Low']
+    high_close = abs(data['High'] - data['Close'].shift(1))
+    low_close = abs(data['Low'] - data['Close'].shift(1))
+    atr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1).rolling(ATR_PERIOD).mean()
+    atr_value = float(atr.iloc[-1]) if not pd.isna(atr.iloc[-1]) else 0
+    atr_pct = (atr_value / current_price) * 100 if current_price > 0 else 0
+
+    # Score swing suitability (0-100)
+    # Volatility score (want 20-40%)
+    if 25 <= volatility <= 35:
+        vol_score = 25
+    elif 20 <= volatility < 25 or 35 < volatility <= 40:
+        vol_score = 20
+    elif 15 <= volatility < 20 or 40 < volatility <= 50:
+        vol_score = 10
+    else:
+        vol_score = 5
+
+    # Liquidity score (want 500K+)
+    if avg_volume >= 2000000:
+        liq_score = 25
+    elif avg_volume >= 1000000:
+        liq_score = 20
+    elif avg_volume >= 500000:
+        liq_score = 15
+    elif avg_volume >= 250000:
+        liq_score = 10
+    else:
+        liq_score = 5
+
+    # Price score (want $5-$500 range)
+    if 10 <= current_price <= 200:
+        price_score = 25
+    elif 5 <= current_price < 10 or 200 < current_price <= 500:
+        price_score = 15
+    elif 2 <= current_price < 5:
+        price_score = 10
+    else:
+        price_score = 5
+
+    # ATR score (want 5-10% stops)
+    if 6 <= atr_pct <= 9:
+        atr_score = 25
+    elif 5 <= atr_pct < 6 or 9 < atr_pct <= 10:
+        atr_score = 20
+    elif 4 <= atr_pct < 5 or 10 < atr_pct <= 12:
+        atr_score = 10
+    else:
+        atr_score = 5
+
+    return {
+        'swing_score': vol_score + liq_score + price_score + atr_score,
+        'volatility': volatility,
+        'avg_volume': avg_volume,
+        'price': current_price,
+        'atr_pct': atr_pct
+    }
+
+
+def _panel_values(data: pd.DataFrame):
+    """
+    Extract a (days, 4) float64 array of Close/High/Low/Volume
+
+    Returns:
+        The array, or None if the frame needs the scalar path
+        (missing or non-numeric columns, or any NaN)
+    """
+    columns = []
+    for col in SWING_COLUMNS:
+        series = data.get(col)
+        if not isinstance(series, pd.Series) or series.dtype.kind not in 'iuf':
+            return None
+        columns.append(series.to_numpy(dtype=np.float64))
+
+    values = np.column_stack(columns)
+    if np.isnan(values).any():
+        return None
+    return values
+
+
+def _score_dense_block(close: np.ndarray, high: np.ndarray, low: np.ndarray,
+                       volume: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Score a dense block of tickers that all share the same history length
+
+    Args:
+        close/high/low/volume: float64 arrays shaped (tickers, days)
+
+    Returns:
+        Dict of metric and score arrays, one entry per ticker row
+    """
+    n_days = close.shape[1]
+
+    # Volatility: std of daily returns (pandas nanvar: mean, then squared deviations)
+    returns = close[:, 1:] / close[:, :-1] - 1
+    n_returns = returns.shape[1]
+    mean_return = returns.sum(axis=1, dtype=np.float64) / n_returns
+    variance = ((mean_return[:, None] - returns) ** 2).sum(axis=1, dtype=np.float64) / (n_returns - 1)
+    volatility = np.sqrt(variance) * np.sqrt(252) * 100
+
+    avg_volume = volume.sum(axis=1, dtype=np.float64) / n_days
+    price = close[:, -1].copy()
+
+    # ATR(14): True Range = max(H-L, |H-prevC|, |L-prevC|); first day is H-L only
+    prev_close = np.empty_like(close)
+    prev_close[:, 0] = np.nan
+    prev_close[:, 1:] = close[:, :-1]
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+    atr = pd.DataFrame(true_range.T).rolling(ATR_PERIOD).mean().to_numpy()[-1]
+    atr_value = np.where(np.isnan(atr), 0.0, atr)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        atr_pct = np.where(price > 0, (atr_value / price) * 100, 0.0)
+
+    result = bucket_scores(volatility, avg_volume, price, atr_pct)
+    result.update({
+        'volatility': volatility,
+        'avg_volume': avg_volume,
+        'price': price,
+        'atr_pct': atr_pct,
+    })
+    return result
+
+
+def score_swing_suitability_panel(frames: Dict[str, pd.DataFrame]) -> Dict[str, Dict]:
+    """
+    Score many tickers at once over stacked (tickers x days) price panels
+
+    Args:
+        frames: Dict of ticker -> OHLCV DataFrame (at least 20 rows each)
+
+    Returns:
+        Dict of ticker -> score dict (same shape as score_swing_suitability).
+        Tickers whose data cannot be scored are mapped to the exception
+        raised by the scalar path instead.
+    """
+    results: Dict[str, object] = {}
+
+    # Group dense frames by history length; everything else goes scalar
+    groups: Dict[int, List[str]] = {}
+    values: Dict[str, np.ndarray] = {}
+    for ticker, data in frames.items():
+        panel_values = _panel_values(data)
+        if panel_values is not None:
+            values[ticker] = panel_values
+            groups.setdefault(len(data), []).append(ticker)
+        else:
+            try:
+                results[ticker] = score_swing_suitability(data)
+            except Exception as e:
+                results[ticker] = e
+
+    for n_days, tickers in groups.items():
+        # (tickers, days, field) -> one C-contiguous (tickers, days) array per field
+        panel = np.stack([values[t] for t in tickers])
+        stacked = {col: np.ascontiguousarray(panel[:, :, i]) for i, col in enumerate(SWING_COLUMNS)}
+        block = _score_dense_block(stacked['Close'], stacked['High'], stacked['Low'], stacked['Volume'])
+
+        for i, ticker in enumerate(tickers):
+            results[ticker] = {
+                'swing_score': int(block['swing_score'][i]),
+                'volatility': float(block['volatility'][i]),
+                'avg_volume': float(block['avg_volume'][i]),
+                'price': float(block['price'][i]),
+                'atr_pct': float(block['atr_pct'][i])
+            }
+
+    return results
+
+
+def score_many(frames: Dict[str, pd.DataFrame], vectorized: bool = True) -> Dict[str, object]:
+    """
+    Score tickers with the panel engine or the per-ticker path
+
+    Returns:
+        Dict of ticker -> score dict, or ticker -> Exception on failure
+    """
+    if vectorized:
+        return score_swing_suitability_panel(frames)
+
+    results = {}
+    for ticker, data in frames.items():
+        try:
+            results[ticker] = score_swing_suitability(data)
+        except Exception as e:
+            results[ticker] = e
+    return results
@@ -22,15 +22,53 @@ Key Changes from v1:
 - v2.1: Fixed scoring to align with swing trading (higher = better for SC)
 """
 
+import sys
 import logging
 import sqlite3
+import numpy as np
 import pandas as pd
-import yfinance as yf
+from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Utils.price_history import PriceHistoryService, get_shared_price_history
+
 logger = logging.getLogger(__name__)
 
+# Keys of each candidate's risk_metrics dict
+RISK_METRIC_COLUMNS = (
+    'entry_price', 'stop_loss', 'target_price', 'risk_per_share', 'reward_per_share',
+    'risk_reward_ratio', 'position_size_shares', 'position_size_value',
+    'total_risk_dollars', 'total_risk_pct', 'atr', 'volatility_pct'
+)
+
+
+def build_price_panel(frames: Dict[str, pd.DataFrame], tickers: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Stack per-ticker OHLC frames into wide High/Low/Close panels
+
+    Each column holds one ticker's own bars, right-aligned so the last row is
+    every ticker's latest bar (shorter histories are NaN-padded at the top).
+    Tickers without a frame get an all-NaN column.
+
+    Returns:
+        {'High': DataFrame, 'Low': DataFrame, 'Close': DataFrame} (rows x tickers)
+    """
+    tickers = list(dict.fromkeys(tickers))
+    length = max((len(frames[t]) for t in tickers if frames.get(t) is not None), default=0)
+    panel = {}
+    for field in ('High', 'Low', 'Close'):
+        values = np.full((length, len(tickers)), np.nan)
+        for col, ticker in enumerate(tickers):
+            frame = frames.get(ticker)
+            if frame is not None and len(frame):
+                values[length - len(frame):, col] = frame[field].to_numpy(dtype=float)
+        panel[field] = pd.DataFrame(values, columns=tickers)
+    return panel
+
 
 class RiskDepartment:
     """
@@ -51,18 +89,22 @@ class RiskDepartment:
     - See SENTINEL_RISK_PHILOSOPHY.md for details
     """
 
-    def __init__(self, max_risk_per_trade_pct: float = 1.0, max_portfolio_heat_pct: float = 5.0):
+    def __init__(self, max_risk_per_trade_pct: float = 1.0, max_portfolio_heat_pct: float = 5.0,
+                 price_history: Optional[PriceHistoryService] = None):
         """
         Initialize Risk Department
 
         Args:
             max_risk_per_trade_pct: Maximum risk per trade (% of capital)
             max_portfolio_heat_pct: Maximum total portfolio heat (% of capital)
+            price_history: Price history source (default: the process-wide shared service)
         """
         self.max_risk_per_trade_pct = max_risk_per_trade_pct
         self.max_portfolio_heat_pct = max_portfolio_heat_pct
+        self.price_history = price_history or get_shared_price_history()
         self.atr_period = 14
         self.atr_multiplier = 2.0
+        self.vectorized_assessment = True  # False = per-candidate scalar path
 
         logger.info(f"Risk Department v2.0 initialized (advisory role)")
         logger.info(f"  - Max risk per trade: {max_risk_per_trade_pct}%")
@@ -85,40 +127,227 @@ class RiskDepartment:
         logger.info(f"Assessing {len(candidates)} candidates...")
         logger.info(f"Available capital: ${available_capital:,.2f}")
 
+        # One bulk fetch up front; ATR, volatility and price all read these frames
+        tickers = [c['ticker'] for c in candidates]
+        frames = self.price_history.prefetch(tickers)
+        logger.info(f"Price history ready for {len(frames)}/{len(tickers)} candidates")
+
+        if self.vectorized_assessment:
+            # Score everything as column operations, then write results back onto the dicts
+            candidate_frame = pd.DataFrame({
+                'ticker': tickers,
+                'current_price': [c.get('current_price', 0) for c in candidates]
+            })
+            results = self.assess_candidates_batch(candidate_frame, build_price_panel(frames, tickers),
+                                                   available_capital)
+        else:
+            results = [self._assess_one(c, available_capital) for c in candidates]
+
         assessed = []
-        for candidate in candidates:
-            ticker = candidate['ticker']
-            logger.info(f"Processing {ticker}...")
+        for candidate, result in zip(candidates, results):
+            candidate['risk_score'] = result['risk_score']
+            candidate['risk_warnings'] = result['risk_warnings']
+            candidate['risk_metrics'] = result['risk_metrics']
+            assessed.append(candidate)
+
+        flagged = sum(1 for c in assessed if c['risk_warnings'])
+        logger.info(f"Risk assessment complete: {len(assessed)} candidates assessed "
+                    f"({flagged} with warnings)")
+        logger.info("All candidates passed through (advisory role - no rejections)")
+        logger.info("=" * 80)
+
+        return assessed
+
+    def _assess_one(self, candidate: Dict, available_capital: float) -> Dict:
+        """Per-candidate (scalar) assessment"""
+        ticker = candidate['ticker']
+
+        # Calculate risk metrics
+        risk_metrics = self._calculate_risk_metrics(ticker, candidate, available_capital)
+
+        # Calculate risk score (0-100, HIGHER = BETTER SWING TRADE)
+        risk_score = self._calculate_risk_score(risk_metrics)
 
-            # Calculate risk metrics
-            risk_metrics = self._calculate_risk_metrics(ticker, candidate, available_capital)
+        # Generate warnings
+        warnings = self._generate_warnings(ticker, risk_metrics, available_capital)
 
-            # Calculate risk score (0-100, HIGHER = BETTER SWING TRADE)
-            risk_score = self._calculate_risk_score(risk_metrics)
+        logger.debug(f"{ticker}: Risk score {risk_score:.1f}/100 - {len(warnings) or 'No'} warnings")
+        for warning in warnings:
+            logger.debug(f"  - {warning}")
 
-            # Generate warnings
-            warnings = self._generate_warnings(ticker, risk_metrics, available_capital)
+        return {'risk_score': risk_score, 'risk_warnings': warnings, 'risk_metrics': risk_metrics}
 
-            # Add to candidate
-            candidate['risk_score'] = risk_score
-            candidate['risk_warnings'] = warnings
-            candidate['risk_metrics'] = risk_metrics
+    def assess_candidates_batch(self, candidates: pd.DataFrame, panel: Dict[str, pd.DataFrame],
+                                available_capital: float) -> List[Dict]:
+        """
+        Vectorized risk assessment (same output as the per-candidate methods)
+
+        Args:
+            candidates: DataFrame with 'ticker' and 'current_price' columns
+                        (any other columns are carried through)
+            panel: Output of build_price_panel() for the same tickers
+            available_capital: Available capital for trading
 
-            # Log summary
-            if warnings:
-                logger.warning(f"{ticker}: Risk score {risk_score:.1f}/100 - {len(warnings)} warnings")
+        Returns:
+            Candidate records with risk_score, risk_warnings and risk_metrics added
+        """
+        frame = self._risk_frame(candidates, panel, available_capital)
+
+        results = []
+        for record, row in zip(candidates.to_dict('records'), frame.itertuples(index=False)):
+            metrics = {col: float(getattr(row, col)) for col in RISK_METRIC_COLUMNS}
+            metrics['position_size_shares'] = int(metrics['position_size_shares'])
+            warnings = self._format_warnings(row)
+
+            record['risk_score'] = float(row.risk_score)
+            record['risk_warnings'] = warnings
+            record['risk_metrics'] = metrics
+            results.append(record)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"{row.ticker}: Risk score {row.risk_score:.1f}/100 - "
+                             f"{len(warnings) or 'No'} warnings")
                 for warning in warnings:
-                    logger.warning(f"  - {warning}")
-            else:
-                logger.info(f"{ticker}: Risk score {risk_score:.1f}/100 - No warnings")
+                    logger.debug(f"  - {warning}")
 
-            assessed.append(candidate)
+        return results
 
-        logger.info(f"Risk assessment complete: {len(assessed)} candidates assessed")
-        logger.info("All candidates passed through (advisory role - no rejections)")
-        logger.info("=" * 80)
+    def _risk_frame(self, candidates: pd.DataFrame, panel: Dict[str, pd.DataFrame],
+                    available_capital: float) -> pd.DataFrame:
+        """
+        Metrics, score and warning flags for every candidate as columns
 
-        return assessed
+        Mirrors _calculate_risk_metrics / _calculate_risk_score / _generate_warnings
+        branch for branch, including their NaN behavior.
+        """
+        tickers = candidates['ticker'].tolist()
+        # Column of each candidate in the panel; tickers not in it read an all-NaN column
+        positions = panel['Close'].columns.get_indexer(tickers)
+
+        def gather(field):
+            values = panel[field].to_numpy(dtype=float)
+            padded = np.hstack([values, np.full((len(values), 1), np.nan)])
+            return padded[:, positions]
+
+        high, low, close = gather('High'), gather('Low'), gather('Close')
+        has_data = ~np.isnan(close).all(axis=0) if len(close) else np.zeros(len(tickers), dtype=bool)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # ATR: mean of the last atr_period true ranges (NaN if any is missing)
+            prev_close = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+            true_range = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+            if len(true_range) >= self.atr_period:
+                atr = true_range[-self.atr_period:].mean(axis=0)
+            else:
+                atr = np.full(len(tickers), np.nan)
+            atr = np.where(has_data, atr, 0.0)
+
+            # Annualized volatility of daily returns (sample std, missing returns dropped)
+            returns = close[1:] / close[:-1] - 1
+            n_returns = np.sum(~np.isnan(returns), axis=0)
+            mean_return = np.nansum(returns, axis=0) / np.maximum(n_returns, 1)
+            squared = np.nansum((returns - mean_return) ** 2, axis=0)
+            daily_vol = np.where(n_returns > 1, np.sqrt(squared / np.maximum(n_returns - 1, 1)), np.nan)
+            volatility_pct = np.where(has_data, daily_vol * (252 ** 0.5) * 100, 0.0)
+
+            # Entry price: candidate price, else latest close (0 if no data)
+            given_price = pd.to_numeric(candidates['current_price'], errors='coerce').fillna(0).to_numpy(dtype=float)
+            latest_close = close[-1] if len(close) else np.zeros(len(tickers))
+            entry_price = np.where(given_price == 0, np.where(has_data, latest_close, 0.0), given_price)
+
+            stop_loss = entry_price - atr * self.atr_multiplier
+            risk_per_share = entry_price - stop_loss
+            reward_per_share = risk_per_share * 2.0
+            target_price = entry_price + reward_per_share
+
+            position_size_value = np.full(len(tickers), available_capital * 0.10)
+            position_size_shares = np.where(entry_price > 0, np.floor(position_size_value / entry_price), 0)
+            total_risk_dollars = position_size_shares * risk_per_share
+            total_risk_pct = (total_risk_dollars / available_capital * 100 if available_capital > 0
+                              else np.zeros(len(tickers)))
+            risk_reward_ratio = np.where(risk_per_share > 0, reward_per_share / risk_per_share, 0.0)
+            stop_distance_pct = np.where(entry_price > 0, (entry_price - stop_loss) / entry_price * 100, np.nan)
+
+        vol, rr, risk_pct = volatility_pct, risk_reward_ratio, total_risk_pct
+        stop_for_score = np.where(entry_price > 0, stop_distance_pct, 0.0)
+        risk_score = (
+            np.select([(25 <= vol) & (vol <= 35),
+                       ((20 <= vol) & (vol < 25)) | ((35 < vol) & (vol <= 40)),
+                       ((15 <= vol) & (vol < 20)) | ((40 < vol) & (vol <= 50)),
+                       ((10 <= vol) & (vol < 15)) | ((50 < vol) & (vol <= 60))],
+                      [25, 20, 10, 5], default=0)
+            + np.select([rr >= 3.0, rr >= 2.5, rr >= 2.0, rr >= 1.5], [25, 20, 15, 10], default=0)
+            + np.select([(6 <= stop_for_score) & (stop_for_score <= 9),
+                         ((5 <= stop_for_score) & (stop_for_score < 6)) | ((9 < stop_for_score) & (stop_for_score <= 10)),
+                         ((4 <= stop_for_score) & (stop_for_score < 5)) | ((10 < stop_for_score) & (stop_for_score <= 12)),
+                         ((3 <= stop_for_score) & (stop_for_score < 4)) | ((12 < stop_for_score) & (stop_for_score <= 15))],
+                        [25, 20, 15, 10], default=5)
+            + np.select([risk_pct <= 0.75, risk_pct <= 1.0, risk_pct <= 1.5, risk_pct <= 2.0],
+                        [25, 20, 15, 10], default=5)
+        )
+
+        return pd.DataFrame({
+            'ticker': tickers,
+            'entry_price': entry_price,
+            'stop_loss': stop_loss,
+            'target_price': target_price,
+            'risk_per_share': risk_per_share,
+            'reward_per_share': reward_per_share,
+            'risk_reward_ratio': risk_reward_ratio,
+            'position_size_shares': position_size_shares,
+            'position_size_value': position_size_value,
+            'total_risk_dollars': total_risk_dollars,
+            'total_risk_pct': total_risk_pct,
+            'atr': atr,
+            'volatility_pct': volatility_pct,
+            'stop_distance_pct': stop_distance_pct,
+            'risk_score': np.clip(risk_score.astype(float), 0.0, 100.0),
+            'warn_low_volatility': vol < 15,
+            'warn_tight_stop': stop_distance_pct < 3,
+            'warn_excessive_risk': risk_pct > 2.0,
+            'warn_extreme_volatility': vol > 60,
+            'warn_wide_stop': stop_distance_pct > 15,
+            'warn_poor_rr': rr < 1.5,
+            'warn_invalid_price': entry_price <= 0,
+        })
+
+    @staticmethod
+    def _format_warnings(row) -> List[str]:
+        """Warning text for one _risk_frame row (same wording and order as _generate_warnings)"""
+        warnings = []
+        if row.warn_low_volatility:
+            warnings.append(
+                f"LOW VOLATILITY ({row.volatility_pct:.1f}%) - "
+                f"Limited profit potential for swing trading (stagnation risk)"
+            )
+        if row.warn_tight_stop:
+            warnings.append(
+                f"TIGHT STOP ({row.stop_distance_pct:.1f}%) - "
+                f"Insufficient room to breathe (death by 1000 cuts risk)"
+            )
+        if row.warn_excessive_risk:
+            warnings.append(
+                f"EXCESSIVE POSITION RISK ({row.total_risk_pct:.2f}%) - "
+                f"Over-leveraged (${row.total_risk_dollars:.2f} at risk)"
+            )
+        if row.warn_extreme_volatility:
+            warnings.append(
+                f"EXTREME VOLATILITY ({row.volatility_pct:.1f}%) - "
+                f"Too chaotic for managed swing trading"
+            )
+        if row.warn_wide_stop:
+            warnings.append(
+                f"VERY WIDE STOP ({row.stop_distance_pct:.1f}%) - "
+                f"Over-exposed on single position"
+            )
+        if row.warn_poor_rr:
+            warnings.append(
+                f"POOR RISK/REWARD ({row.risk_reward_ratio:.2f}:1) - "
+                f"Not worth taking this trade"
+            )
+        if row.warn_invalid_price:
+            warnings.append("INVALID DATA - Could not fetch current price")
+        return warnings
 
     def _calculate_risk_metrics(self, ticker: str, candidate: Dict, available_capital: float) -> Dict:
         """
@@ -325,8 +554,8 @@ class RiskDepartment:
     def _calculate_atr(self, ticker: str, period: int = 14) -> float:
         """Calculate Average True Range"""
         try:
-            data = yf.download(ticker, period='60d', progress=False)
-            if data.empty:
+            data = self.price_history.get(ticker)
+            if data is None or data.empty:
                 return 0.0
 
             high = data['High']
@@ -349,8 +578,8 @@ class RiskDepartment:
     def _calculate_volatility(self, ticker: str) -> float:
         """Calculate annualized volatility (%)"""
         try:
-            data = yf.download(ticker, period='60d', progress=False)
-            if data.empty:
+            data = self.price_history.get(ticker)
+            if data is None or data.empty:
                 return 0.0
 
             returns = data['Close'].pct_change().dropna()
@@ -364,10 +593,10 @@ class RiskDepartment:
             return 0.0
 
     def _fetch_current_price(self, ticker: str) -> float:
-        """Fetch current price for ticker"""
+        """Latest close from the shared price history"""
         try:
-            data = yf.download(ticker, period='1d', progress=False)
-            if not data.empty:
+            data = self.price_history.get(ticker)
+            if data is not None and not data.empty:
                 return float(data['Close'].iloc[-1])
         except:
             pass
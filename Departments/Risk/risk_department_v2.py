@@ -14,13 +14,19 @@ Key Changes from v1:
 - All candidates pass through with risk assessment
 """
 
+import sys
 import logging
 import sqlite3
 import pandas as pd
-import yfinance as yf
+from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Utils.price_history import PriceHistoryService, get_shared_price_history
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,16 +42,19 @@ class RiskDepartment:
     5. NO approval/rejection authority
     """
 
-    def __init__(self, max_risk_per_trade_pct: float = 1.0, max_portfolio_heat_pct: float = 5.0):
+    def __init__(self, max_risk_per_trade_pct: float = 1.0, max_portfolio_heat_pct: float = 5.0,
+                 price_history: Optional[PriceHistoryService] = None):
         """
         Initialize Risk Department
 
         Args:
             max_risk_per_trade_pct: Maximum risk per trade (% of capital)
             max_portfolio_heat_pct: Maximum total portfolio heat (% of capital)
+            price_history: Price history source (default: the process-wide shared service)
         """
         self.max_risk_per_trade_pct = max_risk_per_trade_pct
         self.max_portfolio_heat_pct = max_portfolio_heat_pct
+        self.price_history = price_history or get_shared_price_history()
         self.atr_period = 14
         self.atr_multiplier = 2.0
 
@@ -70,6 +79,11 @@ class RiskDepartment:
         logger.info(f"Assessing {len(candidates)} candidates...")
         logger.info(f"Available capital: ${available_capital:,.2f}")
 
+        # One bulk fetch up front; ATR, volatility and price all read these frames
+        tickers = [c['ticker'] for c in candidates]
+        frames = self.price_history.prefetch(tickers)
+        logger.info(f"Price history ready for {len(frames)}/{len(tickers)} candidates")
+
         assessed = []
         for candidate in candidates:
             ticker = candidate['ticker']
@@ -267,8 +281,8 @@ class RiskDepartment:
     def _calculate_atr(self, ticker: str, period: int = 14) -> float:
         """Calculate Average True Range"""
         try:
-            data = yf.download(ticker, period='60d', progress=False)
-            if data.empty:
+            data = self.price_history.get(ticker)
+            if data is None or data.empty:
                 return 0.0
 
             high = data['High']
@@ -291,8 +305,8 @@ class RiskDepartment:
     def _calculate_volatility(self, ticker: str) -> float:
         """Calculate annualized volatility (%)"""
         try:
-            data = yf.download(ticker, period='60d', progress=False)
-            if data.empty:
+            data = self.price_history.get(ticker)
+            if data is None or data.empty:
                 return 0.0
 
             returns = data['Close'].pct_change().dropna()
@@ -306,10 +320,10 @@ class RiskDepartment:
             return 0.0
 
     def _fetch_current_price(self, ticker: str) -> float:
-        """Fetch current price for ticker"""
+        """Latest close from the shared price history"""
         try:
-            data = yf.download(ticker, period='1d', progress=False)
-            if not data.empty:
+            data = self.price_history.get(ticker)
+            if data is not None and not data.empty:
                 return float(data['Close'].iloc[-1])
         except:
             pass
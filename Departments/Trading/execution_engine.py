@@ -0,0 +1,240 @@
+"""
+PARALLEL ORDER ENGINE - Sentinel Corporation
+Submits an approved plan's orders concurrently, SELLs before BUYs
+
+Used by TradingDepartment.execute_plan (called from CEO.execute_approved_plan):
+- prefetch(): everything the orders need, in bulk, before any order is sent
+  - SELL asset status: get_asset() for every SELL on the pool
+  - BUY prices: one multi-symbol latest-bar request
+  - BUY trailing stops: calculate_trailing_stop_percents (one shared
+    price-history fetch, ATR memoized per trading day)
+- run_phase(): orders of one side on a bounded thread pool
+- execute(): SELL phase -> barrier (optional after_sells hook, e.g. wait for
+  fills) -> BUY phase
+- Per-order latency (ms) is recorded on every OrderOutcome
+- SharedPortfolioState: one account snapshot per phase; BUY cost is reserved
+  as each order passes validation so concurrent BUYs cannot overspend cash,
+  and released again if the order never reaches the broker. It also tracks
+  the (ticker, action, quantity) keys in flight so identical orders in one
+  phase cannot both pass duplicate detection
+"""
+
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from Utils.atr_calculator import calculate_trailing_stop_percents
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8  # Well inside Alpaca's 200 requests/minute
+
+
+@dataclass
+class PlanPrefetch:
+    """Market data gathered once for every order in a plan"""
+    prices: Dict[str, float] = field(default_factory=dict)          # BUY ticker -> latest price
+    trail_stops: Dict[str, Dict] = field(default_factory=dict)      # BUY ticker -> ATR stop result
+    asset_status: Dict[str, str] = field(default_factory=dict)      # SELL ticker -> '' or skip reason
+    elapsed_ms: float = 0.0
+
+
+@dataclass
+class OrderOutcome:
+    """Result of one order in a plan"""
+    ticker: str
+    action: str
+    shares: int
+    message_id: Optional[str]
+    status: str  # Status returned by the executor, 'SKIPPED' or 'ERROR'
+    latency_ms: float = 0.0
+    reason: str = ''
+    order_id: Optional[str] = None  # Broker order ID, if the executor reported one
+
+    def to_dict(self) -> Dict:
+        return {
+            'ticker': self.ticker,
+            'action': self.action,
+            'shares': self.shares,
+            'message_id': self.message_id,
+            'status': self.status,
+            'latency_ms': round(self.latency_ms, 1),
+            'reason': self.reason,
+            'order_id': self.order_id
+        }
+
+
+class SharedPortfolioState:
+    """Account snapshot shared by the concurrent orders of one phase"""
+
+    def __init__(self, state: Dict):
+        self.state = state
+        self.lock = threading.Lock()  # Hold while validating + reserving
+        self.order_keys = set()  # (ticker, action, quantity) already started this phase
+
+    def snapshot(self) -> Dict:
+        """Copy safe to mutate (call with lock held)"""
+        return dict(self.state, current_prices=dict(self.state.get('current_prices', {})))
+
+    def reserve(self, action: str, quantity: int, price: float):
+        """Take a validated BUY's cost out of cash (call with lock held)"""
+        if action == 'BUY' and price > 0:
+            cost = quantity * price
+            self.state['cash'] = self.state.get('cash', 0) - cost
+            self.state['buying_power'] = self.state.get('buying_power', 0) - cost
+
+    def release(self, action: str, quantity: int, price: float):
+        """Give back a reservation whose order never reached the broker (call with lock held)"""
+        self.reserve(action, -quantity, price)
+
+    def start_order(self, key: Tuple) -> bool:
+        """Mark an order key as in flight; False if it already was (call with lock held)"""
+        if key in self.order_keys:
+            return False
+        self.order_keys.add(key)
+        return True
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class ParallelOrderEngine:
+    """
+    Bounded-concurrency order submission for one plan
+
+    Trades are dicts with at least ticker, action and shares (the
+    ExecutiveApproval payload) plus an optional message_id.
+    """
+
+    def __init__(self, trading_client, execute_order: Callable[[Dict, PlanPrefetch], Union[str, Tuple[str, str]]],
+                 latest_prices: Callable[[List[str]], Dict[str, float]],
+                 trail_stops: Optional[Callable[[List[str], Dict[str, float]], Dict[str, Dict]]] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        Args:
+            trading_client: Alpaca TradingClient (get_asset is used for SELL checks)
+            execute_order: Submits one trade, returns its status string or
+                (status, broker order ID)
+            latest_prices: Multi-symbol latest price lookup
+            trail_stops: Multi-symbol ATR trailing stop sizing (default: shared price history)
+            max_workers: Orders in flight at once
+        """
+        self.trading_client = trading_client
+        self.execute_order = execute_order
+        self.latest_prices = latest_prices
+        self.trail_stops = trail_stops or calculate_trailing_stop_percents
+        self.max_workers = max(1, int(max_workers))
+
+    def prefetch(self, sells: List[Dict], buys: List[Dict]) -> PlanPrefetch:
+        """Gather SELL asset status and BUY prices/stops for the whole plan"""
+        start = time.perf_counter()
+        prefetch = PlanPrefetch()
+        sell_tickers = list(dict.fromkeys(t['ticker'] for t in sells))
+        buy_tickers = list(dict.fromkeys(t['ticker'] for t in buys))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='prefetch') as pool:
+            asset_futures = {t: pool.submit(self._asset_status, t) for t in sell_tickers}
+            if buy_tickers:
+                try:
+                    prefetch.prices = self.latest_prices(buy_tickers) or {}
+                except Exception as e:
+                    logger.warning(f"Latest price prefetch failed ({e}) - orders will use plan prices")
+                # Fall back to the plan's price where the latest bar is missing
+                for trade in buys:
+                    if not prefetch.prices.get(trade['ticker']) and trade.get('price', 0) > 0:
+                        prefetch.prices[trade['ticker']] = float(trade['price'])
+                try:
+                    prefetch.trail_stops = self.trail_stops(buy_tickers, prefetch.prices) or {}
+                except Exception as e:
+                    logger.warning(f"Trailing stop prefetch failed ({e}) - sizing per order")
+            prefetch.asset_status = {t: f.result() for t, f in asset_futures.items()}
+
+        prefetch.elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"Prefetched {len(sell_tickers)} SELL assets, {len(prefetch.prices)} BUY prices, "
+                    f"{len(prefetch.trail_stops)} trailing stops in {prefetch.elapsed_ms:.0f}ms")
+        return prefetch
+
+    def _asset_status(self, ticker: str) -> str:
+        """'' if tradable, otherwise why the SELL is skipped"""
+        try:
+            asset = self.trading_client.get_asset(ticker)
+            return '' if asset.tradable else f"Asset not tradeable: {asset.status}"
+        except Exception as e:
+            return f"Cannot verify: {e}"
+
+    def run_phase(self, trades: List[Dict], prefetch: PlanPrefetch) -> List[OrderOutcome]:
+        """Submit one side's orders concurrently; outcomes keep the input order"""
+        if not trades:
+            return []
+
+        def run(trade: Dict) -> OrderOutcome:
+            outcome = OrderOutcome(ticker=trade['ticker'], action=trade['action'], shares=trade.get('shares', 0),
+                                   message_id=trade.get('message_id'), status='ERROR')
+            start = time.perf_counter()
+            try:
+                result = self.execute_order(trade, prefetch)
+                if isinstance(result, tuple):
+                    outcome.status, outcome.order_id = result
+                else:
+                    outcome.status = result
+            except Exception as e:
+                logger.error(f"Order {trade['action']} {trade['ticker']} failed: {e}", exc_info=True)
+                outcome.reason = str(e)
+            outcome.latency_ms = (time.perf_counter() - start) * 1000
+            return outcome
+
+        results: List[Optional[OrderOutcome]] = [None] * len(trades)
+        runnable = []
+        for i, trade in enumerate(trades):
+            reason = prefetch.asset_status.get(trade['ticker'], '') if trade['action'] == 'SELL' else ''
+            if reason:
+                logger.warning(f"SKIPPING {trade['ticker']} SELL - {reason}")
+                results[i] = OrderOutcome(ticker=trade['ticker'], action='SELL', shares=trade.get('shares', 0),
+                                          message_id=trade.get('message_id'), status='SKIPPED', reason=reason)
+            else:
+                runnable.append(i)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, max(1, len(runnable))),
+                                thread_name_prefix='order') as pool:
+            outcomes = list(pool.map(run, [trades[i] for i in runnable]))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for i, outcome in zip(runnable, outcomes):
+            results[i] = outcome
+
+        if outcomes:
+            latencies = [o.latency_ms for o in outcomes]
+            logger.info(f"{trades[0]['action']} phase: {len(outcomes)} orders in {elapsed_ms:.0f}ms "
+                        f"(latency p50 {_percentile(latencies, 50):.0f}ms, max {max(latencies):.0f}ms)")
+        return results
+
+    def execute(self, sells: List[Dict], buys: List[Dict],
+                after_sells: Optional[Callable[[List[OrderOutcome]], None]] = None) -> Dict:
+        """
+        Prefetch, then SELL phase, barrier, BUY phase
+
+        Args:
+            sells: SELL trades
+            buys: BUY trades
+            after_sells: Called with the SELL outcomes before any BUY is sent
+                (e.g. wait for SELL fills to free cash)
+
+        Returns:
+            Dict with prefetch_ms, sells and buys (lists of OrderOutcome)
+        """
+        prefetch = self.prefetch(sells, buys)
+        sell_outcomes = self.run_phase(sells, prefetch)
+        if after_sells and sells:
+            after_sells(sell_outcomes)
+        buy_outcomes = self.run_phase(buys, prefetch)
+        return {
+            'prefetch_ms': prefetch.elapsed_ms,
+            'sells': sell_outcomes,
+            'buys': buy_outcomes
+        }
+
@@ -22,24 +22,31 @@ import os
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import logging
 import time
 import uuid
+import threading
 
 # Add project root to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 # Import Alpaca SDK
-from alpaca.trading.client import TradingClient
 from alpaca.trading.requests import MarketOrderRequest, LimitOrderRequest, TrailingStopOrderRequest, GetOrdersRequest
 from alpaca.trading.enums import OrderSide, TimeInForce, OrderType, QueryOrderStatus
 from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.requests import StockLatestBarRequest
 
 # Import ATR calculator for volatility-based trailing stops
-from Utils.atr_calculator import calculate_trailing_stop_percent
+from Utils.alpaca_session import get_account_snapshot_cache, get_trading_client, invalidate_account_snapshots
+from Utils.atr_calculator import calculate_trailing_stop_percents
+from Utils.db_connection import get_connection
+from Utils.message_bus import BusMessage, MessageBus
+from Utils.price_history import get_shared_price_history
+from Departments.Trading.execution_engine import (
+    DEFAULT_MAX_WORKERS, OrderOutcome, ParallelOrderEngine, PlanPrefetch, SharedPortfolioState
+)
 
 # Import configuration
 from config import APCA_API_KEY_ID, APCA_API_SECRET_KEY, APCA_API_BASE_URL
@@ -51,6 +58,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger('TradingDepartment')
 
+# Most messages execute_plan claims for one plan
+PLAN_CLAIM_LIMIT = 1000
+
 
 # ============================================================================
 # DATA CLASSES
@@ -82,20 +92,28 @@ class HardConstraintViolation:
 # ============================================================================
 
 class MessageHandler:
-    """Handles reading and writing messages for Trading Department"""
+    """
+    Handles reading and writing messages for Trading Department
 
-    def __init__(self):
+    Messages travel on the SQLite message bus. The Markdown inbox is still
+    drained for files written by older tools (e.g. regime broadcasts).
+    """
+
+    def __init__(self, db_path: str = 'sentinel.db', bus: Optional[MessageBus] = None):
         self.inbox_path = Path("Messages_Between_Departments/Inbox/TRADING")
-        self.outbox_path = Path("Messages_Between_Departments/Outbox/TRADING")
         self.archive_path = Path("Messages_Between_Departments/Archive")
+        self.bus = bus or MessageBus(db_path)
 
         # Ensure directories exist
         self.inbox_path.mkdir(parents=True, exist_ok=True)
-        self.outbox_path.mkdir(parents=True, exist_ok=True)
         self.archive_path.mkdir(parents=True, exist_ok=True)
 
+    def claim_messages(self, limit: int = 100, message_ids: Optional[List[str]] = None) -> List[BusMessage]:
+        """Claim pending bus messages for Trading (ack or nack each one)"""
+        return self.bus.claim('TRADING', limit=limit, consumer='TRADING', message_ids=message_ids)
+
     def check_inbox(self) -> List[Path]:
-        """Scan inbox for new messages"""
+        """Scan legacy Markdown inbox for new messages"""
         messages = list(self.inbox_path.glob("*.md"))
         logger.info(f"Found {len(messages)} messages in inbox")
         return sorted(messages, key=lambda p: p.stat().st_mtime)
@@ -123,7 +141,7 @@ class MessageHandler:
                      body: str, data_payload: Optional[Dict] = None,
                      priority: str = 'routine') -> str:
         """
-        Write message to outbox
+        Send message on the bus
 
         Args:
             to_dept: Recipient department
@@ -136,40 +154,9 @@ class MessageHandler:
         Returns:
             message_id
         """
-        # Generate message ID
-        timestamp = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
-        msg_id = f"MSG_TRADING_{timestamp}_{uuid.uuid4().hex[:8]}"
-
-        # Create metadata
-        metadata = {
-            'message_id': msg_id,
-            'from': 'TRADING',
-            'to': to_dept,
-            'timestamp': datetime.utcnow().isoformat() + 'Z',
-            'message_type': message_type,
-            'priority': priority,
-            'requires_response': False  # Trading messages are informational
-        }
-
-        # Build message content
-        content = "---\n"
-        content += yaml.dump(metadata, default_flow_style=False)
-        content += "---\n\n"
-        content += f"# {subject}\n\n"
-        content += body
-
-        if data_payload:
-            content += "\n\n## Data Payload\n\n"
-            content += "```json\n"
-            content += json.dumps(data_payload, indent=2)
-            content += "\n```\n"
-
-        # Write to outbox
-        filename = f"{msg_id}.md"
-        filepath = self.outbox_path / filename
-
-        with open(filepath, 'w') as f:
-            f.write(content)
+        # Trading messages are informational (requires_response=False)
+        msg_id = self.bus.send('TRADING', to_dept, message_type, subject=subject, body=body,
+                               payload=data_payload, priority=priority)
 
         logger.info(f"Wrote message {msg_id} to {to_dept}")
         return msg_id
@@ -447,7 +434,7 @@ class DuplicateDetector:
         """
         cutoff_time = datetime.utcnow() - timedelta(minutes=5)
 
-        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -467,7 +454,7 @@ class DuplicateDetector:
 
     def record_submission(self, order: ExecutionOrder, order_id: int):
         """Record order submission in duplicate cache"""
-        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         expires_at = datetime.utcnow() + timedelta(minutes=5)
@@ -485,7 +472,7 @@ class DuplicateDetector:
 
     def cleanup_expired(self):
         """Remove expired entries from cache"""
-        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -513,12 +500,13 @@ class TradingDepartment:
 
     def __init__(self, db_path: str = 'sentinel.db'):
         self.db_path = db_path
-        self.message_handler = MessageHandler()
+        self.message_handler = MessageHandler(db_path)
         self.constraint_validator = HardConstraintValidator()
         self.duplicate_detector = DuplicateDetector(db_path)
 
-        # Initialize Alpaca clients (using existing credentials from config.py)
-        self.trading_client = TradingClient(APCA_API_KEY_ID, APCA_API_SECRET_KEY, paper=True)
+        # Alpaca clients (using existing credentials from config.py); the trading
+        # client is the process-wide one, so its HTTP connections are reused
+        self.trading_client = get_trading_client(APCA_API_KEY_ID, APCA_API_SECRET_KEY, paper=True)
         self.data_client = StockHistoricalDataClient(APCA_API_KEY_ID, APCA_API_SECRET_KEY)
 
         logger.info("Trading Department initialized")
@@ -528,6 +516,15 @@ class TradingDepartment:
         """
         Main processing loop: check inbox, process messages, execute orders
         """
+        for message in self.message_handler.claim_messages():
+            try:
+                self._dispatch_message(message.metadata, message.body, message.payload)
+                self.message_handler.bus.ack(message.message_id)
+            except Exception as e:
+                logger.error(f"Error processing message {message.message_id}: {e}", exc_info=True)
+                self.message_handler.bus.nack(message.message_id, str(e))
+
+        # Legacy Markdown messages (regime broadcasts, files queued before the bus)
         messages = self.message_handler.check_inbox()
 
         for message_path in messages:
@@ -545,13 +542,7 @@ class TradingDepartment:
                     logger.warning(f"Message {metadata.get('message_id')} not addressed to TRADING, skipping")
                     continue
 
-                # Process based on message type
-                message_type = metadata.get('message_type')
-                if message_type in ['execution_request', 'ExecutiveApproval']:
-                    # Both execution_request and ExecutiveApproval trigger order execution
-                    self._process_execution_request(metadata, body)
-                else:
-                    logger.warning(f"Unknown message type: {message_type}")
+                self._dispatch_message(metadata, body)
 
                 # Archive processed message
                 self.message_handler.archive_message(message_path)
@@ -562,16 +553,122 @@ class TradingDepartment:
         # Cleanup expired duplicate cache entries
         self.duplicate_detector.cleanup_expired()
 
-    def _process_execution_request(self, metadata: Dict, body: str):
-        """Process an order execution request from Executive"""
+    def _dispatch_message(self, metadata: Dict, body: str, data_payload: Optional[Dict] = None):
+        """Route one message by type"""
+        message_type = metadata.get('message_type')
+        if message_type in ['execution_request', 'ExecutiveApproval']:
+            # Both execution_request and ExecutiveApproval trigger order execution
+            self._process_execution_request(metadata, body, data_payload)
+        else:
+            logger.warning(f"Unknown message type: {message_type}")
+
+    def execute_plan(self, message_ids: Optional[List[str]] = None,
+                     after_sells: Optional[Callable[[List[OrderOutcome]], None]] = None,
+                     max_workers: int = DEFAULT_MAX_WORKERS) -> Dict:
+        """
+        Execute a plan's queued orders concurrently: SELLs first, then BUYs
+
+        Claims the plan's Trading messages from the bus, prefetches SELL asset
+        status, BUY prices and trailing stops in bulk, then submits each side on
+        a bounded pool. Each order still goes through duplicate detection and
+        hard constraint validation.
+
+        Args:
+            message_ids: The plan's message IDs (as returned by the bus when
+                they were queued); None claims every pending Trading message
+            after_sells: Called with the SELL outcomes before any BUY is sent
+            max_workers: Orders in flight at once
+
+        Returns:
+            Dict with prefetch_ms, sells and buys (lists of OrderOutcome)
+        """
+        bus = self.message_handler.bus
+        trades = {'SELL': [], 'BUY': []}
+        messages = {}
+        limit = len(message_ids) if message_ids is not None else PLAN_CLAIM_LIMIT
+        for message in self.message_handler.claim_messages(limit=limit, message_ids=message_ids):
+            payload = message.payload or {}
+            action = str(payload.get('action', '')).upper()
+            if message.message_type in ['execution_request', 'ExecutiveApproval'] and action in trades:
+                trades[action].append(dict(payload, action=action, message_id=message.message_id))
+                messages[message.message_id] = message
+                continue
+            try:
+                self._dispatch_message(message.metadata, message.body, message.payload)
+                bus.ack(message.message_id)
+            except Exception as e:
+                logger.error(f"Error processing message {message.message_id}: {e}", exc_info=True)
+                bus.nack(message.message_id, str(e))
+
+        phase_states = {}
+        phase_lock = threading.Lock()
+
+        def execute_order(trade: Dict, prefetch: PlanPrefetch) -> Tuple[str, Optional[str]]:
+            message = messages[trade['message_id']]
+            metadata = message.metadata
+            with phase_lock:
+                # One account snapshot per phase (SELL fills change cash before the BUYs)
+                if trade['action'] not in phase_states:
+                    phase_states[trade['action']] = SharedPortfolioState(self._get_portfolio_state())
+            try:
+                status = self._process_execution_request(metadata, message.body, message.payload,
+                                                         prefetch=prefetch,
+                                                         shared_state=phase_states[trade['action']])
+            except Exception as e:
+                bus.nack(message.message_id, str(e))
+                raise
+            bus.ack(message.message_id)
+            return status, metadata.get('alpaca_order_id')
+
+        engine = ParallelOrderEngine(
+            self.trading_client,
+            execute_order=execute_order,
+            latest_prices=self.get_latest_prices,
+            trail_stops=lambda tickers, prices: calculate_trailing_stop_percents(
+                tickers, prices, history=get_shared_price_history(self.db_path)),
+            max_workers=max_workers
+        )
+        result = engine.execute(trades['SELL'], trades['BUY'], after_sells=after_sells)
+
+        for outcome in result['sells']:
+            if outcome.status == 'SKIPPED':
+                bus.ack(outcome.message_id)
+
+        # Cleanup expired duplicate cache entries
+        self.duplicate_detector.cleanup_expired()
+        return result
+
+    def get_latest_prices(self, tickers: List[str]) -> Dict[str, float]:
+        """Latest bar close for many tickers in one Alpaca request"""
+        request = StockLatestBarRequest(symbol_or_symbols=list(tickers))
+        bars = self.data_client.get_stock_latest_bar(request)
+        return {ticker: float(bar.close) for ticker, bar in bars.items() if bar is not None}
+
+    def _process_execution_request(self, metadata: Dict, body: str, data_payload: Optional[Dict] = None,
+                                   prefetch: Optional[PlanPrefetch] = None,
+                                   shared_state: Optional[SharedPortfolioState] = None) -> str:
+        """
+        Process an order execution request from Executive
+
+        Args:
+            metadata: Message metadata
+            body: Message body (payload is extracted from it if not given)
+            data_payload: Order payload
+            prefetch: Plan-wide prices and trailing stops (execute_plan)
+            shared_state: Phase-wide account snapshot (execute_plan)
+
+        Returns:
+            'SUBMITTED', 'FAILED', 'REJECTED', 'DUPLICATE', 'INVALID' or 'ERROR'
+        """
         logger.info(f"Processing execution request: {metadata.get('message_id')}")
 
         try:
-            # Extract JSON data payload from message body
-            data_payload = self._extract_json_payload(body)
+            # Bus messages carry the payload; Markdown messages embed it in the body
+            if data_payload is None:
+                data_payload = self._extract_json_payload(body)
             if not data_payload:
                 logger.error("No data payload found in message")
-                return
+                return 'INVALID'
 
             logger.info(f"Extracted data payload: {data_payload}")
 
@@ -586,47 +683,74 @@ class TradingDepartment:
                 portfolio_request_msg_id=data_payload.get('proposal_id')
             )
 
-            # Check for duplicate
-            if self.duplicate_detector.is_duplicate(order):
+            # Check for duplicate (concurrent plan orders also check the keys already in flight)
+            if shared_state is None:
+                duplicate = self.duplicate_detector.is_duplicate(order)
+            else:
+                with shared_state.lock:
+                    duplicate = (not shared_state.start_order((order.ticker, order.action, order.quantity))
+                                 or self.duplicate_detector.is_duplicate(order))
+            if duplicate:
                 self._handle_duplicate(order, metadata)
-                return
-
-            # Get portfolio state and market data for validation
-            portfolio_state = self._get_portfolio_state()
+                return 'DUPLICATE'
 
             # Add the price from Executive's message to portfolio_state for validation
             # This handles NEW positions that aren't in the portfolio yet
             executive_price = data_payload.get('price', 0)
             logger.info(f"Executive price for {order.ticker}: {executive_price}")
-            if executive_price > 0:
-                if 'current_prices' not in portfolio_state:
-                    portfolio_state['current_prices'] = {}
-                portfolio_state['current_prices'][order.ticker] = executive_price
-                logger.info(f"Added price to portfolio_state: {order.ticker} = ${executive_price:.2f}")
-            else:
-                logger.warning(f"No price provided in Executive message for {order.ticker}")
 
-            logger.info(f"Portfolio state current_prices: {portfolio_state.get('current_prices', {})}")
-            market_data = self._get_market_data(order.ticker)
-
-            # Validate hard constraints
-            is_valid, violations = self.constraint_validator.validate_order(
-                order, portfolio_state, market_data
-            )
+            # Get portfolio state and market data for validation
+            if shared_state is None:
+                is_valid, violations = self._validate_order(order, self._get_portfolio_state(), executive_price)
+            else:
+                # Concurrent plan orders validate against one snapshot, reserving cash as they pass
+                with shared_state.lock:
+                    is_valid, violations = self._validate_order(order, shared_state.snapshot(), executive_price)
+                    if is_valid:
+                        shared_state.reserve(order.action, order.quantity, executive_price)
 
             if not is_valid:
                 self._handle_constraint_violations(order, violations, metadata)
-                return
+                return 'REJECTED'
 
             # Add price to metadata for bracket order calculation
             metadata['price'] = executive_price
+            if prefetch is not None:
+                metadata['market_price'] = prefetch.prices.get(order.ticker)
+                metadata['trail_stop'] = prefetch.trail_stops.get(order.ticker)
 
             # Execute order via Alpaca
-            self._execute_order_with_retry(order, metadata)
+            submitted = False
+            try:
+                submitted = self._execute_order_with_retry(order, metadata)
+            finally:
+                if shared_state is not None and 'alpaca_order_id' not in metadata:
+                    # Never reached the broker - free the cash for the rest of the phase
+                    with shared_state.lock:
+                        shared_state.release(order.action, order.quantity, executive_price)
+            return 'SUBMITTED' if submitted else 'FAILED'
 
         except Exception as e:
             logger.error(f"Error processing execution request: {e}", exc_info=True)
             self._escalate_error(metadata, str(e))
+            return 'ERROR'
+
+    def _validate_order(self, order: ExecutionOrder, portfolio_state: Dict,
+                        executive_price: float) -> Tuple[bool, List[HardConstraintViolation]]:
+        """Validate hard constraints with the Executive's price added to portfolio_state"""
+        if executive_price > 0:
+            if 'current_prices' not in portfolio_state:
+                portfolio_state['current_prices'] = {}
+            portfolio_state['current_prices'][order.ticker] = executive_price
+            logger.info(f"Added price to portfolio_state: {order.ticker} = ${executive_price:.2f}")
+        else:
+            logger.warning(f"No price provided in Executive message for {order.ticker}")
+
+        logger.info(f"Portfolio state current_prices: {portfolio_state.get('current_prices', {})}")
+        market_data = self._get_market_data(order.ticker)
+
+        # Validate hard constraints
+        return self.constraint_validator.validate_order(order, portfolio_state, market_data)
 
     def _extract_json_payload(self, body: str) -> Optional[Dict]:
         """Extract JSON data payload from message body"""
@@ -646,8 +770,7 @@ class TradingDepartment:
     def _get_portfolio_state(self) -> Dict:
         """Get current portfolio state from Alpaca"""
         try:
-            account = self.trading_client.get_account()
-            positions = self.trading_client.get_all_positions()
+            account, positions = get_account_snapshot_cache(self.trading_client).snapshot()
 
             portfolio_value = float(account.portfolio_value)
             current_prices = {}
@@ -680,7 +803,7 @@ class TradingDepartment:
             'vix': 15.0
         }
 
-    def _execute_order_with_retry(self, order: ExecutionOrder, metadata: Dict):
+    def _execute_order_with_retry(self, order: ExecutionOrder, metadata: Dict) -> bool:
         """
         Execute order via Alpaca with exponential backoff retry logic
 
@@ -689,6 +812,9 @@ class TradingDepartment:
 
         CRITICAL: Alpaca submission happens ONCE. Only database storage retries.
         This prevents duplicate order submissions when database operations fail.
+
+        Returns:
+            True if the order was submitted and stored
         """
         max_retries = 5
         retry_delays = [1, 2, 4, 8, 16]  # Exponential backoff
@@ -699,11 +825,14 @@ class TradingDepartment:
             if not alpaca_order:
                 logger.error(f"Alpaca submission returned None for {order.ticker}")
                 self._handle_submission_failure(order, metadata, "Alpaca API returned None")
-                return
+                return False
         except Exception as e:
             logger.error(f"Alpaca submission failed for {order.ticker}: {e}")
             self._handle_submission_failure(order, metadata, str(e))
-            return
+            return False
+
+        metadata['alpaca_order_id'] = str(alpaca_order.id)
+        invalidate_account_snapshots()  # Buying power changed
 
         # Step 2: Store in database (WITH RETRY - can retry safely)
         for attempt in range(max_retries):
@@ -712,7 +841,7 @@ class TradingDepartment:
                 self.duplicate_detector.record_submission(order, order_id)
                 self._send_execution_confirmation(order, alpaca_order, metadata)
                 logger.info(f"Order executed successfully: {order.ticker} {order.action} {order.quantity}")
-                return
+                return True
 
             except Exception as e:
                 if attempt < max_retries - 1:
@@ -728,6 +857,7 @@ class TradingDepartment:
                         f"CRITICAL: Order was submitted to Alpaca ({alpaca_order.id}) but not stored in database!"
                     )
                     self._handle_submission_failure(order, metadata, f"Database error: {e}")
+        return False
 
     def _submit_to_alpaca(self, order: ExecutionOrder, metadata: Dict):
         """
@@ -752,22 +882,28 @@ class TradingDepartment:
         side = OrderSide.BUY if order.action == 'BUY' else OrderSide.SELL
 
         if order.action == 'BUY':
-            # Get CURRENT market price from Alpaca
-            try:
-                request = StockLatestBarRequest(symbol_or_symbols=order.ticker)
-                latest_bar = self.data_client.get_stock_latest_bar(request)
-                current_price = float(latest_bar[order.ticker].close)
-                logger.info(f"Current market price for {order.ticker}: ${current_price:.2f}")
-            except Exception as e:
-                logger.warning(f"Could not fetch current price for {order.ticker}: {e}")
-                current_price = metadata.get('price', 0)
-                if current_price <= 0:
-                    logger.error(f"No price available for {order.ticker}")
-                    raise ValueError(f"Cannot determine current price for {order.ticker}")
-                logger.info(f"Using estimated price for {order.ticker}: ${current_price:.2f}")
+            # Get CURRENT market price from Alpaca (execute_plan prefetches it for the whole plan)
+            current_price = metadata.get('market_price')
+            if current_price:
+                logger.info(f"Prefetched market price for {order.ticker}: ${current_price:.2f}")
+            else:
+                try:
+                    request = StockLatestBarRequest(symbol_or_symbols=order.ticker)
+                    latest_bar = self.data_client.get_stock_latest_bar(request)
+                    current_price = float(latest_bar[order.ticker].close)
+                    logger.info(f"Current market price for {order.ticker}: ${current_price:.2f}")
+                except Exception as e:
+                    logger.warning(f"Could not fetch current price for {order.ticker}: {e}")
+                    current_price = metadata.get('price', 0)
+                    if current_price <= 0:
+                        logger.error(f"No price available for {order.ticker}")
+                        raise ValueError(f"Cannot determine current price for {order.ticker}")
+                    logger.info(f"Using estimated price for {order.ticker}: ${current_price:.2f}")
 
             # Calculate ATR-based trailing stop percentage
-            atr_result = calculate_trailing_stop_percent(order.ticker, current_price)
+            atr_result = metadata.get('trail_stop') or calculate_trailing_stop_percents(
+                [order.ticker], {order.ticker: current_price},
+                history=get_shared_price_history(self.db_path))[order.ticker]
             trail_percent = atr_result['trail_percent']
 
             # Store trailing stop info in metadata for later use
@@ -866,7 +1002,7 @@ class TradingDepartment:
 
     def _store_order_in_database(self, order: ExecutionOrder, alpaca_order, metadata: Dict) -> int:
         """Store order in database with message chain tracking"""
-        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         # Generate internal order ID
@@ -911,7 +1047,7 @@ class TradingDepartment:
         Uses ATR-based trailing stop percentage from metadata if available.
         """
         try:
-            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             position_id = f"POS_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
@@ -1089,7 +1225,7 @@ class TradingDepartment:
 
     def _store_rejection(self, order: ExecutionOrder, metadata: Dict, rejection_source: str, rejection_reason: str):
         """Store order rejection in database"""
-        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         # First, create order record with REJECTED status
@@ -1169,7 +1305,7 @@ class TradingDepartment:
         logger.info("POSITION RECONCILIATION - Syncing with Alpaca")
         logger.info("=" * 80)
 
-        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         # Get all PENDING positions
@@ -14,6 +14,7 @@ import pytz
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import config
+from Utils.alpaca_session import get_trading_client, invalidate_account_snapshots
 
 try:
     from alpaca.trading.client import TradingClient
@@ -49,12 +50,8 @@ class AlpacaClient:
         self.secret_key = secret_key or config.APCA_API_SECRET_KEY
         self.paper = paper
 
-        # Initialize trading client
-        self.trading_client = TradingClient(
-            api_key=self.api_key,
-            secret_key=self.secret_key,
-            paper=self.paper
-        )
+        # Shared trading client (one long-lived HTTP session per API key)
+        self.trading_client = get_trading_client(self.api_key, self.secret_key, self.paper)
 
         # Initialize data client (for historical data)
         self.data_client = StockHistoricalDataClient(
@@ -283,6 +280,7 @@ class AlpacaClient:
             )
 
             order = self.trading_client.submit_order(order_data=market_order)
+            invalidate_account_snapshots()
             print(f"✓ Market {side} order submitted: {symbol} x{qty}")
             return order
 
@@ -324,6 +322,7 @@ class AlpacaClient:
             )
 
             order = self.trading_client.submit_order(order_data=limit_order)
+            invalidate_account_snapshots()
             print(f"✓ Limit {side} order submitted: {symbol} x{qty} @ ${limit_price}")
             return order
 
@@ -343,6 +342,7 @@ class AlpacaClient:
         """
         try:
             self.trading_client.cancel_order_by_id(order_id)
+            invalidate_account_snapshots()
             print(f"✓ Order {order_id} canceled")
             return True
         except Exception as e:
@@ -358,6 +358,7 @@ class AlpacaClient:
         """
         try:
             result = self.trading_client.cancel_orders()
+            invalidate_account_snapshots()
             print(f"✓ All orders canceled")
             return result
         except Exception as e:
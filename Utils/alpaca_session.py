@@ -0,0 +1,182 @@
+"""
+Alpaca Session - Shared trading client and account/positions snapshot cache
+
+CEO, Trading, Operations, the automated runner and the monitors each built
+their own TradingClient (a new HTTPS session every time) and called
+get_account() / get_all_positions() again seconds after someone else did.
+
+- get_trading_client(): one long-lived TradingClient per (API key, paper);
+  its HTTP session keeps connections alive across every caller
+- AccountSnapshotCache: account and positions reused for ttl_seconds
+  (config.ALPACA_SNAPSHOT_TTL_SECONDS, default 15s); max_age=0 forces a fetch
+- invalidate_account_snapshots(): called on order events (submission, fill,
+  cancel) so no caller sizes orders from pre-trade cash or positions
+
+Usage:
+    from Utils.alpaca_session import get_account_snapshot_cache
+    account, positions = get_account_snapshot_cache().snapshot()
+"""
+
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_TTL_SECONDS = 15.0
+
+_MISSING = object()
+
+
+class AccountSnapshotCache:
+    """
+    Short-TTL cache of one client's account and positions
+
+    Thread-safe; concurrent misses share one fetch. A snapshot fetched while
+    an invalidation happened is returned to its caller but not cached.
+    """
+
+    def __init__(self, trading_client, ttl_seconds: float = DEFAULT_SNAPSHOT_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            trading_client: Alpaca TradingClient (get_account/get_all_positions)
+            ttl_seconds: Seconds a fetched account or position list is reused
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.trading_client = trading_client
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: Dict[str, Tuple[float, object]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self.requests = 0
+        self.hits = 0
+
+    def get_account(self, max_age: Optional[float] = None):
+        """Account, fetched if older than max_age (default: ttl_seconds)"""
+        return self._get('account', self.trading_client.get_account, max_age)
+
+    def get_positions(self, max_age: Optional[float] = None) -> List:
+        """Open positions, fetched if older than max_age (default: ttl_seconds)"""
+        return list(self._get('positions', self.trading_client.get_all_positions, max_age))
+
+    def snapshot(self, max_age: Optional[float] = None) -> Tuple[object, List]:
+        """(account, positions)"""
+        return self.get_account(max_age), self.get_positions(max_age)
+
+    def invalidate(self):
+        """Drop cached values (call after anything that changes the account)"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def _cached(self, name: str, max_age: float):
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and self._clock() - entry[0] < max_age:
+                self.hits += 1
+                return entry[1]
+            return _MISSING
+
+    def _get(self, name: str, fetch: Callable, max_age: Optional[float]):
+        max_age = self.ttl_seconds if max_age is None else max_age
+        value = self._cached(name, max_age)
+        if value is not _MISSING:
+            return value
+
+        with self._fetch_lock:
+            value = self._cached(name, max_age)  # Another thread may have just fetched it
+            if value is not _MISSING:
+                return value
+            with self._lock:
+                generation = self._generation
+            fetched_at = self._clock()
+            value = fetch()
+            with self._lock:
+                self.requests += 1
+                if generation == self._generation:
+                    self._entries[name] = (fetched_at, value)
+            return value
+
+    def stats(self) -> Dict:
+        """Fetches and cache hits since the cache was created"""
+        return {'requests': self.requests, 'hits': self.hits}
+
+
+_clients: Dict[Tuple[str, bool], object] = {}
+_caches: Dict[int, AccountSnapshotCache] = {}  # id(client) -> cache; the cache keeps its client alive
+_registry_lock = threading.Lock()
+
+
+def _build_client(api_key: str, secret_key: str, paper: bool):
+    from alpaca.trading.client import TradingClient
+
+    return TradingClient(api_key, secret_key, paper=paper)
+
+
+def _configured_ttl() -> float:
+    try:
+        import config
+    except ImportError:
+        return DEFAULT_SNAPSHOT_TTL_SECONDS
+    return float(getattr(config, 'ALPACA_SNAPSHOT_TTL_SECONDS', DEFAULT_SNAPSHOT_TTL_SECONDS))
+
+
+def get_trading_client(api_key: Optional[str] = None, secret_key: Optional[str] = None,
+                       paper: bool = True):
+    """
+    Process-wide TradingClient for these credentials (created on first use)
+
+    Args:
+        api_key: Alpaca API key (default: config.APCA_API_KEY_ID)
+        secret_key: Alpaca secret key (default: config.APCA_API_SECRET_KEY)
+        paper: Paper trading endpoint
+    """
+    if not api_key or not secret_key:
+        import config
+        api_key = api_key or config.APCA_API_KEY_ID
+        secret_key = secret_key or config.APCA_API_SECRET_KEY
+    if not api_key or not secret_key:
+        raise ValueError("Alpaca API keys not found in config.py")
+
+    key = (api_key, bool(paper))
+    with _registry_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = _build_client(api_key, secret_key, bool(paper))
+            logger.info(f"Alpaca trading client created ({'paper' if paper else 'LIVE'})")
+        return client
+
+
+def get_account_snapshot_cache(trading_client=None, ttl_seconds: Optional[float] = None) -> AccountSnapshotCache:
+    """
+    Shared snapshot cache for a client (default: the config-credential paper client)
+
+    Args:
+        trading_client: Client whose account/positions are cached
+        ttl_seconds: TTL used if the cache is created by this call
+            (default: config.ALPACA_SNAPSHOT_TTL_SECONDS)
+    """
+    trading_client = trading_client or get_trading_client()
+    with _registry_lock:
+        cache = _caches.get(id(trading_client))
+        if cache is None:
+            ttl = _configured_ttl() if ttl_seconds is None else ttl_seconds
+            cache = _caches[id(trading_client)] = AccountSnapshotCache(trading_client, ttl)
+        return cache
+
+
+def invalidate_account_snapshots():
+    """Invalidate every snapshot cache (order submitted, filled or canceled)"""
+    with _registry_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.invalidate()
@@ -19,17 +19,138 @@ Why ATR-Based Stops:
 Example:
 - HRL (Hormel - consumer staples): 1.5% daily vol -> ~3% trailing stop
 - CLSK (Bitcoin miner): 7% daily vol -> ~14% trailing stop
+
+Batch sizing (calculate_trailing_stop_percents):
+- One shared price-history fetch for every ticker (Research's price cache,
+  then a multi-symbol download for misses)
+- True Range for all tickers at once on stacked numpy arrays
+- ATR values memoized per trading day, so repeated sizing is free
 """
 
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import logging
-from datetime import datetime, timedelta
+import threading
+from datetime import date, datetime, timedelta
+
+from Utils.price_history import get_shared_price_history
 
 logger = logging.getLogger(__name__)
 
+# (ticker, period) -> (trading day, ATR) for calculate_trailing_stop_percents
+_atr_memo: Dict[Tuple[str, int], Tuple[date, float]] = {}
+_atr_memo_lock = threading.Lock()
+
+
+def atr_from_frame(data: pd.DataFrame, period: int = 14) -> Optional[float]:
+    """
+    ATR of the most recent bar of a daily OHLC frame.
+
+    Args:
+        data: DataFrame with High, Low and Close columns
+        period: ATR period (default 14 days)
+
+    Returns:
+        ATR value in dollars, or None if there are too few bars
+    """
+    if data is None or len(data) < period:
+        return None
+
+    # Calculate True Range components
+    high_low = data['High'] - data['Low']
+    high_close = abs(data['High'] - data['Close'].shift(1))
+    low_close = abs(data['Low'] - data['Close'].shift(1))
+
+    # True Range is max of the three
+    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+
+    # ATR is rolling mean of True Range
+    atr_value = float(tr.rolling(window=period).mean().iloc[-1])
+    return None if pd.isna(atr_value) else atr_value
+
+
+def atr_from_frames(frames: Dict[str, pd.DataFrame], period: int = 14) -> Dict[str, Optional[float]]:
+    """
+    ATR of the most recent bar for many daily OHLC frames at once.
+
+    Gives the same values as atr_from_frame per ticker, but stacks the last
+    `period` bars of every frame into (tickers x period) arrays so the True
+    Range and its mean are computed in one pass.
+
+    Args:
+        frames: Dict of ticker -> DataFrame with High, Low and Close columns
+        period: ATR period (default 14 days)
+
+    Returns:
+        Dict of ticker -> ATR value in dollars (None if too few bars or NaN)
+    """
+    atrs = {ticker: None for ticker in frames}
+    usable = [t for t, frame in frames.items() if frame is not None and len(frame) >= period]
+    if not usable:
+        return atrs
+
+    highs = np.empty((len(usable), period))
+    lows = np.empty((len(usable), period))
+    prev_closes = np.full((len(usable), period), np.nan)
+    for row, ticker in enumerate(usable):
+        frame = frames[ticker]
+        highs[row] = frame['High'].to_numpy(dtype=float)[-period:]
+        lows[row] = frame['Low'].to_numpy(dtype=float)[-period:]
+        closes = frame['Close'].to_numpy(dtype=float)[-(period + 1):-1]
+        prev_closes[row, period - len(closes):] = closes  # First bar has no previous close
+
+    # True Range is max of the three (fmax skips the missing previous close)
+    tr = np.fmax(highs - lows, np.fmax(np.abs(highs - prev_closes), np.abs(lows - prev_closes)))
+    values = tr.mean(axis=1)
+
+    for ticker, value in zip(usable, values):
+        atrs[ticker] = None if np.isnan(value) else float(value)
+    return atrs
+
+
+def calculate_atrs(tickers: List[str], period: int = 14, history=None) -> Dict[str, Optional[float]]:
+    """
+    ATR for many tickers from one price-history fetch, memoized per trading day.
+
+    Args:
+        tickers: Stock symbols
+        period: ATR period (default 14 days)
+        history: PriceHistoryService to read frames from (default: shared service)
+
+    Returns:
+        Dict of ticker -> ATR value in dollars, or None if unavailable
+    """
+    tickers = list(dict.fromkeys(tickers))
+    today = date.today()
+    atrs = {}
+    with _atr_memo_lock:
+        for ticker in tickers:
+            memo = _atr_memo.get((ticker, period))
+            if memo and memo[0] == today:
+                atrs[ticker] = memo[1]
+
+    misses = [t for t in tickers if t not in atrs]
+    if misses:
+        history = history or get_shared_price_history()
+        frames = history.prefetch(misses)
+        computed = atr_from_frames({t: frames.get(t) for t in misses}, period)
+        with _atr_memo_lock:
+            for ticker, value in computed.items():
+                if value is not None:
+                    _atr_memo[(ticker, period)] = (today, value)
+        atrs.update(computed)
+        logger.debug(f"ATR computed for {len(misses)} tickers ({len(tickers) - len(misses)} memoized)")
+
+    return {t: atrs[t] for t in tickers}
+
+
+def clear_atr_memo():
+    """Forget memoized ATR values (e.g. after a data correction)"""
+    with _atr_memo_lock:
+        _atr_memo.clear()
+
 
 def calculate_atr(ticker: str, period: int = 14, days: int = 30) -> Optional[float]:
     """
@@ -62,21 +183,9 @@ def calculate_atr(ticker: str, period: int = 14, days: int = 30) -> Optional[flo
         if isinstance(data.columns, pd.MultiIndex):
             data.columns = data.columns.get_level_values(0)
 
-        # Calculate True Range components
-        high_low = data['High'] - data['Low']
-        high_close = abs(data['High'] - data['Close'].shift(1))
-        low_close = abs(data['Low'] - data['Close'].shift(1))
-
-        # True Range is max of the three
-        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+        atr_value = atr_from_frame(data, period)
 
-        # ATR is rolling mean of True Range
-        atr = tr.rolling(window=period).mean()
-
-        # Return most recent ATR value
-        atr_value = float(atr.iloc[-1])
-
-        if pd.isna(atr_value):
+        if atr_value is None:
             logger.warning(f"{ticker}: ATR calculation resulted in NaN")
             return None
 
@@ -142,10 +251,77 @@ def calculate_trailing_stop_percent(
 
     result['current_price'] = current_price
 
-    # Calculate ATR
-    atr_value = calculate_atr(ticker)
+    return trailing_stop_from_atr(ticker, calculate_atrs([ticker])[ticker], current_price,
+                                  atr_multiplier, min_stop_pct, max_stop_pct)
+
+
+def calculate_trailing_stop_percents(
+    tickers: List[str],
+    prices: Optional[Dict[str, float]] = None,
+    atr_multiplier: float = 2.0,
+    min_stop_pct: float = 3.0,
+    max_stop_pct: float = 15.0,
+    history=None
+) -> Dict[str, Dict]:
+    """
+    Trailing stop percentages for many tickers from one price-history fetch.
+
+    Args:
+        tickers: Stock symbols
+        prices: Current price per ticker (missing ones use the last close)
+        atr_multiplier: Multiplier for ATR (default 2.0)
+        min_stop_pct: Minimum trailing stop % (floor, default 3%)
+        max_stop_pct: Maximum trailing stop % (ceiling, default 15%)
+        history: PriceHistoryService to read frames from (default: shared service)
+
+    Returns:
+        Dict of ticker -> calculate_trailing_stop_percent result
+    """
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return {}
+    history = history or get_shared_price_history()
+    prices = dict(prices or {})
+
+    missing_prices = [t for t in tickers if not prices.get(t)]
+    if missing_prices:
+        # One fetch for every ticker, so the ATR pass below reads resident frames
+        frames = history.prefetch(tickers)
+        for ticker in missing_prices:
+            frame = frames.get(ticker)
+            if frame is not None and len(frame):
+                prices[ticker] = float(frame['Close'].iloc[-1])
+
+    atrs = calculate_atrs(tickers, history=history)
+    return {t: trailing_stop_from_atr(t, atrs[t], prices.get(t, 0), atr_multiplier, min_stop_pct, max_stop_pct)
+            for t in tickers}
+
+
+def trailing_stop_from_atr(
+    ticker: str,
+    atr_value: Optional[float],
+    current_price: float,
+    atr_multiplier: float = 2.0,
+    min_stop_pct: float = 3.0,
+    max_stop_pct: float = 15.0
+) -> Dict:
+    """
+    Turn an ATR value into a trailing stop percentage (floor/ceiling applied).
+
+    Returns the same dictionary as calculate_trailing_stop_percent; a missing
+    ATR or price falls back to the fixed 8% stop.
+    """
+    result = {
+        'ticker': ticker,
+        'trail_percent': None,
+        'atr_value': None,
+        'atr_percent': None,
+        'current_price': current_price,
+        'method': None,
+        'success': False
+    }
 
-    if atr_value is None:
+    if atr_value is None or not current_price or current_price <= 0:
         # Fallback to fixed percentage if ATR calculation fails
         result['method'] = 'fallback_default'
         result['trail_percent'] = 8.0
@@ -216,16 +392,8 @@ def analyze_current_positions(positions: list) -> Dict:
     Returns:
         Dictionary mapping ticker to trailing stop analysis
     """
-    analysis = {}
-
-    for pos in positions:
-        ticker = pos.get('ticker')
-        current_price = pos.get('current_price')
-
-        if ticker:
-            analysis[ticker] = calculate_trailing_stop_percent(ticker, current_price)
-
-    return analysis
+    prices = {pos['ticker']: pos.get('current_price') for pos in positions if pos.get('ticker')}
+    return calculate_trailing_stop_percents(list(prices), prices)
 
 
 if __name__ == "__main__":
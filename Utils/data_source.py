@@ -27,6 +27,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
 from Utils.alpaca_client import create_alpaca_client
 from Utils.position_provider import create_position_provider
+from Utils.db_connection import get_connection
 
 
 class DataSource:
@@ -225,7 +226,7 @@ class DataSource:
     def _get_open_positions_from_db(self) -> List[Dict]:
         """Get open positions from database (simulation mode)."""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
 
@@ -247,7 +248,7 @@ class DataSource:
     def _get_position_count_from_db(self) -> int:
         """Get position count from database (simulation mode)."""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -267,7 +268,7 @@ class DataSource:
     def _get_open_tickers_from_db(self) -> List[str]:
         """Get open tickers from database (simulation mode)."""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -288,7 +289,7 @@ class DataSource:
     def _get_deployed_capital_from_db(self) -> float:
         """Get deployed capital from database (simulation mode)."""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -309,7 +310,7 @@ class DataSource:
     def _has_position_in_db(self, ticker: str) -> bool:
         """Check if position exists in database (simulation mode)."""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -329,7 +330,7 @@ class DataSource:
     def _get_position_by_ticker_from_db(self, ticker: str) -> Optional[Dict]:
         """Get position by ticker from database (simulation mode)."""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
 
@@ -352,7 +353,7 @@ class DataSource:
     def _get_account_balance_from_db(self) -> float:
         """Get account balance from database (simulation mode)."""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute("""
@@ -0,0 +1,152 @@
+"""
+DB Connection - Shared, tuned SQLite connections for sentinel.db
+
+Departments used to open a fresh sqlite3 connection per method, in the
+default rollback-journal mode, with a busy timeout on some call sites and
+none on others. The dashboard, automation and compliance hit sentinel.db
+at the same time, so writers blocked readers and every call paid the
+connection setup cost.
+
+get_connection(db_path) is a drop-in for sqlite3.connect(db_path):
+- WAL journal mode (readers no longer block on a writer and vice versa)
+- synchronous=NORMAL (safe with WAL, far fewer fsyncs)
+- mmap_size for memory-mapped reads
+- busy_timeout on every connection
+- Per-thread pool: conn.close() rolls back anything uncommitted, resets
+  row_factory and parks the connection for the next caller on that thread.
+  Nested callers on one thread get separate connections, exactly as before.
+- ':memory:' databases are never pooled (each connect is a fresh database)
+
+Usage:
+    from Utils.db_connection import get_connection
+    conn = get_connection(self.db_path)
+    try:
+        ...
+    finally:
+        conn.close()          # returns it to this thread's pool
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+BUSY_TIMEOUT_SECONDS = 30.0
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+MAX_IDLE_PER_THREAD = 4  # Idle connections kept per (thread, database)
+
+_local = threading.local()
+_stats_lock = threading.Lock()
+_stats = {'opened': 0, 'reused': 0, 'closed': 0}
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3.Connection whose close() hands it back to its thread's pool"""
+
+    _pool: Optional[List['PooledConnection']] = None
+    _file_id: Optional[Tuple[int, int]] = None
+
+    def close(self):
+        pool = self._pool
+        if pool is None:
+            super().close()
+            return
+
+        try:
+            if self.in_transaction:
+                self.rollback()  # Same as closing a plain connection mid-transaction
+            self.row_factory = None
+        except sqlite3.Error:
+            super().close()
+            return
+
+        if len(pool) < MAX_IDLE_PER_THREAD and self not in pool:
+            pool.append(self)
+        else:
+            self.release()
+
+    def release(self):
+        """Really close the underlying connection"""
+        self._pool = None
+        super().close()
+        with _stats_lock:
+            _stats['closed'] += 1
+
+
+def _file_id(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+        return st.st_dev, st.st_ino
+    except OSError:
+        return None
+
+
+def _configure(conn: sqlite3.Connection, timeout: float):
+    conn.execute(f"PRAGMA busy_timeout = {int(timeout * 1000)}")
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+    except sqlite3.Error as e:
+        logger.debug(f"WAL not available ({e}) - keeping default journal mode")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES}")
+
+
+def _pools() -> Dict[str, List[PooledConnection]]:
+    pools = getattr(_local, 'pools', None)
+    if pools is None:
+        pools = _local.pools = {}
+    return pools
+
+
+def get_connection(db_path: Union[str, Path], timeout: float = BUSY_TIMEOUT_SECONDS) -> sqlite3.Connection:
+    """
+    Get a tuned connection to db_path from this thread's pool
+
+    Args:
+        db_path: SQLite database path (':memory:' is supported, unpooled)
+        timeout: Busy timeout in seconds
+
+    Returns:
+        Connection; call close() when done to return it to the pool
+    """
+    path = str(db_path)
+    if path == ':memory:' or path.startswith('file:'):
+        conn = sqlite3.connect(path, timeout=timeout, factory=PooledConnection, uri=path.startswith('file:'))
+        conn.execute(f"PRAGMA busy_timeout = {int(timeout * 1000)}")
+        return conn
+
+    key = os.path.abspath(path)
+    pool = _pools().setdefault(key, [])
+    while pool:
+        conn = pool.pop()
+        # A database file that was deleted or replaced needs a new connection
+        if conn._file_id is not None and conn._file_id == _file_id(key):
+            with _stats_lock:
+                _stats['reused'] += 1
+            return conn
+        conn.release()
+
+    conn = sqlite3.connect(path, timeout=timeout, factory=PooledConnection, check_same_thread=True)
+    _configure(conn, timeout)
+    conn._pool = pool
+    conn._file_id = _file_id(key)
+    with _stats_lock:
+        _stats['opened'] += 1
+    return conn
+
+
+def close_thread_connections():
+    """Close every idle connection this thread has pooled"""
+    for pool in _pools().values():
+        while pool:
+            pool.pop().release()
+
+
+def pool_stats() -> Dict[str, int]:
+    """Process-wide open/reuse/close counters"""
+    with _stats_lock:
+        return dict(_stats)
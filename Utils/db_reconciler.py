@@ -21,8 +21,9 @@ from datetime import datetime
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from alpaca.trading.client import TradingClient
 from config import APCA_API_KEY_ID, APCA_API_SECRET_KEY, APCA_API_BASE_URL
+from Utils.alpaca_session import get_trading_client
+from Utils.db_connection import get_connection
 
 logging.basicConfig(
     level=logging.INFO,
@@ -38,11 +39,7 @@ class DBReconciler:
         """Initialize with database and Alpaca client."""
         self.db_path = db_path
         is_paper = 'paper' in APCA_API_BASE_URL.lower()
-        self.trading_client = TradingClient(
-            APCA_API_KEY_ID,
-            APCA_API_SECRET_KEY,
-            paper=is_paper
-        )
+        self.trading_client = get_trading_client(APCA_API_KEY_ID, APCA_API_SECRET_KEY, paper=is_paper)
         logger.info(f"DBReconciler initialized ({'paper' if is_paper else 'LIVE'} trading)")
 
     def get_alpaca_positions(self) -> Dict[str, Dict]:
@@ -67,7 +64,7 @@ class DBReconciler:
 
     def get_database_open_positions(self) -> List[Dict]:
         """Get all OPEN/PENDING positions from database."""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -152,7 +149,7 @@ class DBReconciler:
 
         # Close stale records (unless dry run)
         if not dry_run and results['stale_records']:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
 
             for pos in results['stale_records']:
@@ -178,7 +175,7 @@ class DBReconciler:
 
     def get_risk_summary(self) -> Dict:
         """Get current portfolio risk from database."""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
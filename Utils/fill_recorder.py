@@ -25,6 +25,8 @@ from alpaca.trading.requests import GetOrdersRequest
 from alpaca.trading.enums import QueryOrderStatus
 
 from config import APCA_API_KEY_ID, APCA_API_SECRET_KEY, APCA_API_BASE_URL
+from Utils.alpaca_session import get_trading_client
+from Utils.db_connection import get_connection
 
 logging.basicConfig(
     level=logging.INFO,
@@ -32,19 +34,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger('FillRecorder')
 
+# Final order statuses; canceled/expired orders may carry a partial fill
+RECORDABLE_STATUSES = {'OrderStatus.FILLED', 'OrderStatus.CANCELED', 'OrderStatus.EXPIRED'}
+
 
 class FillRecorder:
     """Records order fills from Alpaca to the database."""
 
-    def __init__(self, db_path: str = "sentinel.db"):
-        """Initialize with database and Alpaca client."""
+    def __init__(self, db_path: str = "sentinel.db", trading_client: TradingClient = None):
+        """Initialize with database and Alpaca client (an existing client can be passed in)."""
         self.db_path = db_path
         is_paper = 'paper' in APCA_API_BASE_URL.lower()
-        self.trading_client = TradingClient(
-            APCA_API_KEY_ID,
-            APCA_API_SECRET_KEY,
-            paper=is_paper
-        )
+        self.trading_client = trading_client or get_trading_client(APCA_API_KEY_ID, APCA_API_SECRET_KEY,
+                                                                   paper=is_paper)
         logger.info(f"FillRecorder initialized ({'paper' if is_paper else 'LIVE'} trading)")
 
     def get_recent_alpaca_orders(self, days: int = 7, status: str = 'all') -> List[Dict]:
@@ -105,8 +107,31 @@ class FillRecorder:
         Returns:
             Dictionary with sync results
         """
+        # Get filled orders from Alpaca
+        alpaca_orders = self.get_recent_alpaca_orders(days=days, status='closed')
+
+        logger.info(f"Found {len(alpaca_orders)} closed orders in Alpaca (last {days} days)")
+
+        results = self.record_fills(alpaca_orders)
+
+        logger.info(f"Sync complete: {results['fills_recorded']} fills recorded, "
+                   f"{results['orders_updated']} orders updated")
+
+        return results
+
+    def record_fills(self, orders: List[Dict]) -> Dict:
+        """
+        Record fills for orders shaped like get_recent_alpaca_orders() entries.
+
+        Used by sync_fills_to_database and by FillTracker callbacks as each
+        fill event arrives. Orders with no filled shares, or still open, are
+        ignored; canceled/expired orders count with their partial fill.
+
+        Returns:
+            Dictionary with per-outcome counts and errors
+        """
         results = {
-            'orders_checked': 0,
+            'orders_checked': len(orders),
             'fills_recorded': 0,
             'orders_updated': 0,
             'already_recorded': 0,
@@ -114,100 +139,18 @@ class FillRecorder:
             'errors': []
         }
 
-        # Get filled orders from Alpaca
-        alpaca_orders = self.get_recent_alpaca_orders(days=days, status='closed')
-        results['orders_checked'] = len(alpaca_orders)
-
-        logger.info(f"Found {len(alpaca_orders)} closed orders in Alpaca (last {days} days)")
-
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
-        for order in alpaca_orders:
-            # Skip orders that aren't actually filled
-            if order['status'] != 'OrderStatus.FILLED' or order['filled_qty'] == 0:
+        for order in orders:
+            # Skip orders that aren't actually filled (or may still fill more)
+            if order['status'] not in RECORDABLE_STATUSES or not order['filled_qty']:
                 continue
 
             alpaca_id = order['alpaca_order_id']
 
             try:
-                # Find the matching order in our database
-                cursor.execute("""
-                    SELECT id, order_id, ticker, action, quantity, status
-                    FROM trading_orders
-                    WHERE alpaca_order_id = ?
-                """, (alpaca_id,))
-
-                db_order = cursor.fetchone()
-
-                if not db_order:
-                    # Order not in our database (might be from Alpaca directly)
-                    results['no_match_in_db'] += 1
-                    continue
-
-                db_id, order_id, ticker, action, quantity, current_status = db_order
-
-                # Check if fill already recorded
-                cursor.execute("""
-                    SELECT id FROM trading_fills
-                    WHERE order_id = ?
-                """, (db_id,))
-
-                if cursor.fetchone():
-                    results['already_recorded'] += 1
-                    continue
-
-                # Record the fill
-                fill_price = order['filled_avg_price']
-                filled_qty = int(order['filled_qty'])
-                fill_timestamp = order['filled_at']
-
-                # Calculate slippage if we have expected price
-                cursor.execute("""
-                    SELECT limit_price FROM trading_orders WHERE id = ?
-                """, (db_id,))
-                expected_price_row = cursor.fetchone()
-                expected_price = expected_price_row[0] if expected_price_row and expected_price_row[0] else None
-
-                slippage_pct = None
-                slippage_flag = False
-                if expected_price and fill_price:
-                    slippage_pct = ((fill_price - expected_price) / expected_price) * 100
-                    # Flag significant slippage (> 0.5%)
-                    slippage_flag = abs(slippage_pct) > 0.5
-
-                # Insert fill record
-                cursor.execute("""
-                    INSERT INTO trading_fills (
-                        order_id, fill_price, quantity_filled, commission,
-                        fill_timestamp, expected_price, slippage_pct, slippage_flag,
-                        alpaca_fill_id, created_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
-                """, (
-                    db_id,
-                    fill_price,
-                    filled_qty,
-                    0.0,  # Commission (Alpaca is commission-free)
-                    fill_timestamp,
-                    expected_price,
-                    slippage_pct,
-                    slippage_flag,
-                    alpaca_id  # Using order ID as fill ID
-                ))
-
-                results['fills_recorded'] += 1
-                logger.info(f"Recorded fill: {ticker} {action} {filled_qty} @ ${fill_price:.2f}")
-
-                # Update order status to FILLED
-                if current_status != 'FILLED':
-                    cursor.execute("""
-                        UPDATE trading_orders
-                        SET status = 'FILLED', updated_at = datetime('now')
-                        WHERE id = ?
-                    """, (db_id,))
-                    results['orders_updated'] += 1
-                    logger.info(f"Updated order status to FILLED: {order_id}")
-
+                self._record_fill(cursor, order, results)
             except Exception as e:
                 error_msg = f"Error processing order {alpaca_id}: {e}"
                 logger.error(error_msg)
@@ -216,14 +159,92 @@ class FillRecorder:
         conn.commit()
         conn.close()
 
-        logger.info(f"Sync complete: {results['fills_recorded']} fills recorded, "
-                   f"{results['orders_updated']} orders updated")
-
         return results
 
+    def _record_fill(self, cursor, order: Dict, results: Dict):
+        """Insert one fill and mark its order FILLED"""
+        alpaca_id = order['alpaca_order_id']
+
+        # Find the matching order in our database
+        cursor.execute("""
+            SELECT id, order_id, ticker, action, quantity, status
+            FROM trading_orders
+            WHERE alpaca_order_id = ?
+        """, (alpaca_id,))
+
+        db_order = cursor.fetchone()
+
+        if not db_order:
+            # Order not in our database (might be from Alpaca directly)
+            results['no_match_in_db'] += 1
+            return
+
+        db_id, order_id, ticker, action, quantity, current_status = db_order
+
+        # Check if fill already recorded
+        cursor.execute("""
+            SELECT id FROM trading_fills
+            WHERE order_id = ?
+        """, (db_id,))
+
+        if cursor.fetchone():
+            results['already_recorded'] += 1
+            return
+
+        # Record the fill
+        fill_price = order['filled_avg_price']
+        filled_qty = int(order['filled_qty'])
+        fill_timestamp = order['filled_at']
+
+        # Calculate slippage if we have expected price
+        cursor.execute("""
+            SELECT limit_price FROM trading_orders WHERE id = ?
+        """, (db_id,))
+        expected_price_row = cursor.fetchone()
+        expected_price = expected_price_row[0] if expected_price_row and expected_price_row[0] else None
+
+        slippage_pct = None
+        slippage_flag = False
+        if expected_price and fill_price:
+            slippage_pct = ((fill_price - expected_price) / expected_price) * 100
+            # Flag significant slippage (> 0.5%)
+            slippage_flag = abs(slippage_pct) > 0.5
+
+        # Insert fill record
+        cursor.execute("""
+            INSERT INTO trading_fills (
+                order_id, fill_price, quantity_filled, commission,
+                fill_timestamp, expected_price, slippage_pct, slippage_flag,
+                alpaca_fill_id, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+        """, (
+            db_id,
+            fill_price,
+            filled_qty,
+            0.0,  # Commission (Alpaca is commission-free)
+            fill_timestamp,
+            expected_price,
+            slippage_pct,
+            slippage_flag,
+            alpaca_id  # Using order ID as fill ID
+        ))
+
+        results['fills_recorded'] += 1
+        logger.info(f"Recorded fill: {ticker} {action} {filled_qty} @ ${fill_price:.2f}")
+
+        # Update order status to FILLED
+        if current_status != 'FILLED':
+            cursor.execute("""
+                UPDATE trading_orders
+                SET status = 'FILLED', updated_at = datetime('now')
+                WHERE id = ?
+            """, (db_id,))
+            results['orders_updated'] += 1
+            logger.info(f"Updated order status to FILLED: {order_id}")
+
     def get_fill_summary(self, days: int = 30) -> Dict:
         """Get summary of recorded fills."""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
         # Total fills
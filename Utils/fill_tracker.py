@@ -0,0 +1,347 @@
+"""
+Fill Tracker - Event-driven order fill tracking
+
+CEO used to poll get_orders(status=OPEN, symbols=[ticker]) once per ticker
+every 2 seconds, with a fresh TradingClient per wait - hundreds of REST calls
+for a 20-order plan and up to 2s of extra latency per phase.
+
+The tracker resolves one Future per order the moment its terminal event
+arrives:
+- Alpaca trade-updates websocket (TradingStream) when available
+- Otherwise (or if the stream drops) OrderPoller: one all-symbols open-orders
+  query per poll, plus one closed-orders query when tracked orders leave it
+- on_fill callbacks run once per filled order (FillRecorder, realism entry
+  dates, ...), including partial fills of orders canceled or expired later
+- Events that arrive before track() is called are buffered, so orders can be
+  registered after submission without racing the fill
+
+Usage:
+    tracker = create_alpaca_fill_tracker(trading_client, on_fill=[handle_fill])
+    tracker.start()
+    future = tracker.track(order_id, 'AAPL')      # asyncio.wrap_future(future) to await
+    done, pending = tracker.wait([order_id], timeout=60)
+    tracker.stop()
+"""
+
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import Future, wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+logger = logging.getLogger(__name__)
+
+# Trade-update events after which an order never changes again
+TERMINAL_EVENTS = {'fill', 'canceled', 'expired', 'rejected'}
+
+# Order status (REST) -> trade-update event
+STATUS_EVENTS = {'filled': 'fill', 'canceled': 'canceled', 'expired': 'expired', 'rejected': 'rejected'}
+EVENT_STATUSES = {event: status for status, event in STATUS_EVENTS.items()}
+
+POLL_INTERVAL_SECONDS = 2.0
+RECONCILE_INTERVAL_SECONDS = 10.0  # Stream mode: poll pending orders this often while waiting
+MAX_BUFFERED_EVENTS = 1000         # Terminal events kept for orders not tracked yet
+
+
+def _enum_value(value) -> str:
+    return str(getattr(value, 'value', value) or '').lower()
+
+
+@dataclass
+class FillEvent:
+    """Terminal (or partial) state of one order"""
+    order_id: str
+    symbol: str
+    side: str            # 'buy' / 'sell'
+    event: str           # 'fill', 'partial_fill', 'canceled', 'expired', 'rejected'
+    filled_qty: float = 0.0
+    filled_avg_price: Optional[float] = None
+    filled_at: Optional[str] = None
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.event in TERMINAL_EVENTS
+
+    @property
+    def has_fill(self) -> bool:
+        """Some shares filled (a canceled/expired order may be partially filled)"""
+        return self.filled_qty > 0
+
+    @property
+    def action(self) -> str:
+        """'BUY' / 'SELL' as used in trading_orders"""
+        return self.side.upper()
+
+    @classmethod
+    def from_order(cls, order, event: Optional[str] = None) -> 'FillEvent':
+        """Build from an Alpaca Order (event defaults to the one its status implies)"""
+        if event is None:
+            status = _enum_value(order.status)
+            event = STATUS_EVENTS.get(status, status)
+        return cls(
+            order_id=str(order.id),
+            symbol=order.symbol,
+            side=_enum_value(order.side),
+            event=event,
+            filled_qty=float(order.filled_qty) if order.filled_qty else 0.0,
+            filled_avg_price=float(order.filled_avg_price) if order.filled_avg_price else None,
+            filled_at=order.filled_at.isoformat() if order.filled_at else None,
+        )
+
+    @classmethod
+    def from_trade_update(cls, update) -> 'FillEvent':
+        """Build from an Alpaca TradeUpdate websocket message"""
+        return cls.from_order(update.order, event=_enum_value(update.event))
+
+    def to_order_dict(self) -> Dict:
+        """Same shape as FillRecorder.get_recent_alpaca_orders() entries"""
+        return {
+            'alpaca_order_id': self.order_id,
+            'symbol': self.symbol,
+            'side': self.side,
+            'filled_qty': self.filled_qty,
+            'filled_avg_price': self.filled_avg_price,
+            'status': f"OrderStatus.{EVENT_STATUSES.get(self.event, self.event).upper()}",
+            'filled_at': self.filled_at,
+        }
+
+
+class OrderPoller:
+    """REST fallback: at most two all-symbol order queries per poll"""
+
+    def __init__(self, trading_client, since: Optional[datetime] = None):
+        self.trading_client = trading_client
+        self.since = since or datetime.now(timezone.utc) - timedelta(minutes=5)
+        self.requests = 0
+
+    def poll(self, order_ids: Iterable[str]) -> List[FillEvent]:
+        """Terminal events for tracked orders that are no longer open"""
+        order_ids = list(order_ids)
+        if not order_ids:
+            return []
+        open_ids = {str(o.id) for o in self._list_orders('open')}
+        finished = [i for i in order_ids if i not in open_ids]
+        if not finished:
+            return []
+        closed = {str(o.id): o for o in self._list_orders('closed')}
+        events = []
+        for order_id in finished:
+            order = closed.get(order_id)
+            if order is not None:
+                events.append(FillEvent.from_order(order))
+        return events
+
+    def _list_orders(self, status: str) -> list:
+        from alpaca.trading.requests import GetOrdersRequest
+        from alpaca.trading.enums import QueryOrderStatus
+
+        self.requests += 1
+        query_status = QueryOrderStatus.OPEN if status == 'open' else QueryOrderStatus.CLOSED
+        return self.trading_client.get_orders(
+            filter=GetOrdersRequest(status=query_status, after=self.since, limit=500))
+
+
+class FillTracker:
+    """
+    Resolves a Future per order from a trade-update stream or a poller
+
+    Thread-safe; callbacks run on the stream/poll thread (or the caller's
+    thread for handle_update).
+    """
+
+    def __init__(self, stream=None, poller: Optional[OrderPoller] = None,
+                 on_fill: Optional[List[Callable[[FillEvent], None]]] = None,
+                 poll_interval: float = POLL_INTERVAL_SECONDS,
+                 reconcile_interval: float = RECONCILE_INTERVAL_SECONDS):
+        """
+        Args:
+            stream: Alpaca TradingStream-compatible object (subscribe_trade_updates/run/stop)
+            poller: OrderPoller-compatible object (poll(order_ids) -> events);
+                used when there is no stream, when it drops, and to catch up
+                on orders the stream missed while wait() is blocked
+            on_fill: Callbacks run once per order with filled shares (fully
+                filled, or partially filled before it was canceled/expired)
+            poll_interval: Seconds between polls
+            reconcile_interval: Stream mode - seconds between catch-up polls in wait()
+        """
+        if stream is None and poller is None:
+            raise ValueError("FillTracker needs a stream or a poller")
+        self.stream = stream
+        self.poller = poller
+        self.on_fill = list(on_fill or [])
+        self.poll_interval = poll_interval
+        self.reconcile_interval = reconcile_interval
+        self._futures: Dict[str, Future] = {}
+        self._symbols: Dict[str, str] = {}
+        self._seen: Dict[str, FillEvent] = {}  # Terminal events not tracked (yet)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.mode = 'stream' if stream is not None else 'poll'
+
+    def start(self):
+        """Start listening (stream thread or poll thread)"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        if self.stream is not None:
+            self.stream.subscribe_trade_updates(self._on_trade_update)
+            target = self._run_stream
+        else:
+            target = self._poll_loop
+        self._thread = threading.Thread(target=target, name='fill-tracker', daemon=True)
+        self._thread.start()
+        logger.info(f"Fill tracker started ({self.mode})")
+
+    def stop(self):
+        """Stop listening; unresolved futures stay pending"""
+        self._stop.set()
+        if self.stream is not None and self.mode == 'stream':
+            try:
+                self.stream.stop()
+            except Exception as e:
+                logger.debug(f"Stream stop failed: {e}")
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run_stream(self):
+        try:
+            self.stream.run()
+        except Exception as e:
+            logger.warning(f"Trade-update stream failed ({e})")
+        if not self._stop.is_set() and self.poller is not None:
+            logger.warning("Trade-update stream ended - falling back to polling")
+            self.mode = 'poll'
+            self._poll_loop()
+
+    def _poll_loop(self):
+        while not self._stop.is_set():
+            self.poll_once()
+            self._stop.wait(self.poll_interval)
+
+    async def _on_trade_update(self, update):
+        self.handle_update(FillEvent.from_trade_update(update))
+
+    def poll_once(self) -> int:
+        """Poll pending orders once; returns events applied"""
+        with self._lock:
+            pending = [i for i, f in self._futures.items() if not f.done()]
+        if not pending:
+            return 0
+        try:
+            events = self.poller.poll(pending)
+        except Exception as e:
+            logger.warning(f"Order poll failed: {e}")
+            return 0
+        for event in events:
+            self.handle_update(event)
+        return len(events)
+
+    def handle_update(self, event: FillEvent):
+        """Apply one order event (resolves its Future if terminal)"""
+        if not event.is_terminal:
+            logger.debug(f"{event.symbol} {event.event}: {event.filled_qty:g} filled so far")
+            return
+
+        with self._lock:
+            future = self._futures.get(event.order_id)
+            if future is None:
+                self._seen[event.order_id] = event
+                if len(self._seen) > MAX_BUFFERED_EVENTS:
+                    self._seen.pop(next(iter(self._seen)))
+                return
+            if future.done():
+                return  # Duplicate (stream + reconcile poll)
+            future.set_result(event)
+
+        self._dispatch(event)
+
+    def _dispatch(self, event: FillEvent):
+        if event.has_fill:
+            partial = '' if event.event == 'fill' else f" (partial, then {event.event})"
+            logger.info(f"Filled: {event.symbol} {event.action} {event.filled_qty:g} @ "
+                        f"${event.filled_avg_price or 0:.2f}{partial}")
+            for callback in self.on_fill:
+                try:
+                    callback(event)
+                except Exception as e:
+                    logger.error(f"Fill callback failed for {event.symbol}: {e}", exc_info=True)
+        else:
+            logger.warning(f"Order {event.order_id} ({event.symbol}) ended without fill: {event.event}")
+
+    def track(self, order_id: str, symbol: str = '') -> Future:
+        """Future resolving to the order's terminal FillEvent"""
+        order_id = str(order_id)
+        with self._lock:
+            future = self._futures.get(order_id)
+            if future is not None:
+                return future
+            future = self._futures[order_id] = Future()
+            self._symbols[order_id] = symbol
+            early = self._seen.pop(order_id, None)
+            if early is not None:
+                future.set_result(early)
+        if early is not None:
+            self._dispatch(early)
+        return future
+
+    def wait(self, order_ids: Iterable[str], timeout: float = 60) -> Tuple[Set[str], Set[str]]:
+        """
+        Block until the orders are terminal or timeout
+
+        Returns:
+            (done order ids, pending order ids)
+        """
+        futures = {self.track(i): str(i) for i in order_ids}
+        start = time.monotonic()
+        deadline = start + timeout
+        while True:
+            remaining = max(0.0, deadline - time.monotonic())
+            if self.mode == 'stream' and self.poller is not None:
+                done, pending = wait(list(futures), timeout=min(remaining, self.reconcile_interval))
+                if pending:
+                    # Catch anything the stream missed (e.g. filled before it connected)
+                    self.poll_once()
+                    done, pending = wait(list(futures), timeout=0)
+            else:
+                done, pending = wait(list(futures), timeout=remaining)
+            if not pending or time.monotonic() >= deadline:
+                break
+
+        done_ids = {futures[f] for f in done}
+        pending_ids = {futures[f] for f in pending}
+        elapsed = time.monotonic() - start
+        if pending_ids:
+            logger.warning(f"{len(pending_ids)} orders not terminal after {elapsed:.1f}s: "
+                           f"{', '.join(sorted(self._symbols.get(i) or i for i in pending_ids))}")
+        else:
+            logger.info(f"{len(done_ids)} orders terminal in {elapsed:.1f}s")
+        return done_ids, pending_ids
+
+
+def create_alpaca_fill_tracker(trading_client, on_fill: Optional[List[Callable[[FillEvent], None]]] = None,
+                               use_stream: bool = True) -> FillTracker:
+    """
+    Fill tracker on the Alpaca trade-updates stream, polling trading_client
+    as fallback (and only polling if the stream cannot be created)
+    """
+    poller = OrderPoller(trading_client)
+    stream = None
+    if use_stream:
+        try:
+            from alpaca.trading.stream import TradingStream
+            from config import APCA_API_KEY_ID, APCA_API_SECRET_KEY, APCA_API_BASE_URL
+
+            stream = TradingStream(APCA_API_KEY_ID, APCA_API_SECRET_KEY,
+                                   paper='paper' in APCA_API_BASE_URL.lower())
+        except Exception as e:
+            logger.warning(f"Trade-update stream unavailable ({e}) - polling instead")
+    return FillTracker(stream=stream, poller=poller, on_fill=on_fill)
@@ -0,0 +1,350 @@
+"""
+Fundamentals Store - Persistent yfinance .info cache with multi-day TTL
+
+yfinance's Ticker.info is one slow, rate-limited HTTP call per ticker, for
+data that changes quarterly. This store keeps the fields Sentinel actually
+reads in SQLite so a warm run needs zero network calls.
+
+Features:
+- Keyed by ticker, stores only FUNDAMENTAL_FIELDS (+ sector)
+- Multi-day TTL (default 7 days); stale rows are still served
+- Bulk read for a list of tickers (one query per SQLite parameter chunk)
+- Misses and stale entries fetched through the shared InfoFetcher
+  (concurrent, rate-limited)
+- Failed fetches cached with a short negative TTL (default 12 hours)
+- Background refresh of stale entries on a daemon thread; stale tickers
+  seen while a refresh is running are queued for it
+- Hit/stale/miss counters and age stats for reporting
+
+Usage:
+    store = FundamentalsStore("sentinel.db", ttl_days=7)
+    info = store.load(['AAPL', 'MSFT'])      # fetches misses synchronously
+    store.refresh_stale_in_background()       # stale rows refresh off-thread
+    store.stats()                             # hit rate + ages for the briefing
+"""
+
+import json
+import logging
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils.info_fetcher import InfoFetcher, get_shared_fetcher
+from Utils.db_connection import get_connection
+
+logger = logging.getLogger(__name__)
+
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER is 999 on older builds
+SQLITE_PARAM_CHUNK = 900
+
+# yfinance .info keys read by ResearchDepartment._calculate_fundamental_score
+FUNDAMENTAL_FIELDS = (
+    'sector',
+    'returnOnEquity',
+    'profitMargins',
+    'trailingPE',
+    'priceToBook',
+    'revenueGrowth',
+    'earningsGrowth',
+    'debtToEquity',
+    'currentRatio',
+)
+
+
+class FundamentalsStore:
+    """
+    SQLite-backed cache of per-ticker fundamentals
+    """
+
+    def __init__(self, db_path: str = "sentinel.db", ttl_days: float = 7,
+                 info_fetcher: Optional[InfoFetcher] = None,
+                 failure_ttl_hours: float = 12):
+        """
+        Args:
+            db_path: Path to SQLite database
+            ttl_days: Days before an entry is considered stale
+            failure_ttl_hours: Hours before a failed fetch is retried
+            info_fetcher: Fetcher for network lookups (defaults to the
+                          process-wide shared fetcher)
+        """
+        self.db_path = db_path
+        self.ttl_days = ttl_days
+        self.failure_ttl_hours = failure_ttl_hours
+        self.info_fetcher = info_fetcher or get_shared_fetcher()
+
+        self._stale: List[str] = []
+        self._refresh_queue: List[str] = []
+        self._refresh_lock = threading.Lock()
+        self._refresh_running = False
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._reset_stats()
+        self._initialize_table()
+
+    def _initialize_table(self):
+        conn = get_connection(self.db_path)
+        try:
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS fundamentals_cache (
+                        ticker TEXT PRIMARY KEY,
+                        sector TEXT,
+                        fields_json TEXT NOT NULL,
+                        fetched_at TEXT NOT NULL,
+                        expires_at TEXT NOT NULL
+                    )
+                """)
+        finally:
+            conn.close()
+
+    def _reset_stats(self):
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.fetch_failures = 0
+        self._ages_hours: List[float] = []
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_many(self, tickers: List[str]) -> Dict[str, Dict]:
+        """
+        Bulk read cached entries (fresh and stale)
+
+        Returns:
+            Dict of ticker -> {'fields': {...}, 'fetched_at': datetime, 'stale': bool}
+            ('fields' is None for a cached fetch failure)
+        """
+        entries = {}
+        if not tickers:
+            return entries
+
+        now = datetime.now()
+        conn = get_connection(self.db_path)
+        try:
+            for i in range(0, len(tickers), SQLITE_PARAM_CHUNK):
+                chunk = tickers[i:i + SQLITE_PARAM_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(f"""
+                    SELECT ticker, fields_json, fetched_at, expires_at
+                    FROM fundamentals_cache
+                    WHERE ticker IN ({placeholders})
+                """, chunk).fetchall()
+
+                for ticker, fields_json, fetched_at, expires_at in rows:
+                    entries[ticker] = {
+                        'fields': json.loads(fields_json),
+                        'fetched_at': datetime.fromisoformat(fetched_at),
+                        'stale': datetime.fromisoformat(expires_at) <= now
+                    }
+        finally:
+            conn.close()
+
+        return entries
+
+    def load(self, tickers: List[str]) -> Dict[str, Dict]:
+        """
+        Get fundamentals for a list of tickers, fetching only true misses
+
+        - Fresh entries: served from SQLite
+        - Stale entries: served from SQLite, queued for background refresh
+        - Cached failures: skipped until their negative TTL expires
+        - Misses and expired failures: fetched synchronously and stored
+
+        Returns:
+            Dict of ticker -> fields dict (tickers whose fetch failed are omitted)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        now = datetime.now()
+        entries = self.get_many(tickers)
+
+        result = {}
+        misses = []
+        for ticker in tickers:
+            entry = entries.get(ticker)
+            if entry is None:
+                misses.append(ticker)
+                continue
+
+            if entry['fields'] is None:
+                if entry['stale']:
+                    misses.append(ticker)
+                else:
+                    self.negative_hits += 1
+                continue
+
+            result[ticker] = entry['fields']
+            self._ages_hours.append((now - entry['fetched_at']).total_seconds() / 3600)
+            if entry['stale']:
+                self.stale_hits += 1
+                if ticker not in self._stale:
+                    self._stale.append(ticker)
+            else:
+                self.hits += 1
+
+        self.misses += len(misses)
+        if misses:
+            fetched = self.fetch_and_store(misses)
+            result.update(fetched)
+
+        return result
+
+    # ------------------------------------------------------------------
+    # Writes / refresh
+    # ------------------------------------------------------------------
+
+    def put_many(self, infos: Dict[str, Dict]):
+        """Store the FUNDAMENTAL_FIELDS subset of each info dict (one transaction)"""
+        now = datetime.now()
+        expires_at = now + timedelta(days=self.ttl_days)
+
+        rows = []
+        for ticker, info in infos.items():
+            fields = {key: info.get(key) for key in FUNDAMENTAL_FIELDS}
+            rows.append((ticker, fields.get('sector'), json.dumps(fields),
+                         now.isoformat(), expires_at.isoformat()))
+
+        conn = get_connection(self.db_path)
+        try:
+            with conn:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO fundamentals_cache
+                    (ticker, sector, fields_json, fetched_at, expires_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, rows)
+        finally:
+            conn.close()
+
+    def put_failures(self, tickers: List[str]):
+        """Record failed fetches so they are not retried until failure_ttl_hours"""
+        now = datetime.now()
+        expires_at = now + timedelta(hours=self.failure_ttl_hours)
+        rows = [(ticker, 'null', now.isoformat(), expires_at.isoformat()) for ticker in tickers]
+
+        conn = get_connection(self.db_path)
+        try:
+            with conn:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO fundamentals_cache
+                    (ticker, sector, fields_json, fetched_at, expires_at)
+                    VALUES (?, NULL, ?, ?, ?)
+                """, rows)
+        finally:
+            conn.close()
+
+    def fetch_and_store(self, tickers: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch tickers from the network and store them
+
+        Failed tickers are stored as negative entries (see put_failures).
+
+        Returns:
+            Dict of ticker -> fields dict for successful fetches
+        """
+        infos, _ = self.info_fetcher.fetch_many(tickers)
+        failed = [ticker for ticker in tickers if ticker not in infos]
+        self.fetch_failures += len(failed)
+        if failed:
+            logger.debug(f"Fundamentals fetch failed for {len(failed)} tickers")
+
+        fetched = {ticker: {key: info.get(key) for key in FUNDAMENTAL_FIELDS}
+                   for ticker, info in infos.items()}
+
+        try:
+            if fetched:
+                self.put_many(fetched)
+            if failed:
+                self.put_failures(failed)
+        except Exception as e:
+            logger.warning(f"Failed to store fundamentals for {len(tickers)} tickers - {e}")
+
+        return fetched
+
+    def refresh_stale_in_background(self) -> Optional[threading.Thread]:
+        """
+        Refresh every stale entry seen by load() on a daemon thread
+
+        If a refresh is already running, the new stale tickers are queued
+        and picked up by that thread before it exits.
+
+        Returns:
+            The refresh thread, or None if nothing is stale
+        """
+        stale, self._stale = self._stale, []
+
+        with self._refresh_lock:
+            for ticker in stale:
+                if ticker not in self._refresh_queue:
+                    self._refresh_queue.append(ticker)
+
+            if self._refresh_running:
+                if stale:
+                    logger.debug(f"Fundamentals refresh already running - queued {len(stale)} tickers")
+                return self._refresh_thread
+
+            if not self._refresh_queue:
+                return None
+
+            self._refresh_running = True
+            self._refresh_thread = threading.Thread(target=self._drain_refresh_queue,
+                                                    name="FundamentalsRefresh", daemon=True)
+
+        logger.info(f"Refreshing {len(self._refresh_queue)} stale fundamentals in background")
+        self._refresh_thread.start()
+        return self._refresh_thread
+
+    def _drain_refresh_queue(self):
+        """Refresh queued tickers until the queue is empty"""
+        requested = updated = 0
+        try:
+            while True:
+                with self._refresh_lock:
+                    batch, self._refresh_queue = self._refresh_queue, []
+                    if not batch:
+                        self._refresh_running = False
+                        break
+                requested += len(batch)
+                updated += len(self.fetch_and_store(batch))
+        except Exception as e:
+            logger.warning(f"Background fundamentals refresh failed - {e}")
+            with self._refresh_lock:
+                self._refresh_running = False
+
+        logger.info(f"Background fundamentals refresh: {updated}/{requested} tickers updated")
+
+    def wait_for_refresh(self, timeout: Optional[float] = None):
+        """Block until a background refresh (if any) finishes"""
+        if self._refresh_thread is not None:
+            self._refresh_thread.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict:
+        """Hit rate and cache age stats since the last reset_stats()"""
+        lookups = self.hits + self.stale_hits + self.negative_hits + self.misses
+        ages = self._ages_hours
+        return {
+            'lookups': lookups,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'negative_hits': self.negative_hits,
+            'fetch_failures': self.fetch_failures,
+            'hit_rate': round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+            'avg_age_hours': round(sum(ages) / len(ages), 1) if ages else 0.0,
+            'max_age_hours': round(max(ages), 1) if ages else 0.0,
+            'ttl_days': self.ttl_days,
+        }
+
+    def reset_stats(self):
+        """Clear counters (call at the start of each run)"""
+        self._reset_stats()
@@ -0,0 +1,235 @@
+"""
+Info Fetcher - Concurrent, rate-limited yfinance .info lookups
+
+Ticker.info is one blocking HTTP round trip per symbol. Doing them one
+after another leaves most of the yfinance quota unused; doing them all at
+once gets the IP throttled. This module sits in between:
+
+Features:
+- Bounded thread pool (max_workers concurrent lookups)
+- Token-bucket rate limiter shared by every worker (rate_per_second, burst)
+- Per-ticker timeout on each attempt
+- Retry with exponential backoff + jitter
+- fetch_many(tickers) -> ({ticker: info}, {ticker: error})
+- One process-wide shared fetcher so every caller draws on the same quota
+
+Usage:
+    from Utils.info_fetcher import get_shared_fetcher
+    infos, errors = get_shared_fetcher().fetch_many(['AAPL', 'MSFT', 'NVDA'])
+
+    configure_shared_fetcher(max_workers=16, rate_per_second=8)  # tune quota
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import yfinance as yf
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_RATE_PER_SECOND = 4.0
+DEFAULT_TIMEOUT_SECONDS = 15.0
+DEFAULT_MAX_RETRIES = 2
+
+
+def fetch_info(ticker: str) -> Dict:
+    """Fetch one ticker's .info from yfinance (network call)"""
+    return yf.Ticker(ticker).info or {}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    Tokens refill continuously at `rate` per second up to `capacity`;
+    acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _call_with_timeout(func: Callable[[str], Dict], ticker: str, timeout: float,
+                       slots: threading.Semaphore) -> Dict:
+    """
+    Run func(ticker) with a wall-clock timeout
+
+    yfinance exposes no timeout for .info, so the call runs on a daemon
+    thread; on timeout the thread is abandoned and TimeoutError is raised.
+    The call holds one of `slots` until it really finishes, so abandoned
+    calls still count against the concurrency limit.
+    """
+    if not slots.acquire(timeout=timeout):
+        raise TimeoutError(f"{ticker}: no free info worker within {timeout:.0f}s "
+                           f"(earlier lookups still hung)")
+    outcome = {}
+
+    def _run():
+        try:
+            outcome['value'] = func(ticker)
+        except BaseException as e:
+            outcome['error'] = e
+        finally:
+            slots.release()
+
+    worker = threading.Thread(target=_run, name=f"info-{ticker}", daemon=True)
+    worker.start()
+    worker.join(timeout)
+
+    if worker.is_alive():
+        raise TimeoutError(f"{ticker}: info lookup exceeded {timeout:.0f}s")
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['value']
+
+
+class InfoFetcher:
+    """
+    Bounded, rate-limited concurrent fetcher for per-ticker info dicts
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 rate_per_second: float = DEFAULT_RATE_PER_SECOND,
+                 burst: Optional[float] = None,
+                 timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_seconds: float = 1.0,
+                 fetch: Callable[[str], Dict] = fetch_info,
+                 label: str = "info"):
+        """
+        Args:
+            max_workers: Maximum concurrent lookups
+            rate_per_second: Sustained request rate across all workers
+            burst: Token bucket capacity (defaults to rate_per_second)
+            timeout: Seconds allowed per attempt
+            max_retries: Retries after the first attempt
+            backoff_seconds: Base delay for exponential backoff (jittered)
+            fetch: Function ticker -> info dict (injectable for tests)
+            label: What is being fetched, for log lines
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.timeout = timeout
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_seconds = backoff_seconds
+        self.fetch = fetch
+        self.label = label
+        self.limiter = TokenBucket(rate_per_second, burst)
+        self._slots = threading.Semaphore(self.max_workers)  # Calls in flight, hung ones included
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="InfoFetcher")
+            return self._executor
+
+    def fetch_one(self, ticker: str) -> Dict:
+        """
+        Fetch one ticker with rate limiting, timeout and retries
+
+        A timed-out attempt is not retried: its call may still be running.
+
+        Raises:
+            The last attempt's exception if every attempt fails
+        """
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                return _call_with_timeout(self.fetch, ticker, self.timeout, self._slots)
+            except TimeoutError:
+                raise
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff_seconds * (2 ** attempt) * random.uniform(0.5, 1.5)
+                logger.debug(f"{ticker}: {self.label} attempt {attempt + 1} failed ({e}) - retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def fetch_many(self, tickers: List[str]) -> Tuple[Dict[str, Dict], Dict[str, Exception]]:
+        """
+        Fetch info for many tickers concurrently
+
+        Returns:
+            (infos, errors): ticker -> info for successful lookups (input
+            order), and ticker -> final exception for failed ones
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}, {}
+
+        start = time.time()
+        executor = self._get_executor()
+        futures = {ticker: executor.submit(self.fetch_one, ticker) for ticker in tickers}
+
+        results = {}
+        errors = {}
+        for ticker, future in futures.items():
+            try:
+                results[ticker] = future.result()
+            except Exception as e:
+                errors[ticker] = e
+
+        elapsed = time.time() - start
+        logger.info(f"Fetched {self.label} for {len(results)}/{len(tickers)} tickers in {elapsed:.1f}s "
+                    f"({self.max_workers} workers, {self.limiter.rate:g}/s)")
+        return results, errors
+
+    def shutdown(self):
+        """Stop the worker pool (a new one is created on next use)"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+
+_shared_fetcher: Optional[InfoFetcher] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_fetcher() -> InfoFetcher:
+    """Process-wide fetcher (all callers share one pool and one rate limit)"""
+    global _shared_fetcher
+    with _shared_lock:
+        if _shared_fetcher is None:
+            _shared_fetcher = InfoFetcher()
+        return _shared_fetcher
+
+
+def configure_shared_fetcher(**kwargs) -> InfoFetcher:
+    """
+    Replace the shared fetcher with one built from InfoFetcher kwargs
+
+    Example:
+        configure_shared_fetcher(max_workers=16, rate_per_second=8)
+    """
+    global _shared_fetcher
+    with _shared_lock:
+        if _shared_fetcher is not None:
+            _shared_fetcher.shutdown()
+        _shared_fetcher = InfoFetcher(**kwargs)
+        return _shared_fetcher
@@ -5,7 +5,8 @@ Provides real-time and historical market data via yfinance API
 Features:
 - Current price fetching with retry logic
 - Historical price data for technical analysis
-- Stock fundamentals (sector, market cap, PE ratio)
+- Stock fundamentals (sector, market cap, PE ratio), fetched concurrently
+  through the shared rate-limited InfoFetcher
 - Benchmark data (SPY, QQQ) for performance comparison
 - Circuit breaker pattern for API failure handling
 - Caching to reduce API calls
@@ -24,6 +25,12 @@ from typing import Dict, List, Optional, Tuple
 from functools import wraps
 from pathlib import Path
 import json
+import sys
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils.info_fetcher import InfoFetcher, get_shared_fetcher
 
 # Configure logging
 logging.basicConfig(
@@ -119,9 +126,11 @@ class MarketDataProvider:
     - Circuit breaker for API failures
     """
 
-    def __init__(self, cache_dir: Path = None, enable_cache: bool = True):
+    def __init__(self, cache_dir: Path = None, enable_cache: bool = True,
+                 info_fetcher: InfoFetcher = None):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.enable_cache = enable_cache
+        self.info_fetcher = info_fetcher or get_shared_fetcher()
 
         # Setup cache directory
         if cache_dir is None:
@@ -251,11 +260,31 @@ class MarketDataProvider:
         Returns:
             Dict with sector, industry, market_cap, pe_ratio, etc.
         """
-        try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+        return self.get_stock_infos([ticker])[ticker]
+
+    def get_stock_infos(self, tickers: List[str]) -> Dict[str, Dict]:
+        """
+        Get stock fundamentals for many tickers concurrently
 
-            return {
+        Args:
+            tickers: Stock ticker symbols
+
+        Returns:
+            Dict of ticker -> info dict (same shape as get_stock_info;
+            failed lookups get the Unknown placeholder)
+        """
+        infos, errors = self.info_fetcher.fetch_many(tickers)
+
+        results = {}
+        for ticker in tickers:
+            info = infos.get(ticker)
+            if info is None:
+                error = errors.get(ticker)
+                self.logger.error(f"Failed to get info for {ticker}: {error}")
+                results[ticker] = {'ticker': ticker, 'sector': 'Unknown', 'industry': 'Unknown'}
+                continue
+
+            results[ticker] = {
                 'ticker': ticker,
                 'sector': info.get('sector', 'Unknown'),
                 'industry': info.get('industry', 'Unknown'),
@@ -269,9 +298,7 @@ class MarketDataProvider:
                 'avg_volume': info.get('averageVolume', None)
             }
 
-        except Exception as e:
-            self.logger.error(f"Failed to get info for {ticker}: {e}")
-            return {'ticker': ticker, 'sector': 'Unknown', 'industry': 'Unknown'}
+        return results
 
     def get_benchmark_return(self, benchmark: str = 'SPY', start_date: datetime = None,
                             end_date: datetime = None, period_days: int = 30) -> Tuple[float, Dict]:
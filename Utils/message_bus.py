@@ -0,0 +1,511 @@
+"""
+Message Bus - Transactional department messaging in sentinel.db
+
+Departments used to exchange Markdown files: the sender wrote YAML
+frontmatter + body + a ```json block into an Inbox/Outbox folder, and the
+receiver globbed the folder, sorted by mtime, re-parsed YAML and regexed the
+JSON back out, then renamed the file into Archive/. Every message cost
+several file-system round trips and nothing stopped two consumers from
+picking up the same file.
+
+The bus keeps the same message shape in one SQLite table:
+- department_messages, indexed on (to_dept, status, priority, created_at)
+- send(): one INSERT; payloads are JSON and typed messages are checked for
+  their required fields before they are queued
+- claim(): atomic (BEGIN IMMEDIATE) - a message goes to exactly one consumer,
+  highest priority first, then oldest first
+- ack() / nack(): done, or back to pending (failed after MAX_ATTEMPTS)
+- Claims older than claim_timeout_seconds are requeued (consumer crashed),
+  or marked failed once they have used MAX_ATTEMPTS
+- prune(): unclaimed messages expire after PENDING_TTL_HOURS; done, failed
+  and expired rows are deleted after RETENTION_DAYS
+- Optional Markdown export in the legacy file format for the human audit
+  trail (markdown_dir on send, or export_markdown() on demand)
+
+Usage:
+    from Utils.message_bus import MessageBus
+    bus = MessageBus(db_path)
+    bus.send('EXECUTIVE', 'TRADING', 'ExecutiveApproval', subject='BUY AAPL',
+             payload={'ticker': 'AAPL', 'action': 'BUY', 'shares': 10}, priority='urgent')
+    for message in bus.claim('TRADING'):
+        ...
+        bus.ack(message.message_id)
+"""
+
+import json
+import logging
+import sys
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import yaml
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils.db_connection import get_connection
+
+logger = logging.getLogger(__name__)
+
+# Lower rank is delivered first
+PRIORITY_RANKS = {'critical': 0, 'urgent': 1, 'high': 2, 'elevated': 2, 'routine': 3}
+DEFAULT_PRIORITY = 'routine'
+
+# Payload fields a typed message must carry to be queued
+PAYLOAD_FIELDS = {
+    'ExecutiveApproval': ('ticker', 'action', 'shares'),
+    'execution_request': ('ticker', 'action', 'shares'),
+    'TradeOrder': ('ticker', 'shares'),
+    'RiskAssessment': ('approved_candidates',),
+}
+
+MAX_ATTEMPTS = 3
+CLAIM_TIMEOUT_SECONDS = 300
+PENDING_TTL_HOURS = 24
+RETENTION_DAYS = 30
+
+_COLUMNS = ("message_id, from_dept, to_dept, message_type, subject, body, payload_json, "
+            "priority_label, parent_message_id, requires_response, created_at, attempts, status")
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _iso(ts: datetime) -> str:
+    # Fixed-width so created_at sorts correctly as text
+    return ts.isoformat(timespec='microseconds').replace('+00:00', 'Z')
+
+
+def _json_default(value):
+    # numpy scalars (shares, prices from pandas) and anything else str()-able
+    item = getattr(value, 'item', None)
+    return item() if callable(item) else str(value)
+
+
+def validate_payload(message_type: str, payload: Optional[Dict]):
+    """Raise ValueError if a typed message is missing required payload fields"""
+    required = PAYLOAD_FIELDS.get(message_type)
+    if not required:
+        return
+    missing = [f for f in required if not payload or f not in payload]
+    if missing:
+        raise ValueError(f"{message_type} payload missing fields: {', '.join(missing)}")
+
+
+@dataclass
+class BusMessage:
+    """One department message as stored on the bus"""
+    message_id: str
+    from_dept: str
+    to_dept: str
+    message_type: str
+    subject: str
+    body: str
+    payload: Optional[Dict]
+    priority: str
+    parent_message_id: Optional[str]
+    requires_response: bool
+    created_at: str
+    attempts: int = 0
+    status: str = 'pending'
+
+    @property
+    def metadata(self) -> Dict:
+        """Same keys as the YAML frontmatter of a Markdown message"""
+        metadata = {
+            'message_id': self.message_id,
+            'from': self.from_dept,
+            'to': self.to_dept,
+            'timestamp': self.created_at,
+            'message_type': self.message_type,
+            'priority': self.priority,
+            'requires_response': self.requires_response,
+        }
+        if self.parent_message_id:
+            metadata['parent_message_id'] = self.parent_message_id
+        return metadata
+
+    def to_markdown(self) -> str:
+        """Render in the legacy YAML frontmatter + Markdown + JSON file format"""
+        content = "---\n"
+        content += yaml.dump(self.metadata, default_flow_style=False, sort_keys=False)
+        content += "---\n\n"
+        if self.subject:
+            content += f"# {self.subject}\n\n"
+        content += self.body or ''
+        if self.payload:
+            content += "\n\n```json\n"
+            content += json.dumps(self.payload, indent=2, default=_json_default)
+            content += "\n```\n"
+        return content
+
+    @classmethod
+    def from_row(cls, row) -> 'BusMessage':
+        (message_id, from_dept, to_dept, message_type, subject, body, payload_json,
+         priority, parent_message_id, requires_response, created_at, attempts, status) = row
+        return cls(
+            message_id=message_id,
+            from_dept=from_dept,
+            to_dept=to_dept,
+            message_type=message_type,
+            subject=subject or '',
+            body=body or '',
+            payload=json.loads(payload_json) if payload_json else None,
+            priority=priority,
+            parent_message_id=parent_message_id,
+            requires_response=bool(requires_response),
+            created_at=created_at,
+            attempts=attempts,
+            status=status,
+        )
+
+
+class MessageBus:
+    """
+    SQLite-backed queue of department messages
+
+    Safe to share between threads and processes; each call uses its own
+    pooled connection and claims are serialized by SQLite's write lock.
+    """
+
+    def __init__(self, db_path: Union[str, Path] = "sentinel.db",
+                 claim_timeout_seconds: float = CLAIM_TIMEOUT_SECONDS,
+                 markdown_dir: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            db_path: Database holding department_messages
+            claim_timeout_seconds: Claims older than this are requeued
+            markdown_dir: If set, send() also writes each message to
+                markdown_dir/Outbox/<FROM>/<message_id>.md (legacy layout)
+        """
+        self.db_path = db_path
+        self.claim_timeout_seconds = claim_timeout_seconds
+        self.markdown_dir = Path(markdown_dir) if markdown_dir else None
+        self._schema_ready = False
+
+    def initialize(self):
+        """Create the message table and index if missing"""
+        conn = get_connection(self.db_path)
+        try:
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS department_messages (
+                        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                        message_id TEXT NOT NULL UNIQUE,
+                        from_dept TEXT NOT NULL,
+                        to_dept TEXT NOT NULL,
+                        message_type TEXT NOT NULL,
+                        subject TEXT,
+                        body TEXT,
+                        payload_json TEXT,
+                        priority INTEGER NOT NULL,
+                        priority_label TEXT NOT NULL,
+                        parent_message_id TEXT,
+                        requires_response INTEGER NOT NULL DEFAULT 0,
+                        status TEXT NOT NULL DEFAULT 'pending',
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        created_at TEXT NOT NULL,
+                        claimed_at TEXT,
+                        claimed_by TEXT,
+                        acked_at TEXT,
+                        last_error TEXT
+                    )
+                """)
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_department_messages_queue
+                    ON department_messages (to_dept, status, priority, created_at)
+                """)
+        finally:
+            conn.close()
+        self._schema_ready = True
+
+    def _ensure_schema(self):
+        if not self._schema_ready:
+            self.initialize()
+
+    def send(self, from_dept: str, to_dept: str, message_type: str, subject: str = '',
+             body: str = '', payload: Optional[Dict] = None, priority: str = DEFAULT_PRIORITY,
+             parent_message_id: Optional[str] = None, requires_response: bool = False) -> str:
+        """
+        Queue one message
+
+        Returns:
+            message_id (MSG_<FROM>_<timestamp>_<hex>, same as the file format)
+
+        Raises:
+            ValueError: Typed message without its required payload fields
+        """
+        return self.send_many([dict(
+            from_dept=from_dept, to_dept=to_dept, message_type=message_type, subject=subject,
+            body=body, payload=payload, priority=priority, parent_message_id=parent_message_id,
+            requires_response=requires_response)])[0]
+
+    def send_many(self, messages: Iterable[Dict]) -> List[str]:
+        """Queue several messages (send() keyword dicts) in one transaction"""
+        self._ensure_schema()
+        now = _utc_now()
+        built = []
+        for m in messages:
+            validate_payload(m['message_type'], m.get('payload'))
+            priority = m.get('priority') or DEFAULT_PRIORITY
+            built.append(BusMessage(
+                message_id=f"MSG_{m['from_dept']}_{now.strftime('%Y%m%dT%H%M%SZ')}_{uuid.uuid4().hex[:8]}",
+                from_dept=m['from_dept'],
+                to_dept=m['to_dept'],
+                message_type=m['message_type'],
+                subject=m.get('subject', ''),
+                body=m.get('body', ''),
+                payload=m.get('payload'),
+                priority=priority,
+                parent_message_id=m.get('parent_message_id'),
+                requires_response=bool(m.get('requires_response', False)),
+                created_at=_iso(now),
+            ))
+
+        conn = get_connection(self.db_path)
+        try:
+            with conn:
+                conn.executemany("""
+                    INSERT INTO department_messages
+                    (message_id, from_dept, to_dept, message_type, subject, body, payload_json,
+                     priority, priority_label, parent_message_id, requires_response, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, [(m.message_id, m.from_dept, m.to_dept, m.message_type, m.subject, m.body,
+                       json.dumps(m.payload, default=_json_default) if m.payload is not None else None,
+                       PRIORITY_RANKS.get(m.priority, PRIORITY_RANKS[DEFAULT_PRIORITY]), m.priority,
+                       m.parent_message_id, int(m.requires_response), m.created_at)
+                      for m in built])
+        finally:
+            conn.close()
+
+        for m in built:
+            logger.info(f"Queued message {m.message_id} ({m.message_type}) for {m.to_dept}")
+            if self.markdown_dir:
+                self._write_markdown(m, self.markdown_dir / "Outbox" / m.from_dept)
+        return [m.message_id for m in built]
+
+    def claim(self, to_dept: str, limit: int = 100, message_types: Optional[List[str]] = None,
+              consumer: Optional[str] = None, message_ids: Optional[List[str]] = None) -> List[BusMessage]:
+        """
+        Atomically take up to `limit` pending messages for a department
+
+        Args:
+            to_dept: Recipient department
+            limit: Maximum messages to claim
+            message_types: Only claim these message types (default: all)
+            consumer: Recorded in claimed_by for diagnostics
+            message_ids: Only claim these messages (default: any pending)
+
+        Returns:
+            Claimed messages, highest priority first, then oldest first.
+            Each must be ack()ed or nack()ed.
+        """
+        self._ensure_schema()
+        now = _utc_now()
+        stale_before = _iso(now - timedelta(seconds=self.claim_timeout_seconds))
+        type_filter = ''
+        params = [to_dept]
+        if message_types:
+            type_filter = f"AND message_type IN ({', '.join('?' * len(message_types))})"
+            params.extend(message_types)
+        if message_ids is not None:
+            if not message_ids:
+                return []
+            type_filter += f" AND message_id IN ({', '.join('?' * len(message_ids))})"
+            params.extend(message_ids)
+
+        conn = get_connection(self.db_path)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            abandoned = conn.execute("""
+                UPDATE department_messages
+                SET status = 'failed', claimed_at = NULL, claimed_by = NULL,
+                    last_error = 'claim timed out after max attempts'
+                WHERE to_dept = ? AND status = 'claimed' AND claimed_at < ? AND attempts >= ?
+            """, (to_dept, stale_before, MAX_ATTEMPTS)).rowcount
+            if abandoned:
+                logger.warning(f"Failed {abandoned} stale claims for {to_dept} (max attempts reached)")
+
+            requeued = conn.execute("""
+                UPDATE department_messages SET status = 'pending', claimed_at = NULL, claimed_by = NULL
+                WHERE to_dept = ? AND status = 'claimed' AND claimed_at < ?
+            """, (to_dept, stale_before)).rowcount
+            if requeued:
+                logger.warning(f"Requeued {requeued} stale claims for {to_dept}")
+
+            rows = conn.execute(f"""
+                SELECT seq, {_COLUMNS} FROM department_messages
+                WHERE to_dept = ? AND status = 'pending' {type_filter}
+                ORDER BY priority, created_at, seq
+                LIMIT ?
+            """, params + [int(limit)]).fetchall()
+
+            if rows:
+                conn.executemany("""
+                    UPDATE department_messages
+                    SET status = 'claimed', claimed_at = ?, claimed_by = ?, attempts = attempts + 1
+                    WHERE seq = ?
+                """, [(_iso(now), consumer or to_dept, row[0]) for row in rows])
+            conn.commit()
+        finally:
+            conn.close()
+
+        messages = []
+        for row in rows:
+            message = BusMessage.from_row(row[1:])
+            message.status = 'claimed'
+            message.attempts += 1
+            messages.append(message)
+        if messages:
+            logger.info(f"Claimed {len(messages)} messages for {to_dept}")
+        return messages
+
+    def ack(self, message_id: str) -> bool:
+        """Mark a claimed message done (False if it was not claimed)"""
+        conn = get_connection(self.db_path)
+        try:
+            with conn:
+                updated = conn.execute("""
+                    UPDATE department_messages SET status = 'done', acked_at = ?
+                    WHERE message_id = ? AND status = 'claimed'
+                """, (_iso(_utc_now()), message_id)).rowcount
+        finally:
+            conn.close()
+        if not updated:
+            logger.warning(f"Ack for unclaimed message {message_id}")
+        return bool(updated)
+
+    def nack(self, message_id: str, error: str = '', retry: bool = True) -> str:
+        """
+        Give a claimed message back
+
+        Returns:
+            New status: 'pending' (will be redelivered) or 'failed'
+        """
+        conn = get_connection(self.db_path)
+        try:
+            with conn:
+                conn.execute("""
+                    UPDATE department_messages
+                    SET status = CASE WHEN ? AND attempts < ? THEN 'pending' ELSE 'failed' END,
+                        claimed_at = NULL, claimed_by = NULL, last_error = ?
+                    WHERE message_id = ? AND status = 'claimed'
+                """, (int(retry), MAX_ATTEMPTS, error[:1000], message_id))
+                row = conn.execute("SELECT status FROM department_messages WHERE message_id = ?",
+                                   (message_id,)).fetchone()
+        finally:
+            conn.close()
+        status = row[0] if row else 'missing'
+        logger.warning(f"Message {message_id} returned ({status}): {error}")
+        return status
+
+    def prune(self, pending_ttl_hours: float = PENDING_TTL_HOURS,
+              retention_days: float = RETENTION_DAYS) -> Dict[str, int]:
+        """
+        Expire messages nobody claimed and delete old finished ones
+
+        Args:
+            pending_ttl_hours: Pending messages older than this become 'expired'
+                (e.g. notifications to departments that never claim)
+            retention_days: done / failed / expired messages older than this
+                are deleted
+
+        Returns:
+            {'expired': n, 'deleted': n}
+        """
+        self._ensure_schema()
+        now = _utc_now()
+        pending_before = _iso(now - timedelta(hours=pending_ttl_hours))
+        retain_after = _iso(now - timedelta(days=retention_days))
+
+        conn = get_connection(self.db_path)
+        try:
+            with conn:
+                expired = conn.execute("""
+                    UPDATE department_messages SET status = 'expired'
+                    WHERE status = 'pending' AND created_at < ?
+                """, (pending_before,)).rowcount
+                deleted = conn.execute("""
+                    DELETE FROM department_messages
+                    WHERE status IN ('done', 'failed', 'expired') AND created_at < ?
+                """, (retain_after,)).rowcount
+        finally:
+            conn.close()
+
+        if expired or deleted:
+            logger.info(f"Message bus pruned: {expired} expired, {deleted} deleted")
+        return {'expired': expired, 'deleted': deleted}
+
+    def get(self, message_id: str) -> Optional[BusMessage]:
+        """Look up one message in any status"""
+        self._ensure_schema()
+        conn = get_connection(self.db_path)
+        try:
+            row = conn.execute(f"SELECT {_COLUMNS} FROM department_messages WHERE message_id = ?",
+                               (message_id,)).fetchone()
+        finally:
+            conn.close()
+        return BusMessage.from_row(row) if row else None
+
+    def counts(self, to_dept: Optional[str] = None) -> Dict[str, int]:
+        """Message counts by status (optionally for one recipient)"""
+        self._ensure_schema()
+        conn = get_connection(self.db_path)
+        try:
+            if to_dept:
+                rows = conn.execute("SELECT status, COUNT(*) FROM department_messages "
+                                    "WHERE to_dept = ? GROUP BY status", (to_dept,)).fetchall()
+            else:
+                rows = conn.execute("SELECT status, COUNT(*) FROM department_messages "
+                                    "GROUP BY status").fetchall()
+        finally:
+            conn.close()
+        return dict(rows)
+
+    def export_markdown(self, out_dir: Union[str, Path], since: Optional[str] = None,
+                        to_dept: Optional[str] = None) -> int:
+        """
+        Write messages as legacy Markdown files to out_dir/<TO>/<message_id>.md
+
+        Args:
+            out_dir: Export root (e.g. Messages_Between_Departments/Archive/<date>)
+            since: Only messages created at or after this ISO timestamp
+            to_dept: Only messages for this department
+
+        Returns:
+            Number of files written
+        """
+        self._ensure_schema()
+        clauses, params = [], []
+        if since:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if to_dept:
+            clauses.append("to_dept = ?")
+            params.append(to_dept)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+
+        conn = get_connection(self.db_path)
+        try:
+            rows = conn.execute(f"SELECT {_COLUMNS} FROM department_messages {where} ORDER BY seq",
+                                params).fetchall()
+        finally:
+            conn.close()
+
+        out_dir = Path(out_dir)
+        for row in rows:
+            message = BusMessage.from_row(row)
+            self._write_markdown(message, out_dir / message.to_dept)
+        logger.info(f"Exported {len(rows)} messages to {out_dir}")
+        return len(rows)
+
+    def _write_markdown(self, message: BusMessage, folder: Path):
+        try:
+            folder.mkdir(parents=True, exist_ok=True)
+            (folder / f"{message.message_id}.md").write_text(message.to_markdown(), encoding='utf-8')
+        except OSError as e:
+            logger.warning(f"Could not export {message.message_id} to {folder} - {e}")
@@ -28,14 +28,10 @@ class PositionDriftMonitor:
 
     def __init__(self):
         import yaml
-        from alpaca.trading.client import TradingClient
-        import config
+        from Utils.alpaca_session import get_account_snapshot_cache, get_trading_client
 
-        self.trading_client = TradingClient(
-            config.APCA_API_KEY_ID,
-            config.APCA_API_SECRET_KEY,
-            paper=True
-        )
+        self.trading_client = get_trading_client(paper=True)
+        self.snapshot_cache = get_account_snapshot_cache(self.trading_client)
 
         # Load constraints
         hard_constraints_path = project_root / "Config" / "hard_constraints.yaml"
@@ -54,8 +50,7 @@ class PositionDriftMonitor:
         Returns:
             Dict with drift analysis and recommendations
         """
-        account = self.trading_client.get_account()
-        positions = self.trading_client.get_all_positions()
+        account, positions = self.snapshot_cache.snapshot()
 
         portfolio_value = float(account.portfolio_value)
 
@@ -10,6 +10,8 @@ Pattern:
 - Query Alpaca for current positions (GROUND TRUTH)
 - Return data in same format as database queries
 - Database is still used for audit trail (writes continue)
+- Account/positions come from the shared short-TTL snapshot, so
+  count/tickers/has_position checks in one run share one Alpaca call
 """
 
 import os
@@ -21,6 +23,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from Utils.alpaca_client import AlpacaClient
+from Utils.alpaca_session import AccountSnapshotCache, get_account_snapshot_cache
 import config
 
 
@@ -29,14 +32,16 @@ class PositionProvider:
     Provides position data from Alpaca (ground truth) in database-compatible format.
     """
 
-    def __init__(self, alpaca_client: AlpacaClient):
+    def __init__(self, alpaca_client: AlpacaClient, snapshot_cache: Optional[AccountSnapshotCache] = None):
         """
         Initialize Position Provider.
 
         Args:
             alpaca_client: AlpacaClient instance
+            snapshot_cache: Account/positions cache (default: shared cache for the client)
         """
         self.alpaca = alpaca_client
+        self.snapshot_cache = snapshot_cache or get_account_snapshot_cache(alpaca_client.trading_client)
 
     def get_open_positions(self) -> List[Dict]:
         """
@@ -49,8 +54,8 @@ class PositionProvider:
             list: List of position dicts with database-compatible keys
         """
         try:
-            # Query Alpaca (GROUND TRUTH)
-            alpaca_positions = self.alpaca.get_current_positions()
+            # Query Alpaca (GROUND TRUTH, via the short-TTL snapshot)
+            alpaca_positions = self.snapshot_cache.get_positions()
 
             # Convert to database-compatible format
             positions = []
@@ -168,20 +173,20 @@ class PositionProvider:
             dict: Account summary
         """
         try:
-            # Query Alpaca (GROUND TRUTH)
-            account = self.alpaca.get_account_info()
+            # Query Alpaca (GROUND TRUTH, via the short-TTL snapshot)
+            account = self.snapshot_cache.get_account()
 
             return {
-                'portfolio_value': account['portfolio_value'],
-                'equity': account['equity'],
-                'cash': account['cash'],
-                'buying_power': account['buying_power'],
-                'long_market_value': account['long_market_value'],
-                'short_market_value': account['short_market_value'],
-                'initial_margin': account['initial_margin'],
-                'maintenance_margin': account['maintenance_margin'],
-                'daytrade_count': account['daytrade_count'],
-                'pattern_day_trader': account['pattern_day_trader'],
+                'portfolio_value': float(account.portfolio_value),
+                'equity': float(account.equity),
+                'cash': float(account.cash),
+                'buying_power': float(account.buying_power),
+                'long_market_value': float(account.long_market_value),
+                'short_market_value': float(account.short_market_value),
+                'initial_margin': float(account.initial_margin),
+                'maintenance_margin': float(account.maintenance_margin),
+                'daytrade_count': account.daytrade_count,
+                'pattern_day_trader': account.pattern_day_trader,
             }
 
         except Exception as e:
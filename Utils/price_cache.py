@@ -0,0 +1,354 @@
+"""
+Columnar Price Cache - Binary OHLCV storage in SQLite
+
+Stores each ticker's price frame as packed NumPy column buffers instead of
+JSON records. A cache hit is decoded with np.frombuffer per column - no
+per-row Python objects, dtypes preserved, DatetimeIndex restored.
+
+Table layout (price_data_cache):
+- ticker:       Primary key
+- n_rows:       Number of rows in the frame
+- schema_json:  [[column, dtype], ...] (one tiny JSON decode per ticker)
+- index_blob:   int64 nanoseconds since epoch (UTC-naive)
+- index_tz:     Original timezone name, or NULL for naive indexes
+- values_blob:  Column buffers concatenated in schema order
+- fetched_at / expires_at: ISO timestamps (same TTL semantics as before)
+
+Migration:
+- Rows in the legacy market_data_cache table (data_type='price_data',
+  JSON records) are converted on initialize() and then deleted.
+
+FrameStore:
+- Run-scoped in-memory LRU layer in front of the SQLite cache, with a
+  memory cap and hit/miss counters.
+"""
+
+import json
+import logging
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils.db_connection import get_connection
+
+logger = logging.getLogger(__name__)
+
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER is 999 on older builds
+SQLITE_PARAM_CHUNK = 900
+
+
+def encode_price_frame(data: pd.DataFrame) -> Tuple[int, str, bytes, Optional[str], bytes]:
+    """
+    Pack a price DataFrame into binary column buffers
+
+    Args:
+        data: OHLCV DataFrame with a DatetimeIndex (or a 'Date' column)
+
+    Returns:
+        (n_rows, schema_json, index_blob, index_tz, values_blob)
+    """
+    df = data
+
+    # Flatten MultiIndex columns if present (yfinance returns MultiIndex)
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = [col[0] if isinstance(col, tuple) else col for col in df.columns]
+
+    if not isinstance(df.index, pd.DatetimeIndex):
+        if 'Date' in df.columns:
+            df = df.set_index(pd.to_datetime(df['Date'])).drop(columns=['Date'])
+        else:
+            df = df.set_index(pd.to_datetime(df.index))
+
+    index = df.index
+    index_tz = None
+    if index.tz is not None:
+        index_tz = str(index.tz)
+        index = index.tz_convert('UTC').tz_localize(None)
+
+    index_blob = index.astype('datetime64[ns]').asi8.astype('<i8').tobytes()
+
+    schema = []
+    buffers = []
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if values.dtype.kind in 'iu':
+            values = values.astype('<i8')
+        elif values.dtype.kind == 'b':
+            values = values.astype('|b1')
+        else:
+            values = values.astype('<f8')
+        schema.append([str(col), values.dtype.str])
+        buffers.append(values.tobytes())
+
+    return len(df), json.dumps(schema), index_blob, index_tz, b''.join(buffers)
+
+
+def decode_price_frame(n_rows: int, schema_json: str, index_blob: bytes,
+                       index_tz: Optional[str], values_blob: bytes) -> pd.DataFrame:
+    """
+    Rebuild a price DataFrame from binary column buffers (zero per-row work)
+
+    Returns:
+        DataFrame with a DatetimeIndex named 'Date' and the original dtypes
+    """
+    index = pd.DatetimeIndex(np.frombuffer(index_blob, dtype='<i8').view('datetime64[ns]'), name='Date')
+    if index_tz:
+        index = index.tz_localize('UTC').tz_convert(index_tz)
+
+    columns = {}
+    offset = 0
+    for name, dtype_str in json.loads(schema_json):
+        dtype = np.dtype(dtype_str)
+        width = dtype.itemsize * n_rows
+        columns[name] = np.frombuffer(values_blob, dtype=dtype, count=n_rows, offset=offset)
+        offset += width
+
+    return pd.DataFrame(columns, index=index)
+
+
+class PriceCache:
+    """
+    SQLite-backed binary price frame cache
+
+    Usage:
+        cache = PriceCache("sentinel.db", ttl_hours=16)
+        cache.initialize()
+        frames = cache.get_many(['AAPL', 'MSFT'])
+        cache.put_many({'NVDA': nvda_frame})
+    """
+
+    def __init__(self, db_path: str = "sentinel.db", ttl_hours: float = 16):
+        self.db_path = db_path
+        self.ttl_hours = ttl_hours
+
+    def initialize(self):
+        """Create the cache table and migrate any legacy JSON rows"""
+        conn = get_connection(self.db_path)
+        try:
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS price_data_cache (
+                        ticker TEXT PRIMARY KEY,
+                        n_rows INTEGER NOT NULL,
+                        schema_json TEXT NOT NULL,
+                        index_blob BLOB NOT NULL,
+                        index_tz TEXT,
+                        values_blob BLOB NOT NULL,
+                        fetched_at TEXT,
+                        expires_at TEXT
+                    )
+                """)
+            self.migrate_json_cache(conn)
+        finally:
+            conn.close()
+
+    def migrate_json_cache(self, conn: sqlite3.Connection) -> int:
+        """
+        Convert legacy JSON rows in market_data_cache to binary rows
+
+        Rows keep their original fetched_at/expires_at. Rows that fail to
+        decode are dropped (they would have been refetched anyway).
+
+        Returns:
+            Number of rows migrated
+        """
+        exists = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='market_data_cache'"
+        ).fetchone()
+        if not exists:
+            return 0
+
+        rows = conn.execute("""
+            SELECT ticker, data_json, fetched_at, expires_at
+            FROM market_data_cache
+            WHERE data_type = 'price_data'
+        """).fetchall()
+        if not rows:
+            return 0
+
+        migrated = []
+        for ticker, data_json, fetched_at, expires_at in rows:
+            try:
+                frame = pd.DataFrame(json.loads(data_json))
+                migrated.append((ticker, *encode_price_frame(frame), fetched_at, expires_at))
+            except Exception as e:
+                logger.debug(f"{ticker}: Legacy cache row not migrated - {e}")
+
+        with conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO price_data_cache
+                (ticker, n_rows, schema_json, index_blob, index_tz, values_blob, fetched_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, migrated)
+            conn.execute("DELETE FROM market_data_cache WHERE data_type = 'price_data'")
+
+        logger.info(f"Migrated {len(migrated)}/{len(rows)} legacy JSON price cache rows to binary format")
+        return len(migrated)
+
+    def get(self, ticker: str) -> Optional[pd.DataFrame]:
+        """Get one unexpired frame, or None on miss"""
+        return self.get_many([ticker]).get(ticker)
+
+    def get_many(self, tickers: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Read unexpired frames for many tickers
+
+        Uses one WHERE ticker IN (...) query per SQLite parameter chunk.
+
+        Returns:
+            Dict of ticker -> DataFrame for cache hits only
+        """
+        frames = {}
+        if not tickers:
+            return frames
+
+        conn = get_connection(self.db_path)
+        try:
+            now = datetime.now().isoformat()
+            for i in range(0, len(tickers), SQLITE_PARAM_CHUNK):
+                chunk = tickers[i:i + SQLITE_PARAM_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(f"""
+                    SELECT ticker, n_rows, schema_json, index_blob, index_tz, values_blob
+                    FROM price_data_cache
+                    WHERE expires_at > ? AND ticker IN ({placeholders})
+                """, [now] + chunk).fetchall()
+
+                for ticker, *packed in rows:
+                    try:
+                        frames[ticker] = decode_price_frame(*packed)
+                    except Exception as e:
+                        logger.debug(f"{ticker}: Corrupt cache entry ignored - {e}")
+        finally:
+            conn.close()
+
+        return frames
+
+    def put(self, ticker: str, data: pd.DataFrame):
+        """Cache one frame"""
+        self.put_many({ticker: data})
+
+    def put_many(self, frames: Dict[str, pd.DataFrame]):
+        """
+        Cache many frames in a single transaction
+
+        Frames that cannot be encoded (e.g. non-numeric columns) are logged
+        and skipped; the rest of the batch is still written.
+        """
+        now = datetime.now()
+        expires_at = now + timedelta(hours=self.ttl_hours)
+
+        rows = []
+        for ticker, data in frames.items():
+            try:
+                packed = encode_price_frame(data)
+            except (ValueError, TypeError) as e:
+                logger.warning(f"{ticker}: Price frame not cached (cannot encode) - {e}")
+                continue
+            rows.append((ticker, *packed, now.isoformat(), expires_at.isoformat()))
+        if not rows:
+            return
+
+        conn = get_connection(self.db_path)
+        try:
+            with conn:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO price_data_cache
+                    (ticker, n_rows, schema_json, index_blob, index_tz, values_blob, fetched_at, expires_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+        finally:
+            conn.close()
+
+
+class FrameStore:
+    """
+    In-process LRU store for price frames, scoped to one research run
+
+    Every stage of a run (prefetch, Stage 1, Stage 2, scoring) reads through
+    the same store, so each ticker is decoded from SQLite at most once while
+    it stays resident. Tickers known to have no data are remembered too, so
+    they are not refetched by later stages.
+
+    Usage:
+        store = FrameStore(max_megabytes=256)
+        found, frame = store.lookup('AAPL')
+        if not found:
+            frame = load_somehow('AAPL')
+            store.put('AAPL', frame)      # None marks "no data"
+        store.stats()  # {'hits': ..., 'misses': ..., 'evictions': ...}
+    """
+
+    def __init__(self, max_megabytes: float = 256):
+        self.max_bytes = int(max_megabytes * 1024 * 1024)
+        self._entries = OrderedDict()  # ticker -> (frame or None, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, ticker: str) -> Tuple[bool, Optional[pd.DataFrame]]:
+        """
+        Look up a ticker (counts a hit or a miss)
+
+        Returns:
+            (found, frame) - found is True for known-missing tickers too,
+            in which case frame is None
+        """
+        with self._lock:
+            entry = self._entries.get(ticker)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(ticker)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, ticker: str, frame: Optional[pd.DataFrame]):
+        """Store a frame (or None for "no data"), evicting LRU entries over the cap"""
+        nbytes = int(frame.memory_usage(index=True).sum()) if frame is not None else 0
+
+        with self._lock:
+            old = self._entries.pop(ticker, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+            self._entries[ticker] = (frame, nbytes)
+            self._bytes += nbytes
+
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all frames (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters and current memory use"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'frames': len(self._entries),
+                'megabytes': round(self._bytes / (1024 * 1024), 2),
+                'max_megabytes': round(self.max_bytes / (1024 * 1024), 2),
+            }
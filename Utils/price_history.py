@@ -0,0 +1,210 @@
+"""
+Price History Service - One shared source of daily OHLCV frames
+
+Risk used to call yf.download three times per candidate (ATR, volatility,
+current price) for data Research had cached minutes earlier. The service
+reads through three layers so one download serves every metric:
+
+Layers (per (ticker, lookback) key):
+- In-process frame map (frames and known-missing tickers); entries expire
+  after ttl_hours or at the next calendar day, known-missing ones after
+  missing_ttl_minutes
+- Research's SQLite PriceCache (60d frames only - that is what Research stores)
+- Multi-ticker yf.download, in chunks; results are written back to both layers
+
+Usage:
+    from Utils.price_history import get_shared_price_history
+    history = get_shared_price_history()
+    history.prefetch(['AAPL', 'MSFT', 'NVDA'])     # one bulk download for misses
+    frame = history.get('AAPL')                    # no network
+"""
+
+import logging
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import yfinance as yf
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils.price_cache import PriceCache
+from Utils.universe_pipeline import extract_ticker_frame
+
+logger = logging.getLogger(__name__)
+
+# Lookback Research caches in price_data_cache
+CACHED_LOOKBACK = '60d'
+
+
+class PriceHistoryService:
+    """
+    Read-through daily price history keyed by ticker and lookback
+
+    Thread-safe; frames handed out are shared, so callers must not mutate them.
+    """
+
+    def __init__(self, db_path: str = "sentinel.db", ttl_hours: float = 16,
+                 chunk_size: int = 100, download: Optional[Callable] = None,
+                 missing_ttl_minutes: float = 30, clock: Callable[[], datetime] = datetime.now):
+        """
+        Args:
+            db_path: Database holding Research's price_data_cache
+            ttl_hours: TTL for resident frames and for frames this service
+                       writes to the SQLite cache
+            chunk_size: Tickers per multi-symbol yf.download
+            download: yf.download-compatible function (injectable for tests)
+            missing_ttl_minutes: How long a ticker with no data stays known-missing
+            clock: Returns the current datetime (injectable for tests)
+        """
+        self.db_path = db_path
+        self.ttl = timedelta(hours=ttl_hours)
+        self.missing_ttl = timedelta(minutes=missing_ttl_minutes)
+        self.chunk_size = max(1, int(chunk_size))
+        self.download = download or yf.download
+        self.clock = clock
+        self.price_cache = PriceCache(db_path, ttl_hours=ttl_hours)
+        self._frames: Dict[Tuple[str, str], Tuple[Optional[pd.DataFrame], datetime]] = {}
+        self._lock = threading.Lock()
+        self._cache_ready = False
+        self.downloads = 0
+        self.cache_hits = 0
+        self.memory_hits = 0
+
+    def get(self, ticker: str, lookback: str = CACHED_LOOKBACK) -> Optional[pd.DataFrame]:
+        """Get one ticker's frame (None if no data)"""
+        return self.prefetch([ticker], lookback).get(ticker)
+
+    def prefetch(self, tickers: List[str], lookback: str = CACHED_LOOKBACK) -> Dict[str, pd.DataFrame]:
+        """
+        Make frames for many tickers resident, downloading only true misses
+
+        Returns:
+            Dict of ticker -> DataFrame (tickers with no data are omitted)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        frames = {}
+        misses = []
+        now = self.clock()
+        with self._lock:
+            for ticker in tickers:
+                key = (ticker, lookback)
+                entry = self._frames.get(key)
+                if entry is not None and self._is_fresh(entry, now):
+                    self.memory_hits += 1
+                    if entry[0] is not None:
+                        frames[ticker] = entry[0]
+                else:
+                    self._frames.pop(key, None)
+                    misses.append(ticker)
+
+        if not misses:
+            return frames
+
+        if lookback == CACHED_LOOKBACK:
+            cached = self._read_cache(misses)
+            self.cache_hits += len(cached)
+            frames.update(cached)
+            misses = [t for t in misses if t not in cached]
+        else:
+            cached = {}
+
+        fetched, errored = self._download(misses, lookback) if misses else ({}, set())
+        frames.update(fetched)
+
+        if fetched and lookback == CACHED_LOOKBACK:
+            try:
+                self._ensure_cache_table()
+                self.price_cache.put_many(fetched)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to cache {len(fetched)} price frames - {e}")
+
+        with self._lock:
+            for ticker in list(cached) + misses:
+                if ticker not in errored:  # Retry download errors on the next call
+                    self._frames[(ticker, lookback)] = (frames.get(ticker), now)
+
+        return {t: frames[t] for t in tickers if t in frames}
+
+    def clear(self):
+        """Drop the in-process frames (SQLite cache is untouched)"""
+        with self._lock:
+            self._frames.clear()
+
+    def stats(self) -> Dict:
+        """Where frames came from since the service was created"""
+        return {
+            'memory_hits': self.memory_hits,
+            'cache_hits': self.cache_hits,
+            'downloads': self.downloads,
+            'resident': len(self._frames),
+        }
+
+    def _is_fresh(self, entry: Tuple[Optional[pd.DataFrame], datetime], now: datetime) -> bool:
+        """Resident entries last ttl (missing ones missing_ttl) and never span a day"""
+        frame, loaded_at = entry
+        if loaded_at.date() != now.date():
+            return False
+        return now - loaded_at < (self.ttl if frame is not None else self.missing_ttl)
+
+    def _ensure_cache_table(self):
+        if not self._cache_ready:
+            self.price_cache.initialize()
+            self._cache_ready = True
+
+    def _read_cache(self, tickers: List[str]) -> Dict[str, pd.DataFrame]:
+        try:
+            self._ensure_cache_table()
+            return self.price_cache.get_many(tickers)
+        except sqlite3.Error as e:
+            logger.warning(f"Price cache unavailable ({e}) - downloading instead")
+            return {}
+
+    def _download(self, tickers: List[str], lookback: str) -> Tuple[Dict[str, pd.DataFrame], set]:
+        """
+        Multi-ticker download in chunks
+
+        Returns:
+            (frames, errored) - frames found, and tickers whose chunk raised
+        """
+        frames = {}
+        errored = set()
+        for i in range(0, len(tickers), self.chunk_size):
+            chunk = tickers[i:i + self.chunk_size]
+            self.downloads += 1
+            try:
+                data = self.download(chunk, period=lookback, group_by='ticker',
+                                     progress=False, threads=True)
+            except Exception as e:
+                logger.warning(f"Price download failed for {len(chunk)} tickers - {e}")
+                errored.update(chunk)
+                continue
+
+            for ticker in chunk:
+                frame = extract_ticker_frame(data, ticker)
+                if frame is not None:
+                    frame = frame.copy()
+                    frame.columns.name = None
+                    frames[ticker] = frame
+
+        logger.debug(f"Downloaded {lookback} history: {len(frames)}/{len(tickers)} tickers")
+        return frames, errored
+
+
+_shared_histories: Dict[str, PriceHistoryService] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_price_history(db_path: str = "sentinel.db") -> PriceHistoryService:
+    """Process-wide price history service for db_path (created on first use)"""
+    key = os.path.abspath(str(db_path))
+    with _shared_lock:
+        if key not in _shared_histories:
+            _shared_histories[key] = PriceHistoryService(key)
+        return _shared_histories[key]
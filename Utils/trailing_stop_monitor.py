@@ -20,12 +20,12 @@ from datetime import datetime
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from alpaca.trading.client import TradingClient
 from alpaca.trading.requests import GetOrdersRequest, TrailingStopOrderRequest
 from alpaca.trading.enums import OrderSide, TimeInForce, QueryOrderStatus
 
 from config import APCA_API_KEY_ID, APCA_API_SECRET_KEY, APCA_API_BASE_URL
-from Utils.atr_calculator import calculate_trailing_stop_percent
+from Utils.alpaca_session import get_trading_client
+from Utils.atr_calculator import calculate_trailing_stop_percents
 
 logging.basicConfig(
     level=logging.INFO,
@@ -40,11 +40,7 @@ class TrailingStopMonitor:
     def __init__(self):
         """Initialize with Alpaca trading client."""
         is_paper = 'paper' in APCA_API_BASE_URL.lower()
-        self.trading_client = TradingClient(
-            APCA_API_KEY_ID,
-            APCA_API_SECRET_KEY,
-            paper=is_paper
-        )
+        self.trading_client = get_trading_client(APCA_API_KEY_ID, APCA_API_SECRET_KEY, paper=is_paper)
         logger.info(f"TrailingStopMonitor initialized ({'paper' if is_paper else 'LIVE'} trading)")
 
     def get_all_positions(self) -> List[Dict]:
@@ -126,22 +122,25 @@ class TrailingStopMonitor:
             'protection_rate': len(protected) / len(positions) * 100 if positions else 0
         }
 
-    def add_trailing_stop(self, ticker: str, shares: float, current_price: float = None) -> Tuple[bool, str]:
+    def add_trailing_stop(self, ticker: str, shares: float, current_price: float = None,
+                          trail_percent: float = None) -> Tuple[bool, str]:
         """
         Add a GTC trailing stop order for a position.
 
         Args:
             ticker: Stock symbol
             shares: Number of shares to protect
-            current_price: Current price (fetched if not provided)
+            current_price: Current price (last close if not provided)
+            trail_percent: Pre-computed trailing stop % (ATR-based if not provided)
 
         Returns:
             Tuple of (success, message)
         """
         try:
             # Calculate ATR-based trailing stop percentage
-            atr_result = calculate_trailing_stop_percent(ticker, current_price)
-            trail_percent = atr_result['trail_percent']
+            if trail_percent is None:
+                prices = {ticker: current_price} if current_price else None
+                trail_percent = calculate_trailing_stop_percents([ticker], prices)[ticker]['trail_percent']
 
             # Submit trailing stop order
             trailing_stop_request = TrailingStopOrderRequest(
@@ -186,13 +185,17 @@ class TrailingStopMonitor:
 
         logger.info(f"Found {len(status['unprotected'])} unprotected positions")
 
+        # Size every unprotected position from one price-history fetch
+        atr_results = calculate_trailing_stop_percents(
+            status['unprotected'],
+            {ticker: status['details'][ticker]['current_price'] for ticker in status['unprotected']}
+        )
+
         for ticker in status['unprotected']:
             pos = status['details'][ticker]
             shares = pos['shares']
             current_price = pos['current_price']
-
-            # Calculate what trailing stop would be used
-            atr_result = calculate_trailing_stop_percent(ticker, current_price)
+            atr_result = atr_results[ticker]
 
             if dry_run:
                 logger.info(
@@ -206,7 +209,8 @@ class TrailingStopMonitor:
                     'status': 'would_add'
                 })
             else:
-                success, message = self.add_trailing_stop(ticker, shares, current_price)
+                success, message = self.add_trailing_stop(ticker, shares, current_price,
+                                                          trail_percent=atr_result['trail_percent'])
                 if success:
                     results['newly_protected'].append({
                         'ticker': ticker,
@@ -262,10 +266,15 @@ class TrailingStopMonitor:
             lines.append(f"{'Ticker':<8} {'Shares':>10} {'Price':>10} {'Suggested':>10} {'P&L':>10}")
             lines.append("-" * 70)
 
+            # Calculate what trailing stops would be
+            atr_results = calculate_trailing_stop_percents(
+                status['unprotected'],
+                {ticker: status['details'][ticker]['current_price'] for ticker in status['unprotected']}
+            )
+
             for ticker in status['unprotected']:
                 pos = status['details'][ticker]
-                # Calculate what trailing stop would be
-                atr_result = calculate_trailing_stop_percent(ticker, pos['current_price'])
+                atr_result = atr_results[ticker]
                 suggested = f"{atr_result['trail_percent']:.1f}%"
                 pl = f"{pos['unrealized_pl_pct']:+.1f}%"
 
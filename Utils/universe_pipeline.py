@@ -0,0 +1,307 @@
+"""
+Universe Pipeline - Staged, resumable swing-universe filtering
+
+Used by refresh_universe.UniverseRefresher. The old refresh made two
+blocking calls per Alpaca asset (stock.info, then stock.history); with
+thousands of assets the weekend refresh took hours. The pipeline orders
+the work so the expensive call only runs on survivors:
+
+Stage 1 - History (cheap, bulk):
+- Multi-ticker yf.download of 1 month of daily bars, in chunks
+- Rejects on price range, average volume and 14-day ATR%
+
+Stage 2 - Market cap (expensive, per ticker):
+- .info lookups for Stage 1 survivors only, via the shared
+  rate-limited InfoFetcher
+
+Checkpointing:
+- Every finished chunk is written to universe_refresh_checkpoint in SQLite
+- An interrupted run resumes where it stopped (same criteria, checkpoint
+  younger than max_checkpoint_age_hours)
+- The checkpoint is cleared once the pipeline completes
+
+Per-stage throughput (tickers/sec, pass counts) is returned in stage_stats.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+import yfinance as yf
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils.info_fetcher import InfoFetcher, get_shared_fetcher
+from Utils.db_connection import get_connection
+
+logger = logging.getLogger(__name__)
+
+STAGE_HISTORY = 'history'
+STAGE_MARKET_CAP = 'market_cap'
+
+
+def passes_history_filters(hist: Optional[pd.DataFrame], criteria: Dict) -> bool:
+    """
+    Price / average volume / ATR% filters on ~1 month of daily bars
+
+    Args:
+        hist: OHLCV DataFrame (or None)
+        criteria: Dict with min_price, max_price, min_avg_volume, min_atr_percent
+
+    Returns:
+        True if the ticker passes every history-based filter
+    """
+    if hist is None or hist.empty or len(hist) < 14:
+        return False
+
+    current_price = hist['Close'].iloc[-1]
+    if current_price < criteria['min_price'] or current_price > criteria['max_price']:
+        return False
+
+    avg_volume = hist['Volume'].mean()
+    if avg_volume < criteria['min_avg_volume']:
+        return False
+
+    # ATR% (14-day)
+    high_low = hist['High'] - hist['Low']
+    high_close = abs(hist['High'] - hist['Close'].shift())
+    low_close = abs(hist['Low'] - hist['Close'].shift())
+
+    true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+    atr = true_range.rolling(window=14).mean().iloc[-1]
+    atr_percent = (atr / current_price) * 100
+
+    return bool(atr_percent >= criteria['min_atr_percent'])
+
+
+def passes_market_cap_filter(info: Dict, criteria: Dict) -> bool:
+    """Market cap range filter on a yfinance info dict"""
+    market_cap = info.get('marketCap') or 0
+    return criteria['min_market_cap'] <= market_cap <= criteria['max_market_cap']
+
+
+def extract_ticker_frame(data: pd.DataFrame, ticker: str) -> Optional[pd.DataFrame]:
+    """
+    Pull one ticker's OHLCV columns out of a yfinance download
+
+    Handles both (Ticker, Price) and (Price, Ticker) MultiIndex layouts
+    as well as flat single-ticker frames.
+
+    Returns:
+        DataFrame with flat OHLCV columns, or None if the ticker has no rows
+    """
+    if data is None or data.empty:
+        return None
+
+    if isinstance(data.columns, pd.MultiIndex):
+        for level in range(data.columns.nlevels):
+            if ticker in data.columns.get_level_values(level):
+                frame = data.xs(ticker, axis=1, level=level).copy()
+                break
+        else:
+            return None
+    else:
+        frame = data.copy()
+
+    frame = frame.dropna(how='all')
+    if frame.empty or 'Close' not in frame.columns or frame['Close'].isna().all():
+        return None
+    frame.columns.name = None
+    return frame
+
+
+class RefreshCheckpoint:
+    """
+    Per-ticker stage results persisted in SQLite
+
+    Rows are keyed by run_key (a hash of the filter criteria) so a resumed
+    run never reuses results computed under different thresholds.
+    """
+
+    def __init__(self, db_path: str, run_key: str, max_age_hours: float = 48):
+        self.db_path = db_path
+        self.run_key = run_key
+        self.max_age_hours = max_age_hours
+        self._initialize_table()
+
+    def _initialize_table(self):
+        conn = get_connection(self.db_path)
+        try:
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS universe_refresh_checkpoint (
+                        run_key TEXT NOT NULL,
+                        ticker TEXT NOT NULL,
+                        stage TEXT NOT NULL,
+                        passed INTEGER NOT NULL,
+                        updated_at TEXT NOT NULL,
+                        PRIMARY KEY (run_key, ticker, stage)
+                    )
+                """)
+        finally:
+            conn.close()
+
+    def completed(self, stage: str) -> Dict[str, bool]:
+        """Results already recorded for a stage (ticker -> passed)"""
+        cutoff = (datetime.now() - timedelta(hours=self.max_age_hours)).isoformat()
+        conn = get_connection(self.db_path)
+        try:
+            rows = conn.execute("""
+                SELECT ticker, passed FROM universe_refresh_checkpoint
+                WHERE run_key = ? AND stage = ? AND updated_at > ?
+            """, (self.run_key, stage, cutoff)).fetchall()
+        finally:
+            conn.close()
+        return {ticker: bool(passed) for ticker, passed in rows}
+
+    def record(self, stage: str, results: Dict[str, bool]):
+        """Persist one chunk of stage results (single transaction)"""
+        now = datetime.now().isoformat()
+        conn = get_connection(self.db_path)
+        try:
+            with conn:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO universe_refresh_checkpoint
+                    (run_key, ticker, stage, passed, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, [(self.run_key, t, stage, int(p), now) for t, p in results.items()])
+        finally:
+            conn.close()
+
+    def clear(self):
+        """Drop this run's checkpoint rows (run finished)"""
+        conn = get_connection(self.db_path)
+        try:
+            with conn:
+                conn.execute("DELETE FROM universe_refresh_checkpoint WHERE run_key = ?",
+                             (self.run_key,))
+        finally:
+            conn.close()
+
+
+class UniversePipeline:
+    """
+    Two-stage swing universe filter with checkpoint/resume
+
+    Usage:
+        pipeline = UniversePipeline(criteria, db_path="sentinel.db")
+        qualified = pipeline.run(tickers)
+        for stage in pipeline.stage_stats: print(stage)
+    """
+
+    def __init__(self, criteria: Dict, db_path: str = "sentinel.db",
+                 history_chunk_size: int = 200, info_chunk_size: int = 100,
+                 download: Callable = None, info_fetcher: InfoFetcher = None,
+                 max_checkpoint_age_hours: float = 48):
+        """
+        Args:
+            criteria: min/max market cap, min_avg_volume, min/max price, min_atr_percent
+            db_path: SQLite database for the checkpoint table
+            history_chunk_size: Tickers per multi-symbol yf.download
+            info_chunk_size: Tickers per checkpointed market-cap batch
+            download: yf.download-compatible function (injectable for tests)
+            info_fetcher: InfoFetcher for Stage 2 (defaults to the shared one)
+            max_checkpoint_age_hours: Older checkpoint rows are ignored
+        """
+        self.criteria = criteria
+        self.history_chunk_size = max(1, int(history_chunk_size))
+        self.info_chunk_size = max(1, int(info_chunk_size))
+        self.download = download or yf.download
+        self.info_fetcher = info_fetcher or get_shared_fetcher()
+
+        run_key = hashlib.sha1(json.dumps(criteria, sort_keys=True).encode()).hexdigest()[:16]
+        self.checkpoint = RefreshCheckpoint(db_path, run_key, max_checkpoint_age_hours)
+        self.stage_stats: List[Dict] = []
+
+    def run(self, tickers: List[str]) -> List[str]:
+        """
+        Filter tickers through both stages
+
+        Returns:
+            Qualified tickers in input order
+        """
+        tickers = list(dict.fromkeys(tickers))
+        self.stage_stats = []
+
+        history_results = self._run_stage(
+            STAGE_HISTORY, tickers, self.history_chunk_size, self._evaluate_history_chunk)
+        survivors = [t for t in tickers if history_results.get(t)]
+
+        cap_results = self._run_stage(
+            STAGE_MARKET_CAP, survivors, self.info_chunk_size, self._evaluate_market_cap_chunk)
+        qualified = [t for t in survivors if cap_results.get(t)]
+
+        self.checkpoint.clear()
+        return qualified
+
+    def _run_stage(self, stage: str, tickers: List[str], chunk_size: int,
+                   evaluate: Callable[[List[str]], Dict[str, bool]]) -> Dict[str, bool]:
+        """Run one stage chunk by chunk, skipping tickers already checkpointed"""
+        done = self.checkpoint.completed(stage)
+        results = {t: done[t] for t in tickers if t in done}
+        pending = [t for t in tickers if t not in done]
+
+        if results:
+            logger.info(f"{stage}: resuming - {len(results)} tickers restored from checkpoint")
+
+        start = time.time()
+        for i in range(0, len(pending), chunk_size):
+            chunk_results = evaluate(pending[i:i + chunk_size])
+            self.checkpoint.record(stage, chunk_results)
+            results.update(chunk_results)
+        elapsed = time.time() - start
+
+        stats = {
+            'stage': stage,
+            'input': len(tickers),
+            'resumed': len(tickers) - len(pending),
+            'processed': len(pending),
+            'passed': sum(1 for t in tickers if results.get(t)),
+            'seconds': round(elapsed, 2),
+            'per_second': round(len(pending) / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+        self.stage_stats.append(stats)
+        logger.info(f"{stage}: {stats['processed']} tickers in {stats['seconds']:.1f}s "
+                    f"({stats['per_second']:.1f}/s), {stats['passed']} passed")
+        return results
+
+    def _evaluate_history_chunk(self, tickers: List[str]) -> Dict[str, bool]:
+        """Stage 1: one multi-ticker download, then cheap per-ticker filters"""
+        try:
+            data = self.download(tickers, period='1mo', interval='1d', group_by='ticker',
+                                 progress=False, threads=True)
+            frames = {t: extract_ticker_frame(data, t) for t in tickers}
+        except Exception as e:
+            logger.warning(f"Chunk history download failed ({e}) - retrying {len(tickers)} tickers individually")
+            frames = {}
+            for ticker in tickers:
+                try:
+                    frames[ticker] = extract_ticker_frame(
+                        self.download(ticker, period='1mo', interval='1d', progress=False), ticker)
+                except Exception:
+                    frames[ticker] = None
+
+        results = {}
+        for ticker in tickers:
+            try:
+                results[ticker] = passes_history_filters(frames.get(ticker), self.criteria)
+            except Exception:
+                results[ticker] = False  # Data issues - skip stock
+        return results
+
+    def _evaluate_market_cap_chunk(self, tickers: List[str]) -> Dict[str, bool]:
+        """
+        Stage 2: concurrent .info lookups for survivors
+
+        Failed lookups are left out of the result so a resumed run retries them.
+        """
+        infos, _ = self.info_fetcher.fetch_many(tickers)
+        return {t: passes_market_cap_filter(info, self.criteria) for t, info in infos.items()}
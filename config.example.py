@@ -26,6 +26,10 @@ APCA_API_BASE_URL = "https://paper-api.alpaca.markets"
 # "sip" = paid tier (real-time data)
 APCA_API_DATA_FEED = "iex"
 
+# Seconds an Alpaca account/positions snapshot is reused across departments
+# (order submissions and fills always invalidate it)
+ALPACA_SNAPSHOT_TTL_SECONDS = 15
+
 # --- Twilio API Keys (Optional - for SMS notifications) ---
 # Get your keys from: https://www.twilio.com/console
 TWILIO_ACCOUNT_SID = "YOUR_TWILIO_ACCOUNT_SID_HERE"
@@ -12,6 +12,8 @@ from datetime import datetime, timedelta
 import yfinance as yf
 from openai import OpenAI
 
+from Utils.info_fetcher import get_shared_fetcher
+
 # Import API key from config
 try:
     from config import OPENAI_API_KEY
@@ -37,11 +39,12 @@ def calculate_rsi(prices, period=14):
     return rsi.iloc[-1] if not rsi.empty else None
 
 
-def get_stock_data(ticker: str) -> dict:
-    """Fetch comprehensive stock data using yfinance."""
+def get_stock_data(ticker: str, info: dict = None) -> dict:
+    """Fetch comprehensive stock data using yfinance (info may be prefetched)."""
     try:
         stock = yf.Ticker(ticker)
-        info = stock.info
+        if info is None:
+            info = get_shared_fetcher().fetch_one(ticker)
 
         # Get historical data for technicals
         hist = stock.history(period="1y")
@@ -250,15 +253,23 @@ def run_quicklook(tickers: list, skip_ai: bool = False):
     print(f"  {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"{'='*72}\n")
 
+    tickers = [t.upper().strip() for t in tickers]
+
+    # Fetch every ticker's .info up front, concurrently and rate-limited
+    fetcher = get_shared_fetcher()
+    infos, errors = fetcher.fetch_many(tickers)
+
     for ticker in tickers:
-        ticker = ticker.upper().strip()
         print(f"{'='*72}")
         print(f"  {ticker}")
         print(f"{'='*72}")
 
         # Get stock data
         print("\n  Fetching data...\n")
-        data = get_stock_data(ticker)
+        if ticker in errors:
+            data = {"error": str(errors[ticker]), "ticker": ticker}
+        else:
+            data = get_stock_data(ticker, infos.get(ticker))
         print_stock_summary(data)
 
         # Get AI analysis
@@ -14,6 +14,11 @@ Filters Applied:
 - Price range: $10 - $500
 - Excludes: Utilities, REITs, Preferred stocks
 
+Pipeline (Utils/universe_pipeline.py):
+- Stage 1: bulk history download, reject on price/volume/ATR%
+- Stage 2: concurrent market cap lookup for survivors only
+- Checkpointed per chunk - rerun after an interruption to resume
+
 Usage:
   python refresh_universe.py              # Interactive mode (asks confirmation)
   python refresh_universe.py --force      # Force run (skip weekend check)
@@ -23,8 +28,6 @@ Usage:
 import sys
 import json
 import sqlite3
-import yfinance as yf
-import pandas as pd
 import alpaca_trade_api as tradeapi
 from datetime import datetime, timedelta, date
 from pathlib import Path
@@ -33,6 +36,7 @@ from typing import List, Dict, Tuple
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 import config
+from Utils.universe_pipeline import UniversePipeline
 
 
 class UniverseRefresher:
@@ -147,10 +151,26 @@ class UniverseRefresher:
             print(f"  ERROR: Failed to fetch stocks from Alpaca: {e}")
             return []
 
+    def _criteria(self) -> Dict:
+        """Current filter thresholds as a dict"""
+        return {
+            'min_market_cap': self.MIN_MARKET_CAP,
+            'max_market_cap': self.MAX_MARKET_CAP,
+            'min_avg_volume': self.MIN_AVG_VOLUME,
+            'min_price': self.MIN_PRICE,
+            'max_price': self.MAX_PRICE,
+            'min_atr_percent': self.MIN_ATR_PERCENT
+        }
+
     def apply_swing_filters(self, stocks: List[Dict]) -> List[str]:
         """
         Apply swing trading filters to stock list
 
+        Runs the staged pipeline (Utils/universe_pipeline.py):
+        1. Bulk history download -> price / volume / ATR% filters
+        2. Concurrent market cap lookup for survivors only
+        Progress is checkpointed per chunk, so an interrupted run resumes.
+
         Args:
             stocks: List of stock info dicts
 
@@ -165,67 +185,15 @@ class UniverseRefresher:
         print(f"    - ATR%: >{self.MIN_ATR_PERCENT}%")
         print()
 
-        qualified = []
         tickers = [s['ticker'] for s in stocks]
 
-        # Process in batches to avoid rate limits
-        batch_size = 100
-        total_batches = (len(tickers) + batch_size - 1) // batch_size
-
-        for i in range(0, len(tickers), batch_size):
-            batch = tickers[i:i+batch_size]
-            batch_num = i // batch_size + 1
-
-            print(f"  Processing batch {batch_num}/{total_batches} ({len(batch)} tickers)...", end='', flush=True)
-
-            for ticker in batch:
-                try:
-                    stock = yf.Ticker(ticker)
-
-                    # Get info (contains market cap)
-                    info = stock.info
-
-                    # Check market cap
-                    market_cap = info.get('marketCap', 0)
-                    if market_cap < self.MIN_MARKET_CAP or market_cap > self.MAX_MARKET_CAP:
-                        continue
-
-                    # Get price data (last 30 days for ATR calculation)
-                    hist = stock.history(period='1mo', interval='1d')
-
-                    if hist.empty or len(hist) < 14:
-                        continue
-
-                    # Check current price
-                    current_price = hist['Close'].iloc[-1]
-                    if current_price < self.MIN_PRICE or current_price > self.MAX_PRICE:
-                        continue
-
-                    # Check average volume
-                    avg_volume = hist['Volume'].mean()
-                    if avg_volume < self.MIN_AVG_VOLUME:
-                        continue
-
-                    # Calculate ATR% (14-day)
-                    high_low = hist['High'] - hist['Low']
-                    high_close = abs(hist['High'] - hist['Close'].shift())
-                    low_close = abs(hist['Low'] - hist['Close'].shift())
-
-                    true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-                    atr = true_range.rolling(window=14).mean().iloc[-1]
-                    atr_percent = (atr / current_price) * 100
-
-                    if atr_percent < self.MIN_ATR_PERCENT:
-                        continue
-
-                    # Passed all filters!
-                    qualified.append(ticker)
-
-                except Exception as e:
-                    # Skip stocks with data issues
-                    continue
+        pipeline = UniversePipeline(self._criteria(), db_path=self.db_path)
+        qualified = pipeline.run(tickers)
 
-            print(f" {len(qualified)} qualified so far")
+        for stats in pipeline.stage_stats:
+            resumed = f", {stats['resumed']:,} resumed from checkpoint" if stats['resumed'] else ""
+            print(f"  Stage [{stats['stage']}]: {stats['processed']:,} tickers in {stats['seconds']:.1f}s "
+                  f"({stats['per_second']:.1f}/s) -> {stats['passed']:,} passed{resumed}")
 
         print(f"\n  RESULT: {len(qualified)} stocks meet swing trading criteria")
         return qualified
@@ -247,14 +215,7 @@ class UniverseRefresher:
             refresh_date = date.today().isoformat()
             created_at = datetime.now().isoformat()
 
-            criteria = {
-                'min_market_cap': self.MIN_MARKET_CAP,
-                'max_market_cap': self.MAX_MARKET_CAP,
-                'min_avg_volume': self.MIN_AVG_VOLUME,
-                'min_price': self.MIN_PRICE,
-                'max_price': self.MAX_PRICE,
-                'min_atr_percent': self.MIN_ATR_PERCENT
-            }
+            criteria = self._criteria()
 
             cursor.execute("""
                 INSERT OR REPLACE INTO universe_history
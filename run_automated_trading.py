@@ -170,14 +170,9 @@ class AutomatedTradingRunner:
                 self.results['errors'].append("Database not found")
                 return False
 
-            # Check Alpaca connection
-            from alpaca.trading.client import TradingClient
-            trading_client = TradingClient(
-                config.APCA_API_KEY_ID,
-                config.APCA_API_SECRET_KEY,
-                paper=True
-            )
-            account = trading_client.get_account()
+            # Check Alpaca connection (also warms the shared account snapshot)
+            from Utils.alpaca_session import get_account_snapshot_cache
+            account = get_account_snapshot_cache().get_account()
             logger.info(f"[AutoTrader] Alpaca connected - Equity: ${float(account.equity):,.2f}")
 
             logger.info("[AutoTrader] Pre-flight checks PASSED")
@@ -540,17 +535,10 @@ class AutomatedTradingRunner:
         logger.info("\n[AutoTrader] Fetching final portfolio state...")
 
         try:
-            import config
-            from alpaca.trading.client import TradingClient
-
-            trading_client = TradingClient(
-                config.APCA_API_KEY_ID,
-                config.APCA_API_SECRET_KEY,
-                paper=True
-            )
+            from Utils.alpaca_session import get_account_snapshot_cache
 
-            account = trading_client.get_account()
-            positions = trading_client.get_all_positions()
+            # Fills during execution invalidated the snapshot, so this is post-trade state
+            account, positions = get_account_snapshot_cache().snapshot()
 
             # Calculate metrics
             starting_capital = 100000.00
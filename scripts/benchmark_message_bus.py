@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# scripts/benchmark_message_bus.py
+# Benchmark: Markdown file inbox vs SQLite message bus
+
+"""
+Message Bus Benchmark
+
+Enqueues N ExecutiveApproval messages for Trading, then drains them, and
+reports throughput for both transports:
+
+- files: write YAML frontmatter + Markdown + JSON file into Inbox/TRADING;
+         drain = glob + sort by mtime, parse YAML, regex out the JSON,
+         rename into Archive/<date>/TRADING (what Trading used to do)
+- bus:   Utils.message_bus.MessageBus.send() per message; drain = claim()
+         in batches + ack() per message
+
+Usage:
+    python scripts/benchmark_message_bus.py [--messages 2000] [--batch 100]
+"""
+
+import re
+import sys
+import json
+import time
+import uuid
+import argparse
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils.db_connection import close_thread_connections
+from Utils.message_bus import MessageBus
+
+
+def payload(i):
+    return {'ticker': f"T{i:04d}", 'action': 'BUY', 'shares': 10 + i % 90, 'price': 50.0 + i % 40,
+            'sector': 'Technology', 'order_type': 'MARKET', 'plan_id': 'PLAN_BENCH'}
+
+
+def file_enqueue(root, count):
+    inbox = root / "Inbox" / "TRADING"
+    inbox.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        msg_id = f"MSG_EXECUTIVE_{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}_{uuid.uuid4().hex[:8]}"
+        metadata = {'message_id': msg_id, 'from': 'EXECUTIVE', 'to': 'TRADING',
+                    'timestamp': datetime.utcnow().isoformat() + 'Z', 'message_type': 'ExecutiveApproval',
+                    'priority': 'urgent', 'requires_response': False}
+        content = "---\n" + yaml.dump(metadata, default_flow_style=False, sort_keys=False) + "---\n"
+        content += f"# Executive Approval - BUY T{i:04d}\n\n```json\n{json.dumps(payload(i), indent=2)}\n```\n"
+        with open(inbox / f"{msg_id}.md", 'w') as f:
+            f.write(content)
+
+
+def file_drain(root):
+    inbox = root / "Inbox" / "TRADING"
+    archive = root / "Archive" / datetime.now().strftime('%Y-%m-%d') / "TRADING"
+    archive.mkdir(parents=True, exist_ok=True)
+    drained = 0
+    for path in sorted(inbox.glob("*.md"), key=lambda p: p.stat().st_mtime):
+        with open(path, 'r') as f:
+            parts = f.read().split('---\n')
+        metadata = yaml.safe_load(parts[1])
+        body = '---\n'.join(parts[2:])
+        data = json.loads(re.search(r'```json\n(.*?)\n```', body, re.DOTALL).group(1))
+        assert metadata['to'] == 'TRADING' and data['ticker']
+        path.rename(archive / path.name)
+        drained += 1
+    return drained
+
+
+def bus_enqueue(bus, count):
+    for i in range(count):
+        bus.send('EXECUTIVE', 'TRADING', 'ExecutiveApproval', subject=f"Executive Approval - BUY T{i:04d}",
+                 payload=payload(i), priority='urgent')
+
+
+def bus_drain(bus, batch):
+    drained = 0
+    while True:
+        messages = bus.claim('TRADING', limit=batch)
+        if not messages:
+            return drained
+        for message in messages:
+            assert message.metadata['to'] == 'TRADING' and message.payload['ticker']
+            bus.ack(message.message_id)
+        drained += len(messages)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--batch', type=int, default=100, help='Messages per bus claim')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"MESSAGE TRANSPORT BENCHMARK ({args.messages} messages)")
+    print("=" * 70)
+    print(f"{'Transport':<10} {'Enqueue/s':>12} {'Drain/s':>12} {'Drained':>10}")
+    print("-" * 70)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "Messages_Between_Departments"
+        enqueue_s, _ = timed(file_enqueue, root, args.messages)
+        drain_s, drained = timed(file_drain, root)
+        results['files'] = (enqueue_s, drain_s)
+        print(f"{'files':<10} {args.messages / enqueue_s:>12.0f} {args.messages / drain_s:>12.0f} {drained:>10}")
+
+        bus = MessageBus(Path(tmp) / "sentinel.db")
+        bus.initialize()
+        enqueue_s, _ = timed(bus_enqueue, bus, args.messages)
+        drain_s, drained = timed(bus_drain, bus, args.batch)
+        results['bus'] = (enqueue_s, drain_s)
+        print(f"{'bus':<10} {args.messages / enqueue_s:>12.0f} {args.messages / drain_s:>12.0f} {drained:>10}")
+        close_thread_connections()
+
+    files, bus = results['files'], results['bus']
+    print("-" * 70)
+    print(f"Enqueue speedup: {files[0] / bus[0]:.1f}x")
+    print(f"Drain speedup:   {files[1] / bus[1]:.1f}x")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
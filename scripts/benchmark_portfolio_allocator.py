@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# scripts/benchmark_portfolio_allocator.py
+# Benchmark: PortfolioAllocator.allocate() latency over replayed synthetic days
+
+"""
+Portfolio Allocator Benchmark
+
+Replays synthetic trading days (holdings, candidates, regime, buying power,
+PENDING tickers) through the pure PortfolioAllocator and reports per-call
+allocation latency.
+
+Usage:
+    python scripts/benchmark_portfolio_allocator.py [--days 2000] [--holdings 30] [--candidates 80 500]
+"""
+
+import sys
+import time
+import random
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Departments.Operations.portfolio_allocator import PortfolioAllocator
+
+REGIMES = [
+    None,
+    {'regime': 'BEARISH', 'confidence': 'HIGH', 'vix_level': 32.0},
+    {'regime': 'BEARISH', 'confidence': 'MEDIUM', 'vix_level': 24.0},
+    {'regime': 'BULLISH', 'confidence': 'HIGH', 'vix_level': 12.5},
+    {'regime': 'NEUTRAL', 'confidence': 'MEDIUM', 'vix_level': 18.0},
+]
+
+
+def make_day(rng, n_holdings, n_candidates):
+    holdings = [{
+        'ticker': f"H{i:04d}",
+        'research_composite_score': rng.uniform(45, 90),
+        'quantity': rng.randint(1, 200),
+        'market_value': rng.uniform(500, 25000),
+        'current_price': rng.uniform(5, 600),
+        'unrealized_plpc': rng.uniform(-12, 15),
+    } for i in range(n_holdings)]
+    candidates = [{
+        'ticker': f"C{i:04d}",
+        'composite_score': rng.uniform(45, 95),
+        'current_price': rng.uniform(5, 600),
+        'sentiment': {'score': rng.uniform(30, 80), 'summary': 'synthetic'},
+    } for i in range(n_candidates)]
+    pending = {c['ticker'] for c in rng.sample(candidates, min(3, len(candidates)))}
+    return holdings, candidates, rng.choice(REGIMES), rng.choice([25000.0, 100000.0, 400000.0]), pending
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=2000)
+    parser.add_argument('--holdings', type=int, default=30)
+    parser.add_argument('--candidates', type=int, nargs='+', default=[80, 500])
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    allocator = PortfolioAllocator()
+
+    print("=" * 70)
+    print(f"PORTFOLIO ALLOCATOR BENCHMARK ({args.days} replayed days, {args.holdings} holdings)")
+    print("=" * 70)
+    print(f"{'Candidates':>10} {'Mean':>10} {'p50':>10} {'p95':>10} {'Max':>10} {'Days/s':>10}")
+    print("-" * 70)
+
+    for n_candidates in args.candidates:
+        rng = random.Random(args.seed)
+        days = [make_day(rng, args.holdings, n_candidates) for _ in range(args.days)]
+
+        latencies = []
+        start = time.perf_counter()
+        for holdings, candidates, regime, buying_power, pending in days:
+            call_start = time.perf_counter()
+            allocator.allocate(holdings, candidates, regime, buying_power, pending)
+            latencies.append(time.perf_counter() - call_start)
+        total = time.perf_counter() - start
+
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(f"{n_candidates:>10} {statistics.mean(latencies) * 1e6:>8.0f}us "
+              f"{statistics.median(latencies) * 1e6:>8.0f}us {p95 * 1e6:>8.0f}us "
+              f"{latencies[-1] * 1e6:>8.0f}us {len(days) / total:>10.0f}")
+
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
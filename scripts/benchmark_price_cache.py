@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# scripts/benchmark_price_cache.py
+# Benchmark: legacy JSON price cache vs binary columnar price cache
+
+"""
+Price Cache Decode Benchmark
+
+Builds a warm cache of synthetic 60-day OHLCV frames in a temporary
+database, then times cache-hit reads:
+
+1. BEFORE: legacy market_data_cache (JSON records -> pd.DataFrame)
+2. AFTER:  price_data_cache (binary column buffers -> pd.DataFrame)
+
+The AFTER cache is produced by the real migration path, so both runs read
+exactly the same data.
+
+Usage:
+    python scripts/benchmark_price_cache.py [--tickers 600] [--repeat 3]
+"""
+
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils.price_cache import PriceCache
+
+
+def make_frame(rng, days=60):
+    close = 100 + np.cumsum(rng.normal(0, 1.5, days))
+    index = pd.date_range(end=datetime.now().date(), periods=days, freq='B', name='Date')
+    return pd.DataFrame({
+        'Close': close,
+        'High': close + rng.uniform(0, 2, days),
+        'Low': close - rng.uniform(0, 2, days),
+        'Open': close + rng.normal(0, 0.5, days),
+        'Volume': rng.integers(100_000, 5_000_000, days),
+    }, index=index)
+
+
+def write_legacy_rows(db_path, frames):
+    """Write frames exactly as the old ResearchDepartment._cache_price_data did"""
+    now = datetime.now()
+    expires = now + timedelta(hours=16)
+    rows = []
+    for ticker, df in frames.items():
+        df_copy = df.reset_index()
+        df_copy['Date'] = df_copy['Date'].astype(str)
+        rows.append((ticker, 'price_data', json.dumps(df_copy.to_dict(orient='records')),
+                     now.isoformat(), expires.isoformat()))
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE market_data_cache (
+            ticker TEXT, data_type TEXT, data_json TEXT, fetched_at TEXT, expires_at TEXT,
+            PRIMARY KEY (ticker, data_type)
+        )
+    """)
+    conn.executemany("INSERT INTO market_data_cache VALUES (?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def read_legacy(db_path, tickers):
+    """Old per-ticker cache-hit path: one SELECT + json.loads + DataFrame per ticker"""
+    frames = {}
+    now = datetime.now().isoformat()
+    for ticker in tickers:
+        conn = sqlite3.connect(db_path)
+        row = conn.execute("""
+            SELECT data_json FROM market_data_cache
+            WHERE ticker = ? AND data_type = 'price_data' AND expires_at > ?
+        """, (ticker, now)).fetchone()
+        conn.close()
+        frames[ticker] = pd.DataFrame(json.loads(row[0]))
+    return frames
+
+
+def best_of(repeat, func, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', type=int, default=600)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    tickers = [f"T{i:05d}" for i in range(args.tickers)]
+    frames = {t: make_frame(rng) for t in tickers}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        write_legacy_rows(db_path, frames)
+
+        before = best_of(args.repeat, read_legacy, db_path, tickers)
+
+        cache = PriceCache(db_path)
+        start = time.perf_counter()
+        cache.initialize()  # Migrates the legacy rows
+        migrate_secs = time.perf_counter() - start
+
+        after_single = best_of(args.repeat, lambda: [cache.get(t) for t in tickers])
+        after_bulk = best_of(args.repeat, cache.get_many, tickers)
+
+    print("=" * 70)
+    print(f"PRICE CACHE DECODE BENCHMARK - {args.tickers} tickers x 60 days (best of {args.repeat})")
+    print("=" * 70)
+    print(f"  BEFORE  JSON, per-ticker reads:    {before * 1000:9.1f} ms  ({before / args.tickers * 1e6:7.1f} us/ticker)")
+    print(f"  AFTER   binary, per-ticker reads:  {after_single * 1000:9.1f} ms  ({after_single / args.tickers * 1e6:7.1f} us/ticker)")
+    print(f"  AFTER   binary, bulk get_many:     {after_bulk * 1000:9.1f} ms  ({after_bulk / args.tickers * 1e6:7.1f} us/ticker)")
+    print(f"  Speedup (per-ticker / bulk):       {before / after_single:9.1f}x / {before / after_bulk:.1f}x")
+    print(f"  One-time migration:                {migrate_secs * 1000:9.1f} ms")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# scripts/benchmark_risk_assessment.py
+# Benchmark: per-candidate vs vectorized RiskDepartment.assess_candidates
+
+"""
+Risk Assessment Benchmark
+
+Times RiskDepartment.assess_candidates on synthetic 60-day price histories
+with the per-candidate and vectorized paths, and checks that their scores
+and warnings are identical. Price history is served from memory, so only
+the assessment itself is timed.
+
+Usage:
+    python scripts/benchmark_risk_assessment.py [--sizes 100 2000] [--repeat 3]
+"""
+
+import sys
+import time
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils.price_history import PriceHistoryService
+from Departments.Risk.risk_department import RiskDepartment
+
+
+def make_universe(count, days=60, seed=42):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(end='2026-03-02', periods=days, freq='B', name='Date')
+    frames = {}
+    for i in range(count):
+        close = rng.uniform(2, 600) * np.cumprod(1 + rng.normal(0, rng.uniform(0.005, 0.04), days))
+        frames[f"T{i:05d}"] = pd.DataFrame({
+            'Close': close,
+            'High': close * (1 + rng.uniform(0, 0.05, days)),
+            'Low': close * (1 - rng.uniform(0, 0.05, days)),
+            'Open': close,
+            'Volume': rng.integers(50_000, 8_000_000, days),
+        }, index=index)
+    return frames
+
+
+def best_of(repeat, func):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 2000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    print("=" * 70)
+    print(f"RISK ASSESSMENT BENCHMARK (best of {args.repeat})")
+    print("=" * 70)
+    print(f"{'Candidates':>10} {'Per-ticker':>12} {'Vectorized':>12} {'Speedup':>9} {'Identical':>10}")
+    print("-" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            frames = make_universe(size)
+            history = PriceHistoryService(
+                db_path=str(Path(tmp) / f"bench_{size}.db"), chunk_size=size,
+                download=lambda tickers, **kwargs: pd.concat({t: frames[t] for t in tickers}, axis=1))
+            history.prefetch(list(frames))  # Resident before timing starts
+            risk = RiskDepartment(price_history=history)
+
+            def run(vectorized):
+                risk.vectorized_assessment = vectorized
+                candidates = [{'ticker': t, 'current_price': 0} for t in frames]
+                assessed = risk.assess_candidates(candidates, available_capital=100000.0)
+                return [(c['risk_score'], c['risk_warnings']) for c in assessed]
+
+            scalar_secs, scalar = best_of(args.repeat, lambda: run(False))
+            vector_secs, vector = best_of(args.repeat, lambda: run(True))
+
+            print(f"{size:>10} {scalar_secs * 1000:>10.1f}ms {vector_secs * 1000:>10.1f}ms "
+                  f"{scalar_secs / vector_secs:>8.1f}x {str(scalar == vector):>10}")
+
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
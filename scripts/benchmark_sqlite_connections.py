@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# scripts/benchmark_sqlite_connections.py
+# Benchmark: connect-per-call rollback journal vs pooled WAL connections
+
+"""
+SQLite Connection Benchmark
+
+Runs concurrent reader and writer threads against a scratch copy of a
+portfolio_positions-style table for a fixed time and reports throughput:
+
+- legacy: sqlite3.connect() per operation, default rollback journal,
+          default 5s busy timeout (what departments used to do)
+- pooled: Utils.db_connection.get_connection() (WAL, synchronous=NORMAL,
+          mmap, 30s busy timeout, per-thread connection reuse)
+
+Usage:
+    python scripts/benchmark_sqlite_connections.py [--readers 4] [--writers 2] [--seconds 3]
+"""
+
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils.db_connection import get_connection, close_thread_connections
+
+
+def legacy_connect(db_path):
+    return sqlite3.connect(db_path)
+
+
+def setup(db_path, rows=5000):
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("""
+            CREATE TABLE portfolio_positions (
+                id INTEGER PRIMARY KEY, ticker TEXT, status TEXT, sector TEXT,
+                actual_entry_price REAL, actual_shares INTEGER, total_risk REAL
+            )
+        """)
+        conn.execute("CREATE INDEX idx_status ON portfolio_positions(status)")
+        conn.executemany(
+            "INSERT INTO portfolio_positions (ticker, status, sector, actual_entry_price, actual_shares, total_risk) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(f"T{i:04d}", 'OPEN' if i % 3 else 'CLOSED', f"S{i % 11}", 50.0 + i % 40, 10 + i % 90, 100.0)
+             for i in range(rows)])
+    conn.close()
+
+
+def run(db_path, connect, readers, writers, seconds):
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    lock = threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def reader():
+        done = errors = 0
+        while time.perf_counter() < stop:
+            try:
+                conn = connect(db_path)
+                try:
+                    conn.execute("""
+                        SELECT sector, SUM(actual_entry_price * actual_shares)
+                        FROM portfolio_positions WHERE status = 'OPEN' GROUP BY sector
+                    """).fetchall()
+                finally:
+                    conn.close()
+                done += 1
+            except sqlite3.OperationalError:
+                errors += 1
+        with lock:
+            counts['reads'] += done
+            counts['errors'] += errors
+        close_thread_connections()
+
+    def writer(worker_id):
+        done = errors = 0
+        while time.perf_counter() < stop:
+            try:
+                conn = connect(db_path)
+                try:
+                    with conn:
+                        conn.execute("UPDATE portfolio_positions SET total_risk = total_risk + 1 WHERE id = ?",
+                                     (1 + (done * 7 + worker_id) % 5000,))
+                finally:
+                    conn.close()
+                done += 1
+            except sqlite3.OperationalError:
+                errors += 1
+        with lock:
+            counts['writes'] += done
+            counts['errors'] += errors
+        close_thread_connections()
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=3.0)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"SQLITE CONNECTION BENCHMARK ({args.readers} readers, {args.writers} writers, {args.seconds:.0f}s each)")
+    print("=" * 70)
+    print(f"{'Mode':<8} {'Reads/s':>10} {'Writes/s':>10} {'Lock errors':>12}")
+    print("-" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for mode, connect in (('legacy', legacy_connect), ('pooled', get_connection)):
+            db_path = str(Path(tmp) / f"{mode}.db")
+            setup(db_path)
+            counts = run(db_path, connect, args.readers, args.writers, args.seconds)
+            results[mode] = counts
+            print(f"{mode:<8} {counts['reads'] / args.seconds:>10.0f} {counts['writes'] / args.seconds:>10.0f} "
+                  f"{counts['errors']:>12}")
+
+    legacy, pooled = results['legacy'], results['pooled']
+    print("-" * 70)
+    print(f"Read throughput:  {pooled['reads'] / max(legacy['reads'], 1):.1f}x")
+    print(f"Write throughput: {pooled['writes'] / max(legacy['writes'], 1):.1f}x")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
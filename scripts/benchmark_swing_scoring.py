@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# scripts/benchmark_swing_scoring.py
+# Benchmark: per-ticker vs vectorized panel swing suitability scoring
+
+"""
+Swing Scoring Benchmark
+
+Times Research Stage 1 swing suitability scoring on synthetic 60-day
+universes with both engines and checks that their outputs are identical.
+
+Usage:
+    python scripts/benchmark_swing_scoring.py [--sizes 600 5000] [--repeat 3]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Departments.Research import swing_scoring
+
+
+def make_universe(count, days=60, seed=42):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(end='2026-03-02', periods=days, freq='B', name='Date')
+    frames = {}
+    for i in range(count):
+        close = rng.uniform(2, 600) * np.cumprod(1 + rng.normal(0, rng.uniform(0.005, 0.04), days))
+        frames[f"T{i:05d}"] = pd.DataFrame({
+            'Close': close,
+            'High': close * (1 + rng.uniform(0, 0.05, days)),
+            'Low': close * (1 - rng.uniform(0, 0.05, days)),
+            'Open': close,
+            'Volume': rng.integers(50_000, 8_000_000, days),
+        }, index=index)
+    return frames
+
+
+def best_of(repeat, func):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[600, 5000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"SWING SCORING BENCHMARK (best of {args.repeat})")
+    print("=" * 70)
+    print(f"{'Tickers':>8} {'Per-ticker':>12} {'Panel':>12} {'Speedup':>9} {'Identical':>10}")
+    print("-" * 70)
+
+    for size in args.sizes:
+        frames = make_universe(size)
+        scalar_secs, scalar = best_of(args.repeat, lambda: swing_scoring.score_many(frames, vectorized=False))
+        panel_secs, panel = best_of(args.repeat, lambda: swing_scoring.score_many(frames, vectorized=True))
+
+        print(f"{size:>8} {scalar_secs * 1000:>10.1f}ms {panel_secs * 1000:>10.1f}ms "
+              f"{scalar_secs / panel_secs:>8.1f}x {str(scalar == panel):>10}")
+
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -319,14 +319,14 @@ Proceeding with trading plan generation.
         net_capital_change = total_sell_value - total_buy_value
 
         # Get actual account data from Alpaca for accurate capital calculations
-        from alpaca.trading.client import TradingClient
+        from Utils.alpaca_session import get_account_snapshot_cache, get_trading_client
         api_key = os.getenv('APCA_API_KEY_ID')
         api_secret = os.getenv('APCA_API_SECRET_KEY')
 
         if api_key and api_secret:
             try:
-                trading_client = TradingClient(api_key, api_secret, paper=True)
-                account = trading_client.get_account()
+                trading_client = get_trading_client(api_key, api_secret, paper=True)
+                account = get_account_snapshot_cache(trading_client).get_account()
                 cash_value = float(account.cash)
                 equity_value = float(account.equity)
                 buying_power = float(account.buying_power)
@@ -427,7 +427,7 @@ Proceeding with trading plan generation.
         print("-" * 80)
 
         # Build the projected portfolio
-        from alpaca.trading.client import TradingClient
+        from Utils.alpaca_session import get_account_snapshot_cache, get_trading_client
         api_key = os.getenv('APCA_API_KEY_ID')
         api_secret = os.getenv('APCA_API_SECRET_KEY')
 
@@ -436,8 +436,8 @@ Proceeding with trading plan generation.
         if api_key and api_secret:
             try:
                 # Get current positions from Alpaca
-                trading_client = TradingClient(api_key, api_secret, paper=True)
-                positions = trading_client.get_all_positions()
+                trading_client = get_trading_client(api_key, api_secret, paper=True)
+                positions = get_account_snapshot_cache(trading_client).get_positions()
 
                 # Add all current positions to projected portfolio
                 for pos in positions:
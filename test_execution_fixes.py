@@ -13,6 +13,7 @@ This test should catch execution issues BEFORE live trading.
 
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import Mock, MagicMock, patch
 from datetime import datetime, timezone
 
@@ -36,6 +37,7 @@ print()
 def test_order_sequencing():
     """Verify that SELLs are executed before BUYs"""
     from Departments.Executive.ceo import CEO
+    from Departments.Trading.execution_engine import ParallelOrderEngine
 
     # Create CEO instance
     project_root = Path(__file__).parent
@@ -55,31 +57,52 @@ def test_order_sequencing():
     }
     ceo.plan_approved = True  # Mark plan as approved
 
-    # Track execution order
+    # Track the order in which the engine actually submits orders
     execution_log = []
+    queued = {}
 
     def mock_send_trade(trade):
+        message_id = f"MSG_TEST_{trade['ticker']}"
         action = 'BUY' if 'allocated_capital' in trade else 'SELL'
+        queued[message_id] = dict(trade, action=action, message_id=message_id)
+        return message_id
+
+    def execute_order(trade, prefetch):
         execution_log.append({
-            'action': action,
+            'action': trade['action'],
             'ticker': trade['ticker'],
             'timestamp': datetime.now()
         })
-        return f"MSG_TEST_{trade['ticker']}"
+        return 'SUBMITTED', f"ORDER_{trade['ticker']}"
+
+    class FakeTradingClient:
+        def get_asset(self, ticker):
+            return SimpleNamespace(tradable=True, status='active')
+
+    class FakeTradingDepartment:
+        """Runs the real ParallelOrderEngine over the messages CEO queued"""
 
-    def mock_process_inbox():
-        pass  # No-op for testing
+        def __init__(self, db_path=None):
+            self.trading_client = FakeTradingClient()
 
-    def mock_wait_for_orders(tickers, timeout=60):
-        return True  # Assume all orders fill immediately
+        def execute_plan(self, message_ids=None, after_sells=None):
+            trades = [queued[message_id] for message_id in message_ids]
+            engine = ParallelOrderEngine(self.trading_client, execute_order,
+                                         latest_prices=lambda tickers: {},
+                                         trail_stops=lambda tickers, prices: {})
+            return engine.execute([t for t in trades if t['action'] == 'SELL'],
+                                  [t for t in trades if t['action'] == 'BUY'],
+                                  after_sells=after_sells)
+
+    def mock_create_fill_tracker(trading_client, on_fill):
+        tracker = MagicMock()
+        tracker.wait.return_value = (set(), set())  # Assume all orders fill immediately
+        return tracker
 
     # Patch methods
     with patch.object(ceo, '_send_trade_to_trading_dept', side_effect=mock_send_trade):
-        with patch('Departments.Trading.trading_department.TradingDepartment') as MockTradingDept:
-            mock_trading = MockTradingDept.return_value
-            mock_trading.process_inbox = mock_process_inbox
-
-            with patch.object(ceo, '_wait_for_orders_to_fill', side_effect=mock_wait_for_orders):
+        with patch('Departments.Trading.trading_department.TradingDepartment', FakeTradingDepartment):
+            with patch.object(ceo, '_create_fill_tracker', side_effect=mock_create_fill_tracker):
                 # Execute plan
                 result = ceo.execute_approved_plan()
 
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the shared Alpaca client registry and account snapshot cache.
+
+Uses an in-process fake trading client, so no network is needed.
+
+Run with: python -m pytest tests/test_alpaca_session.py -v
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils import alpaca_session
+from Utils.alpaca_session import (
+    AccountSnapshotCache, get_account_snapshot_cache, get_trading_client, invalidate_account_snapshots
+)
+
+
+class FakeTradingClient:
+    """Counts get_account / get_all_positions round trips"""
+
+    def __init__(self, delay=0.0, on_fetch=None):
+        self.delay = delay
+        self.on_fetch = on_fetch
+        self.calls = {'account': 0, 'positions': 0}
+        self.cash = 1000.0
+
+    def get_account(self):
+        self.calls['account'] += 1
+        time.sleep(self.delay)
+        if self.on_fetch:
+            self.on_fetch()
+        return SimpleNamespace(cash=self.cash)
+
+    def get_all_positions(self):
+        self.calls['positions'] += 1
+        time.sleep(self.delay)
+        return [SimpleNamespace(symbol='AAPL')]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Empty client/cache registry with a fake client factory"""
+    built = []
+
+    def build(api_key, secret_key, paper):
+        built.append((api_key, paper))
+        return FakeTradingClient()
+
+    monkeypatch.setattr(alpaca_session, '_clients', {})
+    monkeypatch.setattr(alpaca_session, '_caches', {})
+    monkeypatch.setattr(alpaca_session, '_build_client', build)
+    return built
+
+
+class TestAccountSnapshotCache:
+    """Account/positions are reused within the TTL."""
+
+    def test_reused_within_ttl(self):
+        client, clock = FakeTradingClient(), FakeClock()
+        cache = AccountSnapshotCache(client, ttl_seconds=10, clock=clock)
+
+        account, positions = cache.snapshot()
+        cache.get_positions()
+        clock.now = 9.9
+        assert cache.get_account() is account
+        assert client.calls == {'account': 1, 'positions': 1}
+
+        clock.now = 10.0
+        cache.snapshot()
+        assert client.calls == {'account': 2, 'positions': 2}
+        assert cache.stats() == {'requests': 4, 'hits': 2}
+        assert [p.symbol for p in positions] == ['AAPL']
+
+    def test_max_age_zero_forces_fetch(self):
+        client = FakeTradingClient()
+        cache = AccountSnapshotCache(client, clock=FakeClock())
+
+        cache.get_account()
+        cache.get_account(max_age=0)
+
+        assert client.calls['account'] == 2
+
+    def test_invalidate(self):
+        client = FakeTradingClient()
+        cache = AccountSnapshotCache(client, clock=FakeClock())
+
+        assert cache.get_account().cash == 1000.0
+        client.cash = 400.0
+        assert cache.get_account().cash == 1000.0
+        cache.invalidate()
+        assert cache.get_account().cash == 400.0
+
+    def test_fetch_racing_an_invalidation_is_not_cached(self):
+        cache = None
+        client = FakeTradingClient(on_fetch=lambda: cache.invalidate())  # Order filled mid-fetch
+        cache = AccountSnapshotCache(client, clock=FakeClock())
+
+        cache.get_account()
+        client.on_fetch = None
+        cache.get_account()
+
+        assert client.calls['account'] == 2
+
+    def test_concurrent_misses_share_one_fetch(self):
+        client = FakeTradingClient(delay=0.05)
+        cache = AccountSnapshotCache(client)
+
+        threads = [threading.Thread(target=cache.get_positions) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert client.calls['positions'] == 1
+
+
+class TestRegistry:
+    """One long-lived client and cache per credentials."""
+
+    def test_client_reused_per_key_and_mode(self, registry):
+        paper = get_trading_client('key', 'secret', paper=True)
+
+        assert get_trading_client('key', 'secret', paper=True) is paper
+        assert get_trading_client('key', 'secret', paper=False) is not paper
+        assert registry == [('key', True), ('key', False)]
+
+    def test_cache_shared_per_client(self, registry):
+        client = get_trading_client('key', 'secret')
+        cache = get_account_snapshot_cache(client, ttl_seconds=30)
+
+        assert get_account_snapshot_cache(client) is cache and cache.ttl_seconds == 30
+        assert get_account_snapshot_cache(FakeTradingClient()) is not cache
+
+    def test_invalidate_all_snapshots(self, registry):
+        clients = [get_trading_client(f"key{i}", 'secret') for i in range(2)]
+        caches = [get_account_snapshot_cache(c, ttl_seconds=60) for c in clients]
+        for cache in caches:
+            cache.get_account()
+
+        invalidate_account_snapshots()
+        for cache in caches:
+            cache.get_account()
+
+        assert [c.calls['account'] for c in clients] == [2, 2]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for batch ATR trailing-stop sizing.
+
+Price history comes from a fake multi-ticker downloader, so no network is needed.
+
+Run with: python -m pytest tests/test_atr_calculator.py -v
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils import atr_calculator
+from Utils.atr_calculator import (
+    atr_from_frame, atr_from_frames, calculate_atrs, calculate_trailing_stop_percents,
+    clear_atr_memo, trailing_stop_from_atr
+)
+from Utils.price_history import PriceHistoryService
+from tests.test_research_prefetch import FakeDownloader, make_ohlcv
+
+
+@pytest.fixture
+def history(tmp_path):
+    clear_atr_memo()
+    frames = {f"T{i}": make_ohlcv(i) for i in range(5)}
+    yield PriceHistoryService(db_path=str(tmp_path / "prices.db"), download=FakeDownloader(frames))
+    clear_atr_memo()
+
+
+class TestAtrFromFrames:
+    """Vectorized ATR matches the per-frame calculation."""
+
+    def test_matches_atr_from_frame(self):
+        gapped = make_ohlcv(7)
+        gapped.iloc[-3, gapped.columns.get_loc('High')] = np.nan  # TR falls back to |Low - prev close|
+        frames = {
+            'LONG': make_ohlcv(1),
+            'EXACT': make_ohlcv(2, days=14),   # First bar has no previous close
+            'GAPPED': gapped,
+            'SHORT': make_ohlcv(3, days=10),
+            'NONE': None,
+        }
+
+        atrs = atr_from_frames(frames)
+
+        assert atrs['LONG'] == pytest.approx(atr_from_frame(frames['LONG']))
+        assert atrs['EXACT'] == pytest.approx(atr_from_frame(frames['EXACT']))
+        assert atrs['GAPPED'] == pytest.approx(atr_from_frame(frames['GAPPED']))
+        assert atrs['SHORT'] is None and atrs['NONE'] is None
+
+
+class TestBatchSizing:
+    """One history fetch for every ticker, memoized per trading day."""
+
+    def test_one_fetch_for_all_tickers(self, history):
+        tickers = ['T0', 'T1', 'T2', 'NOPE']
+
+        stops = calculate_trailing_stop_percents(tickers, {'T0': 50.0, 'T1': 45.0, 'T2': 60.0},
+                                                 history=history)
+
+        assert history.download.calls == [tickers]
+        assert stops['T1'] == trailing_stop_from_atr('T1', atr_from_frame(make_ohlcv(1)), 45.0)
+        assert stops['NOPE']['method'] == 'fallback_default' and stops['NOPE']['trail_percent'] == 8.0
+
+    def test_missing_price_uses_last_close(self, history):
+        stops = calculate_trailing_stop_percents(['T3'], history=history)
+
+        assert stops['T3']['current_price'] == pytest.approx(float(make_ohlcv(3)['Close'].iloc[-1]))
+        assert stops['T3']['method'] == 'atr_calculated'
+
+    def test_memoized_for_the_trading_day(self, history, monkeypatch):
+        first = calculate_atrs(['T0', 'T1'], history=history)
+        history.clear()
+
+        assert calculate_atrs(['T1', 'T0'], history=history) == {'T1': first['T1'], 'T0': first['T0']}
+        assert len(history.download.calls) == 1
+
+        class Tomorrow(date):
+            @classmethod
+            def today(cls):
+                return date.today() + timedelta(days=1)
+
+        monkeypatch.setattr(atr_calculator, 'date', Tomorrow)
+        calculate_atrs(['T0'], history=history)
+        assert history.stats()['cache_hits'] == 1  # Recomputed from Research's price cache
+
+    def test_empty(self, history):
+        assert calculate_trailing_stop_percents([], history=history) == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
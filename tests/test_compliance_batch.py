@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for PreTradeValidator.validate_batch.
+
+A plan is validated against one in-memory portfolio snapshot that is updated
+as each BUY is approved.
+
+Run with: python -m pytest tests/test_compliance_batch.py -v
+"""
+
+import sys
+import sqlite3
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import pytest
+import yaml
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Departments.Compliance import compliance_department
+from Departments.Compliance.compliance_department import PreTradeValidator
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def add_position(conn, ticker, status, sector, value=0.0, risk=0.0, updated_at=None):
+    conn.execute("""
+        INSERT INTO portfolio_positions
+        (position_id, ticker, status, intended_entry_price, intended_shares, intended_stop_loss,
+         intended_target, actual_entry_price, actual_shares, risk_per_share, total_risk, sector, updated_at)
+        VALUES (?, ?, ?, 100, 1, 95, 110, ?, ?, 5, ?, ?, ?)
+    """, (f"POS_{ticker}_{status}_{sector}", ticker, status,
+          100.0 if status == 'OPEN' else None, value / 100.0 if status == 'OPEN' else None,
+          risk, sector, updated_at or datetime.now().isoformat()))
+
+
+def buy(ticker, sector, value=6000.0, risk=500.0, price=50.0):
+    return {'ticker': ticker, 'trade_type': 'BUY', 'shares': int(value / price), 'price': price,
+            'position_value': value, 'total_risk': risk, 'sector': sector}
+
+
+@pytest.fixture
+def validator(tmp_path):
+    db_path = tmp_path / "sentinel.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript((PROJECT_ROOT / "Departments/Portfolio/database_schema.sql").read_text())
+    with conn:
+        add_position(conn, 'XOM', 'OPEN', 'Energy', value=5000.0, risk=400.0)
+        add_position(conn, 'AAPL', 'OPEN', 'Technology', value=9000.0, risk=600.0)
+        add_position(conn, 'MSFT', 'PENDING', 'Technology', risk=500.0)
+        add_position(conn, 'TSLA', 'CLOSED', 'Consumer', updated_at=datetime.now().isoformat())
+        add_position(conn, 'IBM', 'CLOSED', 'Technology',
+                     updated_at=(datetime.now() - timedelta(days=3)).isoformat())
+    conn.close()
+
+    config = yaml.safe_load((PROJECT_ROOT / "Config/compliance_config.yaml").read_text())
+    return PreTradeValidator(config, db_path)
+
+
+class TestValidateBatch:
+    """Batch validation against one snapshot."""
+
+    def test_matches_per_trade_validation_for_independent_proposals(self, validator):
+        plan = [buy('CVX', 'Energy'), buy('AAPL', 'Technology'), buy('MSFT', 'Healthcare'),
+                buy('TSLA', 'Consumer'), buy('IBM', 'Industrials'), buy('GME', 'Consumer'),
+                buy('BIG', 'Utilities', value=20000.0), buy('JNJ', 'Healthcare', risk=5000.0),
+                {'ticker': 'XOM', 'trade_type': 'SELL', 'position_value': 5000.0}]
+
+        assert validator.validate_batch(plan) == [validator.validate_trade(p) for p in plan]
+
+    def test_reads_the_database_once(self, validator, monkeypatch):
+        connects = []
+        real_connect = compliance_department.get_connection
+        monkeypatch.setattr(compliance_department, 'get_connection',
+                            lambda *a, **k: connects.append(a) or real_connect(*a, **k))
+
+        validator.validate_batch([buy(f"T{i}", 'Healthcare', value=1000.0, risk=50.0) for i in range(10)])
+
+        assert len(connects) == 1
+
+    def test_same_sector_buys_use_a_running_total(self, validator):
+        plan = [buy('CVX', 'Energy'), buy('OXY', 'Energy')]  # $5K open + $6K + $6K vs 15% cap
+
+        assert validator.validate_trade(plan[1])[0]  # Passes on its own
+        (first, _, _, _), (second, reason, category, _) = validator.validate_batch(plan)
+
+        assert first and not second
+        assert category == 'SECTOR_LIMIT' and 'Energy allocation to 17.0%' in reason
+
+    def test_portfolio_risk_accumulates_across_the_plan(self, validator):
+        plan = [buy(f"H{i}", 'Healthcare', value=1000.0, risk=1900.0) for i in range(6)]
+
+        results = validator.validate_batch(plan)
+
+        # 1,500 already at risk; each trade adds 1,900 against a 10,000 cap
+        assert [r[0] for r in results] == [True, True, True, True, False, False]
+        assert results[4][2] == 'RISK_LIMIT'
+
+    def test_duplicate_ticker_in_plan_and_position_adjustments(self, validator):
+        adjustment = dict(buy('AAPL', 'Healthcare', value=1000.0), is_position_adjustment=True)
+        plan = [buy('NVDA', 'Healthcare', value=1000.0), buy('NVDA', 'Healthcare', value=1000.0), adjustment]
+
+        results = validator.validate_batch(plan)
+
+        assert results[0][0] and results[2][0]
+        assert results[1][2] == 'DUPLICATE' and 'earlier in this plan' in results[1][1]
+
+    def test_snapshot_contents(self, validator):
+        snapshot = validator.load_snapshot()
+
+        assert snapshot.open_sector_values == {'Energy': 5000.0, 'Technology': 9000.0}
+        assert snapshot.portfolio_risk == 1500.0
+        assert snapshot.open_counts == {'XOM': 1, 'AAPL': 1}
+        assert snapshot.pending_counts == {'MSFT': 1}
+        assert snapshot.recently_closed == {'TSLA': 1}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the shared SQLite connection manager.
+
+Run with: python -m pytest tests/test_db_connection.py -v
+"""
+
+import os
+import sys
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils import db_connection
+from Utils.db_connection import get_connection, close_thread_connections
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "sentinel.db"
+    conn = get_connection(path)
+    with conn:
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+        conn.execute("INSERT INTO t (v) VALUES ('a')")
+    conn.close()
+    yield path
+    close_thread_connections()
+
+
+class TestGetConnection:
+    """Pragmas and per-thread pooling."""
+
+    def test_pragmas(self, db_path):
+        conn = get_connection(db_path)
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 30000
+            assert conn.execute("PRAGMA mmap_size").fetchone()[0] == db_connection.MMAP_SIZE_BYTES
+        finally:
+            conn.close()
+
+    def test_close_returns_a_clean_connection_to_the_pool(self, db_path):
+        conn = get_connection(db_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("INSERT INTO t (v) VALUES ('uncommitted')")
+        conn.close()
+
+        again = get_connection(db_path)
+        try:
+            assert again is conn
+            assert again.row_factory is None
+            assert again.execute("SELECT v FROM t").fetchall() == [('a',)]  # Rolled back
+        finally:
+            again.close()
+
+    def test_nested_callers_get_separate_connections(self, db_path):
+        outer = get_connection(db_path)
+        inner = get_connection(db_path)
+        try:
+            assert inner is not outer
+        finally:
+            inner.close()
+            outer.close()
+
+    def test_threads_do_not_share_connections(self, db_path):
+        main = get_connection(db_path)
+        main.close()
+        seen = []
+
+        def worker():
+            conn = get_connection(db_path)
+            seen.append((conn, conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]))
+            conn.close()
+            close_thread_connections()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        assert seen[0][0] is not main and seen[0][1] == 1
+
+    def test_replaced_database_file_gets_a_new_connection(self, db_path):
+        conn = get_connection(db_path)
+        conn.close()
+        replacement = db_path.with_name("replacement.db")
+        sqlite3.connect(replacement).close()
+        os.replace(replacement, db_path)
+
+        fresh = get_connection(db_path)
+        try:
+            assert fresh is not conn
+            assert fresh.execute("SELECT name FROM sqlite_master").fetchall() == []
+        finally:
+            fresh.close()
+
+    def test_memory_databases_are_not_pooled(self):
+        conn = get_connection(':memory:')
+        conn.execute("CREATE TABLE m (x)")
+        conn.close()
+
+        fresh = get_connection(':memory:')
+        assert fresh.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0
+        fresh.close()
+
+    def test_reader_is_not_blocked_by_open_write_transaction(self, db_path):
+        writer = get_connection(db_path)
+        writer.execute("BEGIN EXCLUSIVE")  # Would lock readers out in rollback-journal mode
+        writer.execute("INSERT INTO t (v) VALUES ('pending')")
+        result = []
+
+        def reader():
+            conn = get_connection(db_path, timeout=0.1)
+            result.append(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0])
+            conn.close()
+            close_thread_connections()
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        thread.join()
+        writer.commit()
+        writer.close()
+
+        assert result == [1]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the parallel order engine.
+
+Orders go to an in-process fake Alpaca trading client, so no network is needed.
+
+Run with: python -m pytest tests/test_execution_engine.py -v
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Departments.Trading.execution_engine import ParallelOrderEngine, SharedPortfolioState
+from Utils.atr_calculator import (
+    atr_from_frame, calculate_trailing_stop_percents, clear_atr_memo, trailing_stop_from_atr
+)
+from Utils.price_history import PriceHistoryService
+from tests.test_research_prefetch import FakeDownloader, make_ohlcv
+
+
+class FakeTradingClient:
+    """Alpaca TradingClient stand-in: slow submit_order, per-ticker asset status"""
+
+    def __init__(self, delay=0.05, untradable=(), unknown=()):
+        self.delay = delay
+        self.untradable = set(untradable)
+        self.unknown = set(unknown)
+        self.asset_calls = []
+        self.orders = []  # (action, ticker, start, end)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get_asset(self, ticker):
+        self.asset_calls.append(ticker)
+        if ticker in self.unknown:
+            raise RuntimeError("asset not found")
+        tradable = ticker not in self.untradable
+        return SimpleNamespace(tradable=tradable, status='active' if tradable else 'inactive')
+
+    def submit_order(self, action, ticker, qty):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        start = time.perf_counter()
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+            self.orders.append((action, ticker, start, time.perf_counter()))
+        return SimpleNamespace(id=f"{action}-{ticker}")
+
+
+def trade(action, ticker, shares=10, price=50.0):
+    return {'ticker': ticker, 'action': action, 'shares': shares, 'price': price,
+            'message_id': f"MSG_EXECUTIVE_{action}_{ticker}"}
+
+
+def make_engine(client, max_workers=4, prices=None, calls=None):
+    calls = calls if calls is not None else {}
+
+    def execute_order(trade, prefetch):
+        client.submit_order(trade['action'], trade['ticker'], trade['shares'])
+        return 'SUBMITTED'
+
+    def latest_prices(tickers):
+        calls.setdefault('prices', []).append(list(tickers))
+        return dict(prices or {})
+
+    def trail_stops(tickers, prices):
+        calls.setdefault('trail', []).append((list(tickers), dict(prices)))
+        return {t: {'trail_percent': 5.0} for t in tickers}
+
+    return ParallelOrderEngine(client, execute_order, latest_prices, trail_stops, max_workers=max_workers)
+
+
+class TestPrefetch:
+    """Plan-wide data is gathered once, before any order."""
+
+    def test_bulk_prices_stops_and_asset_status(self):
+        client = FakeTradingClient(untradable={'OLD'}, unknown={'GONE'})
+        calls = {}
+        engine = make_engine(client, prices={'AAA': 51.0}, calls=calls)
+
+        prefetch = engine.prefetch([trade('SELL', 'XOM'), trade('SELL', 'OLD'), trade('SELL', 'GONE')],
+                                   [trade('BUY', 'AAA'), trade('BUY', 'BBB', price=20.0)])
+
+        assert calls['prices'] == [['AAA', 'BBB']]
+        assert prefetch.prices == {'AAA': 51.0, 'BBB': 20.0}  # BBB falls back to the plan price
+        assert calls['trail'] == [(['AAA', 'BBB'], {'AAA': 51.0, 'BBB': 20.0})]
+        assert sorted(client.asset_calls) == ['GONE', 'OLD', 'XOM']
+        assert prefetch.asset_status['XOM'] == ''
+        assert prefetch.asset_status['OLD'] == 'Asset not tradeable: inactive'
+        assert prefetch.asset_status['GONE'].startswith('Cannot verify')
+
+    def test_trail_stops_from_one_history_download(self, tmp_path):
+        frames = {'AAA': make_ohlcv(1), 'BBB': make_ohlcv(2)}
+        history = PriceHistoryService(db_path=str(tmp_path / "prices.db"), download=FakeDownloader(frames))
+        clear_atr_memo()
+
+        stops = calculate_trailing_stop_percents(['AAA', 'BBB', 'NOPE'], {'AAA': 50.0, 'BBB': 40.0},
+                                                 history=history)
+
+        assert history.download.calls == [['AAA', 'BBB', 'NOPE']]
+        assert stops['AAA'] == trailing_stop_from_atr('AAA', atr_from_frame(frames['AAA']), 50.0)
+        assert stops['AAA']['method'] == 'atr_calculated'
+        assert stops['NOPE']['method'] == 'fallback_default' and stops['NOPE']['trail_percent'] == 8.0
+
+
+class TestExecute:
+    """Bounded concurrency with the SELL -> BUY barrier."""
+
+    def test_sells_finish_before_any_buy_starts(self):
+        client = FakeTradingClient()
+        barrier_seen = []
+        engine = make_engine(client)
+
+        result = engine.execute([trade('SELL', f"S{i}") for i in range(5)],
+                                [trade('BUY', f"B{i}") for i in range(5)],
+                                after_sells=lambda outcomes: barrier_seen.append(
+                                    (len(outcomes), len(client.orders))))
+
+        sells = [o for o in client.orders if o[0] == 'SELL']
+        buys = [o for o in client.orders if o[0] == 'BUY']
+        assert max(end for *_, end in sells) <= min(start for _, _, start, _ in buys)
+        assert barrier_seen == [(5, 5)]
+        assert [o.status for o in result['sells'] + result['buys']] == ['SUBMITTED'] * 10
+
+    def test_concurrency_is_bounded(self):
+        client = FakeTradingClient(delay=0.05)
+        engine = make_engine(client, max_workers=3)
+
+        start = time.perf_counter()
+        result = engine.execute([], [trade('BUY', f"B{i}") for i in range(9)])
+        elapsed = time.perf_counter() - start
+
+        assert client.max_in_flight == 3
+        assert elapsed < 9 * 0.05  # Faster than serial
+        assert [o.ticker for o in result['buys']] == [f"B{i}" for i in range(9)]
+        assert all(o.latency_ms >= 45 for o in result['buys'])
+
+    def test_untradeable_sells_are_skipped(self):
+        client = FakeTradingClient(untradable={'OLD'})
+        engine = make_engine(client)
+
+        result = engine.execute([trade('SELL', 'OLD'), trade('SELL', 'XOM')], [])
+
+        assert [(o.ticker, o.status) for o in result['sells']] == [('OLD', 'SKIPPED'), ('XOM', 'SUBMITTED')]
+        assert result['sells'][0].message_id == 'MSG_EXECUTIVE_SELL_OLD'
+        assert [o[1] for o in client.orders] == ['XOM']
+
+    def test_outcomes_keep_input_order(self):
+        client = FakeTradingClient(delay=0.0, untradable={'OLD'})
+        engine = make_engine(client)
+
+        result = engine.execute([trade('SELL', 'XOM'), trade('SELL', 'OLD'), trade('SELL', 'CVX')], [])
+
+        assert [(o.ticker, o.status) for o in result['sells']] == [
+            ('XOM', 'SUBMITTED'), ('OLD', 'SKIPPED'), ('CVX', 'SUBMITTED')]
+
+    def test_one_failing_order_does_not_stop_the_rest(self):
+        client = FakeTradingClient(delay=0.0)
+
+        def execute_order(trade, prefetch):
+            if trade['ticker'] == 'BAD':
+                raise RuntimeError("insufficient buying power")
+            client.submit_order(trade['action'], trade['ticker'], trade['shares'])
+            return 'SUBMITTED'
+
+        engine = ParallelOrderEngine(client, execute_order, lambda tickers: {}, lambda t, p: {})
+        result = engine.execute([], [trade('BUY', 'AAA'), trade('BUY', 'BAD'), trade('BUY', 'CCC')])
+
+        assert [(o.ticker, o.status) for o in result['buys']] == [
+            ('AAA', 'SUBMITTED'), ('BAD', 'ERROR'), ('CCC', 'SUBMITTED')]
+        assert 'buying power' in result['buys'][1].reason
+        assert result['buys'][1].to_dict()['latency_ms'] >= 0
+
+    def test_broker_order_ids_are_reported(self):
+        client = FakeTradingClient(delay=0.0)
+
+        def execute_order(trade, prefetch):
+            order = client.submit_order(trade['action'], trade['ticker'], trade['shares'])
+            return 'SUBMITTED', order.id
+
+        engine = ParallelOrderEngine(client, execute_order, lambda tickers: {}, lambda t, p: {})
+        result = engine.execute([trade('SELL', 'XOM')], [trade('BUY', 'AAA')])
+
+        assert [o.order_id for o in result['sells'] + result['buys']] == ['SELL-XOM', 'BUY-AAA']
+        assert result['buys'][0].to_dict()['order_id'] == 'BUY-AAA'
+
+
+class TestSharedPortfolioState:
+    """Concurrent BUYs cannot spend the same cash twice."""
+
+    def test_reservations_under_lock(self):
+        shared = SharedPortfolioState({'cash': 1000.0, 'buying_power': 1000.0, 'current_prices': {'X': 1.0}})
+        approved = []
+
+        def validate_and_reserve(i):
+            with shared.lock:
+                state = shared.snapshot()
+                state['current_prices'][f"T{i}"] = 200.0  # Snapshot copies are independent
+                if state['cash'] - 200.0 >= 0:
+                    shared.reserve('BUY', 1, 200.0)
+                    approved.append(i)
+
+        threads = [threading.Thread(target=validate_and_reserve, args=(i,)) for i in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(approved) == 5
+        assert shared.state['cash'] == 0.0 and shared.state['current_prices'] == {'X': 1.0}
+
+    def test_sells_reserve_nothing(self):
+        shared = SharedPortfolioState({'cash': 100.0})
+        shared.reserve('SELL', 10, 50.0)
+        assert shared.state['cash'] == 100.0
+
+    def test_release_returns_reserved_cash(self):
+        shared = SharedPortfolioState({'cash': 1000.0, 'buying_power': 1000.0})
+        shared.reserve('BUY', 4, 200.0)
+        shared.release('BUY', 4, 200.0)
+        assert shared.state['cash'] == 1000.0 and shared.state['buying_power'] == 1000.0
+
+    def test_identical_orders_start_once(self):
+        shared = SharedPortfolioState({})
+        assert shared.start_order(('AAA', 'BUY', 10))
+        assert not shared.start_order(('AAA', 'BUY', 10))
+        assert shared.start_order(('AAA', 'BUY', 11))
+
+
+class TestAtrFromFrame:
+    """ATR helper shared by the per-ticker and bulk paths."""
+
+    def test_matches_true_range_rolling_mean(self):
+        frame = make_ohlcv(3)
+        tr = pd.concat([frame['High'] - frame['Low'],
+                        (frame['High'] - frame['Close'].shift(1)).abs(),
+                        (frame['Low'] - frame['Close'].shift(1)).abs()], axis=1).max(axis=1)
+
+        assert atr_from_frame(frame) == pytest.approx(tr.tail(14).mean())
+        assert atr_from_frame(frame.head(10)) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
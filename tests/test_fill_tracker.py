@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for event-driven fill tracking.
+
+Trade updates come from an in-process fake stream (same interface as
+alpaca.trading.stream.TradingStream), so no network is needed.
+
+Run with: python -m pytest tests/test_fill_tracker.py -v
+"""
+
+import sys
+import time
+import queue
+import asyncio
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils.fill_tracker import FillEvent, FillTracker, OrderPoller
+
+
+def make_order(order_id, symbol='AAPL', side='buy', status='filled', filled_qty=10, price=150.0):
+    return SimpleNamespace(id=order_id, symbol=symbol, side=side, status=status,
+                           filled_qty=str(filled_qty) if filled_qty else None,
+                           filled_avg_price=str(price) if filled_qty else None,
+                           filled_at=datetime(2026, 10, 16, 14, 30, tzinfo=timezone.utc) if filled_qty else None)
+
+
+def make_update(order_id, event='fill', **kwargs):
+    return SimpleNamespace(event=event, order=make_order(order_id, **kwargs))
+
+
+class FakeStream:
+    """TradingStream stand-in: run() delivers pushed updates to the async handler"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.handler = None
+        self.updates = queue.Queue()
+        self.stopped = threading.Event()
+
+    def subscribe_trade_updates(self, handler):
+        self.handler = handler
+
+    def run(self):
+        if self.fail:
+            raise ConnectionError("websocket refused")
+        while not self.stopped.is_set():
+            try:
+                update = self.updates.get(timeout=0.01)
+            except queue.Empty:
+                continue
+            asyncio.run(self.handler(update))
+
+    def stop(self):
+        self.stopped.set()
+
+    def push(self, update):
+        self.updates.put(update)
+
+
+class FakePoller:
+    """OrderPoller stand-in: orders become terminal when finish() is called"""
+
+    def __init__(self):
+        self.finished = {}
+        self.calls = []
+
+    def finish(self, order_id, **kwargs):
+        self.finished[order_id] = FillEvent.from_order(make_order(order_id, **kwargs))
+
+    def poll(self, order_ids):
+        self.calls.append(sorted(order_ids))
+        return [self.finished[i] for i in order_ids if i in self.finished]
+
+
+@pytest.fixture
+def stream_tracker():
+    stream = FakeStream()
+    fills = []
+    tracker = FillTracker(stream=stream, on_fill=[fills.append])
+    tracker.start()
+    yield tracker, stream, fills
+    tracker.stop()
+
+
+class TestStream:
+    """Futures resolve as soon as the trade update arrives."""
+
+    def test_future_resolves_on_fill(self, stream_tracker):
+        tracker, stream, fills = stream_tracker
+        future = tracker.track('o1', 'AAPL')
+
+        stream.push(make_update('o1', filled_qty=10, price=150.25))
+
+        event = future.result(timeout=2)
+        assert (event.symbol, event.action, event.filled_qty, event.filled_avg_price) == ('AAPL', 'BUY', 10.0, 150.25)
+        assert fills == [event]
+
+    def test_duplicate_events_call_back_once(self, stream_tracker):
+        tracker, stream, fills = stream_tracker
+        tracker.track('o1')
+
+        stream.push(make_update('o1'))
+        stream.push(make_update('o1'))
+        done, pending = tracker.wait(['o1'], timeout=2)
+        time.sleep(0.05)
+
+        assert done == {'o1'} and not pending
+        assert len(fills) == 1
+
+    def test_event_before_track_is_buffered(self):
+        fills = []
+        tracker = FillTracker(stream=FakeStream(), on_fill=[fills.append])
+
+        tracker.handle_update(FillEvent.from_trade_update(make_update('o1', side='sell', symbol='XOM')))
+        assert fills == []
+
+        future = tracker.track('o1', 'XOM')
+        assert future.done() and future.result().action == 'SELL'
+        assert [f.symbol for f in fills] == ['XOM']
+
+    def test_partial_fill_is_not_terminal_and_cancel_skips_callbacks(self, stream_tracker):
+        tracker, stream, fills = stream_tracker
+        partial = tracker.track('o1')
+        canceled = tracker.track('o2')
+
+        stream.push(make_update('o1', event='partial_fill', status='partially_filled', filled_qty=3))
+        stream.push(make_update('o2', event='canceled', status='canceled', filled_qty=0))
+
+        assert canceled.result(timeout=2).event == 'canceled'
+        assert not partial.done()
+        assert fills == []
+
+    def test_partially_filled_cancel_runs_callbacks(self):
+        fills = []
+        tracker = FillTracker(stream=FakeStream(), on_fill=[fills.append])
+        expired = tracker.track('o1')
+
+        tracker.handle_update(FillEvent.from_trade_update(
+            make_update('o1', event='expired', status='expired', filled_qty=4)))
+
+        assert expired.result(timeout=0).event == 'expired'
+        assert [(f.order_id, f.filled_qty) for f in fills] == [('o1', 4.0)]
+
+    def test_wait_times_out_with_pending_ids(self, stream_tracker):
+        tracker, stream, _ = stream_tracker
+        stream.push(make_update('o1'))
+
+        done, pending = tracker.wait(['o1', 'o2'], timeout=0.2)
+
+        assert done == {'o1'} and pending == {'o2'}
+
+    def test_callback_errors_do_not_block_resolution(self):
+        def broken(event):
+            raise RuntimeError("database locked")
+
+        tracker = FillTracker(stream=FakeStream(), on_fill=[broken])
+        future = tracker.track('o1')
+        tracker.handle_update(FillEvent.from_trade_update(make_update('o1')))
+
+        assert future.result(timeout=0).event == 'fill'
+
+
+class TestPolling:
+    """No stream (or a dropped one) falls back to batched REST polls."""
+
+    def test_poll_mode(self):
+        poller = FakePoller()
+        fills = []
+        tracker = FillTracker(poller=poller, on_fill=[fills.append], poll_interval=0.01)
+        tracker.start()
+        try:
+            tracker.track('o1')
+            tracker.track('o2')
+            poller.finish('o1')
+            poller.finish('o2', side='sell')
+            done, pending = tracker.wait(['o1', 'o2'], timeout=2)
+        finally:
+            tracker.stop()
+
+        assert tracker.mode == 'poll'
+        assert done == {'o1', 'o2'} and not pending
+        assert sorted(f.action for f in fills) == ['BUY', 'SELL']
+
+    def test_stream_failure_falls_back_to_polling(self):
+        poller = FakePoller()
+        tracker = FillTracker(stream=FakeStream(fail=True), poller=poller, poll_interval=0.01)
+        tracker.start()
+        try:
+            poller.finish('o1')
+            done, _ = tracker.wait(['o1'], timeout=2)
+        finally:
+            tracker.stop()
+
+        assert done == {'o1'} and tracker.mode == 'poll'
+
+    def test_stream_mode_reconciles_missed_events(self, stream_tracker):
+        tracker, _, fills = stream_tracker
+        tracker.poller = FakePoller()
+        tracker.reconcile_interval = 0.05
+        tracker.poller.finish('o1')  # Filled before the stream connected
+
+        done, _ = tracker.wait(['o1'], timeout=2)
+
+        assert done == {'o1'} and len(fills) == 1
+
+    def test_needs_a_source(self):
+        with pytest.raises(ValueError):
+            FillTracker()
+
+
+class TestOrderPoller:
+    """Two all-symbol queries at most, however many orders are tracked."""
+
+    def test_open_then_closed_query(self, monkeypatch):
+        listings = {'open': [make_order('o2', status='new')],
+                    'closed': [make_order('o1'), make_order('o3', status='canceled', filled_qty=0)]}
+        poller = OrderPoller(trading_client=None)
+        queried = []
+
+        def list_orders(status):
+            queried.append(status)
+            return listings[status]
+
+        monkeypatch.setattr(poller, '_list_orders', list_orders)
+
+        events = poller.poll(['o1', 'o2', 'o3'])
+
+        assert queried == ['open', 'closed']
+        assert {e.order_id: e.event for e in events} == {'o1': 'fill', 'o3': 'canceled'}
+
+    def test_no_closed_query_while_all_open(self, monkeypatch):
+        poller = OrderPoller(trading_client=None)
+        queried = []
+        monkeypatch.setattr(poller, '_list_orders',
+                            lambda status: queried.append(status) or [make_order('o1', status='new')])
+
+        assert poller.poll(['o1']) == [] and queried == ['open']
+
+
+class TestFillEvent:
+    """Mapping to the FillRecorder order shape."""
+
+    def test_to_order_dict(self):
+        order = make_order('o1', side=SimpleNamespace(value='sell'), status=SimpleNamespace(value='filled'))
+        event = FillEvent.from_order(order)
+
+        assert event.event == 'fill' and event.action == 'SELL'
+        assert event.to_order_dict() == {
+            'alpaca_order_id': 'o1', 'symbol': 'AAPL', 'side': 'sell', 'filled_qty': 10.0,
+            'filled_avg_price': 150.0, 'status': 'OrderStatus.FILLED',
+            'filled_at': '2026-10-16T14:30:00+00:00'}
+
+    def test_partially_filled_cancel_keeps_terminal_status(self):
+        event = FillEvent.from_order(make_order('o1', status='canceled', filled_qty=4))
+
+        assert event.event == 'canceled' and event.has_fill
+        assert event.to_order_dict()['status'] == 'OrderStatus.CANCELED'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
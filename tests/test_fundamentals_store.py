@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the persistent fundamentals store.
+
+The yfinance fetcher is replaced with an in-process fake so no network is needed.
+
+Run with: python -m pytest tests/test_fundamentals_store.py -v
+"""
+
+import sys
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils.fundamentals_store import FundamentalsStore, FUNDAMENTAL_FIELDS
+from Utils.info_fetcher import InfoFetcher
+from Departments.Research.research_department import ResearchDepartment
+
+
+INFO = {
+    'sector': 'Technology',
+    'returnOnEquity': 0.2,
+    'profitMargins': 0.12,
+    'trailingPE': 15,
+    'priceToBook': 2,
+    'revenueGrowth': 0.08,
+    'earningsGrowth': 0.11,
+    'debtToEquity': 0.4,
+    'currentRatio': 1.8,
+    'longBusinessSummary': 'not stored',
+}
+
+
+class FakeFetcher:
+    """Records fetched tickers; raises for tickers in `failing`."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker):
+        with self._lock:
+            self.calls.append(ticker)
+        if ticker in self.failing:
+            raise RuntimeError("simulated 404")
+        return dict(INFO)
+
+
+def make_info_fetcher(fetcher):
+    """Wrap a fake fetch function in a fast, retry-free InfoFetcher."""
+    return InfoFetcher(max_workers=4, rate_per_second=1000, max_retries=0, fetch=fetcher)
+
+
+def age_rows(db_path, days):
+    """Backdate every cached row by `days` so it is past its TTL."""
+    conn = sqlite3.connect(db_path)
+    past = (datetime.now() - timedelta(days=days)).isoformat()
+    conn.execute("UPDATE fundamentals_cache SET fetched_at = ?, expires_at = ?", (past, past))
+    conn.commit()
+    conn.close()
+
+
+class TestFundamentalsStore:
+    """Tests for FundamentalsStore load/refresh/stats."""
+
+    def test_warm_store_makes_no_network_calls(self, tmp_path):
+        fetcher = FakeFetcher()
+        store = FundamentalsStore(str(tmp_path / "f.db"), info_fetcher=make_info_fetcher(fetcher))
+        tickers = [f"T{i}" for i in range(110)]
+
+        store.load(tickers)
+        assert len(fetcher.calls) == 110
+
+        fetcher.calls.clear()
+        store.reset_stats()
+        loaded = store.load(tickers)
+
+        assert fetcher.calls == []
+        assert len(loaded) == 110
+        assert set(loaded['T0']) == set(FUNDAMENTAL_FIELDS)
+        stats = store.stats()
+        assert stats['hit_rate'] == 1.0 and stats['misses'] == 0
+
+    def test_failed_fetches_are_omitted_and_cached_negatively(self, tmp_path):
+        db_path = str(tmp_path / "f.db")
+        fetcher = FakeFetcher(failing={'BAD'})
+        store = FundamentalsStore(db_path, failure_ttl_hours=12, info_fetcher=make_info_fetcher(fetcher))
+
+        loaded = store.load(['GOOD', 'BAD'])
+
+        assert set(loaded) == {'GOOD'}
+        assert store.get_many(['BAD'])['BAD']['fields'] is None
+        assert store.stats()['fetch_failures'] == 1
+
+        # Within the negative TTL the failure is not refetched
+        fetcher.calls.clear()
+        assert set(store.load(['GOOD', 'BAD'])) == {'GOOD'}
+        assert fetcher.calls == []
+        assert store.stats()['negative_hits'] == 1
+
+        # Once it expires the ticker is retried synchronously
+        age_rows(db_path, days=1)
+        fetcher.failing.clear()
+        assert set(store.load(['BAD'])) == {'BAD'}
+        assert fetcher.calls == ['BAD']
+
+    def test_stale_entries_are_served_then_refreshed_in_background(self, tmp_path):
+        db_path = str(tmp_path / "f.db")
+        fetcher = FakeFetcher()
+        store = FundamentalsStore(db_path, ttl_days=7, info_fetcher=make_info_fetcher(fetcher))
+        store.load(['AAA', 'BBB'])
+        age_rows(db_path, days=8)
+
+        fetcher.calls.clear()
+        store.reset_stats()
+        loaded = store.load(['AAA', 'BBB'])
+
+        # Served without blocking on the network
+        assert fetcher.calls == [] and set(loaded) == {'AAA', 'BBB'}
+        stats = store.stats()
+        assert stats['stale_hits'] == 2
+        assert stats['avg_age_hours'] >= 8 * 24 - 1
+
+        thread = store.refresh_stale_in_background()
+        assert thread is not None
+        store.wait_for_refresh(timeout=5)
+
+        assert sorted(fetcher.calls) == ['AAA', 'BBB']
+        assert not any(e['stale'] for e in store.get_many(['AAA', 'BBB']).values())
+        assert store.refresh_stale_in_background() is None
+
+    def test_stale_tickers_seen_during_a_refresh_are_queued(self, tmp_path):
+        db_path = str(tmp_path / "f.db")
+        release = threading.Event()
+
+        class BlockingFetcher(FakeFetcher):
+            def __call__(self, ticker):
+                release.wait(5)
+                return super().__call__(ticker)
+
+        fetcher = BlockingFetcher()
+        store = FundamentalsStore(db_path, info_fetcher=make_info_fetcher(fetcher))
+        release.set()
+        store.load(['AAA', 'BBB'])
+        age_rows(db_path, days=8)
+        release.clear()
+        fetcher.calls.clear()
+
+        store.load(['AAA'])
+        first = store.refresh_stale_in_background()
+        store.load(['BBB'])
+        assert store.refresh_stale_in_background() is first
+
+        release.set()
+        store.wait_for_refresh(timeout=5)
+
+        assert sorted(fetcher.calls) == ['AAA', 'BBB']
+        assert not any(e['stale'] for e in store.get_many(['AAA', 'BBB']).values())
+
+
+class TestResearchFundamentalScore:
+    """Tests for ResearchDepartment scoring through the fundamentals store."""
+
+    def test_score_matches_field_values_and_is_cached(self, tmp_path):
+        research = ResearchDepartment(db_path=str(tmp_path / "r.db"))
+        fetcher = FakeFetcher()
+        research.fundamentals.info_fetcher = make_info_fetcher(fetcher)
+
+        score, sector = research._calculate_fundamental_score('AAA')
+
+        # ROE 15 + margin 6 + P/E 15 + P/B 10 + rev 8 + earn 13 + D/E 15 + CR 7
+        assert (score, sector) == (89.0, 'Technology')
+
+        research._fundamentals = {}
+        assert research._calculate_fundamental_score('AAA') == (89.0, 'Technology')
+        assert fetcher.calls == ['AAA']
+
+    def test_unavailable_fundamentals_score_neutral_once(self, tmp_path):
+        research = ResearchDepartment(db_path=str(tmp_path / "r.db"))
+        fetcher = FakeFetcher(failing={'BAD'})
+        research.fundamentals.info_fetcher = make_info_fetcher(fetcher)
+
+        research._load_fundamentals(['BAD'])
+
+        assert research._calculate_fundamental_score('BAD') == (50.0, 'Unknown')
+        assert fetcher.calls == ['BAD']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
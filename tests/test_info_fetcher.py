@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the concurrent, rate-limited info fetcher.
+
+Fetch functions are in-process fakes so no network is needed.
+
+Run with: python -m pytest tests/test_info_fetcher.py -v
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils.info_fetcher import InfoFetcher, TokenBucket
+from Utils.market_data_provider import MarketDataProvider
+
+
+class SlowFetch:
+    """Sleeps per call and tracks peak concurrency."""
+
+    def __init__(self, delay=0.05, fail_first=0, hang=()):
+        self.delay = delay
+        self.fail_first = fail_first
+        self.hang = set(hang)
+        self.attempts = {}
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker):
+        with self._lock:
+            self.attempts[ticker] = self.attempts.get(ticker, 0) + 1
+            attempt = self.attempts[ticker]
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(5 if ticker in self.hang else self.delay)
+            if attempt <= self.fail_first:
+                raise ConnectionError("simulated throttle")
+            return {'symbol': ticker, 'marketCap': 10_000_000_000, 'sector': 'Technology'}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class TestTokenBucket:
+    """Tests for the token bucket rate limiter."""
+
+    def test_rate_is_enforced_after_burst(self):
+        bucket = TokenBucket(rate=50, capacity=5)
+        start = time.monotonic()
+        for _ in range(15):
+            bucket.acquire()
+        elapsed = time.monotonic() - start
+
+        # 5 burst tokens are free; the other 10 need 10/50 = 0.2s
+        assert elapsed >= 0.18
+
+
+class TestInfoFetcher:
+    """Tests for InfoFetcher.fetch_many."""
+
+    def test_runs_concurrently_within_worker_bound(self):
+        fetch = SlowFetch(delay=0.1)
+        fetcher = InfoFetcher(max_workers=4, rate_per_second=1000, fetch=fetch)
+        tickers = [f"T{i}" for i in range(12)]
+
+        start = time.monotonic()
+        infos, errors = fetcher.fetch_many(tickers)
+        elapsed = time.monotonic() - start
+
+        assert list(infos) == tickers and errors == {}
+        assert fetch.peak == 4
+        assert elapsed < 12 * 0.1 / 2  # well under the serial time
+
+    def test_retries_transient_failures(self):
+        fetch = SlowFetch(delay=0, fail_first=2)
+        fetcher = InfoFetcher(rate_per_second=1000, max_retries=2, backoff_seconds=0.01, fetch=fetch)
+
+        infos, _ = fetcher.fetch_many(['AAA', 'BBB'])
+
+        assert set(infos) == {'AAA', 'BBB'}
+        assert fetch.attempts == {'AAA': 3, 'BBB': 3}
+
+    def test_exhausted_retries_and_timeouts_are_reported(self):
+        fetch = SlowFetch(delay=0, fail_first=5, hang={'HUNG'})
+        fetcher = InfoFetcher(rate_per_second=1000, max_retries=1, backoff_seconds=0.01,
+                              timeout=0.2, fetch=fetch)
+
+        start = time.monotonic()
+        infos, errors = fetcher.fetch_many(['BAD', 'HUNG'])
+
+        assert infos == {}
+        assert isinstance(errors['BAD'], ConnectionError)
+        assert isinstance(errors['HUNG'], TimeoutError)
+        assert fetch.attempts['HUNG'] == 1  # Timeouts are not retried
+        assert time.monotonic() - start < 2
+
+    def test_hung_calls_count_against_worker_limit(self):
+        fetch = SlowFetch(delay=0, hang={'HUNG'})
+        fetcher = InfoFetcher(max_workers=1, rate_per_second=1000, timeout=0.2, fetch=fetch)
+
+        infos, errors = fetcher.fetch_many(['HUNG', 'AAA'])
+
+        assert infos == {}
+        assert isinstance(errors['AAA'], TimeoutError)
+        assert fetch.peak == 1 and 'AAA' not in fetch.attempts
+
+
+class TestMarketDataProviderInfos:
+    """Tests for MarketDataProvider.get_stock_infos."""
+
+    def test_failed_lookups_get_placeholder(self, tmp_path):
+        def fetch(ticker):
+            if ticker == 'BAD':
+                raise ValueError("no such symbol")
+            return {'marketCap': 10_000_000_000, 'sector': 'Technology'}
+
+        fetcher = InfoFetcher(rate_per_second=1000, max_retries=0, fetch=fetch)
+        provider = MarketDataProvider(cache_dir=tmp_path, enable_cache=False, info_fetcher=fetcher)
+
+        infos = provider.get_stock_infos(['AAPL', 'BAD'])
+
+        assert infos['AAPL']['market_cap'] == 10_000_000_000
+        assert infos['BAD'] == {'ticker': 'BAD', 'sector': 'Unknown', 'industry': 'Unknown'}
+        assert provider.get_stock_info('AAPL')['sector'] == 'Technology'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the SQLite department message bus.
+
+Run with: python -m pytest tests/test_message_bus.py -v
+"""
+
+import sys
+import json
+import threading
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+import yaml
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils import message_bus
+from Utils.db_connection import close_thread_connections, get_connection
+from Utils.message_bus import MessageBus
+
+
+def approval(ticker, shares=10):
+    return {'ticker': ticker, 'action': 'BUY', 'shares': shares, 'price': 50.0}
+
+
+@pytest.fixture
+def bus(tmp_path):
+    yield MessageBus(tmp_path / "sentinel.db")
+    close_thread_connections()
+
+
+class TestSendAndClaim:
+    """Ordering, typing and payload round trips."""
+
+    def test_claims_by_priority_then_age(self, bus):
+        first = bus.send('EXECUTIVE', 'TRADING', 'ExecutiveApproval', payload=approval('AAA'))
+        second = bus.send('EXECUTIVE', 'TRADING', 'ExecutiveApproval', payload=approval('BBB'))
+        urgent = bus.send('EXECUTIVE', 'TRADING', 'ExecutiveApproval', payload=approval('CCC'),
+                          priority='urgent')
+        bus.send('TRADING', 'PORTFOLIO', 'execution', payload={'ticker': 'AAA'})
+
+        claimed = bus.claim('TRADING')
+
+        assert [m.message_id for m in claimed] == [urgent, first, second]
+        assert claimed[0].payload == approval('CCC')
+        assert claimed[0].metadata['to'] == 'TRADING' and claimed[0].metadata['priority'] == 'urgent'
+        assert bus.claim('TRADING') == []
+
+    def test_message_type_filter_and_limit(self, bus):
+        bus.send('RISK', 'PORTFOLIO', 'RiskAssessment', payload={'approved_candidates': []})
+        bus.send('TRADING', 'PORTFOLIO', 'execution')
+        bus.send('RISK', 'PORTFOLIO', 'RiskAssessment', payload={'approved_candidates': []})
+
+        claimed = bus.claim('PORTFOLIO', limit=1, message_types=['RiskAssessment'])
+
+        assert [m.message_type for m in claimed] == ['RiskAssessment']
+        assert bus.counts('PORTFOLIO') == {'claimed': 1, 'pending': 2}
+
+    def test_claim_only_listed_messages(self, bus):
+        leftover = bus.send('EXECUTIVE', 'TRADING', 'ExecutiveApproval', payload=approval('OLD'))
+        wanted = bus.send_many([dict(from_dept='EXECUTIVE', to_dept='TRADING', message_type='ExecutiveApproval',
+                                     payload=approval(t)) for t in ('AAA', 'BBB')])
+
+        assert bus.claim('TRADING', message_ids=[]) == []
+        assert sorted(m.message_id for m in bus.claim('TRADING', message_ids=wanted)) == sorted(wanted)
+        assert bus.get(leftover).status == 'pending'
+
+    def test_typed_payload_fields_are_required(self, bus):
+        with pytest.raises(ValueError, match='action, shares'):
+            bus.send('EXECUTIVE', 'TRADING', 'ExecutiveApproval', payload={'ticker': 'AAA'})
+        assert bus.counts() == {}
+
+    def test_numpy_scalars_are_serialized(self, bus):
+        np = pytest.importorskip('numpy')
+        bus.send('EXECUTIVE', 'TRADING', 'ExecutiveApproval',
+                 payload={'ticker': 'AAA', 'action': 'BUY', 'shares': np.int64(7), 'price': np.float64(1.5)})
+
+        assert bus.claim('TRADING')[0].payload['shares'] == 7
+
+    def test_queue_lookup_uses_index(self, bus):
+        bus.initialize()
+        conn = get_connection(bus.db_path)
+        try:
+            plan = conn.execute("""
+                EXPLAIN QUERY PLAN SELECT seq FROM department_messages
+                WHERE to_dept = 'TRADING' AND status = 'pending'
+                ORDER BY priority, created_at, seq LIMIT 10
+            """).fetchall()
+        finally:
+            conn.close()
+
+        assert 'idx_department_messages_queue' in ' '.join(row[-1] for row in plan)
+
+
+class TestAckAndRedelivery:
+    """A claimed message is delivered once unless handed back."""
+
+    def test_ack_and_nack(self, bus):
+        done = bus.send('EXECUTIVE', 'TRADING', 'ExecutiveApproval', payload=approval('AAA'))
+        retried = bus.send('EXECUTIVE', 'TRADING', 'ExecutiveApproval', payload=approval('BBB'))
+        bus.claim('TRADING')
+
+        assert bus.ack(done)
+        assert not bus.ack(done)  # Already done
+        assert bus.nack(retried, 'broker timeout') == 'pending'
+
+        again = bus.claim('TRADING')
+        assert [m.message_id for m in again] == [retried] and again[0].attempts == 2
+
+    def test_failed_after_max_attempts(self, bus):
+        message_id = bus.send('EXECUTIVE', 'TRADING', 'ExecutiveApproval', payload=approval('AAA'))
+
+        statuses = []
+        for _ in range(message_bus.MAX_ATTEMPTS):
+            bus.claim('TRADING')
+            statuses.append(bus.nack(message_id, 'rejected'))
+
+        assert statuses[-1] == 'failed' and statuses[:-1] == ['pending'] * (message_bus.MAX_ATTEMPTS - 1)
+        assert bus.claim('TRADING') == []
+
+    def test_stale_claims_are_requeued(self, tmp_path):
+        bus = MessageBus(tmp_path / "sentinel.db", claim_timeout_seconds=-1)
+        message_id = bus.send('EXECUTIVE', 'TRADING', 'ExecutiveApproval', payload=approval('AAA'))
+        bus.claim('TRADING', consumer='crashed')
+
+        assert [m.message_id for m in bus.claim('TRADING')] == [message_id]
+
+    def test_stale_claims_fail_after_max_attempts(self, tmp_path):
+        bus = MessageBus(tmp_path / "sentinel.db", claim_timeout_seconds=-1)
+        message_id = bus.send('EXECUTIVE', 'TRADING', 'ExecutiveApproval', payload=approval('AAA'))
+        for _ in range(message_bus.MAX_ATTEMPTS):
+            assert [m.message_id for m in bus.claim('TRADING', consumer='crashed')] == [message_id]
+
+        assert bus.claim('TRADING') == []
+        assert bus.get(message_id).status == 'failed'
+
+    def test_prune_expires_unclaimed_and_deletes_old_finished(self, bus):
+        done_id = bus.send('EXECUTIVE', 'TRADING', 'ExecutiveApproval', payload=approval('AAA'))
+        bus.claim('TRADING')
+        bus.ack(done_id)
+        unclaimed_id = bus.send('TRADING', 'EXECUTIVE', 'TradeConfirmation')
+        fresh_id = bus.send('EXECUTIVE', 'TRADING', 'ExecutiveApproval', payload=approval('BBB'))
+
+        two_days_ago = message_bus._iso(message_bus._utc_now() - timedelta(days=2))
+        conn = get_connection(bus.db_path)
+        with conn:
+            conn.execute("UPDATE department_messages SET created_at = '2020-01-01T00:00:00.000000Z' "
+                         "WHERE message_id = ?", (done_id,))
+            conn.execute("UPDATE department_messages SET created_at = ? WHERE message_id = ?",
+                         (two_days_ago, unclaimed_id))
+        conn.close()
+
+        assert bus.prune() == {'expired': 1, 'deleted': 1}
+        assert bus.get(done_id) is None
+        assert bus.get(unclaimed_id).status == 'expired'
+        assert bus.get(fresh_id).status == 'pending'
+
+        assert bus.prune(retention_days=0) == {'expired': 0, 'deleted': 1}
+        assert bus.get(unclaimed_id) is None
+
+    def test_concurrent_consumers_never_share_a_message(self, bus):
+        bus.send_many([dict(from_dept='EXECUTIVE', to_dept='TRADING', message_type='ExecutiveApproval',
+                            payload=approval(f"T{i}")) for i in range(200)])
+        claimed = []
+        lock = threading.Lock()
+
+        def consumer():
+            while True:
+                batch = bus.claim('TRADING', limit=7)
+                if not batch:
+                    break
+                with lock:
+                    claimed.extend(m.message_id for m in batch)
+            close_thread_connections()
+
+        threads = [threading.Thread(target=consumer) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(claimed) == 200 and len(set(claimed)) == 200
+
+
+class TestMarkdownExport:
+    """Human-readable audit in the legacy file format."""
+
+    def parse(self, path):
+        _, frontmatter, body = path.read_text(encoding='utf-8').split('---\n', 2)
+        payload = json.loads(body.split('```json')[1].split('```')[0])
+        return yaml.safe_load(frontmatter), body, payload
+
+    def test_send_writes_legacy_outbox_file(self, tmp_path):
+        bus = MessageBus(tmp_path / "sentinel.db", markdown_dir=tmp_path / "Messages")
+        message_id = bus.send('PORTFOLIO', 'TRADING', 'TradeOrder', subject='Trade Order - BUY AAA',
+                              body='**Order Type**: BUY', payload={'ticker': 'AAA', 'shares': 5},
+                              parent_message_id='MSG_RISK_1')
+
+        metadata, body, payload = self.parse(tmp_path / "Messages" / "Outbox" / "PORTFOLIO" / f"{message_id}.md")
+
+        assert metadata['message_id'] == message_id and metadata['parent_message_id'] == 'MSG_RISK_1'
+        assert '# Trade Order - BUY AAA' in body and payload == {'ticker': 'AAA', 'shares': 5}
+
+    def test_export_markdown(self, bus, tmp_path):
+        trading = bus.send('EXECUTIVE', 'TRADING', 'ExecutiveApproval', payload=approval('AAA'))
+        bus.send('TRADING', 'PORTFOLIO', 'execution', payload={'ticker': 'AAA'})
+
+        assert bus.export_markdown(tmp_path / "audit", to_dept='TRADING') == 1
+
+        metadata, _, payload = self.parse(tmp_path / "audit" / "TRADING" / f"{trading}.md")
+        assert metadata['from'] == 'EXECUTIVE' and payload == approval('AAA')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
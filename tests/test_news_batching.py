@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for News Department multi-ticker (batched) sentiment prompts.
+
+Runs offline against a local stub of the chat-completions API.
+
+Run with: python -m pytest tests/test_news_batching.py -v
+"""
+
+import sys
+import json
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Departments.News.news_department import NewsDepartment, parse_batch_sentiment
+from tests.test_news_fetcher import StubPerplexity
+
+
+def entry(ticker, score=70):
+    return {'ticker': ticker, 'sentiment_score': score,
+            'news_summary': f'{ticker} news', 'sentiment_reasoning': 'batched'}
+
+
+class BatchStub(StubPerplexity):
+    """Answers multi-ticker prompts; can drop or corrupt chosen tickers."""
+
+    def __init__(self, drop=(), corrupt=(), garbage=False):
+        super().__init__(rate=10_000, burst=10_000)
+        self.drop = set(drop)
+        self.corrupt = set(corrupt)
+        self.garbage = garbage
+        self.batch_requests = []
+        self.single_requests = []
+
+    def respond(self, prompt, body):
+        if 'each of these stocks:' not in prompt:
+            self.single_requests.append(prompt.split(' for ')[1].split(' ')[0])
+            return super().respond(prompt, body)
+
+        tickers = prompt.split('each of these stocks: ')[1].split('\n')[0].split(', ')
+        self.batch_requests.append(tickers)
+        assert body['response_format']['type'] == 'json_schema'
+        if self.garbage:
+            return "Sorry, I can't help with that."
+
+        results = []
+        for ticker in tickers:
+            if ticker in self.drop:
+                continue
+            results.append({'ticker': ticker, 'sentiment_score': 'high'} if ticker in self.corrupt
+                           else entry(ticker))
+        return "```json\n" + json.dumps({'results': results}) + "\n```"
+
+
+@pytest.fixture
+def news(tmp_path):
+    dept = NewsDepartment(db_path=str(tmp_path / "news.db"), perplexity_api_key="test")
+    dept.initial_requests_per_second = 1000.0
+    dept.max_requests_per_second = 1000.0
+    dept.prompt_batch_size = 5
+    return dept
+
+
+class TestParseBatchSentiment:
+    """Tests for strict per-ticker validation."""
+
+    def test_keeps_only_valid_requested_entries(self):
+        content = json.dumps({'results': [
+            entry('AAA'),
+            entry('bbb', score=55.5),                    # Case-insensitive match
+            entry('AAA', score=10),                      # Duplicate - first wins
+            entry('ZZZ'),                                # Not requested
+            entry('CCC', score=101),                     # Out of range
+            {'ticker': 'DDD', 'sentiment_score': True,   # Bool is not a score
+             'news_summary': '', 'sentiment_reasoning': ''},
+            {'ticker': 'EEE', 'sentiment_score': 60},    # Missing text fields
+            'not an object',
+        ]})
+
+        parsed = parse_batch_sentiment(content, ['AAA', 'BBB', 'CCC', 'DDD', 'EEE'])
+
+        assert set(parsed) == {'AAA', 'BBB'}
+        assert parsed['AAA']['sentiment_score'] == 70.0
+        assert parsed['BBB']['sentiment_score'] == 55.5
+
+    def test_bare_array_and_unparseable_content(self):
+        assert set(parse_batch_sentiment(json.dumps([entry('AAA')]), ['AAA'])) == {'AAA'}
+        assert parse_batch_sentiment("no json here", ['AAA']) == {}
+        assert parse_batch_sentiment(None, ['AAA']) == {}
+
+
+class TestBatchedFetch:
+    """End-to-end batched fetches against the stub API."""
+
+    def test_batches_cut_request_count(self, news):
+        tickers = [f"T{i:02d}" for i in range(20)]
+        with BatchStub() as stub:
+            news.api_url = stub.url
+            results = news._batch_fetch_sentiment(tickers)
+
+        assert len(stub.batch_requests) == 4 and stub.single_requests == []
+        assert news.last_fetch_stats['requests'] == 4
+        assert all(results[t]['sentiment_reasoning'] == 'batched' for t in tickers)
+
+    def test_missing_and_malformed_tickers_fall_back_to_single_calls(self, news):
+        tickers = ['AAA', 'BBB', 'CCC', 'DDD', 'EEE', 'FFF']
+        with BatchStub(drop={'BBB'}, corrupt={'EEE'}) as stub:
+            news.api_url = stub.url
+            results = news._batch_fetch_sentiment(tickers)
+
+        assert sorted(stub.single_requests) == ['BBB', 'EEE', 'FFF']  # FFF is a batch of one
+        assert results['BBB']['sentiment_reasoning'] == 'stub'
+        assert results['AAA']['sentiment_reasoning'] == 'batched'
+        assert news.last_fetch_stats['single_fallbacks'] == 2
+
+    def test_unusable_batch_answer_falls_back_for_whole_group(self, news):
+        with BatchStub(garbage=True) as stub:
+            news.api_url = stub.url
+            results = news._batch_fetch_sentiment(['AAA', 'BBB'])
+
+        assert sorted(stub.single_requests) == ['AAA', 'BBB']
+        assert not any(r.get('fetch_failed') for r in results.values())
+
+    def test_unparseable_single_answer_is_marked_failed(self, news):
+        class GarbageStub(BatchStub):
+            def respond(self, prompt, body):
+                super().respond(prompt, body)
+                return "Sorry, I can't help with that."
+
+        with GarbageStub() as stub:
+            news.api_url = stub.url
+            results = news._batch_fetch_sentiment(['AAA', 'BBB'])
+
+        assert sorted(stub.single_requests) == ['AAA', 'BBB']
+        assert all(r['fetch_failed'] and r['sentiment_score'] == 50.0 for r in results.values())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
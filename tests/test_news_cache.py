@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the News Department sentiment cache.
+
+Run with: python -m pytest tests/test_news_cache.py -v
+"""
+
+import sys
+import sqlite3
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Departments.News import news_department
+from Departments.News.news_department import NewsDepartment
+
+
+def sentiment(score):
+    return {'sentiment_score': score, 'news_summary': f'summary {score}',
+            'sentiment_reasoning': 'reason', 'age_hours': 0.0}
+
+
+@pytest.fixture
+def news(tmp_path):
+    return NewsDepartment(db_path=str(tmp_path / "news.db"), perplexity_api_key="test")
+
+
+class TestSentimentCache:
+    """Tests for _check_cache / _update_cache / clear_expired_cache."""
+
+    def test_bulk_round_trip_across_parameter_chunks(self, news, monkeypatch):
+        monkeypatch.setattr(news_department, 'SQLITE_PARAM_CHUNK', 7)
+        tickers = [f"T{i:03d}" for i in range(30)]
+        news._update_cache({t: sentiment(float(i)) for i, t in enumerate(tickers[:20])})
+
+        cached, needs_fetch = news._check_cache(tickers + ['T000'])
+
+        assert set(cached) == set(tickers[:20])
+        assert cached['T013']['sentiment_score'] == 13.0
+        assert cached['T013']['news_summary'] == 'summary 13.0'
+        assert needs_fetch == tickers[20:]
+
+    def test_expired_rows_are_misses_and_cleared(self, news):
+        news._update_cache({'AAA': sentiment(60.0), 'BBB': sentiment(40.0)})
+        past = (datetime.now() - timedelta(hours=1)).isoformat()
+        conn = sqlite3.connect(news.db_path)
+        conn.execute("UPDATE news_sentiment_cache SET expires_at = ? WHERE ticker = 'AAA'", (past,))
+        conn.commit()
+        conn.close()
+
+        cached, needs_fetch = news._check_cache(['AAA', 'BBB'])
+        assert list(cached) == ['BBB'] and needs_fetch == ['AAA']
+
+        news.clear_expired_cache()
+        conn = sqlite3.connect(news.db_path)
+        remaining = [r[0] for r in conn.execute("SELECT ticker FROM news_sentiment_cache")]
+        conn.close()
+        assert remaining == ['BBB']
+
+    def test_expires_at_index_exists(self, news):
+        conn = sqlite3.connect(news.db_path)
+        plan = conn.execute("EXPLAIN QUERY PLAN DELETE FROM news_sentiment_cache WHERE expires_at < ?",
+                            (datetime.now().isoformat(),)).fetchall()
+        conn.close()
+        assert any('idx_news_sentiment_cache_expires_at' in str(row) for row in plan)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the News Department adaptive sentiment fetcher.
+
+Requests go to a local stub HTTP server (aiohttp) that enforces its own
+rate limit and answers 429 + Retry-After when it is exceeded.
+
+Run with: python -m pytest tests/test_news_fetcher.py -v
+"""
+
+import sys
+import json
+import time
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Departments.News.news_department import NewsDepartment, AdaptiveRateLimiter
+
+
+class StubPerplexity:
+    """Chat-completions stub with a server-side token bucket."""
+
+    def __init__(self, rate: float, burst: float, retry_after: float = 0.2):
+        self.rate = rate
+        self.burst = burst
+        self.retry_after = retry_after
+        self.tokens = burst
+        self.last = time.monotonic()
+        self.served = 0
+        self.rejected = 0
+        self.url = None
+
+    async def handle(self, request):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        if self.tokens < 1:
+            self.rejected += 1
+            return web.Response(status=429, headers={'Retry-After': str(self.retry_after)})
+        self.tokens -= 1
+        self.served += 1
+
+        body = await request.json()
+        content = self.respond(body['messages'][0]['content'], body)
+        return web.json_response({'choices': [{'message': {'content': content}}]})
+
+    def respond(self, prompt: str, body: dict) -> str:
+        """Single-ticker answer (override for other prompt shapes)."""
+        ticker = prompt.split(' for ')[1].split(' ')[0]
+        return json.dumps({'sentiment_score': 60 + len(ticker),
+                           'news_summary': f'{ticker} news',
+                           'sentiment_reasoning': 'stub'})
+
+    def __enter__(self):
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        async def _start():
+            app = web.Application()
+            app.router.add_post('/chat/completions', self.handle)
+            self.runner = web.AppRunner(app)
+            await self.runner.setup()
+            site = web.TCPSite(self.runner, '127.0.0.1', 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            self.url = f"http://127.0.0.1:{port}/chat/completions"
+            started.set()
+
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(_start(), self.loop)
+        started.wait(5)
+        return self
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+
+@pytest.fixture
+def news(tmp_path):
+    dept = NewsDepartment(db_path=str(tmp_path / "news.db"), perplexity_api_key="test")
+    dept.max_concurrency = 5
+    dept.prompt_batch_size = 1
+    dept.initial_requests_per_second = 40.0
+    dept.max_requests_per_second = 80.0
+    return dept
+
+
+class TestAdaptiveRateLimiter:
+    """Tests for the AIMD limiter."""
+
+    def test_backs_off_and_recovers(self):
+        limiter = AdaptiveRateLimiter(rate=8.0, max_rate=9.0, min_rate=1.0, increase_step=0.5)
+
+        limiter.on_rate_limited(0.01)
+        assert limiter.rate == 4.0
+        for _ in range(20):
+            limiter.on_success()
+        assert limiter.rate == 9.0
+
+        for _ in range(10):
+            limiter.on_rate_limited(0.01)
+        assert limiter.rate == 1.0
+
+    def test_pause_applies_to_next_acquire(self):
+        limiter = AdaptiveRateLimiter(rate=100.0)
+
+        async def _run():
+            await limiter.acquire()
+            limiter.on_rate_limited(0.3)
+            start = time.monotonic()
+            await limiter.acquire()
+            return time.monotonic() - start
+
+        assert asyncio.run(_run()) >= 0.29
+
+
+class TestSentimentFetch:
+    """End-to-end fetches against the rate-limited stub server."""
+
+    def test_adapts_to_server_rate_limit(self, news):
+        tickers = [f"T{i:02d}" for i in range(40)]
+        with StubPerplexity(rate=20, burst=5) as stub:
+            news.api_url = stub.url
+            results = news._batch_fetch_sentiment(tickers)
+
+        # Every ticker got a real answer despite the 429s
+        assert all(results[t]['sentiment_score'] == 63.0 for t in tickers)
+        assert stub.rejected > 0
+
+        stats = news.last_fetch_stats
+        assert stats['requests'] == stub.served + stub.rejected
+        assert stats['rate_limited'] == stub.rejected
+        assert stats['final_rate_limit'] < 40.0
+        assert stats['requests_per_second'] > 0
+        # Far faster than the old batches-of-5 with 5s sleeps (~35s for 40 tickers)
+        assert stats['seconds'] < 10
+
+    def test_persistent_429_falls_back_to_neutral(self, news):
+        news.max_rate_limit_retries = 2
+        with StubPerplexity(rate=0.001, burst=0, retry_after=0.05) as stub:
+            news.api_url = stub.url
+            results = news._batch_fetch_sentiment(['AAA'])
+
+        assert results['AAA']['sentiment_score'] == 50.0
+        assert stub.rejected == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
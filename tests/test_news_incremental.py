@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for News Department incremental (news-change driven) refresh.
+
+Perplexity and the headline fingerprint source are in-process fakes.
+
+Run with: python -m pytest tests/test_news_incremental.py -v
+"""
+
+import sys
+import sqlite3
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Departments.News.news_department import NewsDepartment
+from Utils.info_fetcher import InfoFetcher
+
+
+class FakeHeadlines:
+    """ticker -> fingerprint; missing tickers raise like a failed lookup."""
+
+    def __init__(self, fingerprints):
+        self.fingerprints = dict(fingerprints)
+
+    def __call__(self, ticker):
+        return self.fingerprints[ticker]
+
+
+@pytest.fixture
+def news(tmp_path, monkeypatch):
+    dept = NewsDepartment(db_path=str(tmp_path / "news.db"), perplexity_api_key="test")
+    dept.headlines = FakeHeadlines({'AAA': 'a1', 'BBB': 'b1', 'CCC': 'c1'})
+    dept.news_fingerprinter = InfoFetcher(rate_per_second=1000, max_retries=0, fetch=dept.headlines)
+
+    dept.scored = []
+
+    def fake_fetch(tickers):
+        dept.scored.append(list(tickers))
+        return {t: {'sentiment_score': 70.0, 'news_summary': f'{t} news',
+                    'sentiment_reasoning': 'fake', 'age_hours': 0.0} for t in tickers}
+
+    monkeypatch.setattr(dept, '_batch_fetch_sentiment', fake_fetch)
+    return dept
+
+
+def expire_all(db_path, scored_hours_ago=None):
+    conn = sqlite3.connect(db_path)
+    past = (datetime.now() - timedelta(hours=1)).isoformat()
+    conn.execute("UPDATE news_sentiment_cache SET expires_at = ?", (past,))
+    if scored_hours_ago is not None:
+        fetched_at = (datetime.now() - timedelta(hours=scored_hours_ago)).isoformat()
+        conn.execute("UPDATE news_sentiment_cache SET fetched_at = ?", (fetched_at,))
+    conn.commit()
+    conn.close()
+
+
+class TestIncrementalRefresh:
+    """Tests for get_sentiment_scores in incremental mode."""
+
+    def test_only_tickers_with_new_news_are_rescored(self, news):
+        news.get_sentiment_scores(['AAA', 'BBB', 'CCC'])
+        assert news.scored == [['AAA', 'BBB', 'CCC']]
+
+        expire_all(news.db_path)
+        news.headlines.fingerprints['BBB'] = 'b2'  # New headline for BBB only
+        news.scored.clear()
+
+        results = news.get_sentiment_scores(['AAA', 'BBB', 'CCC'])
+
+        assert news.scored == [['BBB']]
+        assert set(results) == {'AAA', 'BBB', 'CCC'}
+        assert news.last_refresh_stats == {'cache_hits': 0, 'unchanged': 2, 'rescored': 1}
+
+        # Unchanged tickers had their TTL extended - now plain cache hits
+        news.scored.clear()
+        news.get_sentiment_scores(['AAA', 'BBB', 'CCC'])
+        assert news.scored == []
+        assert news.last_refresh_stats['cache_hits'] == 3
+
+    def test_failed_fingerprint_or_failed_score_forces_rescore(self, news, monkeypatch):
+        news.get_sentiment_scores(['AAA', 'BBB'])
+        expire_all(news.db_path)
+
+        del news.headlines.fingerprints['AAA']  # Headline lookup fails
+        news.scored.clear()
+        news.get_sentiment_scores(['AAA', 'BBB'])
+        assert news.scored == [['AAA']]
+
+        # A neutral fallback from a failed Perplexity call is never reused
+        def failing_fetch(tickers):
+            news.scored.append(list(tickers))
+            return {t: {'sentiment_score': 50.0, 'news_summary': 'No recent news', 'sentiment_reasoning': 'Error',
+                        'age_hours': 0.0, 'fetch_failed': True} for t in tickers}
+
+        monkeypatch.setattr(news, '_batch_fetch_sentiment', failing_fetch)
+        expire_all(news.db_path)
+        results = news.get_sentiment_scores(['AAA', 'BBB'])
+        assert 'fetch_failed' not in results['AAA']  # Documented result shape is unchanged
+
+        expire_all(news.db_path)
+        news.scored.clear()
+        news.get_sentiment_scores(['AAA', 'BBB'])
+        assert news.scored == [['AAA']]
+        assert news.last_refresh_stats == {'cache_hits': 0, 'unchanged': 1, 'rescored': 1}
+
+    def test_unchanged_scores_past_max_age_are_rescored(self, news):
+        news.get_sentiment_scores(['AAA', 'BBB'])
+        expire_all(news.db_path, scored_hours_ago=news.max_reuse_age_hours + 1)
+        news.scored.clear()
+
+        news.get_sentiment_scores(['AAA', 'BBB'])
+
+        assert news.scored == [['AAA', 'BBB']]
+        assert news.last_refresh_stats == {'cache_hits': 0, 'unchanged': 0, 'rescored': 2}
+
+    def test_disabled_incremental_rescores_everything(self, news):
+        news.get_sentiment_scores(['AAA', 'BBB'])
+        expire_all(news.db_path)
+        news.incremental_refresh = False
+        news.scored.clear()
+
+        news.get_sentiment_scores(['AAA', 'BBB'])
+
+        assert news.scored == [['AAA', 'BBB']]
+
+    def test_adds_fingerprint_column_to_existing_table(self, tmp_path):
+        db_path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE news_sentiment_cache (
+                ticker TEXT PRIMARY KEY, sentiment_score REAL NOT NULL, news_summary TEXT,
+                sentiment_reasoning TEXT, fetched_at TEXT NOT NULL, expires_at TEXT NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+        NewsDepartment(db_path=db_path, perplexity_api_key="test")
+
+        conn = sqlite3.connect(db_path)
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(news_sentiment_cache)")]
+        conn.close()
+        assert 'news_fingerprint' in columns
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the Operations portfolio allocator.
+
+Ranking keep/sell decisions must match the original per-holding
+linear-scan loop; PortfolioAllocator.allocate() must be pure.
+
+Run with: python -m pytest tests/test_portfolio_allocator.py -v
+"""
+
+import sys
+import copy
+import random
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Departments.Operations.portfolio_allocator import (
+    ComparativeRanking, PortfolioAllocator, PositionLimits, RegimeSizing, ABSOLUTE_SCORE_FLOOR
+)
+
+
+def legacy_decisions(holdings, candidates, keeper_threshold_rank):
+    """The pre-refactor ranking loop, kept verbatim as the reference."""
+    all_stocks = []
+    for holding in holdings:
+        all_stocks.append({'ticker': holding.get('ticker'),
+                           'composite_score': holding.get('research_composite_score', holding.get('composite_score', 50))})
+    for candidate in candidates:
+        all_stocks.append({'ticker': candidate.get('ticker'),
+                           'composite_score': candidate.get('composite_score', candidate.get('research_composite_score', 0))})
+    all_stocks.sort(key=lambda x: x['composite_score'], reverse=True)
+
+    decisions = []
+    for holding in holdings:
+        ticker = holding.get('ticker')
+        score = holding.get('research_composite_score', holding.get('composite_score', 50))
+        holding_rank = next((i+1 for i, s in enumerate(all_stocks) if s['ticker'] == ticker), None)
+        must_sell = False
+        sell_reason = None
+        if score < ABSOLUTE_SCORE_FLOOR:
+            must_sell = True
+            sell_reason = f"Score {score:.1f} < {ABSOLUTE_SCORE_FLOOR} absolute minimum"
+        elif holding_rank is not None and holding_rank > keeper_threshold_rank:
+            must_sell = True
+            sell_reason = f"Rank #{holding_rank} (below top {keeper_threshold_rank}), score {score:.1f}"
+        decisions.append((ticker, holding_rank, must_sell, sell_reason))
+    return [s['ticker'] for s in all_stocks], decisions
+
+
+def make_universe(seed, n_holdings=25, n_candidates=80):
+    rng = random.Random(seed)
+    holdings = []
+    for i in range(n_holdings):
+        holding = {'ticker': f"H{i:02d}", 'market_value': 1000.0, 'unrealized_plpc': 1.5}
+        if rng.random() < 0.8:
+            holding['research_composite_score'] = round(rng.uniform(40, 90), 0)  # Coarse -> ties
+        elif rng.random() < 0.5:
+            holding['composite_score'] = round(rng.uniform(40, 90), 0)
+        holdings.append(holding)
+    candidates = [{'ticker': f"C{i:02d}", 'composite_score': round(rng.uniform(40, 90), 0)}
+                  for i in range(n_candidates)]
+    candidates.append({'ticker': 'H03', 'composite_score': 99.0})  # Also listed as a candidate
+    return holdings, candidates
+
+
+class TestComparativeRanking:
+    """Tests for ComparativeRanking."""
+
+    @pytest.mark.parametrize("seed", range(5))
+    @pytest.mark.parametrize("keeper_rank", [15, 20, 28])
+    def test_matches_legacy_decisions(self, seed, keeper_rank):
+        holdings, candidates = make_universe(seed)
+        expected_order, expected = legacy_decisions(holdings, candidates, keeper_rank)
+
+        ranking = ComparativeRanking(holdings, candidates)
+        decisions = ranking.evaluate_holdings(keeper_rank)
+
+        assert [s['ticker'] for s in ranking.all_stocks] == expected_order
+        assert [(d.ticker, d.rank, d.must_sell, d.sell_reason) for d in decisions] == expected
+
+    def test_days_held_and_lookup(self):
+        holdings = [{'ticker': 'AAA', 'research_composite_score': 70}, {'ticker': 'BBB', 'composite_score': 65}]
+        candidates = [{'ticker': 'CCC', 'composite_score': 80}]
+
+        ranking = ComparativeRanking(holdings, candidates, days_held={'AAA': 4})
+
+        assert [s['ticker'] for s in ranking.top(2)] == ['CCC', 'AAA']
+        assert ranking.rank_of('BBB') == 3 and ranking.rank_of('ZZZ') is None
+        by_ticker = {s['ticker']: s for s in ranking.all_stocks}
+        assert by_ticker['AAA']['days_held'] == 4 and by_ticker['BBB']['days_held'] is None
+        assert by_ticker['AAA']['type'] == 'HOLDING' and by_ticker['CCC']['type'] == 'CANDIDATE'
+
+
+def holding(ticker, score, value=5000.0, qty=10, price=500.0, **extra):
+    return dict({'ticker': ticker, 'research_composite_score': score, 'market_value': value,
+                 'quantity': qty, 'current_price': price}, **extra)
+
+
+def candidate(ticker, score, price=50.0):
+    return {'ticker': ticker, 'composite_score': score, 'current_price': price,
+            'sentiment': {'score': 70, 'summary': f'{ticker} news'}}
+
+
+class TestPortfolioAllocator:
+    """Tests for PortfolioAllocator.allocate()."""
+
+    def test_allocate_does_not_mutate_inputs(self):
+        holdings = [holding('KEEP', 80), holding('DROP', 50)]
+        candidates = [candidate(f"C{i:02d}", 90 - i) for i in range(20)]
+        before = copy.deepcopy((holdings, candidates))
+
+        plan = PortfolioAllocator().allocate(holdings, candidates, regime=None, buying_power=100000.0)
+
+        assert (holdings, candidates) == before
+        assert plan.mandatory_sell_flags == {'DROP': f"Score 50.0 < {ABSOLUTE_SCORE_FLOOR} absolute minimum"}
+        assert [o['ticker'] for o in plan.sell_orders] == ['DROP']
+        assert plan.available_capital == 105000.0  # Buying power + mandatory sell proceeds
+        assert all(c['ticker'] in plan.allocated_capital for c in plan.optimized_candidates)
+
+    def test_pending_and_held_tickers_are_not_bought(self):
+        holdings = [holding('HELD', 85)]
+        candidates = [candidate('HELD', 95), candidate('PEND', 94), candidate('OK', 93), candidate('LOW', 55)]
+
+        plan = PortfolioAllocator().allocate(holdings, candidates, regime=None, buying_power=50000.0,
+                                             pending={'PEND'})
+
+        ranked_buys = [o['ticker'] for o in plan.buy_orders if o['gpt5_allocated']]
+        auto_filled = [o['ticker'] for o in plan.buy_orders if not o['gpt5_allocated']]
+        assert ranked_buys == ['OK']
+        assert 'PEND' not in auto_filled and 'LOW' not in auto_filled
+        assert plan.filtered_pending == ['PEND']
+
+    def test_regime_multiplier_and_limits(self):
+        candidates = [candidate(f"C{i:02d}", 90 - i, price=10.0) for i in range(5)]
+        limits = PositionLimits(max_position_value=4000, max_position_pct=0.5, min_position_value=100)
+
+        plan = PortfolioAllocator(limits=limits).allocate(
+            [], candidates, regime={'regime': 'BEARISH', 'confidence': 'HIGH', 'vix_level': 30},
+            buying_power=100000.0)
+
+        assert plan.sizing == RegimeSizing('DEFENSIVE', 15, 0.6)
+        equal_weight = [o for o in plan.buy_orders if o['gpt5_allocated']]
+        assert [o['allocated_capital'] for o in equal_weight] == [4000 * 0.6] * 5
+        assert [o['shares'] for o in equal_weight] == [240] * 5
+
+    def test_drift_trims_and_unknown_holdings(self):
+        holdings = [holding('KEEP', 80, qty=10)]
+        sells = [{'ticker': 'KEEP', 'shares': 25, 'reason': 'drift'}, {'ticker': 'GONE', 'shares': 5}]
+
+        plan = PortfolioAllocator().allocate(holdings, [candidate('C', 90)], regime=None,
+                                             buying_power=1000.0, external_sells=sells)
+
+        assert [(o['ticker'], o['shares'], o['sell_pct']) for o in plan.sell_orders] == [('KEEP', 10, 100)]
+        assert plan.skipped_external_sells == ['GONE']
+
+    def test_no_candidates_raises(self):
+        with pytest.raises(ValueError):
+            PortfolioAllocator().allocate([holding('A', 80)], [], regime=None, buying_power=1000.0)
+
+    def test_position_limits_from_config(self):
+        limits = PositionLimits.from_compliance_config({'position_sizing': {'max_position_value': 9000}})
+        assert (limits.max_position_value, limits.max_position_pct, limits.min_position_value) == (9000, 0.10, 500)
+        assert PositionLimits.from_compliance_config(None) == PositionLimits()
+        assert limits.max_allowed_position(50000.0) == 5000.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
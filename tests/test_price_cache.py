@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the binary columnar price cache.
+
+Run with: python -m pytest tests/test_price_cache.py -v
+"""
+
+import sys
+import json
+import sqlite3
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils.price_cache import PriceCache, FrameStore, encode_price_frame, decode_price_frame
+
+
+def make_frame(days: int = 30) -> pd.DataFrame:
+    """Build an OHLCV frame with yfinance-style dtypes."""
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, days))
+    index = pd.date_range('2026-02-02', periods=days, freq='B', name='Date').as_unit('ns')
+    return pd.DataFrame({
+        'Close': close,
+        'High': close + 1,
+        'Low': close - 1,
+        'Open': close,
+        'Volume': rng.integers(1_000, 1_000_000, days),
+    }, index=index)
+
+
+class TestEncodeDecode:
+    """Round-trip tests for encode_price_frame / decode_price_frame."""
+
+    def test_round_trip_preserves_values_dtypes_and_index(self):
+        frame = make_frame()
+        decoded = decode_price_frame(*encode_price_frame(frame))
+
+        pd.testing.assert_frame_equal(decoded, frame, check_freq=False)
+        assert decoded['Volume'].dtype == np.int64
+        assert isinstance(decoded.index, pd.DatetimeIndex)
+
+    def test_round_trip_timezone_aware_index(self):
+        frame = make_frame()
+        frame.index = frame.index.tz_localize('America/New_York')
+        decoded = decode_price_frame(*encode_price_frame(frame))
+
+        pd.testing.assert_frame_equal(decoded, frame, check_freq=False)
+
+    def test_multiindex_columns_are_flattened(self):
+        frame = make_frame()
+        frame.columns = pd.MultiIndex.from_product([frame.columns, ['AAPL']])
+        decoded = decode_price_frame(*encode_price_frame(frame))
+
+        assert list(decoded.columns) == ['Close', 'High', 'Low', 'Open', 'Volume']
+
+    def test_legacy_json_records_frame(self):
+        """Frames rebuilt from the old JSON format carry dates in a 'Date' column."""
+        frame = make_frame()
+        legacy = frame.reset_index()
+        legacy['Date'] = legacy['Date'].astype(str)
+        legacy = pd.DataFrame(json.loads(json.dumps(legacy.to_dict(orient='records'))))
+
+        decoded = decode_price_frame(*encode_price_frame(legacy))
+
+        pd.testing.assert_frame_equal(decoded, frame, check_freq=False)
+
+
+class TestPriceCache:
+    """Tests for PriceCache storage and migration."""
+
+    def test_put_many_and_get_many(self, tmp_path):
+        cache = PriceCache(str(tmp_path / "cache.db"))
+        cache.initialize()
+        cache.put_many({'AAA': make_frame(), 'BBB': make_frame(10)})
+
+        frames = cache.get_many(['AAA', 'BBB', 'CCC'])
+
+        assert set(frames) == {'AAA', 'BBB'}
+        assert len(frames['BBB']) == 10
+        assert cache.get('CCC') is None
+
+    def test_unencodable_frame_does_not_drop_the_batch(self, tmp_path):
+        cache = PriceCache(str(tmp_path / "cache.db"))
+        cache.initialize()
+        bad = make_frame()
+        bad['Note'] = 'not a number'
+
+        cache.put_many({'AAA': make_frame(), 'BAD': bad})
+
+        assert set(cache.get_many(['AAA', 'BAD'])) == {'AAA'}
+
+    def test_expired_rows_are_misses(self, tmp_path):
+        cache = PriceCache(str(tmp_path / "cache.db"), ttl_hours=-1)
+        cache.initialize()
+        cache.put('AAA', make_frame())
+
+        assert cache.get('AAA') is None
+
+    def test_migrates_legacy_json_rows(self, tmp_path):
+        db_path = str(tmp_path / "cache.db")
+        frame = make_frame()
+        legacy = frame.reset_index()
+        legacy['Date'] = legacy['Date'].astype(str)
+        expires = (datetime.now() + timedelta(hours=4)).isoformat()
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE market_data_cache (
+                ticker TEXT, data_type TEXT, data_json TEXT, fetched_at TEXT, expires_at TEXT,
+                PRIMARY KEY (ticker, data_type)
+            )
+        """)
+        conn.execute("INSERT INTO market_data_cache VALUES (?, ?, ?, ?, ?)",
+                     ('AAA', 'price_data', json.dumps(legacy.to_dict(orient='records')),
+                      datetime.now().isoformat(), expires))
+        conn.commit()
+        conn.close()
+
+        cache = PriceCache(db_path)
+        cache.initialize()
+
+        pd.testing.assert_frame_equal(cache.get('AAA'), frame, check_freq=False)
+
+        conn = sqlite3.connect(db_path)
+        remaining = conn.execute("SELECT COUNT(*) FROM market_data_cache").fetchone()[0]
+        migrated_expiry = conn.execute(
+            "SELECT expires_at FROM price_data_cache WHERE ticker = 'AAA'").fetchone()[0]
+        conn.close()
+        assert remaining == 0
+        assert migrated_expiry == expires
+
+
+class TestFrameStore:
+    """Tests for the run-scoped in-memory FrameStore."""
+
+    def test_hits_misses_and_known_missing(self):
+        store = FrameStore()
+        assert store.lookup('AAA') == (False, None)
+
+        store.put('AAA', make_frame())
+        store.put('BBB', None)  # Known to have no data
+
+        found, frame = store.lookup('AAA')
+        assert found and len(frame) == 30
+        assert store.lookup('BBB') == (True, None)
+
+        stats = store.stats()
+        assert (stats['hits'], stats['misses'], stats['frames']) == (2, 1, 2)
+
+    def test_lru_eviction_over_memory_cap(self):
+        frame = make_frame()
+        frame_mb = frame.memory_usage(index=True).sum() / (1024 * 1024)
+        store = FrameStore(max_megabytes=frame_mb * 2.5)
+
+        store.put('AAA', frame)
+        store.put('BBB', frame)
+        store.lookup('AAA')  # AAA becomes most recently used
+        store.put('CCC', frame)
+
+        assert store.lookup('BBB') == (False, None)
+        assert store.lookup('AAA')[0] and store.lookup('CCC')[0]
+        assert store.stats()['evictions'] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the shared price-history service and its use by Risk.
+
+yfinance is replaced with an in-process fake so no network is needed.
+
+Run with: python -m pytest tests/test_price_history.py -v
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils.price_cache import PriceCache
+from Utils.price_history import PriceHistoryService, get_shared_price_history
+from Departments.Risk.risk_department import RiskDepartment
+from Departments.Risk.risk_department_v2 import RiskDepartment as RiskDepartmentV2
+from tests.test_research_prefetch import FakeDownloader, make_ohlcv
+
+
+@pytest.fixture
+def frames():
+    return {t: make_ohlcv(seed) for seed, t in enumerate(['AAA', 'BBB', 'CCC', 'DDD'])}
+
+
+@pytest.fixture
+def history(tmp_path, frames):
+    return PriceHistoryService(db_path=str(tmp_path / "prices.db"), chunk_size=2,
+                               download=FakeDownloader(frames))
+
+
+class TestPriceHistoryService:
+    """Read-through layering and download batching."""
+
+    def test_prefetch_downloads_once_then_serves_from_memory(self, history, frames):
+        result = history.prefetch(['AAA', 'BBB', 'CCC', 'NOPE'])
+
+        assert history.download.calls == [['AAA', 'BBB'], ['CCC', 'NOPE']]
+        assert list(result) == ['AAA', 'BBB', 'CCC']
+        assert result['AAA']['Close'].tolist() == frames['AAA']['Close'].tolist()
+
+        assert history.get('AAA') is result['AAA']
+        assert history.get('NOPE') is None  # Known-missing, not refetched
+        assert len(history.download.calls) == 2
+
+    def test_research_cache_is_read_before_downloading(self, tmp_path, frames):
+        db_path = str(tmp_path / "prices.db")
+        cache = PriceCache(db_path)
+        cache.initialize()
+        cache.put_many({'AAA': frames['AAA']})
+
+        history = PriceHistoryService(db_path=db_path, download=FakeDownloader(frames))
+        history.prefetch(['AAA', 'BBB'])
+
+        assert history.download.calls == [['BBB']]
+        assert history.stats()['cache_hits'] == 1
+        assert set(cache.get_many(['AAA', 'BBB'])) == {'AAA', 'BBB'}  # Download written back
+
+    def test_lookbacks_are_cached_separately(self, history):
+        history.get('AAA')
+        history.get('AAA', lookback='1y')
+
+        assert history.download.calls == [['AAA'], ['AAA']]
+        assert history.stats()['resident'] == 2
+
+    def test_failed_download_is_retried(self, tmp_path, frames):
+        downloader = FakeDownloader(frames, fail_chunks=True)
+        history = PriceHistoryService(db_path=str(tmp_path / "prices.db"), download=downloader)
+
+        assert history.prefetch(['AAA']) == {}
+        downloader.fail_chunks = False
+        assert 'AAA' in history.prefetch(['AAA'])
+
+    def test_resident_frames_and_missing_markers_expire(self, tmp_path, frames):
+        now = [datetime(2026, 3, 10, 9, 30)]
+        history = PriceHistoryService(db_path=str(tmp_path / "prices.db"), ttl_hours=4,
+                                      missing_ttl_minutes=30, download=FakeDownloader(frames),
+                                      clock=lambda: now[0])
+        history.get('AAA', lookback='1y')
+        history.get('NOPE', lookback='1y')
+
+        now[0] += timedelta(minutes=45)  # Missing marker expired, frame still fresh
+        history.get('AAA', lookback='1y')
+        history.get('NOPE', lookback='1y')
+        assert history.download.calls == [['AAA'], ['NOPE'], ['NOPE']]
+
+        now[0] += timedelta(hours=4)  # Past ttl_hours
+        history.get('AAA', lookback='1y')
+        assert history.download.calls[-1] == ['AAA']
+
+        now[0] = datetime(2026, 3, 10, 23, 50)
+        history.get('AAA', lookback='1y')
+        now[0] = datetime(2026, 3, 11, 0, 5)  # New day, even though within ttl
+        history.get('AAA', lookback='1y')
+        assert history.download.calls[-2:] == [['AAA'], ['AAA']] and len(history.download.calls) == 6
+
+    def test_shared_service_is_per_database(self, tmp_path):
+        first = get_shared_price_history(str(tmp_path / "a.db"))
+
+        assert get_shared_price_history(str(tmp_path / "a.db")) is first
+        assert get_shared_price_history(str(tmp_path / "b.db")) is not first
+
+
+class TestRiskUsesSharedHistory:
+    """Risk derives ATR, volatility and price from one bulk download."""
+
+    @pytest.mark.parametrize('risk_class', [RiskDepartment, RiskDepartmentV2])
+    def test_one_download_for_all_candidates(self, history, frames, risk_class):
+        risk = risk_class(price_history=history)
+        candidates = [{'ticker': 'AAA', 'current_price': 0}, {'ticker': 'BBB', 'current_price': 0},
+                      {'ticker': 'CCC', 'current_price': 55.0}]
+
+        assessed = risk.assess_candidates(candidates, available_capital=100000.0)
+
+        assert history.download.calls == [['AAA', 'BBB'], ['CCC']]
+        metrics = assessed[0]['risk_metrics']
+        assert metrics['entry_price'] == pytest.approx(frames['AAA']['Close'].iloc[-1])
+        expected_vol = frames['AAA']['Close'].pct_change().dropna().std() * (252 ** 0.5) * 100
+        assert metrics['volatility_pct'] == pytest.approx(expected_vol)
+        assert metrics['atr'] >= 2.0  # High - Low is 2.0 on every bar
+        assert assessed[2]['risk_metrics']['entry_price'] == 55.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for Research Department bulk price prefetch.
+
+yfinance is replaced with an in-process fake so no network is needed.
+
+Run with: python -m pytest tests/test_research_prefetch.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Departments.Research import research_department
+from Departments.Research.research_department import ResearchDepartment
+
+
+def make_ohlcv(seed: int, days: int = 40) -> pd.DataFrame:
+    """Build a deterministic OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    close = 50 + np.cumsum(rng.normal(0, 1, days))
+    index = pd.date_range('2026-01-01', periods=days, freq='B', name='Date')
+    return pd.DataFrame({
+        'Open': close + 0.1,
+        'High': close + 1.0,
+        'Low': close - 1.0,
+        'Close': close,
+        'Volume': rng.integers(500_000, 3_000_000, days).astype(float),
+    }, index=index)
+
+
+class FakeDownloader:
+    """Records yf.download calls and returns grouped-by-ticker frames."""
+
+    def __init__(self, available, fail_chunks=False):
+        self.available = available
+        self.fail_chunks = fail_chunks
+        self.calls = []
+
+    def __call__(self, tickers, **kwargs):
+        self.calls.append(tickers)
+        if isinstance(tickers, str):
+            if tickers not in self.available:
+                return pd.DataFrame()
+            return self.available[tickers]
+        if self.fail_chunks:
+            raise RuntimeError("simulated chunk failure")
+        frames = {t: self.available[t] for t in tickers if t in self.available}
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1, names=['Ticker', 'Price'])
+
+
+@pytest.fixture
+def research(tmp_path):
+    return ResearchDepartment(db_path=str(tmp_path / "test.db"), prefetch_chunk_size=2)
+
+
+class TestPrefetchPriceData:
+    """Tests for ResearchDepartment._prefetch_price_data."""
+
+    def test_chunks_only_cache_misses(self, research, monkeypatch):
+        """Cached tickers are read from SQLite; misses are fetched in chunks."""
+        available = {t: make_ohlcv(i) for i, t in enumerate(['AAA', 'BBB', 'CCC', 'DDD', 'EEE'])}
+        research._cache_price_data('AAA', available['AAA'])
+
+        fake = FakeDownloader(available)
+        monkeypatch.setattr(research_department.yf, 'download', fake)
+
+        frames = research._prefetch_price_data(['AAA', 'BBB', 'CCC', 'DDD', 'EEE'])
+
+        assert fake.calls == [['BBB', 'CCC'], ['DDD', 'EEE']]
+        assert set(frames) == {'AAA', 'BBB', 'CCC', 'DDD', 'EEE'}
+        assert frames['CCC']['Close'].tolist() == available['CCC']['Close'].tolist()
+
+        # Everything is now cached - a second prefetch makes no downloads
+        fake.calls.clear()
+        frames = research._prefetch_price_data(['AAA', 'BBB', 'CCC', 'DDD', 'EEE'])
+        assert fake.calls == []
+        assert len(frames) == 5
+
+    def test_missing_symbols_are_reported_not_fatal(self, research, monkeypatch):
+        """A symbol absent from the chunk result does not drop its neighbours."""
+        available = {'AAA': make_ohlcv(1), 'CCC': make_ohlcv(3)}
+        monkeypatch.setattr(research_department.yf, 'download', FakeDownloader(available))
+
+        frames = research._prefetch_price_data(['AAA', 'BBB', 'CCC'])
+
+        assert set(frames) == {'AAA', 'CCC'}
+
+    def test_failed_chunk_falls_back_to_single_downloads(self, research, monkeypatch):
+        """If the multi-symbol request raises, each symbol is retried alone."""
+        available = {'AAA': make_ohlcv(1), 'BBB': make_ohlcv(2)}
+        fake = FakeDownloader(available, fail_chunks=True)
+        monkeypatch.setattr(research_department.yf, 'download', fake)
+
+        frames = research._prefetch_price_data(['AAA', 'BBB'])
+
+        assert fake.calls == [['AAA', 'BBB'], 'AAA', 'BBB']
+        assert set(frames) == {'AAA', 'BBB'}
+
+
+class TestRunFrameStore:
+    """Tests for the per-run frame store shared across Research stages."""
+
+    def test_stages_share_frames_within_a_run(self, research, monkeypatch):
+        available = {f"T{i}": make_ohlcv(i, 60) for i in range(12)}
+        fake = FakeDownloader(available)
+        monkeypatch.setattr(research_department.yf, 'download', fake)
+        monkeypatch.setattr(research, '_calculate_fundamental_score', lambda t: (50.0, 'Unknown'))
+
+        db_reads = []
+        get_many = research.price_cache.get_many
+        monkeypatch.setattr(research.price_cache, 'get_many',
+                            lambda tickers: db_reads.append(list(tickers)) or get_many(tickers))
+
+        with research._frame_store_scope() as store:
+            candidates = research._two_stage_filter(list(available), target_count=4)
+            research._score_stocks(candidates, context='new_buys')
+            stats = store.stats()
+
+        assert candidates
+        # Only the prefetch touched SQLite; every later stage read from memory
+        assert len(db_reads) == 1
+        assert stats['misses'] == 0
+        assert stats['hits'] >= len(available) + len(candidates)
+        assert research._frame_store is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
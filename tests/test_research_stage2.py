@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for single-pass Stage 2 preset evaluation.
+
+The feature-table/mask path must choose the same preset and return the
+same candidate list as the original preset-by-preset _passes_filters loop.
+
+Run with: python -m pytest tests/test_research_stage2.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Departments.Research.research_department import ResearchDepartment
+
+
+def legacy_stage2(research, qualified_tickers, target_count):
+    """The pre-refactor Stage 2 loop, kept verbatim as the reference."""
+    candidates = []
+    for preset in research.STAGE2_PRESETS:
+        candidates = []
+        for ticker in qualified_tickers:
+            data = research._get_cached_price_data(ticker)
+            if data is None or len(data) < 20:
+                continue
+            if research._passes_filters(data, preset):
+                candidates.append(ticker)
+
+        target_min = int(target_count * 0.8)
+        target_max = int(target_count * 1.2)
+        if target_min <= len(candidates) <= target_max:
+            return preset['name'], candidates[:target_count]
+        if len(candidates) < target_min and preset['name'] == 'VERY_RELAXED':
+            return preset['name'], candidates
+    return None, candidates[:target_count]
+
+
+def make_frames(count, seed):
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for i in range(count):
+        days = int(rng.choice([15, 40, 60]))
+        close = rng.uniform(0.5, 300) * np.cumprod(1 + rng.normal(0, 0.03, days))
+        frames[f"T{i:03d}"] = pd.DataFrame({
+            'Close': close,
+            'High': close * 1.01,
+            'Low': close * 0.99,
+            'Volume': rng.integers(50_000, 4_000_000, days).astype(float),
+        })
+    frames['FLAT'] = pd.DataFrame({'Close': [10.0] * 30, 'Volume': [1e6] * 30})  # RSI is NaN
+    return frames
+
+
+@pytest.fixture
+def research(tmp_path):
+    return ResearchDepartment(db_path=str(tmp_path / "test.db"))
+
+
+class TestStage2Presets:
+    """Mask-based preset selection vs the legacy loop."""
+
+    @pytest.mark.parametrize("seed,target_count", [(0, 20), (1, 40), (2, 80), (3, 5)])
+    def test_same_candidates_as_legacy_loop(self, research, monkeypatch, seed, target_count):
+        frames = make_frames(150, seed)
+        tickers = list(frames) + ['MISSING']
+        monkeypatch.setattr(research, '_get_cached_price_data', lambda t: frames.get(t))
+
+        _, expected = legacy_stage2(research, tickers, target_count)
+
+        features = research._build_stage2_features(tickers)
+        masks = [research._preset_mask(features, p) for p in research.STAGE2_PRESETS]
+        legacy_counts = [
+            sum(1 for t in tickers if frames.get(t) is not None and len(frames[t]) >= 20
+                and research._passes_filters(frames[t], p))
+            for p in research.STAGE2_PRESETS
+        ]
+        assert [int(m.sum()) for m in masks] == legacy_counts
+
+        result = research._apply_stage2_filters(tickers, target_count)
+
+        assert result == expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
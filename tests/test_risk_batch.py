@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the vectorized Risk Department assessment.
+
+The batch path must match the per-candidate methods (_calculate_risk_metrics,
+_calculate_risk_score, _generate_warnings) candidate for candidate.
+
+Run with: python -m pytest tests/test_risk_batch.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils.price_history import PriceHistoryService
+from Departments.Risk.risk_department import RiskDepartment, build_price_panel
+from tests.test_research_prefetch import FakeDownloader
+
+
+def make_frames(n, seed=7):
+    """Random-walk OHLC frames with varied volatility, lengths and a few gaps."""
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for i in range(n):
+        days = int(rng.choice([10, 14, 15, 40, 60]))
+        sigma = rng.uniform(0.002, 0.06)
+        close = 20 * np.exp(np.cumsum(rng.normal(0, sigma, days))) + rng.uniform(0, 200)
+        spread = close * rng.uniform(0.002, 0.08)
+        frame = make_frame(close, spread)
+        if i % 9 == 0:
+            frame.iloc[days // 2, :] = np.nan  # Missing bar mid-history
+        frames[f"T{i:03d}"] = frame
+    return frames
+
+
+def make_frame(close, spread):
+    index = pd.date_range('2026-01-01', periods=len(close), freq='B', name='Date')
+    return pd.DataFrame({'Open': close, 'High': close + spread, 'Low': close - spread,
+                         'Close': close, 'Volume': np.full(len(close), 1e6)}, index=index)
+
+
+@pytest.fixture
+def risk(tmp_path):
+    frames = make_frames(120)
+    history = PriceHistoryService(db_path=str(tmp_path / "prices.db"), download=FakeDownloader(frames))
+    dept = RiskDepartment(price_history=history)
+    dept.frames = frames
+    return dept
+
+
+class TestBatchMatchesScalar:
+    """Batch output equals the per-candidate path."""
+
+    @pytest.mark.parametrize('capital', [100000.0, 7500.0])
+    def test_metrics_scores_and_warnings(self, risk, capital):
+        rng = np.random.default_rng(3)
+        candidates = [{'ticker': t, 'current_price': 0 if i % 3 else float(rng.uniform(5, 300))}
+                      for i, t in enumerate(risk.frames)]
+        candidates.append({'ticker': 'NODATA', 'current_price': 42.0})
+        risk.price_history.prefetch([c['ticker'] for c in candidates])
+
+        risk.vectorized_assessment = False
+        expected = risk.assess_candidates([dict(c) for c in candidates], capital)
+        risk.vectorized_assessment = True
+        batch = risk.assess_candidates([dict(c) for c in candidates], capital)
+
+        for want, got in zip(expected, batch):
+            assert got['risk_score'] == want['risk_score'], got['ticker']
+            assert got['risk_warnings'] == want['risk_warnings'], got['ticker']
+            assert got['risk_metrics'].keys() == want['risk_metrics'].keys()
+            for key, value in want['risk_metrics'].items():
+                assert got['risk_metrics'][key] == pytest.approx(value, rel=1e-9, abs=1e-9, nan_ok=True), key
+
+    def test_candidates_keep_their_fields_and_identity(self, risk):
+        candidates = [{'ticker': 'T001', 'current_price': 0, 'sentiment': {'score': 70}},
+                      {'ticker': 'T001', 'current_price': 12.5}]
+
+        assessed = risk.assess_candidates(candidates, 100000.0)
+
+        assert assessed[0] is candidates[0] and assessed[0]['sentiment'] == {'score': 70}
+        assert assessed[1]['risk_metrics']['entry_price'] == 12.5
+        assert assessed[0]['risk_metrics']['atr'] == assessed[1]['risk_metrics']['atr']
+
+    def test_missing_price_is_flagged_instead_of_raising(self, risk):
+        assessed = risk.assess_candidates([{'ticker': 'NODATA', 'current_price': 0}], 100000.0)
+
+        assert assessed[0]['risk_warnings'][-1] == "INVALID DATA - Could not fetch current price"
+
+
+class TestBuildPricePanel:
+    """Panel layout used by the batch path."""
+
+    def test_right_aligned_with_nan_columns_for_missing(self, risk):
+        frames = {t: risk.frames[t] for t in ['T001', 'T002']}
+        panel = build_price_panel(frames, ['T001', 'T002', 'MISSING'])
+
+        length = max(len(f) for f in frames.values())
+        assert panel['Close'].shape == (length, 3)
+        for ticker, frame in frames.items():
+            assert panel['Close'][ticker].iloc[-1] == frame['Close'].iloc[-1]
+            assert panel['Close'][ticker].notna().sum() == frame['Close'].notna().sum()
+        assert panel['Close']['MISSING'].isna().all()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
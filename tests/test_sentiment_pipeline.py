@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the pipelined Research -> News workflow.
+
+Research streams tickers to a SentimentPipeline while it scores them; the
+pipeline must return the same sentiment data as one sequential
+get_sentiment_scores() call, in roughly max(research, news) wall time.
+
+Run with: python -m pytest tests/test_sentiment_pipeline.py -v
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Departments.News.news_department import NewsDepartment, SentimentPipeline
+from Departments.Research.research_department import ResearchDepartment
+
+
+@pytest.fixture
+def news(tmp_path, monkeypatch):
+    dept = NewsDepartment(db_path=str(tmp_path / "news.db"), perplexity_api_key="test")
+    dept.incremental_refresh = False
+    dept.fetched = []
+
+    def fake_fetch(tickers):
+        dept.fetched.extend(tickers)
+        time.sleep(0.05 * len(tickers))  # Stand-in for Perplexity latency
+        return {t: {'sentiment_score': float(len(t) * 10), 'news_summary': f'{t} news',
+                    'sentiment_reasoning': 'fake', 'age_hours': 0.0} for t in tickers}
+
+    monkeypatch.setattr(dept, '_batch_fetch_sentiment', fake_fetch)
+    return dept
+
+
+def produce(sink, holdings, candidates, delay):
+    """Mimic Research: holdings up front, then one candidate per scoring step."""
+    sink(holdings)
+    for ticker in candidates:
+        time.sleep(delay)
+        sink([ticker])
+
+
+class TestSentimentPipeline:
+    """Tests for the producer/consumer sentiment pipeline."""
+
+    def test_matches_sequential_and_overlaps_research(self, news, tmp_path):
+        holdings = ['AAPL', 'MSFT', 'NVDA']
+        candidates = [f"C{i:02d}" for i in range(12)]
+        final = holdings + candidates
+
+        start = time.perf_counter()
+        pipeline = SentimentPipeline(news, batch_size=4, linger_seconds=0.05).start()
+        produce(pipeline.submit, holdings, candidates, delay=0.05)
+        research_seconds = time.perf_counter() - start
+        pipelined = pipeline.finish(final)
+        pipelined_seconds = time.perf_counter() - start
+
+        sequential_news = NewsDepartment(db_path=str(tmp_path / "sequential.db"), perplexity_api_key="test")
+        sequential_news.incremental_refresh = False
+        sequential_news._batch_fetch_sentiment = news._batch_fetch_sentiment
+        sequential = sequential_news.get_sentiment_scores(final)
+
+        strip = lambda data: {t: {k: v for k, v in d.items() if k != 'age_hours'} for t, d in data.items()}
+        assert strip(pipelined) == strip(sequential)
+
+        # News work (~0.75s) mostly hidden behind Research (~0.6s) rather than added to it
+        assert pipelined_seconds < research_seconds + 0.75 * 0.6
+        assert pipeline.stats['scored_early'] > len(final) // 2
+        assert pipeline.refresh_stats['rescored'] == len(final)
+
+    def test_unused_tickers_dropped_and_late_tickers_fetched(self, news):
+        pipeline = SentimentPipeline(news, batch_size=2, linger_seconds=0.01).start()
+        pipeline.submit(['AAA', 'BBB', 'AAA'])
+        pipeline.submit(['DROPPED'])
+
+        results = pipeline.finish(['AAA', 'BBB', 'LATE'])
+
+        assert list(results) == ['AAA', 'BBB', 'LATE']
+        assert sorted(news.fetched) == ['AAA', 'BBB', 'DROPPED', 'LATE']  # AAA scored once
+        assert pipeline.stats == {'submitted': 3, 'scored_early': 2, 'scored_late': 1, 'unused': 1}
+
+    def test_worker_error_is_raised_by_finish(self, news, monkeypatch):
+        def broken(tickers):
+            raise RuntimeError("perplexity down")
+
+        monkeypatch.setattr(news, '_batch_fetch_sentiment', broken)
+        pipeline = SentimentPipeline(news, batch_size=1, linger_seconds=0.0).start()
+        pipeline.submit(['AAA'])
+
+        with pytest.raises(RuntimeError, match="perplexity down"):
+            pipeline.finish(['AAA'])
+
+
+class TestResearchTickerSink:
+    """Research emits holdings first, then each candidate once it is scored."""
+
+    def test_emission_order(self, tmp_path, monkeypatch):
+        research = ResearchDepartment(db_path=str(tmp_path / "research.db"))
+        frame = pd.DataFrame({'Close': np.linspace(10, 20, 60), 'Volume': np.full(60, 1e6)})
+
+        monkeypatch.setattr(research, '_load_universe', lambda: ['AAA', 'BBB', 'NODATA', 'HELD'])
+        monkeypatch.setattr(research, '_get_current_holdings', lambda: [{'ticker': 'HELD', 'quantity': 5}])
+        monkeypatch.setattr(research, '_two_stage_filter', lambda universe, target_count, exclude: ['AAA', 'NODATA', 'BBB'])
+        monkeypatch.setattr(research, '_load_fundamentals', lambda tickers: {})
+        monkeypatch.setattr(research, '_calculate_fundamental_score', lambda ticker: (50.0, 'Tech'))
+        monkeypatch.setattr(research, '_get_cached_price_data', lambda t: None if t == 'NODATA' else frame)
+        monkeypatch.setattr(research, '_get_market_conditions', lambda: {})
+
+        emitted = []
+        universe = research.generate_daily_candidate_universe(ticker_sink=emitted.append)
+
+        assert emitted == [['HELD'], ['AAA'], ['BBB']]
+        assert [c['ticker'] for c in universe['buy_candidates']] == ['AAA', 'BBB']
+        assert research._ticker_sink is None
+
+    def test_failing_sink_does_not_break_research(self, tmp_path, monkeypatch):
+        research = ResearchDepartment(db_path=str(tmp_path / "research.db"))
+        frame = pd.DataFrame({'Close': np.linspace(10, 20, 60), 'Volume': np.full(60, 1e6)})
+        monkeypatch.setattr(research, '_calculate_fundamental_score', lambda ticker: (50.0, 'Tech'))
+        monkeypatch.setattr(research, '_get_cached_price_data', lambda t: frame)
+
+        def sink(tickers):
+            raise ValueError("queue closed")
+
+        research._ticker_sink = sink
+        scored = research._score_stocks(['AAA', 'BBB'], context='new_buys')
+
+        assert [s['ticker'] for s in scored] == ['AAA', 'BBB']
+        assert research._ticker_sink is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
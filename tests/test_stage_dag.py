@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the Operations workflow stage DAG executor.
+
+Run with: python -m pytest tests/test_stage_dag.py -v
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Departments.Operations.stage_dag import StageDAG
+
+
+def sleeper(seconds, value=None):
+    def _run(*deps):
+        time.sleep(seconds)
+        return value if value is not None else deps
+    return _run
+
+
+class TestStageDAG:
+    """Tests for StageDAG scheduling, timing and critical path."""
+
+    def test_independent_nodes_run_concurrently(self):
+        dag = StageDAG(max_workers=4)
+        dag.add('regime', sleeper(0.2, 'BULL'))
+        dag.add('buying_power', sleeper(0.2, 1000.0))
+        dag.add('research', sleeper(0.3, 'R'))
+        dag.add('news', lambda research: research + '+N', deps=['research'])
+        dag.add('allocator', lambda news, regime, bp: (news, regime, bp),
+                deps=['news', 'regime', 'buying_power'])
+
+        results = dag.run()
+
+        assert results['allocator'] == ('R+N', 'BULL', 1000.0)
+        assert dag.total_seconds < 0.5  # Serial would be ~0.7s
+        assert dag.timings['regime'].start < 0.05 and dag.timings['research'].start < 0.05
+        assert dag.timings['allocator'].start >= dag.timings['news'].end
+
+    def test_critical_path_and_payload(self):
+        dag = StageDAG(max_workers=4)
+        dag.add('fast', sleeper(0.01, 1))
+        dag.add('slow', sleeper(0.15, 2))
+        dag.add('join', lambda a, b: a + b, deps=['fast', 'slow'])
+        dag.run()
+
+        assert [t.name for t in dag.critical_path()] == ['slow', 'join']
+
+        payload = dag.to_payload()
+        assert payload['critical_path'] == ['slow', 'join']
+        nodes = {n['name']: n for n in payload['nodes']}
+        assert nodes['slow']['duration_seconds'] >= 0.15
+        assert nodes['join']['deps'] == ['fast', 'slow'] and nodes['join']['status'] == 'ok'
+        assert nodes['fast']['started_at'].endswith('Z')
+
+        report = dag.format_report()
+        assert 'CRITICAL PATH' in report and 'slow' in report
+
+    def test_halt_skips_dependents_only(self):
+        dag = StageDAG()
+        dag.add('research', lambda: {'success': False}, halt_if=lambda r: not r['success'])
+        dag.add('news', lambda r: 'news', deps=['research'])
+        dag.add('allocator', lambda n: 'plan', deps=['news'])
+        dag.add('regime', lambda: 'BULL')
+
+        results = dag.run()
+
+        assert set(results) == {'research', 'regime'}
+        statuses = {name: t.status for name, t in dag.timings.items()}
+        assert statuses == {'research': 'halted', 'news': 'skipped', 'allocator': 'skipped', 'regime': 'ok'}
+
+    def test_error_skips_downstream_and_is_reraised(self):
+        def broken():
+            raise RuntimeError("alpaca down")
+
+        dag = StageDAG()
+        dag.add('buying_power', broken)
+        dag.add('allocator', lambda bp: bp, deps=['buying_power'])
+        dag.add('research', sleeper(0.05, 'R'))
+
+        with pytest.raises(RuntimeError, match="alpaca down"):
+            dag.run()
+
+        assert dag.results == {'research': 'R'}  # In-flight work still completes
+        assert dag.timings['buying_power'].status == 'failed'
+        assert dag.timings['buying_power'].error == 'alpaca down'
+        assert dag.timings['allocator'].status == 'skipped'
+
+    def test_rejects_unknown_dependency_and_duplicates(self):
+        dag = StageDAG()
+        dag.add('a', lambda: 1)
+        with pytest.raises(ValueError):
+            dag.add('b', lambda x: x, deps=['missing'])
+        with pytest.raises(ValueError):
+            dag.add('a', lambda: 2)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
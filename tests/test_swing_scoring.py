@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the vectorized swing suitability scoring engine.
+
+The panel engine must reproduce the per-ticker path exactly - same
+floats, same bucket scores - so these tests compare with ==, not approx.
+
+Run with: python -m pytest tests/test_swing_scoring.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Departments.Research import swing_scoring
+
+
+def make_universe(count: int, seed: int = 0) -> dict:
+    """Random OHLCV frames with mixed lengths, price levels and volatilities."""
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for i in range(count):
+        days = int(rng.choice([20, 33, 41, 60, 60, 60]))
+        close = rng.uniform(1, 600) * np.cumprod(1 + rng.normal(0, rng.uniform(0.005, 0.05), days))
+        volume = rng.integers(1_000, 5_000_000, days)
+        frames[f"T{i:04d}"] = pd.DataFrame({
+            'Open': close,
+            'High': close * (1 + rng.uniform(0, 0.08, days)),
+            'Low': close * (1 - rng.uniform(0, 0.08, days)),
+            'Close': close,
+            'Volume': volume.astype(float) if i % 2 else volume,
+        }, index=pd.date_range('2026-01-01', periods=days, freq='B'))
+    return frames
+
+
+class TestPanelMatchesScalar:
+    """score_swing_suitability_panel must equal score_swing_suitability."""
+
+    def test_random_universe_bit_identical(self):
+        frames = make_universe(500)
+        scalar = swing_scoring.score_many(frames, vectorized=False)
+        panel = swing_scoring.score_many(frames, vectorized=True)
+
+        assert panel == scalar
+
+    def test_irregular_frames_fall_back_to_scalar(self):
+        frames = make_universe(3)
+        frames['GAPS'] = frames['T0000'].copy()
+        frames['GAPS'].iloc[4, frames['GAPS'].columns.get_loc('Close')] = np.nan
+        frames['NO_HIGH'] = frames['T0001'].drop(columns=['High'])
+
+        panel = swing_scoring.score_many(frames, vectorized=True)
+
+        assert panel['GAPS'] == swing_scoring.score_swing_suitability(frames['GAPS'])
+        assert isinstance(panel['NO_HIGH'], KeyError)
+
+    def test_bucket_edges(self):
+        """Boundary values land in the same buckets as the if/elif ladders."""
+        volatility = np.array([15, 20, 25, 35, 40, 50, 50.01, 14.99, np.nan])
+        avg_volume = np.array([249_999, 250_000, 500_000, 1_000_000, 2_000_000, 0, 1, 2, np.nan])
+        price = np.array([2, 5, 10, 200, 200.01, 500, 500.01, 1.99, np.nan])
+        atr_pct = np.array([4, 5, 6, 9, 10, 12, 12.01, 3.99, np.nan])
+
+        scores = swing_scoring.bucket_scores(volatility, avg_volume, price, atr_pct)
+
+        assert scores['vol_score'].tolist() == [10, 20, 25, 25, 20, 10, 5, 5, 5]
+        assert scores['liq_score'].tolist() == [5, 10, 15, 20, 25, 5, 5, 5, 5]
+        assert scores['price_score'].tolist() == [10, 15, 25, 25, 15, 15, 5, 5, 5]
+        assert scores['atr_score'].tolist() == [10, 20, 25, 25, 20, 10, 5, 5, 5]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
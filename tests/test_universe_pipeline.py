@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the staged, resumable universe refresh pipeline.
+
+yf.download and the info fetcher are in-process fakes so no network is needed.
+
+Run with: python -m pytest tests/test_universe_pipeline.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Utils.info_fetcher import InfoFetcher
+from Utils.universe_pipeline import UniversePipeline, passes_history_filters, STAGE_HISTORY
+
+CRITERIA = {
+    'min_market_cap': 2_000_000_000,
+    'max_market_cap': 200_000_000_000,
+    'min_avg_volume': 2_000_000,
+    'min_price': 10.0,
+    'max_price': 500.0,
+    'min_atr_percent': 2.5,
+}
+
+
+def make_history(price=50.0, volume=3_000_000, swing=2.0, days=21):
+    """Daily bars with a fixed High-Low range of `swing` dollars."""
+    index = pd.date_range('2026-03-02', periods=days, freq='B', name='Date')
+    close = np.full(days, price)
+    return pd.DataFrame({
+        'Open': close, 'High': close + swing / 2, 'Low': close - swing / 2,
+        'Close': close, 'Volume': np.full(days, float(volume)),
+    }, index=index)
+
+
+UNIVERSE = {
+    'GOOD': (make_history(), 10e9),
+    'CHEAP': (make_history(price=5.0, swing=0.5), 10e9),
+    'THIN': (make_history(volume=100_000), 10e9),
+    'CALM': (make_history(swing=0.5), 10e9),
+    'SMALL': (make_history(), 1e9),
+    'HUGE': (make_history(), 500e9),
+    'OK2': (make_history(price=100.0, swing=4.0), 50e9),
+}
+
+
+class FakeDownload:
+    """Group-by-ticker multi-symbol yf.download; optionally dies after N chunks."""
+
+    def __init__(self, fail_after=None):
+        self.calls = []
+        self.fail_after = fail_after
+
+    def __call__(self, tickers, **kwargs):
+        if self.fail_after is not None and len(self.calls) >= self.fail_after:
+            raise KeyboardInterrupt  # Simulated interruption (not a download error)
+        self.calls.append(list(tickers))
+        frames = {t: UNIVERSE[t][0] for t in tickers if t in UNIVERSE}
+        return pd.concat(frames, axis=1, names=['Ticker', 'Price']) if frames else pd.DataFrame()
+
+
+class FakeInfo:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, ticker):
+        self.calls.append(ticker)
+        return {'marketCap': UNIVERSE[ticker][1]}
+
+
+def make_pipeline(tmp_path, download, info, **kwargs):
+    fetcher = InfoFetcher(max_workers=1, rate_per_second=1000, max_retries=0, fetch=info)
+    return UniversePipeline(CRITERIA, db_path=str(tmp_path / "u.db"), download=download,
+                            info_fetcher=fetcher, **kwargs)
+
+
+class TestHistoryFilters:
+    """Tests for the Stage 1 filter function."""
+
+    def test_thresholds(self):
+        assert passes_history_filters(make_history(), CRITERIA)
+        assert not passes_history_filters(make_history(price=5.0), CRITERIA)
+        assert not passes_history_filters(make_history(volume=1_000_000), CRITERIA)
+        assert not passes_history_filters(make_history(swing=0.5), CRITERIA)
+        assert not passes_history_filters(make_history(days=10), CRITERIA)
+        assert not passes_history_filters(None, CRITERIA)
+
+
+class TestUniversePipeline:
+    """Tests for UniversePipeline.run."""
+
+    def test_only_history_survivors_get_info_lookups(self, tmp_path):
+        download, info = FakeDownload(), FakeInfo()
+        pipeline = make_pipeline(tmp_path, download, info, history_chunk_size=3)
+
+        qualified = pipeline.run(list(UNIVERSE) + ['DELISTED'])
+
+        assert qualified == ['GOOD', 'OK2']
+        assert len(download.calls) == 3
+        assert sorted(info.calls) == ['GOOD', 'HUGE', 'OK2', 'SMALL']
+
+        history, market_cap = pipeline.stage_stats
+        assert (history['input'], history['passed']) == (8, 4)
+        assert (market_cap['input'], market_cap['passed']) == (4, 2)
+
+    def test_resumes_from_checkpoint_after_interruption(self, tmp_path):
+        tickers = list(UNIVERSE)
+        pipeline = make_pipeline(tmp_path, FakeDownload(fail_after=2), FakeInfo(), history_chunk_size=2)
+        with pytest.raises(KeyboardInterrupt):
+            pipeline.run(tickers)
+
+        assert len(pipeline.checkpoint.completed(STAGE_HISTORY)) == 4
+
+        download = FakeDownload()
+        pipeline = make_pipeline(tmp_path, download, FakeInfo(), history_chunk_size=2)
+        qualified = pipeline.run(tickers)
+
+        assert qualified == ['GOOD', 'OK2']
+        assert download.calls == [['SMALL', 'HUGE'], ['OK2']]
+        assert pipeline.stage_stats[0]['resumed'] == 4
+
+        # Completed runs clear the checkpoint
+        assert pipeline.checkpoint.completed(STAGE_HISTORY) == {}
+
+    def test_checkpoint_is_ignored_when_criteria_change(self, tmp_path):
+        pipeline = make_pipeline(tmp_path, FakeDownload(fail_after=1), FakeInfo(), history_chunk_size=2)
+        with pytest.raises(KeyboardInterrupt):
+            pipeline.run(list(UNIVERSE))
+
+        stricter = dict(CRITERIA, min_price=60.0)
+        other = UniversePipeline(stricter, db_path=str(tmp_path / "u.db"))
+        assert other.checkpoint.completed(STAGE_HISTORY) == {}
+
+    def test_finishing_one_run_keeps_other_runs_checkpoints(self, tmp_path):
+        pipeline = make_pipeline(tmp_path, FakeDownload(fail_after=1), FakeInfo(), history_chunk_size=2)
+        with pytest.raises(KeyboardInterrupt):
+            pipeline.run(list(UNIVERSE))
+
+        stricter = dict(CRITERIA, min_price=60.0)
+        fetcher = InfoFetcher(max_workers=1, rate_per_second=1000, max_retries=0, fetch=FakeInfo())
+        other = UniversePipeline(stricter, db_path=str(tmp_path / "u.db"),
+                                 download=FakeDownload(), info_fetcher=fetcher)
+        other.run(list(UNIVERSE))
+
+        assert len(pipeline.checkpoint.completed(STAGE_HISTORY)) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])